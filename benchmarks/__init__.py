@@ -0,0 +1,6 @@
+"""
+SchemaForge benchmarks.
+
+Standalone scripts, run with ``python -m benchmarks.<name>`` from the
+repository root. They are not part of the test suite.
+"""
@@ -0,0 +1,149 @@
+"""
+CLI import-time benchmark.
+
+Runs ``python -X importtime -c "import schemaforge.main"`` in fresh
+interpreters and reports the cumulative import time of the CLI module and
+its slowest imports. Fails when a heavy dependency (sqlglot, sqlparse) is
+loaded at startup, when the import exceeds ``--max-ms`` or when it is
+slower than a baseline by more than ``--max-regression``.
+
+    python -m benchmarks.import_time --out import.json
+    python -m benchmarks.import_time --max-ms 150
+    python -m benchmarks.import_time --baseline import.json --max-regression 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+MODULE = 'schemaforge.main'
+# Only needed once a schema is parsed; importing them up front costs ~250ms
+HEAVY_MODULES = ('sqlglot', 'sqlparse')
+# Differences below this are noise, whatever the ratio
+MIN_MS = 5.0
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output: str, module: Optional[str] = None) -> Dict[str, int]:
+    """
+    Returns the cumulative import time in microseconds per module of
+    ``-X importtime`` output; with ``module``, only that module and the
+    imports it triggered (not the interpreter's own startup imports).
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(parts[1]), depth))
+    if module is not None:
+        # A module's imports are printed right before it, one level deeper
+        end = next(i for i, (name, _, depth) in enumerate(entries) if name == module and depth == 0)
+        start = end
+        while start > 0 and entries[start - 1][2] > 0:
+            start -= 1
+        entries = entries[start:end + 1]
+    return {name: micros for name, micros, _ in entries}
+
+
+def import_times(module: str = MODULE, runs: int = 5) -> Dict[str, int]:
+    """
+    Imports ``module`` in ``runs`` fresh interpreters (after one warm-up
+    run that writes the bytecode caches) and returns the best cumulative
+    time of every module it imported.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [_ROOT, env.get('PYTHONPATH')]))
+    best: Dict[str, int] = {}
+    for run in range(runs + 1):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, env=env, check=True)
+        if run == 0:
+            continue
+        for name, micros in parse_importtime(result.stderr, module).items():
+            best[name] = min(micros, best.get(name, micros))
+    return best
+
+
+def heavy_imports(times: Dict[str, int], heavy=HEAVY_MODULES) -> List[str]:
+    """Returns the heavy top-level packages among the imported modules."""
+    return sorted({name.split('.')[0] for name in times if name.split('.')[0] in heavy})
+
+
+def run(module: str = MODULE, runs: int = 5, top: int = 10) -> dict:
+    """Measures ``module`` and returns the results document."""
+    times = import_times(module, runs)
+    slowest = sorted(((name, micros) for name, micros in times.items() if name != module),
+                     key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "python": platform.python_version(),
+        "module": module,
+        "runs": runs,
+        "milliseconds": times[module] / 1000,
+        "heavy_imports": heavy_imports(times),
+        "slowest": {name: micros / 1000 for name, micros in slowest},
+    }
+
+
+def check(current: dict, baseline: Optional[dict] = None, max_ms: Optional[float] = None,
+          max_regression: float = 0.2, min_ms: float = MIN_MS) -> List[str]:
+    """Returns a description of every failed check."""
+    failures = [f"{current['module']} imports {name} at startup" for name in current["heavy_imports"]]
+    ms = current["milliseconds"]
+    if max_ms is not None and ms > max_ms:
+        failures.append(f"{current['module']} import takes {ms:.1f}ms (budget {max_ms:.1f}ms)")
+    if baseline is not None:
+        old = baseline["milliseconds"]
+        if ms - old > min_ms and ms > old * (1 + max_regression):
+            failures.append(f"{current['module']} import: {old:.1f}ms -> {ms:.1f}ms (+{(ms / old - 1) * 100:.0f}%)")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--module', default=MODULE, help=f'Module to import (default: {MODULE})')
+    parser.add_argument('--runs', type=int, default=5, help='Measured imports, best is kept (default: 5)')
+    parser.add_argument('--out', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Compare against this results file and fail on regressions')
+    parser.add_argument('--max-ms', type=float, help='Fail when the import takes longer than this')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='Fail when the import is slower than the baseline by more than this fraction (default: 0.2)')
+    parser.add_argument('--min-ms', type=float, default=MIN_MS,
+                        help=f'Ignore differences to the baseline below this (default: {MIN_MS})')
+    args = parser.parse_args(argv)
+
+    current = run(args.module, args.runs)
+    print(f"{'import':<40} {'ms':>8}")
+    print(f"{current['module']:<40} {current['milliseconds']:>8.1f}")
+    for name, ms in current["slowest"].items():
+        print(f"  {name:<38} {ms:>8.1f}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Results saved to {args.out}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = check(current, baseline, args.max_ms, args.max_regression, args.min_ms)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    if failures:
+        print(f"FAIL: {len(failures)} import-time check(s) failed")
+        return 1
+    print("OK: import-time checks passed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Schema model memory benchmark.
+
+Builds a synthetic warehouse schema directly from the model classes (no
+parsing) and reports the memory it holds, per column and per table, as
+measured by tracemalloc. Type and collation strings are built per column
+the way a parser produces them, so interning shows up in the numbers.
+
+    python -m benchmarks.model_memory --tables 2000 --columns 50
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from schemaforge.models import Column, ForeignKey, Index, Schema, Table
+
+_TYPES = ('INT', 'BIGINT', 'VARCHAR({})', 'DECIMAL(18, {})', 'TIMESTAMP', 'TEXT', 'BOOLEAN', 'CHAR({})')
+
+
+def build_schema(tables: int, columns: int) -> Schema:
+    schema = Schema()
+    for t in range(tables):
+        table = Table(name=f"fact_{t:06d}")
+        for c in range(columns):
+            template = _TYPES[(t + c) % len(_TYPES)]
+            # Fresh string objects, as produced by a parser
+            data_type = ''.join(template.format((c % 4 + 1) * 8).split(' '))
+            collation = ''.join(['utf8mb4_', 'bin']) if c % 5 == 0 else None
+            table.columns.append(Column(
+                name=f"col_{c:04d}",
+                data_type=data_type,
+                is_nullable=c != 0,
+                is_primary_key=c == 0,
+                collation=collation,
+            ))
+        table.indexes.append(Index(name=f"ix_fact_{t:06d}", columns=['col_0001']))
+        if t:
+            table.foreign_keys.append(ForeignKey(
+                name=f"fk_fact_{t:06d}", column_names=['col_0002'],
+                ref_table=f"fact_{t - 1:06d}", ref_column_names=['col_0000'],
+            ))
+        schema.add_table(table)
+    return schema
+
+
+def measure(tables: int, columns: int) -> int:
+    """Returns the bytes still allocated by a schema of the given size."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        schema = build_schema(tables, columns)
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del schema
+    return size
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tables', type=int, default=2000, help='Number of tables (default: 2000)')
+    parser.add_argument('--columns', type=int, default=50, help='Columns per table (default: 50)')
+    parser.add_argument('--max-bytes-per-column', type=float, default=None,
+                        help='Fail if the schema holds more than this many bytes per column')
+    args = parser.parse_args(argv)
+
+    size = measure(args.tables, args.columns)
+    total_columns = args.tables * args.columns
+    per_column = size / total_columns
+    print(f"tables={args.tables} columns={total_columns} total={size / 1024 / 1024:.1f} MiB")
+    print(f"bytes/column (incl. table overhead): {per_column:.0f}")
+    print(f"bytes/table: {size / args.tables:.0f}")
+
+    if args.max_bytes_per_column is not None and per_column > args.max_bytes_per_column:
+        print(f"FAIL: {per_column:.0f} bytes/column exceeds {args.max_bytes_per_column:.0f}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
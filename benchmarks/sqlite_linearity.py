@@ -0,0 +1,86 @@
+"""
+SQLite parse scaling benchmark.
+
+Parses synthetic SQLite schemas of doubling size and reports the time per
+table, both for the statement front end (splitting, WITHOUT ROWID / STRICT
+detection, preprocessing) and for the full parse. With per-statement
+detection the per-table cost stays flat; a quadratic scan shows up as a
+growing ratio.
+
+    python -m benchmarks.sqlite_linearity --tables 1000 --steps 4
+"""
+
+import argparse
+import sys
+import time
+
+from schemaforge.parsers.sqlite import SQLiteParser
+
+
+def generate_sqlite_schema(tables: int) -> str:
+    """
+    Returns ``tables`` CREATE TABLE statements.
+
+    Only the last two tables carry WITHOUT ROWID / STRICT. This is the worst
+    case for a whole-file ``CREATE TABLE ... .*? WITHOUT ROWID`` scan: every
+    table backtracks to the end of the file.
+    """
+    parts = []
+    for i in range(tables):
+        options = {tables - 2: " WITHOUT ROWID", tables - 1: " STRICT"}.get(i, "")
+        parts.append(
+            f"CREATE TABLE t{i} (\n"
+            f"    id INTEGER PRIMARY KEY,\n"
+            f"    name TEXT NOT NULL,\n"
+            f"    note TEXT DEFAULT 'x'\n"
+            f"){options};\n"
+        )
+    return "".join(parts)
+
+
+def time_scan(sql: str) -> float:
+    """Seconds spent splitting, detecting table options and preprocessing."""
+    parser = SQLiteParser()
+    parser._reset_table_options()
+    start = time.perf_counter()
+    for statement in parser._iter_statements(sql):
+        parser._prepare(statement)
+    return time.perf_counter() - start
+
+
+def time_parse(sql: str) -> float:
+    """Seconds for a full parse."""
+    start = time.perf_counter()
+    SQLiteParser().parse(sql)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tables', type=int, default=1000, help='Tables in the smallest schema (default: 1000)')
+    parser.add_argument('--steps', type=int, default=4, help='Number of doublings (default: 4)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size, best time is kept (default: 3)')
+    parser.add_argument('--gate', choices=['scan', 'parse'], default='parse',
+                        help='Timing checked against --max-ratio (default: parse)')
+    parser.add_argument('--max-ratio', type=float, default=2.0,
+                        help='Fail if per-table time of the largest run exceeds the smallest by this factor (default: 2.0)')
+    args = parser.parse_args(argv)
+
+    print(f"{'tables':>8} {'bytes':>12} {'scan s':>10} {'parse s':>10} {'scan us/t':>10} {'parse us/t':>10}")
+    per_table = []
+    for step in range(args.steps):
+        tables = args.tables * 2 ** step
+        sql = generate_sqlite_schema(tables)
+        scan = min(time_scan(sql) for _ in range(args.repeat))
+        full = min(time_parse(sql) for _ in range(args.repeat))
+        per_table.append((scan if args.gate == 'scan' else full) / tables)
+        print(f"{tables:>8} {len(sql):>12} {scan:>10.3f} {full:>10.3f} "
+              f"{scan / tables * 1e6:>10.1f} {full / tables * 1e6:>10.1f}")
+
+    ratio = per_table[-1] / per_table[0]
+    print(f"{args.gate} per-table growth: {ratio:.2f}x (limit {args.max_ratio:.2f}x)")
+    return 0 if ratio <= args.max_ratio else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+SchemaForge benchmark suite.
+
+Times and measures the peak memory of every pipeline stage on seeded
+synthetic schemas (see ``benchmarks.synthetic``): reading the source
+files, each dialect's parser, ``Comparator.compare``, each generator and
+the JSON report. Results are written as JSON; ``compare`` checks them
+against a baseline and fails on regressions.
+
+    python -m benchmarks.suite run --tables 2000 --out current.json
+    python -m benchmarks.suite compare baseline.json current.json --max-regression 0.15
+    python -m benchmarks.suite run --dialects postgres mysql --baseline baseline.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic import DIALECTS, SchemaSpec, write_pair
+
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS = 0.01
+MIN_BYTES = 1024 * 1024
+
+
+def measure(func: Callable[[], object], repeat: int = 3) -> Dict[str, float]:
+    """
+    Returns the best wall time of ``repeat`` runs and the peak traced
+    memory of one extra run (tracing slows the code down, so it is not
+    timed).
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run_suite(spec: SchemaSpec, dialects: List[str], repeat: int = 3, files: int = 1,
+              log: Callable[[str], None] = print) -> dict:
+    """Runs all benchmarks for ``dialects`` and returns the results document."""
+    from schemaforge.comparator import Comparator
+    from schemaforge.main import get_generator, get_parser, read_sql_source
+    from schemaforge.version import __version__
+
+    results = {}
+
+    def record(name, func):
+        results[name] = measure(func, repeat)
+        log(f"{name:<26} {results[name]['seconds']:>10.4f}s {results[name]['peak_bytes'] / 1024 / 1024:>10.1f} MiB")
+
+    with tempfile.TemporaryDirectory(prefix='sf-bench-') as tmp:
+        for dialect in dialects:
+            source_dir, target_dir = write_pair(f"{tmp}/{dialect}", dialect, spec, files=files)
+            record(f"read_sql_source.{dialect}", lambda: read_sql_source(source_dir))
+            source_sql, target_sql = read_sql_source(source_dir), read_sql_source(target_dir)
+
+            record(f"parse.{dialect}", lambda: get_parser(dialect).parse(source_sql))
+            source = get_parser(dialect).parse(source_sql)
+            target = get_parser(dialect).parse(target_sql)
+
+            record(f"compare.{dialect}", lambda: Comparator(dialect=dialect).compare(source, target))
+            plan = Comparator(dialect=dialect).compare(source, target)
+
+            record(f"generate.{dialect}", lambda: get_generator(dialect).generate_migration(plan))
+            record(f"json.{dialect}", lambda: json.dumps(plan.to_dict(), indent=2))
+
+    return {
+        "schemaforge": __version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "spec": asdict(spec),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, max_regression: float = 0.2,
+                    min_seconds: float = MIN_SECONDS, min_bytes: int = MIN_BYTES) -> List[str]:
+    """
+    Returns a description of every benchmark whose time or peak memory grew
+    by more than ``max_regression`` (0.2 = 20%) over the baseline, ignoring
+    differences below ``min_seconds`` / ``min_bytes``.
+    """
+    regressions = []
+    for name, now in sorted(current["results"].items()):
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric, floor in (("seconds", min_seconds), ("peak_bytes", min_bytes)):
+            old, new = before[metric], now[metric]
+            if new - old > floor and new > old * (1 + max_regression):
+                growth = (new / old - 1) * 100 if old else float('inf')
+                regressions.append(f"{name} {metric}: {old:.4g} -> {new:.4g} (+{growth:.0f}%)")
+    return regressions
+
+
+def _print_comparison(baseline: dict, current: dict):
+    if baseline.get("spec") != current.get("spec"):
+        print("WARNING: baseline and current runs use different schema specs")
+    print(f"{'benchmark':<26} {'base s':>10} {'now s':>10} {'ratio':>7} {'base MiB':>10} {'now MiB':>10} {'ratio':>7}")
+    for name, now in sorted(current["results"].items()):
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<26} {'-':>10} {now['seconds']:>10.4f}")
+            continue
+        time_ratio = now["seconds"] / before["seconds"] if before["seconds"] else float('inf')
+        mem_ratio = now["peak_bytes"] / before["peak_bytes"] if before["peak_bytes"] else float('inf')
+        print(f"{name:<26} {before['seconds']:>10.4f} {now['seconds']:>10.4f} {time_ratio:>7.2f} "
+              f"{before['peak_bytes'] / 1024 / 1024:>10.1f} {now['peak_bytes'] / 1024 / 1024:>10.1f} {mem_ratio:>7.2f}")
+
+
+def _load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _gate(baseline: dict, current: dict, args) -> int:
+    _print_comparison(baseline, current)
+    regressions = compare_results(baseline, current, args.max_regression, args.min_seconds, args.min_mb * 1024 * 1024)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    if regressions:
+        print(f"FAIL: {len(regressions)} regression(s) above {args.max_regression:.0%}")
+        return 1
+    print(f"OK: no regression above {args.max_regression:.0%}")
+    return 0
+
+
+def _add_gate_args(parser):
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='Fail when time or peak memory grows by more than this fraction (default: 0.2)')
+    parser.add_argument('--min-seconds', type=float, default=MIN_SECONDS,
+                        help=f'Ignore time differences below this (default: {MIN_SECONDS})')
+    parser.add_argument('--min-mb', type=float, default=MIN_BYTES / 1024 / 1024,
+                        help='Ignore peak memory differences below this many MiB (default: 1)')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run the benchmarks')
+    run.add_argument('--dialects', nargs='+', choices=DIALECTS, default=list(DIALECTS))
+    run.add_argument('--tables', type=int, default=SchemaSpec.tables)
+    run.add_argument('--columns', type=int, default=SchemaSpec.columns)
+    run.add_argument('--indexes', type=int, default=SchemaSpec.indexes)
+    run.add_argument('--foreign-keys', type=int, default=SchemaSpec.foreign_keys)
+    run.add_argument('--views', type=int, default=SchemaSpec.views)
+    run.add_argument('--change-fraction', type=float, default=SchemaSpec.change_fraction)
+    run.add_argument('--seed', type=int, default=SchemaSpec.seed)
+    run.add_argument('--files', type=int, default=10, help='SQL files per schema (default: 10)')
+    run.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark, best is kept (default: 3)')
+    run.add_argument('--out', help='Write the results to this JSON file')
+    run.add_argument('--baseline', help='Compare against this results file and fail on regressions')
+    _add_gate_args(run)
+
+    check = commands.add_parser('compare', help='Compare two results files')
+    check.add_argument('baseline')
+    check.add_argument('current')
+    _add_gate_args(check)
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        return _gate(_load(args.baseline), _load(args.current), args)
+
+    spec = SchemaSpec(args.tables, args.columns, args.indexes, args.foreign_keys, args.views,
+                      args.change_fraction, args.seed)
+    # Parser warnings about synthetic DDL would drown the table
+    import logging
+    logger = logging.getLogger('schemaforge')
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        current = run_suite(spec, args.dialects, repeat=args.repeat, files=args.files)
+    finally:
+        logger.setLevel(level)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Results saved to {args.out}")
+    if args.baseline:
+        return _gate(_load(args.baseline), current, args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Seeded synthetic DDL generator.
+
+Produces a source/target schema pair for any supported dialect, scaled by
+table, column, index, foreign key and custom object (view) counts. The
+target differs from the source in ``change_fraction`` of the objects:
+tables get columns added, dropped or retyped and indexes added, some
+tables are dropped or created, and views are redefined. The same seed
+always gives the same DDL.
+
+    python -m benchmarks.synthetic --dialect postgres --tables 2000 --out /tmp/schema
+"""
+
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+DIALECTS = ('postgres', 'mysql', 'sqlite', 'oracle', 'db2', 'snowflake', 'mssql')
+
+# Column types per dialect; the first one is the key type
+_TYPES: Dict[str, Tuple[str, ...]] = {
+    'postgres': ('INTEGER', 'BIGINT', 'VARCHAR(64)', 'NUMERIC(18, 2)', 'TIMESTAMP', 'TEXT', 'BOOLEAN'),
+    'mysql': ('INT', 'BIGINT', 'VARCHAR(64)', 'DECIMAL(18, 2)', 'DATETIME', 'TEXT', 'TINYINT'),
+    'sqlite': ('INTEGER', 'INTEGER', 'TEXT', 'REAL', 'TEXT', 'BLOB', 'NUMERIC'),
+    'oracle': ('NUMBER(10)', 'NUMBER(19)', 'VARCHAR2(64)', 'NUMBER(18, 2)', 'TIMESTAMP', 'CLOB', 'DATE'),
+    'db2': ('INTEGER', 'BIGINT', 'VARCHAR(64)', 'DECIMAL(18, 2)', 'TIMESTAMP', 'CLOB', 'SMALLINT'),
+    'snowflake': ('NUMBER(10, 0)', 'NUMBER(19, 0)', 'VARCHAR(64)', 'NUMBER(18, 2)', 'TIMESTAMP_NTZ', 'VARIANT', 'BOOLEAN'),
+    'mssql': ('INT', 'BIGINT', 'NVARCHAR(64)', 'DECIMAL(18, 2)', 'DATETIME2', 'NVARCHAR(MAX)', 'BIT'),
+}
+# Snowflake has no secondary indexes on standard tables
+_NO_INDEXES = {'snowflake'}
+
+
+@dataclass
+class SchemaSpec:
+    """Size and shape of a synthetic schema."""
+    tables: int = 500
+    columns: int = 20          # per table, including the key column
+    indexes: int = 2           # per table
+    foreign_keys: int = 1      # per table, to earlier tables
+    views: int = 50
+    change_fraction: float = 0.1
+    seed: int = 0
+
+
+class _Table:
+    __slots__ = ('name', 'columns', 'indexes', 'fks')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.columns: List[Tuple[str, str, bool]] = []   # (name, type, nullable)
+        self.indexes: List[Tuple[str, List[str]]] = []
+        self.fks: List[Tuple[str, str, str]] = []        # (name, column, referenced table)
+
+
+def _build(dialect: str, spec: SchemaSpec, rng: random.Random) -> List[_Table]:
+    types = _TYPES[dialect]
+    tables = []
+    for t in range(spec.tables):
+        table = _Table(f"bench_t{t:06d}")
+        table.columns.append(('id', types[0], False))
+        for c in range(1, spec.columns):
+            table.columns.append((f"c{c:03d}", types[rng.randrange(1, len(types))], rng.random() < 0.7))
+        if dialect not in _NO_INDEXES:
+            for i in range(min(spec.indexes, spec.columns - 1)):
+                table.indexes.append((f"ix_t{t:06d}_{i}", [table.columns[1 + i][0]]))
+        for f in range(min(spec.foreign_keys, t)):
+            column = f"ref{f}_id"
+            table.columns.append((column, types[0], True))
+            table.fks.append((f"fk_t{t:06d}_{f}", column, f"bench_t{rng.randrange(t):06d}"))
+        tables.append(table)
+    return tables
+
+
+def _change(dialect: str, tables: List[_Table], spec: SchemaSpec, rng: random.Random) -> List[_Table]:
+    """Returns a changed copy of ``tables`` (the target schema)."""
+    types = _TYPES[dialect]
+    changed = []
+    dropped = set(rng.sample(range(len(tables)), int(len(tables) * spec.change_fraction / 4)))
+    for t, table in enumerate(tables):
+        if t in dropped:
+            continue
+        copy = _Table(table.name)
+        copy.columns = list(table.columns)
+        copy.indexes = list(table.indexes)
+        copy.fks = [fk for fk in table.fks if int(fk[2][-6:]) not in dropped]
+        if rng.random() < spec.change_fraction:
+            action = rng.randrange(4)
+            if action == 0:
+                copy.columns.append((f"added_{t}", types[2], True))
+            elif action == 1 and len(copy.columns) > 2:
+                removed = copy.columns.pop(len(copy.columns) // 2)[0]
+                copy.indexes = [ix for ix in copy.indexes if removed not in ix[1]]
+                copy.fks = [fk for fk in copy.fks if fk[1] != removed]
+            elif action == 2 and len(copy.columns) > 1:
+                name, data_type, nullable = copy.columns[1]
+                copy.columns[1] = (name, types[1] if data_type != types[1] else types[3], nullable)
+            elif dialect not in _NO_INDEXES:
+                copy.indexes.append((f"ix_added_{t}", [copy.columns[-1][0]]))
+        changed.append(copy)
+    for n in range(len(dropped)):
+        table = _Table(f"bench_new{n:06d}")
+        table.columns = [('id', types[0], False), ('payload', types[2], True)]
+        changed.append(table)
+    return changed
+
+
+def _render(dialect: str, tables: List[_Table], views: List[Tuple[str, str]]) -> str:
+    parts = []
+    for table in tables:
+        lines = [f"    {name} {data_type}{'' if nullable else ' NOT NULL'}" for name, data_type, nullable in table.columns]
+        lines.append("    PRIMARY KEY (id)")
+        for fk_name, column, ref in table.fks:
+            lines.append(f"    CONSTRAINT {fk_name} FOREIGN KEY ({column}) REFERENCES {ref} (id)")
+        parts.append(f"CREATE TABLE {table.name} (\n" + ",\n".join(lines) + "\n);\n")
+        for ix_name, columns in table.indexes:
+            parts.append(f"CREATE INDEX {ix_name} ON {table.name} ({', '.join(columns)});\n")
+    for name, body in views:
+        parts.append(f"CREATE VIEW {name} AS {body};\n")
+    return "".join(parts)
+
+
+def _views(source: List[_Table], target: List[_Table], count: int, rng: random.Random,
+           changed: float = 0.0) -> List[Tuple[str, str]]:
+    """Views over the source tables; a view over a dropped table reads a new one."""
+    views = []
+    names = [t.name for t in source]
+    existing = {t.name for t in target}
+    for v in range(min(count, len(names))):
+        table = names[(v * 7919) % len(names)]
+        if table not in existing:
+            table = target[-1].name
+        column = 'id' if rng.random() >= changed else 'id AS key_id'
+        views.append((f"bench_v{v:05d}", f"SELECT {column} FROM {table}"))
+    return views
+
+
+def generate_pair(dialect: str, spec: SchemaSpec = None) -> Tuple[str, str]:
+    """Returns ``(source DDL, target DDL)`` for ``dialect``."""
+    if dialect not in _TYPES:
+        raise ValueError(f"Unknown dialect: {dialect}")
+    spec = spec or SchemaSpec()
+    rng = random.Random(f"{spec.seed}:{dialect}")
+    source = _build(dialect, spec, rng)
+    target = _change(dialect, source, spec, rng)
+    source_views = _views(source, source, spec.views, random.Random(spec.seed))
+    target_views = _views(source, target, spec.views, random.Random(spec.seed), spec.change_fraction)
+    return _render(dialect, source, source_views), _render(dialect, target, target_views)
+
+
+def write_pair(directory: str, dialect: str, spec: SchemaSpec = None, files: int = 1) -> Tuple[str, str]:
+    """
+    Writes the pair as ``source/`` and ``target/`` directories of ``files``
+    SQL files each (split at statement boundaries) and returns their paths.
+    """
+    paths = []
+    for side, sql in zip(('source', 'target'), generate_pair(dialect, spec)):
+        path = os.path.join(directory, side)
+        os.makedirs(path, exist_ok=True)
+        statements = sql.split(";\n")
+        per_file = -(-len(statements) // files)
+        for n in range(files):
+            chunk = statements[n * per_file:(n + 1) * per_file]
+            with open(os.path.join(path, f"part_{n:04d}.sql"), 'w') as f:
+                f.write(";\n".join(s for s in chunk if s.strip()) + (";\n" if any(s.strip() for s in chunk) else ""))
+        paths.append(path)
+    return paths[0], paths[1]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--dialect', choices=DIALECTS, default='postgres')
+    parser.add_argument('--tables', type=int, default=SchemaSpec.tables)
+    parser.add_argument('--columns', type=int, default=SchemaSpec.columns)
+    parser.add_argument('--indexes', type=int, default=SchemaSpec.indexes)
+    parser.add_argument('--foreign-keys', type=int, default=SchemaSpec.foreign_keys)
+    parser.add_argument('--views', type=int, default=SchemaSpec.views)
+    parser.add_argument('--change-fraction', type=float, default=SchemaSpec.change_fraction)
+    parser.add_argument('--seed', type=int, default=SchemaSpec.seed)
+    parser.add_argument('--files', type=int, default=1, help='SQL files per side (default: 1)')
+    parser.add_argument('--out', required=True, help='Directory for the source/ and target/ schemas')
+    args = parser.parse_args(argv)
+
+    spec = SchemaSpec(args.tables, args.columns, args.indexes, args.foreign_keys, args.views,
+                      args.change_fraction, args.seed)
+    source, target = write_pair(args.out, args.dialect, spec, files=args.files)
+    print(f"Wrote {source} and {target}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+SchemaForge Batch Comparison
+
+``sf compare-batch --manifest FILE --out DIR`` diffs many source/target
+pairs in one run. Each distinct source and target is parsed once, so a
+golden schema shared by hundreds of tenants is not parsed hundreds of
+times. The pairs are then compared in a process pool (``--jobs``) that
+receives the parsed schemas once per worker.
+
+The manifest is JSON, or YAML when PyYAML is installed::
+
+    {
+      "dialect": "postgres",
+      "target": "golden",
+      "pairs": [
+        {"name": "tenant_001", "source": "tenants/001"},
+        {"name": "tenant_002", "source": "tenants/002", "stats": "stats/002.csv"}
+      ]
+    }
+
+Top-level ``dialect``, ``source``, ``target`` and ``stats`` are defaults for
+pairs that do not set them. Relative paths are resolved against the
+manifest's directory. A pair's ``name`` (default: the base name of its
+source) names its outputs ``DIR/<name>.sql`` and ``DIR/<name>.json``
+(plus ``DIR/<name>.rollback.sql`` with ``--generate-rollback``).
+``DIR/summary.json`` lists every pair with its status and change counts.
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from dataclasses import fields
+from typing import Dict, List, NamedTuple, Optional
+
+from schemaforge.exceptions import SchemaForgeError
+from schemaforge.logging_config import get_logger
+
+SUMMARY_FILE = 'summary.json'
+
+_NAME = re.compile(r'[A-Za-z0-9_][A-Za-z0-9_.-]*')
+_PAIR_KEYS = ('name', 'source', 'target', 'dialect', 'stats')
+
+# Set in each compare worker by _init_compare_worker()
+_worker_schemas = None
+_worker_args = None
+
+
+class ManifestError(SchemaForgeError):
+    """Raised when a batch manifest cannot be read or is invalid."""
+    pass
+
+
+class BatchPair(NamedTuple):
+    """One source/target comparison of a batch manifest."""
+    name: str
+    source: str
+    target: str
+    dialect: str
+    stats: Optional[str] = None
+
+
+def _read_manifest(path: str):
+    yaml = None
+    errors = (ValueError,)
+    if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ManifestError(f"Reading {path} requires PyYAML (pip install pyyaml); use a JSON manifest instead")
+        errors = (ValueError, yaml.YAMLError)
+    try:
+        with open(path) as f:
+            return yaml.safe_load(f) if yaml is not None else json.load(f)
+    except OSError as e:
+        raise ManifestError(f"Cannot read manifest {path}: {e}")
+    except errors as e:
+        raise ManifestError(f"Invalid manifest {path}: {e}")
+
+
+def load_manifest(path: str, dialect: Optional[str] = None, dialects=None) -> List[BatchPair]:
+    """
+    Reads the pairs of a batch manifest.
+
+    ``dialect`` (the ``--dialect`` option) is used for pairs without one in
+    the manifest; ``dialects`` restricts the accepted dialect names.
+    """
+    data = _read_manifest(path)
+    if isinstance(data, list):
+        data = {'pairs': data}
+    if not isinstance(data, dict) or not isinstance(data.get('pairs'), list):
+        raise ManifestError(f"Manifest {path} needs a list of pairs under \"pairs\"")
+
+    base = os.path.dirname(os.path.abspath(path))
+    defaults = {key: data.get(key) for key in ('source', 'target', 'stats')}
+    defaults['dialect'] = data.get('dialect') or dialect
+
+    pairs = []
+    names = set()
+    for number, entry in enumerate(data['pairs'], 1):
+        if not isinstance(entry, dict):
+            raise ManifestError(f"Pair {number} of {path} is not an object: {entry!r}")
+        unknown = set(entry) - set(_PAIR_KEYS)
+        if unknown:
+            raise ManifestError(f"Pair {number} of {path} has unknown keys: {', '.join(sorted(unknown))}")
+        values = {key: entry.get(key) or defaults[key] for key in defaults}
+        for key in ('source', 'target', 'dialect'):
+            if not values[key]:
+                raise ManifestError(f"Pair {number} of {path} has no {key}")
+        if dialects is not None and values['dialect'] not in dialects:
+            raise ManifestError(f"Pair {number} of {path} has an unsupported dialect: {values['dialect']}")
+        for key in ('source', 'target', 'stats'):
+            if values[key]:
+                values[key] = os.path.normpath(os.path.join(base, values[key]))
+
+        name = entry.get('name') or os.path.splitext(os.path.basename(values['source']))[0]
+        if not isinstance(name, str) or not _NAME.fullmatch(name):
+            raise ManifestError(f"Pair {number} of {path} has an invalid name (letters, digits, '_', '.', '-'): {name!r}")
+        if name == os.path.splitext(SUMMARY_FILE)[0]:
+            raise ManifestError(f"Pair {number} of {path} cannot be named {name!r}: {SUMMARY_FILE} holds the batch summary")
+        if name in names:
+            raise ManifestError(f"Duplicate pair name in {path}: {name} (set a unique \"name\" per pair)")
+        names.add(name)
+        pairs.append(BatchPair(name, values['source'], values['target'], values['dialect'], values['stats']))
+    return pairs
+
+
+def _parse_all(sources, args, cache=None) -> Dict[tuple, object]:
+    """
+    Parses each distinct ``(dialect, path)`` once.
+
+    Returns the Schema, or the exception that stopped its parse, per key,
+    so one broken source fails only the pairs that use it.
+    """
+    from schemaforge.main import _parse_schema_worker, get_parser, parse_source
+
+    results = {}
+    if args.jobs < 2 or len(sources) < 2:
+        parsers = {}
+        for dialect, path in sources:
+            parser_instance = parsers.get(dialect)
+            if parser_instance is None:
+                parser_instance = parsers[dialect] = get_parser(dialect, strict=args.strict)
+            try:
+                results[(dialect, path)] = parse_source(parser_instance, path, cache)
+            except Exception as e:
+                results[(dialect, path)] = e
+        return results
+
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(sources))) as executor:
+        futures = {key: executor.submit(_parse_schema_worker, key[0], key[1], args.strict, 1, cache) for key in sources}
+        for key, future in futures.items():
+            try:
+                results[key] = pickle.loads(future.result())
+            except Exception as e:
+                results[key] = e
+    return results
+
+
+def _init_compare_worker(schemas, args):
+    # Runs once per worker; with the fork start method ``schemas`` is
+    # inherited rather than pickled
+    global _worker_schemas, _worker_args
+    _worker_schemas = schemas
+    _worker_args = args
+
+
+def _compare_task(index: int, pair: BatchPair, source_key: int, target_key: int) -> dict:
+    return compare_pair(pair, _worker_schemas[source_key], _worker_schemas[target_key], _worker_args)
+
+
+def _change_count(migration_plan) -> int:
+    return sum(len(getattr(migration_plan, f.name)) for f in fields(migration_plan) if f.name != 'costs')
+
+
+def compare_pair(pair: BatchPair, source_schema, target_schema, args) -> dict:
+    """
+    Compares one pair and writes its outputs to ``args.out`` with
+    ``_handle_output``. Returns the pair's summary entry.
+    """
+    import contextlib
+    import io
+    from schemaforge.comparator import Comparator
+    from schemaforge.main import _handle_output
+
+    started = time.perf_counter()
+    outputs = {
+        'sql_out': os.path.join(args.out, f"{pair.name}.sql"),
+        'json_out': os.path.join(args.out, f"{pair.name}.json"),
+        'rollback_out': os.path.join(args.out, f"{pair.name}.rollback.sql") if args.generate_rollback else None,
+    }
+    entry = {"name": pair.name, "source": pair.source, "target": pair.target, "dialect": pair.dialect}
+    try:
+        # Pairs share their targets; the digests cached on a shared schema
+        # let the next pair skip its unchanged tables
+        comparator = Comparator(fingerprints=True, dialect=pair.dialect, detect_renames=args.detect_renames)
+        if args.rename_threshold is not None:
+            comparator.rename_threshold = args.rename_threshold
+        migration_plan = comparator.compare(source_schema, target_schema)
+        stats_path = pair.stats or args.stats
+        if stats_path:
+            from schemaforge.costs import estimate_costs, load_stats
+            migration_plan.costs = estimate_costs(migration_plan, load_stats(stats_path), pair.dialect, online=args.online)
+
+        pair_args = argparse.Namespace(**dict(vars(args), dialect=pair.dialect, plan=False, batches_out=None, **outputs))
+        # The "saved to" lines of each pair would drown the summary
+        with contextlib.redirect_stdout(io.StringIO()):
+            _handle_output(pair_args, migration_plan)
+    except Exception as e:
+        entry.update(status="failed", error=str(e))
+    else:
+        changes = _change_count(migration_plan)
+        entry.update(
+            status="changed" if changes else "unchanged",
+            changes=changes,
+            new_tables=len(migration_plan.new_tables),
+            dropped_tables=len(migration_plan.dropped_tables),
+            modified_tables=len(migration_plan.modified_tables),
+            outputs={key[:-len('_out')]: value for key, value in outputs.items() if value},
+        )
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def run_batch(pairs: List[BatchPair], args, cache=None) -> dict:
+    """
+    Parses every distinct source and target of ``pairs`` once, compares the
+    pairs (in a process pool with ``args.jobs`` >= 2) and writes their
+    outputs and ``summary.json`` to ``args.out``. Returns the summary.
+    """
+    logger = get_logger("batch")
+    os.makedirs(args.out, exist_ok=True)
+
+    started = time.perf_counter()
+    sources = list(dict.fromkeys(key for pair in pairs for key in ((pair.dialect, pair.source), (pair.dialect, pair.target))))
+    parsed = _parse_all(sources, args, cache)
+    parse_seconds = time.perf_counter() - started
+    logger.info(f"Parsed {len(sources)} distinct schemas for {len(pairs)} pairs in {parse_seconds:.2f}s")
+
+    # Schemas go to the workers as one list; tasks refer to them by index
+    schemas = [parsed[key] for key in sources]
+    index = {key: i for i, key in enumerate(sources)}
+    results: List[Optional[dict]] = [None] * len(pairs)
+    tasks = []
+    for i, pair in enumerate(pairs):
+        failed = [(path, parsed[(pair.dialect, path)]) for path in (pair.source, pair.target)
+                  if isinstance(parsed[(pair.dialect, path)], Exception)]
+        if failed:
+            path, error = failed[0]
+            results[i] = {"name": pair.name, "source": pair.source, "target": pair.target, "dialect": pair.dialect,
+                          "status": "failed", "error": f"Cannot parse {path}: {error}"}
+        else:
+            tasks.append((i, pair, index[(pair.dialect, pair.source)], index[(pair.dialect, pair.target)]))
+
+    started = time.perf_counter()
+    if args.jobs < 2 or len(tasks) < 2:
+        for i, pair, source_key, target_key in tasks:
+            results[i] = compare_pair(pair, schemas[source_key], schemas[target_key], args)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(tasks)), initializer=_init_compare_worker,
+                                 initargs=(schemas, args)) as executor:
+            futures = [(task[0], executor.submit(_compare_task, *task)) for task in tasks]
+            for i, future in futures:
+                results[i] = future.result()
+    compare_seconds = time.perf_counter() - started
+
+    for entry in results:
+        if entry["status"] == "failed":
+            logger.error(f"{entry['name']}: {entry['error']}")
+
+    totals = {status: sum(1 for entry in results if entry["status"] == status)
+              for status in ("changed", "unchanged", "failed")}
+    summary = {
+        "pairs": len(pairs),
+        "schemas_parsed": len(sources),
+        "totals": totals,
+        "parse_seconds": round(parse_seconds, 3),
+        "compare_seconds": round(compare_seconds, 3),
+        "results": results,
+    }
+    with open(os.path.join(args.out, SUMMARY_FILE), 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def format_summary(summary: dict) -> str:
+    """Returns the per-pair table printed by ``sf compare-batch``."""
+    width = max([len("pair")] + [len(entry["name"]) for entry in summary["results"]])
+    lines = [f"{'pair':<{width}}  {'status':<9}  {'changes':>7}  {'seconds':>7}"]
+    for entry in summary["results"]:
+        changes = entry.get("changes", "")
+        seconds = f"{entry['seconds']:.2f}" if "seconds" in entry else ""
+        lines.append(f"{entry['name']:<{width}}  {entry['status']:<9}  {changes:>7}  {seconds:>7}")
+    totals = summary["totals"]
+    lines.append(f"{summary['pairs']} pairs ({summary['schemas_parsed']} schemas parsed in {summary['parse_seconds']:.2f}s, "
+                 f"compared in {summary['compare_seconds']:.2f}s): {totals['changed']} changed, "
+                 f"{totals['unchanged']} unchanged, {totals['failed']} failed")
+    return "\n".join(lines)
@@ -0,0 +1,249 @@
+"""
+SchemaForge Parse Cache
+
+Content-addressed on-disk cache for per-file parse fragments (see
+BaseParser.parse_fragment). Entries are keyed by the parser dialect, the
+strict flag, the SchemaForge/sqlglot/sqlparse versions and a SHA-256 of the
+file content, so a changed file or an upgrade simply misses. Least recently
+used entries are evicted once the cache grows past its size limit.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Optional
+
+from schemaforge.logging_config import get_logger
+
+# Bump when the fragment layout changes
+CACHE_FORMAT = 3
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_ENTRY_SUFFIX = '.frag'
+
+
+def default_cache_dir() -> str:
+    """Returns ``$XDG_CACHE_HOME/schemaforge`` or ``~/.cache/schemaforge``."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'schemaforge')
+
+
+def _tool_versions() -> str:
+    import sqlglot
+    import sqlparse
+    try:
+        from schemaforge.version import __version__ as version
+    except ImportError:
+        version = 'Unknown'
+    return f"{CACHE_FORMAT}|{version}|sqlglot-{sqlglot.__version__}|sqlparse-{sqlparse.__version__}"
+
+
+class ParseCache:
+    """
+    Stores parse fragments as pickles under ``cache_dir``.
+
+    Reads refresh an entry's mtime, which prune() uses as the LRU order.
+    Writes go through a temporary file and os.replace(), so concurrent
+    processes sharing a directory never see partial entries.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir or default_cache_dir()))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._written = False
+        self._versions = None
+
+    def __getstate__(self):
+        # Workers start with fresh counters
+        state = self.__dict__.copy()
+        state.update(hits=0, misses=0, _written=False)
+        return state
+
+    def key(self, parser, data: bytes) -> str:
+        """Cache key for ``data`` parsed by ``parser``."""
+        if self._versions is None:
+            self._versions = _tool_versions()
+        cls = type(parser)
+        h = hashlib.sha256()
+        h.update(self._versions.encode('utf-8'))
+        h.update(f"|{cls.__module__}.{cls.__qualname__}|{getattr(parser, 'dialect', None)}|strict={parser.strict}|".encode('utf-8'))
+        h.update(hashlib.sha256(data).digest())
+        return h.hexdigest()
+
+    def get_schema(self, keys):
+        """
+        Returns a cached Schema built from the files with ``keys`` (in
+        order), or None. The on-disk cache stores fragments only.
+        """
+        return None
+
+    def put_schema(self, keys, schema) -> None:
+        """Stores the Schema merged from the files with ``keys``; see get_schema()."""
+        pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + _ENTRY_SUFFIX)
+
+    def get(self, key: str):
+        """Returns the cached fragment for ``key`` or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                fragment = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            # Corrupt or incompatible entry: drop it and re-parse
+            get_logger("cache").warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return fragment
+
+    def put(self, key: str, fragment) -> None:
+        """
+        Stores ``fragment`` under ``key``.
+
+        The fragment is pickled immediately, so callers may apply (and
+        mutate) it afterwards. Write errors are logged and ignored.
+        """
+        path = self._path(key)
+        try:
+            data = pickle.dumps(fragment, protocol=pickle.HIGHEST_PROTOCOL)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._remove(tmp_path)
+                raise
+        except Exception as e:
+            get_logger("cache").warning(f"Could not write cache entry {path}: {e}")
+            return
+        self._written = True
+
+    def prune(self) -> int:
+        """
+        Evicts least recently used entries until the cache fits in max_bytes.
+
+        Only scans the directory when this instance wrote something.
+        Returns the number of entries removed.
+        """
+        if not self._written:
+            return 0
+        self._written = False
+
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(_ENTRY_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        removed = 0
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class MemoryParseCache(ParseCache):
+    """
+    In-process LRU of parse fragments for long-lived processes (``sf serve``).
+
+    Uses the same keys as ParseCache and also keeps the merged Schema of
+    each source, so a source whose files are all unchanged is not merged
+    again. Entries are kept pickled, both so callers can mutate what they
+    get back and so ``max_bytes`` bounds the real footprint; least recently
+    used entries are evicted on put().
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        from collections import OrderedDict
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._versions = None
+        self._entries = OrderedDict()
+        self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        raise TypeError("MemoryParseCache cannot be shared with worker processes")
+
+    @staticmethod
+    def _schema_key(keys) -> str:
+        return 'schema:' + hashlib.sha256('|'.join(keys).encode('ascii')).hexdigest()
+
+    def get_schema(self, keys):
+        data = self._entries.get(self._schema_key(keys))
+        if data is None:
+            return None
+        self._entries.move_to_end(self._schema_key(keys))
+        self.hits += len(keys)
+        return pickle.loads(data)
+
+    def put_schema(self, keys, schema) -> None:
+        # Stored with their fingerprints, so a reused schema is not hashed again
+        for obj in (*schema.tables, *schema.custom_objects, *schema.policies, *schema.domains, *schema.types):
+            obj.fingerprint()
+        self.put(self._schema_key(keys), schema)
+
+    def get(self, key: str):
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key: str, fragment) -> None:
+        data = pickle.dumps(fragment, protocol=pickle.HIGHEST_PROTOCOL)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= len(old)
+        self._entries[key] = data
+        self.total_bytes += len(data)
+        self.prune()
+
+    def prune(self) -> int:
+        removed = 0
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, data = self._entries.popitem(last=False)
+            self.total_bytes -= len(data)
+            removed += 1
+        return removed
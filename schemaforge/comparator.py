@@ -1,6 +1,59 @@
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Optional, Tuple, Dict, Any
-from schemaforge.models import Schema, Table, Column, Index, ForeignKey, CheckConstraint, ExclusionConstraint, CustomObject
+from schemaforge.models import Schema, Table, Column, Index, ForeignKey, CheckConstraint, ExclusionConstraint, CustomObject, diff_fields
+from schemaforge.renames import RENAME_THRESHOLD, column_features, column_rename_allowed, match_renames, table_features
+
+# Below this many shared tables a process pool costs more than it saves
+PARALLEL_MIN_TABLES = 2000
+# Table pairs per task sent to a pool worker
+PARALLEL_CHUNK_SIZE = 250
+
+# Set in each diff worker by _init_diff_worker()
+_worker_comparator = None
+_worker_pairs = None
+
+
+@lru_cache(maxsize=None)
+def _diff_layout(cls, dialect: Optional[str]):
+    """
+    Returns ``(specs, getter)`` for the registered diff fields of ``cls``:
+    ``getter(obj)`` yields their values as one tuple, so unchanged objects
+    cost a single tuple comparison.
+    """
+    specs = diff_fields(cls, dialect)
+    names = [name for name, _ in specs]
+    if not names:
+        return specs, lambda obj: ()
+    if len(names) == 1:
+        return specs, lambda obj, name=names[0]: (getattr(obj, name),)
+    return specs, attrgetter(*names)
+
+
+def _init_diff_worker(comparator, pairs):
+    # Runs once per worker; with the fork start method ``pairs`` is
+    # inherited rather than pickled
+    global _worker_comparator, _worker_pairs
+    _worker_comparator = comparator
+    _worker_pairs = pairs
+
+
+def _diff_range(start: int, end: int) -> List[Tuple[int, "TableDiff"]]:
+    """
+    Diffs ``_worker_pairs[start:end]`` in a pool worker.
+
+    Returns ``(index, diff)`` for changed tables only. ``new_table_obj`` is
+    cleared so the table is not pickled back; the parent re-attaches it.
+    """
+    results = []
+    for i in range(start, end):
+        old_table, new_table = _worker_pairs[i]
+        diff = _worker_comparator._compare_tables(old_table, new_table)
+        if diff:
+            diff.new_table_obj = None
+            results.append((i, diff))
+    return results
 
 @dataclass
 class TableDiff:
@@ -8,6 +61,7 @@ class TableDiff:
     added_columns: List[Column] = field(default_factory=list)
     dropped_columns: List[Column] = field(default_factory=list)
     modified_columns: List[tuple[Column, Column]] = field(default_factory=list) # (old, new)
+    renamed_columns: List[tuple[Column, Column]] = field(default_factory=list)  # (old, new)
     added_indexes: List[Index] = field(default_factory=list)
     dropped_indexes: List[Index] = field(default_factory=list)
     added_fks: List[ForeignKey] = field(default_factory=list)
@@ -33,6 +87,10 @@ class TableDiff:
                 {"old": old.to_dict(), "new": new.to_dict()} 
                 for old, new in self.modified_columns
             ],
+            "renamed_columns": [
+                {"old": old.name, "new": new.name}
+                for old, new in self.renamed_columns
+            ],
             "added_indexes": [i.to_dict() for i in self.added_indexes],
             "dropped_indexes": [i.to_dict() for i in self.dropped_indexes],
             "added_fks": [fk.to_dict() for fk in self.added_fks],
@@ -57,6 +115,7 @@ class MigrationPlan:
     new_tables: List[Table] = field(default_factory=list)
     dropped_tables: List[Table] = field(default_factory=list)
     modified_tables: List[TableDiff] = field(default_factory=list) 
+    renamed_tables: List[tuple[Table, Table]] = field(default_factory=list)  # (old, new)
     
     # Custom Objects
     new_custom_objects: List[CustomObject] = field(default_factory=list)
@@ -71,12 +130,19 @@ class MigrationPlan:
     new_policies: List[CustomObject] = field(default_factory=list)
     dropped_policies: List[CustomObject] = field(default_factory=list)
     modified_policies: List[tuple[CustomObject, CustomObject]] = field(default_factory=list)
+
+    # Lock/rewrite estimates of the table diffs (schemaforge.costs), filled from --stats
+    costs: List[Any] = field(default_factory=list)
     
     def to_dict(self):
         return {
             "new_tables": [t.to_dict() for t in self.new_tables],
             "dropped_tables": [t.to_dict() for t in self.dropped_tables],
             "modified_tables": [t.to_dict() for t in self.modified_tables],
+            "renamed_tables": [
+                {"old": old.name, "new": new.name}
+                for old, new in self.renamed_tables
+            ],
             "new_custom_objects": [o.to_dict() for o in self.new_custom_objects],
             "dropped_custom_objects": [o.to_dict() for o in self.dropped_custom_objects],
             "modified_custom_objects": [
@@ -100,10 +166,44 @@ class MigrationPlan:
             "modified_types": [
                 {"old": old.to_dict(), "new": new.to_dict()} 
                 for old, new in self.modified_types
-            ]
+            ],
+            **({"costs": [c.to_dict() for c in self.costs]} if self.costs else {})
         } 
 
 class Comparator:
+    def __init__(self, fingerprints: bool = False, jobs: int = 1,
+                 parallel_threshold: int = PARALLEL_MIN_TABLES, dialect: Optional[str] = None,
+                 detect_renames: bool = False, rename_threshold: float = RENAME_THRESHOLD):
+        """
+        Args:
+            fingerprints: Compute (and cache) structural fingerprints of
+                tables and objects, then skip the field-by-field comparison
+                for those whose fingerprints match. Worth it when schemas
+                are compared more than once; a single comparison is faster
+                without. Fingerprints that are already cached on both sides
+                are always used.
+            jobs: Number of worker processes used to diff tables present in
+                both schemas. 1 (default) diffs in the current process.
+            parallel_threshold: Minimum number of shared tables before the
+                process pool is used.
+            dialect: Only compare model fields registered for this dialect
+                (see schemaforge.models.diff_fields). None compares all.
+            detect_renames: Report dropped/added tables and columns that
+                are structurally similar as renames (see
+                schemaforge.renames) instead of a drop plus a create.
+            rename_threshold: Minimum similarity (0-1) of a rename.
+        """
+        self.fingerprints = fingerprints
+        self.jobs = max(1, jobs or 1)
+        self.parallel_threshold = parallel_threshold
+        self.dialect = dialect
+        self.detect_renames = detect_renames
+        self.rename_threshold = rename_threshold
+
+    def _unchanged(self, old_obj, new_obj) -> bool:
+        old_digest = old_obj.fingerprint(compute=self.fingerprints)
+        return old_digest is not None and old_digest == new_obj.fingerprint(compute=self.fingerprints)
+
     def _compare_lists(self, old_list, new_list, plan_new, plan_dropped):
         old_objs = {o.name: o for o in old_list}
         new_objs = {o.name: o for o in new_list}
@@ -131,14 +231,21 @@ class Comparator:
         for name, table in old_tables.items():
             if name not in new_tables:
                 plan.dropped_tables.append(table)
+
+        if self.detect_renames:
+            self._detect_table_renames(plan)
                 
         # Detect modifications
+        shared = []
         for name, new_table in new_tables.items():
             if name in old_tables:
                 old_table = old_tables[name]
-                diff = self._compare_tables(old_table, new_table)
-                if diff:
-                    plan.modified_tables.append(diff)
+                # Structurally identical: nothing to compare field by field
+                if not self._unchanged(old_table, new_table):
+                    shared.append((old_table, new_table))
+        # Renamed tables are diffed under their new name
+        shared.extend(plan.renamed_tables)
+        plan.modified_tables.extend(self._compare_shared_tables(shared))
                     
         # Custom Objects Comparison
         old_objs = {(o.obj_type, o.name): o for o in old_schema.custom_objects}
@@ -150,7 +257,7 @@ class Comparator:
             else:
                 # Check for modification (simple property check)
                 old_obj = old_objs[key]
-                if old_obj.properties != obj.properties:
+                if not self._unchanged(old_obj, obj) and old_obj.properties != obj.properties:
                     plan.modified_custom_objects.append((old_obj, obj))
                     
         for key, obj in old_objs.items():
@@ -167,7 +274,7 @@ class Comparator:
                     added_list.append(obj)
                 else:
                     old_obj = old_dict[name]
-                    if old_obj.properties != obj.properties:
+                    if not self._unchanged(old_obj, obj) and old_obj.properties != obj.properties:
                         modified_list.append((old_obj, obj))
                         
             for name, obj in old_dict.items():
@@ -180,6 +287,85 @@ class Comparator:
 
         return plan
 
+    def _detect_table_renames(self, plan: MigrationPlan):
+        """Moves dropped/new table pairs that look like renames to ``plan.renamed_tables``."""
+        matches = match_renames(
+            [table_features(t) for t in plan.dropped_tables],
+            [table_features(t) for t in plan.new_tables],
+            self.rename_threshold,
+        )
+        if not matches:
+            return
+        plan.renamed_tables.extend((plan.dropped_tables[i], plan.new_tables[j]) for i, j in matches)
+        renamed_old = {i for i, _ in matches}
+        renamed_new = {j for _, j in matches}
+        plan.dropped_tables[:] = [t for i, t in enumerate(plan.dropped_tables) if i not in renamed_old]
+        plan.new_tables[:] = [t for j, t in enumerate(plan.new_tables) if j not in renamed_new]
+
+    def _detect_column_renames(self, old_table: Table, new_table: Table, diff: TableDiff):
+        """
+        Moves dropped/added column pairs that look like renames to
+        ``diff.renamed_columns``. A renamed column whose definition also
+        changed is listed in ``diff.modified_columns`` as well.
+        """
+        old_positions = {id(c): i for i, c in enumerate(old_table.columns)}
+        new_positions = {id(c): i for i, c in enumerate(new_table.columns)}
+        dropped, added = diff.dropped_columns, diff.added_columns
+        matches = match_renames(
+            [column_features(c, old_positions[id(c)]) for c in dropped],
+            [column_features(c, new_positions[id(c)]) for c in added],
+            self.rename_threshold,
+            # Features ignore names: unrelated columns of one type must not match
+            lambda i, j: column_rename_allowed(dropped[i], old_positions[id(dropped[i])],
+                                               added[j], new_positions[id(added[j])]),
+        )
+        if not matches:
+            return
+        _, column_values = _diff_layout(Column, self.dialect)
+        for i, j in matches:
+            old_col, new_col = diff.dropped_columns[i], diff.added_columns[j]
+            diff.renamed_columns.append((old_col, new_col))
+            if column_values(old_col) != column_values(new_col):
+                diff.modified_columns.append((old_col, new_col))
+        renamed_old = {i for i, _ in matches}
+        renamed_new = {j for _, j in matches}
+        diff.dropped_columns[:] = [c for i, c in enumerate(diff.dropped_columns) if i not in renamed_old]
+        diff.added_columns[:] = [c for j, c in enumerate(diff.added_columns) if j not in renamed_new]
+
+    def _compare_shared_tables(self, pairs: List[Tuple[Table, Table]]) -> List[TableDiff]:
+        """
+        Diffs ``(old, new)`` table pairs and returns the diffs in pair order.
+
+        With ``jobs`` > 1 and at least ``parallel_threshold`` pairs, chunks of
+        pairs are diffed in a process pool; the result is identical to the
+        serial loop.
+        """
+        if self.jobs > 1 and len(pairs) >= self.parallel_threshold:
+            return self._compare_shared_tables_pool(pairs)
+
+        diffs = []
+        for old_table, new_table in pairs:
+            diff = self._compare_tables(old_table, new_table)
+            if diff:
+                diffs.append(diff)
+        return diffs
+
+    def _compare_shared_tables_pool(self, pairs: List[Tuple[Table, Table]]) -> List[TableDiff]:
+        from concurrent.futures import ProcessPoolExecutor
+
+        diffs = []
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_diff_worker,
+                                 initargs=(self, pairs)) as executor:
+            futures = [
+                executor.submit(_diff_range, start, min(start + PARALLEL_CHUNK_SIZE, len(pairs)))
+                for start in range(0, len(pairs), PARALLEL_CHUNK_SIZE)
+            ]
+            for future in futures:
+                for i, diff in future.result():
+                    diff.new_table_obj = pairs[i][1]
+                    diffs.append(diff)
+        return diffs
+
     def _compare_tables(self, old_table: Table, new_table: Table) -> Optional[TableDiff]:
         # Extract PK columns from old table for constraint-aware migrations
         pk_columns = [c.name for c in old_table.columns if c.is_primary_key]
@@ -207,12 +393,16 @@ class Comparator:
             if name not in new_cols:
                 diff.dropped_columns.append(col)
                 has_changes = True
+
+        if self.detect_renames and diff.added_columns and diff.dropped_columns:
+            self._detect_column_renames(old_table, new_table, diff)
                 
-        # Modified columns
+        # Modified columns (compared as value tuples, nothing is formatted)
+        _, column_values = _diff_layout(Column, self.dialect)
         for name, new_col in new_cols.items():
             if name in old_cols:
                 old_col = old_cols[name]
-                if self._is_column_modified(old_col, new_col):
+                if column_values(old_col) != column_values(new_col):
                     diff.modified_columns.append((old_col, new_col))
                     has_changes = True
                     
@@ -305,164 +495,28 @@ class Comparator:
                     has_changes = True
         
         # Table Properties
-        if old_table.cluster_by != new_table.cluster_by:
-            diff.property_changes.append(f"Cluster Key: {old_table.cluster_by} -> {new_table.cluster_by}")
-            has_changes = True
-            
-        if old_table.retention_days != new_table.retention_days:
-            diff.property_changes.append(f"Retention: {old_table.retention_days} -> {new_table.retention_days}")
-            has_changes = True
-            
-        if old_table.comment != new_table.comment:
-            diff.property_changes.append(f"Comment: {old_table.comment} -> {new_table.comment}")
-            has_changes = True
-            
-        if old_table.is_transient != new_table.is_transient:
-            diff.property_changes.append(f"Transient: {old_table.is_transient} -> {new_table.is_transient}")
-            has_changes = True
-            
-        if old_table.primary_key_name != new_table.primary_key_name:
-            diff.property_changes.append(f"Primary Key Name: {old_table.primary_key_name} -> {new_table.primary_key_name}")
-            has_changes = True
-
-        # MySQL Specifics
-        if old_table.engine != new_table.engine:
-            diff.property_changes.append(f"Engine: {old_table.engine} -> {new_table.engine}")
-            has_changes = True
-
-        if old_table.row_format != new_table.row_format:
-            diff.property_changes.append(f"Row Format: {old_table.row_format} -> {new_table.row_format}")
-            has_changes = True
-
-        # SQLite Specifics
-        if old_table.is_strict != new_table.is_strict:
-            diff.property_changes.append(f"Strict: {old_table.is_strict} -> {new_table.is_strict}")
-            has_changes = True
-
-        if old_table.without_rowid != new_table.without_rowid:
-            diff.property_changes.append(f"Without RowID: {old_table.without_rowid} -> {new_table.without_rowid}")
-            has_changes = True
-            
-        # Policies
-        old_policies = set(old_table.policies)
-        new_policies = set(new_table.policies)
-        if old_policies != new_policies:
-            added = new_policies - old_policies
-            removed = old_policies - new_policies
-            for p in added:
-                diff.property_changes.append(f"Policy: {p}")
-            for p in removed:
-                # Format: "MASKING POLICY name ON col" -> "Unset Policy: name ON col"
-                # Or just "Unset Policy" if the test expects that
-                # Test expects "Unset Policy" or "Drop Policy"
-                if "ROW ACCESS POLICY" in p:
-                    diff.property_changes.append(f"Drop Policy: {p}")
-                else:
-                    diff.property_changes.append(f"Unset Policy: {p}")
-            has_changes = True
-            
-        # Tags
-        if old_table.tags != new_table.tags:
-            # Check for unset tags
-            old_tags = set(old_table.tags.keys())
-            new_tags = set(new_table.tags.keys())
-            
-            added_tags = new_tags - old_tags
-            removed_tags = old_tags - new_tags
-            modified_tags = {k for k in old_tags & new_tags if old_table.tags[k] != new_table.tags[k]}
-            
-            for t in added_tags:
-                diff.property_changes.append(f"Tag: {t}={new_table.tags[t]}")
-            for t in removed_tags:
-                diff.property_changes.append(f"Unset Tag: {t}")
-            for t in modified_tags:
-                diff.property_changes.append(f"Tag: {t} {old_table.tags[t]} -> {new_table.tags[t]}")
-                
-            has_changes = True
-            
-        # Other Dialect Properties
-        if old_table.partition_by != new_table.partition_by:
-            diff.property_changes.append(f"Partition: {old_table.partition_by} -> {new_table.partition_by}")
-            has_changes = True
-            
-        if old_table.tablespace != new_table.tablespace:
-            diff.property_changes.append(f"Tablespace: {old_table.tablespace} -> {new_table.tablespace}")
-            has_changes = True
-
-        if old_table.database_name != new_table.database_name:
-            diff.property_changes.append(f"Database: {old_table.database_name} -> {new_table.database_name}")
-            has_changes = True
-            
-        if old_table.stogroup != new_table.stogroup:
-            diff.property_changes.append(f"Stogroup: {old_table.stogroup} -> {new_table.stogroup}")
-            has_changes = True
-            
-        if old_table.priqty != new_table.priqty:
-            diff.property_changes.append(f"Priqty: {old_table.priqty} -> {new_table.priqty}")
-            has_changes = True
-            
-        if old_table.secqty != new_table.secqty:
-            diff.property_changes.append(f"Secqty: {old_table.secqty} -> {new_table.secqty}")
-            has_changes = True
-            
-        if old_table.audit != new_table.audit:
-            diff.property_changes.append(f"Audit: {old_table.audit} -> {new_table.audit}")
-            has_changes = True
-            
-        if old_table.ccsid != new_table.ccsid:
-            diff.property_changes.append(f"CCSID: {old_table.ccsid} -> {new_table.ccsid}")
-            has_changes = True
-            
-        if old_table.without_rowid != new_table.without_rowid:
-            diff.property_changes.append(f"Without RowID: {old_table.without_rowid} -> {new_table.without_rowid}")
-            has_changes = True
-            
-        # Postgres Properties
-        if old_table.inherits != new_table.inherits:
-            diff.property_changes.append(f"Inherits: {old_table.inherits} -> {new_table.inherits}")
-            has_changes = True
-            
-        if old_table.row_security != new_table.row_security:
-            diff.property_changes.append(f"Row Security: {old_table.row_security} -> {new_table.row_security}")
-            has_changes = True
-            
-        if old_table.partition_of != new_table.partition_of:
-            diff.property_changes.append(f"Partition Of: {old_table.partition_of} -> {new_table.partition_of}")
-            has_changes = True
-
-        if old_table.partition_bound != new_table.partition_bound:
-            diff.property_changes.append(f"Partition Bound: {old_table.partition_bound} -> {new_table.partition_bound}")
+        if self._property_changes(Table, old_table, new_table, diff.property_changes):
             has_changes = True
 
         return diff if has_changes else None
 
+    def _property_changes(self, cls, old_obj, new_obj, changes: List[str]) -> bool:
+        """
+        Appends a message for every registered diff field of ``cls`` that
+        differs between the two objects. Returns True if any was added.
+        """
+        specs, values = _diff_layout(cls, self.dialect)
+        old_values = values(old_obj)
+        new_values = values(new_obj)
+        if old_values == new_values:
+            return False
+        count = len(changes)
+        for (_, spec), old_value, new_value in zip(specs, old_values, new_values):
+            if old_value != new_value:
+                changes.extend(spec.changes(old_value, new_value))
+        return len(changes) > count
+
     def _is_column_modified(self, old_col: Column, new_col: Column) -> Optional[List[str]]:
         changes = []
-        if old_col.data_type != new_col.data_type:
-            changes.append(f"Data Type: {old_col.data_type} -> {new_col.data_type}")
-        if old_col.is_nullable != new_col.is_nullable:
-            changes.append(f"Nullable: {old_col.is_nullable} -> {new_col.is_nullable}")
-        if old_col.default_value != new_col.default_value:
-            changes.append(f"Default: {old_col.default_value} -> {new_col.default_value}")
-        if old_col.is_primary_key != new_col.is_primary_key:
-            changes.append(f"Primary Key: {old_col.is_primary_key} -> {new_col.is_primary_key}")
-        if old_col.comment != new_col.comment:
-            changes.append(f"Comment: {old_col.comment} -> {new_col.comment}")
-        if old_col.collation != new_col.collation:
-            changes.append(f"Collation: {old_col.collation} -> {new_col.collation}")
-        if old_col.masking_policy != new_col.masking_policy:
-            changes.append(f"Masking Policy: {old_col.masking_policy} -> {new_col.masking_policy}")
-        if old_col.is_identity != new_col.is_identity:
-            changes.append(f"Identity: {old_col.is_identity} -> {new_col.is_identity}")
-        if old_col.identity_start != new_col.identity_start:
-            changes.append(f"Identity Start: {old_col.identity_start} -> {new_col.identity_start}")
-        if old_col.identity_step != new_col.identity_step:
-            changes.append(f"Identity Step: {old_col.identity_step} -> {new_col.identity_step}")
-        if old_col.is_generated != new_col.is_generated:
-            changes.append(f"Generated: {old_col.is_generated} -> {new_col.is_generated}")
-        if old_col.generation_expression != new_col.generation_expression:
-            changes.append(f"Generation Expr: {old_col.generation_expression} -> {new_col.generation_expression}")
-        if old_col.identity_cycle != new_col.identity_cycle:
-            changes.append(f"Identity Cycle: {old_col.identity_cycle} -> {new_col.identity_cycle}")
-            
+        self._property_changes(Column, old_col, new_col, changes)
         return changes if changes else None
@@ -0,0 +1,294 @@
+"""
+SchemaForge Migration Cost Estimates
+
+Estimates which ``TableDiff`` operations rewrite or lock large tables,
+from table statistics exported from the database catalogs (``--stats``).
+Nothing connects to a database: each operation is classified by a
+per-dialect cost model and its duration is derived from the table's row
+count and size.
+
+Operation kinds:
+
+- ``metadata``: catalog change only; cost does not depend on table size
+- ``index_build``: reads the table and sorts the indexed columns
+- ``table_scan``: reads the whole table (validating a constraint)
+- ``rewrite``: copies the whole table, indexes included
+
+Durations use the throughput constants of the cost model. They are
+rough, hardware dependent orders of magnitude meant to rank operations,
+not to schedule deployments to the second.
+"""
+
+import csv
+import json
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+from schemaforge.exceptions import SchemaForgeError
+
+METADATA = 'metadata'
+INDEX_BUILD = 'index_build'
+TABLE_SCAN = 'table_scan'
+REWRITE = 'rewrite'
+
+# Column defaults that are evaluated per row (Postgres cannot store them as a fast default)
+_VOLATILE_DEFAULT = re.compile(r"\b(random|gen_random_uuid|uuid_generate_v\d\w*|clock_timestamp|nextval)\s*\(", re.I)
+_VARCHAR = re.compile(r"(?:VARCHAR|CHARACTER VARYING)\s*\((\d+)\)", re.I)
+
+
+class StatsError(SchemaForgeError):
+    """Raised when a --stats file cannot be read."""
+    pass
+
+
+class TableStats(NamedTuple):
+    """Row count and size of one table, as exported from the catalogs."""
+    rows: int = 0
+    bytes: int = 0
+
+
+class OperationCost(NamedTuple):
+    """Estimated cost of one operation of a table diff."""
+    table: str
+    operation: str       # e.g. "add column email"
+    kind: str            # METADATA, INDEX_BUILD, TABLE_SCAN or REWRITE
+    lock: str            # dialect lock level held while it runs
+    rows: Optional[int]  # None without stats for the table
+    seconds: Optional[float]
+
+    def to_dict(self):
+        return {
+            "table": self.table,
+            "operation": self.operation,
+            "kind": self.kind,
+            "lock": self.lock,
+            "rows": self.rows,
+            "estimated_seconds": None if self.seconds is None else round(self.seconds, 3),
+        }
+
+
+def _number(value, field_name, table) -> int:
+    if value in (None, ''):
+        return 0
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        raise StatsError(f"Invalid {field_name} for table {table}: {value!r}")
+
+
+def load_stats(path: str) -> Dict[str, TableStats]:
+    """
+    Reads table statistics from a JSON or CSV file.
+
+    JSON is either ``{"table": {"rows": N, "bytes": N}, ...}`` (optionally
+    under a ``"tables"`` key) or a list of ``{"table", "rows", "bytes"}``
+    objects. CSV needs a header with ``table``, ``rows`` and ``bytes``
+    columns. Table names are matched case-insensitively.
+    """
+    try:
+        with open(path, newline='') as f:
+            if os.path.splitext(path)[1].lower() == '.csv':
+                entries = list(csv.DictReader(f))
+            else:
+                data = json.load(f)
+                if isinstance(data, dict):
+                    data = data.get('tables', data)
+                if isinstance(data, dict):
+                    entries = [dict(values, table=name) for name, values in data.items()]
+                else:
+                    entries = data
+    except (OSError, ValueError) as e:
+        raise StatsError(f"Cannot read stats file {path}: {e}")
+
+    stats = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get('table'):
+            raise StatsError(f"Stats entry without a table name in {path}: {entry!r}")
+        name = entry['table']
+        stats[name.lower()] = TableStats(_number(entry.get('rows'), 'rows', name),
+                                         _number(entry.get('bytes'), 'bytes', name))
+    return stats
+
+
+def _lookup(stats: Dict[str, TableStats], table_name: str) -> Optional[TableStats]:
+    key = table_name.strip('"`[]').lower()
+    found = stats.get(key)
+    if found is None and '.' in key:
+        found = stats.get(key.rsplit('.', 1)[1])
+    return found
+
+
+class CostModel:
+    """
+    Dialect-neutral cost model: conservative about locks, which are
+    reported as an exclusive table lock.
+    """
+    # Throughput assumptions used for the duration estimates
+    scan_bytes_per_second = 200 * 1024 * 1024
+    rewrite_bytes_per_second = 50 * 1024 * 1024
+    index_rows_per_second = 1_000_000
+
+    exclusive_lock = 'EXCLUSIVE'
+
+    def __init__(self, online: bool = False):
+        self.online = online
+
+    def estimate(self, plan, stats: Dict[str, TableStats]) -> List[OperationCost]:
+        """Returns the cost of every operation of the plan's modified tables."""
+        costs = []
+        for diff in plan.modified_tables:
+            table_stats = _lookup(stats, diff.table_name)
+            for operation, kind, lock in self.classify(diff):
+                costs.append(OperationCost(diff.table_name, operation, kind, lock,
+                                           table_stats.rows if table_stats else None,
+                                           self.seconds(kind, table_stats)))
+        return costs
+
+    def seconds(self, kind: str, table_stats: Optional[TableStats]) -> Optional[float]:
+        if kind == METADATA:
+            return 0.0
+        if table_stats is None:
+            return None
+        if kind == INDEX_BUILD:
+            return table_stats.rows / self.index_rows_per_second
+        if kind == TABLE_SCAN:
+            return table_stats.bytes / self.scan_bytes_per_second
+        return table_stats.bytes / self.rewrite_bytes_per_second
+
+    def classify(self, diff) -> List[tuple]:
+        """Returns ``(operation, kind, lock)`` for each change of ``diff``."""
+        lock = self.exclusive_lock
+        ops = [(f"rename column {old.name} -> {new.name}", METADATA, lock) for old, new in diff.renamed_columns]
+        ops += [(f"add column {col.name}", METADATA, lock) for col in diff.added_columns]
+        ops += [(f"drop column {col.name}", METADATA, lock) for col in diff.dropped_columns]
+        for old_col, new_col in diff.modified_columns:
+            changed = False
+            if old_col.data_type != new_col.data_type:
+                ops.append((f"alter column {new_col.name} type {new_col.data_type}", REWRITE, lock))
+                changed = True
+            if old_col.is_nullable and not new_col.is_nullable:
+                ops.append((f"alter column {new_col.name} set not null", TABLE_SCAN, lock))
+                changed = True
+            if not changed:
+                ops.append((f"alter column {new_col.name}", METADATA, lock))
+        ops += [(f"add index {idx.name}", INDEX_BUILD, lock) for idx in diff.added_indexes]
+        ops += [(f"drop index {idx.name}", METADATA, lock) for idx in diff.dropped_indexes]
+        ops += [(f"add check {check.name}", TABLE_SCAN, lock) for check in diff.added_checks]
+        ops += [(f"drop check {check.name}", METADATA, lock) for check in diff.dropped_checks]
+        ops += [(f"add foreign key {fk.name}", TABLE_SCAN, lock) for fk in diff.added_fks]
+        ops += [(f"add foreign key {new.name}", TABLE_SCAN, lock) for _, new in diff.modified_fks]
+        ops += [(f"drop foreign key {fk.name}", METADATA, lock) for fk in diff.dropped_fks]
+        return ops
+
+
+class PostgresCostModel(CostModel):
+    """
+    PostgreSQL 12+. With ``online`` the operations are the ones emitted by
+    ``PostgresGenerator(online=True)``: scans run while validating under
+    SHARE UPDATE EXCLUSIVE, which does not block reads or writes.
+    """
+    exclusive_lock = 'ACCESS EXCLUSIVE'
+    online_lock = 'SHARE UPDATE EXCLUSIVE'
+
+    def classify(self, diff):
+        exclusive = self.exclusive_lock
+        validate = self.online_lock if self.online else exclusive
+        ops = [(f"rename column {old.name} -> {new.name}", METADATA, exclusive) for old, new in diff.renamed_columns]
+        for col in diff.added_columns:
+            # Non-volatile defaults are stored in the catalog (PG 11+)
+            rewrites = col.is_identity or col.generation_expression or _VOLATILE_DEFAULT.search(col.default_value or '')
+            ops.append((f"add column {col.name}", REWRITE if rewrites else METADATA, exclusive))
+        ops += [(f"drop column {col.name}", METADATA, exclusive) for col in diff.dropped_columns]
+        for old_col, new_col in diff.modified_columns:
+            changed = False
+            if old_col.data_type != new_col.data_type:
+                kind = METADATA if _binary_coercible(old_col.data_type, new_col.data_type) else REWRITE
+                ops.append((f"alter column {new_col.name} type {new_col.data_type}", kind, exclusive))
+                changed = True
+            if old_col.is_nullable and not new_col.is_nullable:
+                ops.append((f"alter column {new_col.name} set not null", TABLE_SCAN, validate))
+                changed = True
+            if not changed:
+                ops.append((f"alter column {new_col.name}", METADATA, exclusive))
+        ops += [(f"add index {idx.name}", INDEX_BUILD, self.online_lock if self.online else 'SHARE')
+                for idx in diff.added_indexes]
+        ops += [(f"drop index {idx.name}", METADATA, self.online_lock if self.online else exclusive)
+                for idx in diff.dropped_indexes]
+        ops += [(f"add check {check.name}", TABLE_SCAN, validate) for check in diff.added_checks]
+        ops += [(f"drop check {check.name}", METADATA, exclusive) for check in diff.dropped_checks]
+        fk_lock = self.online_lock if self.online else 'SHARE ROW EXCLUSIVE'
+        ops += [(f"add foreign key {fk.name}", TABLE_SCAN, fk_lock) for fk in diff.added_fks]
+        ops += [(f"add foreign key {new.name}", TABLE_SCAN, fk_lock) for _, new in diff.modified_fks]
+        ops += [(f"drop foreign key {fk.name}", METADATA, exclusive) for fk in diff.dropped_fks]
+        return ops
+
+    def seconds(self, kind, table_stats):
+        seconds = super().seconds(kind, table_stats)
+        if kind == INDEX_BUILD and self.online and seconds is not None:
+            # CREATE INDEX CONCURRENTLY scans the table twice
+            seconds *= 2
+        return seconds
+
+
+def _binary_coercible(old_type: str, new_type: str) -> bool:
+    """VARCHAR widening and VARCHAR -> TEXT do not rewrite a Postgres table."""
+    old_match = _VARCHAR.fullmatch(old_type.strip())
+    if not old_match:
+        return False
+    if new_type.strip().upper() in ('TEXT', 'VARCHAR', 'CHARACTER VARYING'):
+        return True
+    new_match = _VARCHAR.fullmatch(new_type.strip())
+    return bool(new_match) and int(new_match.group(1)) >= int(old_match.group(1))
+
+
+class MySQLCostModel(CostModel):
+    """
+    MySQL 8.0.29+ InnoDB. Column and index changes use the algorithm
+    ``MySQLGenerator`` picks for their ALTER TABLE clause; the lock is the
+    LOCK level that algorithm allows. InnoDB picks the same algorithm
+    without hints, so ``online`` does not change the estimate.
+    """
+    def classify(self, diff):
+        from schemaforge.generators.mysql import COPY, INSTANT, MySQLGenerator, _varchar_widening
+
+        # Same order as MySQLGenerator.alter_clauses(); kind when the clause runs INPLACE
+        described = [(f"add column {col.name}", METADATA) for col in diff.added_columns]
+        described += [(f"drop column {col.name}", METADATA) for col in diff.dropped_columns]
+        for old_col, new_col in diff.modified_columns:
+            if old_col.data_type != new_col.data_type:
+                widening = _varchar_widening(old_col.data_type, new_col.data_type)
+                described.append((f"alter column {new_col.name} type {new_col.data_type}", METADATA if widening else REWRITE))
+            else:
+                described.append((f"alter column {new_col.name}", REWRITE))  # rebuilt in place
+        described += [(f"drop index {idx.name}", METADATA) for idx in diff.dropped_indexes]
+        described += [(f"add index {idx.name}", INDEX_BUILD) for idx in diff.added_indexes]
+
+        ops = [(f"rename column {old.name} -> {new.name}", METADATA, 'NONE') for old, new in diff.renamed_columns]
+        for (operation, kind), clause in zip(described, MySQLGenerator(online=True).alter_clauses(diff)):
+            if clause.algorithm == INSTANT:
+                kind = METADATA
+            elif clause.algorithm == COPY:
+                kind = REWRITE
+            ops.append((operation, kind, 'NONE' if clause.concurrent else 'SHARED'))
+        # ADD CHECK needs a table copy; ADD FOREIGN KEY too unless foreign_key_checks=0
+        ops += [(f"add check {check.name}", REWRITE, 'SHARED') for check in diff.added_checks]
+        ops += [(f"drop check {check.name}", METADATA, 'NONE') for check in diff.dropped_checks]
+        ops += [(f"add foreign key {fk.name}", REWRITE, 'SHARED') for fk in diff.added_fks]
+        ops += [(f"add foreign key {new.name}", REWRITE, 'SHARED') for _, new in diff.modified_fks]
+        ops += [(f"drop foreign key {fk.name}", METADATA, 'NONE') for fk in diff.dropped_fks]
+        return ops
+
+
+def cost_model(dialect: str, online: bool = False) -> CostModel:
+    """Returns the cost model of ``dialect`` (dialect-neutral for the others)."""
+    if dialect == 'postgres':
+        return PostgresCostModel(online)
+    if dialect == 'mysql':
+        return MySQLCostModel(online)
+    return CostModel(online)
+
+
+def estimate_costs(plan, stats: Dict[str, TableStats], dialect: str, online: bool = False) -> List[OperationCost]:
+    """Estimates the cost of every table diff operation in ``plan``."""
+    return cost_model(dialect, online).estimate(plan, stats)
@@ -0,0 +1,245 @@
+"""
+SchemaForge Migration Ordering
+
+A MigrationPlan is turned into steps (create a table, drop a view, alter
+a table, ...) that are ordered by a dependency graph instead of a fixed
+category order. Edges come from:
+
+- ``ForeignKey.ref_table``, ``Table.inherits`` and ``Table.partition_of``:
+  referenced tables are created first and dropped last.
+- Names referenced from a custom object's ``raw_sql`` (views, functions,
+  triggers, ...): the object is dropped before the tables and objects it
+  used are dropped or altered, and it is created after the ones it uses.
+- Name reuse: a name is dropped or renamed away before it is created again.
+
+The graph is sorted into batches. Steps within a batch do not depend on
+each other, so a runner may apply them on separate connections. Steps in
+a batch keep the plan's category order, so a plan without dependencies
+produces the same statements as before.
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Set
+
+from schemaforge.logging_config import get_logger
+
+DROP_OBJECT = 'drop_object'
+CREATE_OBJECT = 'create_object'
+RECREATE_OBJECT = 'recreate_object'  # create side of a modified object
+CREATE_TABLE = 'create_table'
+DROP_TABLE = 'drop_table'
+RENAME_TABLE = 'rename_table'
+ALTER_TABLE = 'alter_table'
+# Follow-up phases of an altered table that must run in their own
+# transaction after it (see GenericGenerator.step_phases)
+VALIDATE_CONSTRAINTS = 'validate_constraints'
+SET_NOT_NULL = 'set_not_null'
+
+_IDENTIFIER = re.compile(
+    r"'(?:[^']|'')*'"           # string literal: skipped
+    r"|--[^\n]*|/\*.*?\*/"      # comments: skipped
+    r'|"([^"]+)"|`([^`]+)`|\[([^\]]+)\]'
+    r"|([A-Za-z_][\w$#]*)",
+    re.S,
+)
+_PLAIN_NAME = re.compile(r"[\w$#]+(?:\.[\w$#]+)*")
+
+
+class MigrationStep(NamedTuple):
+    """One unit of a migration: an action on a table, table diff or custom object."""
+    action: str
+    subject: Any  # Table, TableDiff, CustomObject or (old Table, new Table) for renames
+
+    @property
+    def name(self) -> str:
+        """Name of the object the step works on (the new name for renames)."""
+        if self.action == RENAME_TABLE:
+            return self.subject[1].name
+        if self.action in (ALTER_TABLE, VALIDATE_CONSTRAINTS, SET_NOT_NULL):
+            return self.subject.table_name
+        return self.subject.name
+
+    def label(self) -> str:
+        if self.action == RENAME_TABLE:
+            return f"{self.action} {self.subject[0].name} -> {self.subject[1].name}"
+        return f"{self.action} {self.name}"
+
+
+def _key(name: str) -> str:
+    return name.strip('"`[]').lower() if name else ''
+
+
+def _table_references(table) -> Set[str]:
+    refs = {_key(fk.ref_table) for fk in table.foreign_keys if fk.ref_table}
+    for parents in (table.inherits, table.partition_of):
+        if parents:
+            refs.update(_key(p) for p in parents.strip('()').split(','))
+    refs.discard(_key(table.name))
+    refs.discard('')
+    return refs
+
+
+def sql_references(sql: str, names: Iterable[str]) -> Set[str]:
+    """
+    Returns the names in ``names`` (case-folded) that appear as identifiers
+    in ``sql``. String literals and comments are ignored; a qualified name
+    also matches by its last part.
+    """
+    known = names if isinstance(names, (set, frozenset)) else set(names)
+    return _references(sql, known, [name for name in known if '.' in name])
+
+
+def _references(sql: str, known: Set[str], dotted: List[str]) -> Set[str]:
+    if not sql or not known:
+        return set()
+    found = set()
+    for match in _IDENTIFIER.finditer(sql):
+        ident = next((g for g in match.groups() if g), None)
+        if ident is None:
+            continue
+        ident = ident.lower()
+        if ident in known:
+            found.add(ident)
+    # Qualified references (schema.view) are matched by their parts above;
+    # qualified known names need the dotted form
+    if dotted:
+        lowered = sql.lower()
+        found.update(name for name in dotted if name in lowered)
+    return found
+
+
+def migration_steps(plan) -> List[MigrationStep]:
+    """Returns the steps of ``plan`` in category order (before sorting)."""
+    steps = [MigrationStep(DROP_OBJECT, obj) for obj in plan.dropped_custom_objects]
+    steps += [MigrationStep(CREATE_OBJECT, obj) for obj in plan.new_custom_objects]
+    for old, new in plan.modified_custom_objects:
+        steps.append(MigrationStep(DROP_OBJECT, old))
+        steps.append(MigrationStep(RECREATE_OBJECT, new))
+    steps += [MigrationStep(CREATE_TABLE, table) for table in plan.new_tables]
+    steps += [MigrationStep(DROP_TABLE, table) for table in plan.dropped_tables]
+    steps += [MigrationStep(RENAME_TABLE, pair) for pair in getattr(plan, 'renamed_tables', [])]
+    steps += [MigrationStep(ALTER_TABLE, diff) for diff in plan.modified_tables]
+    return steps
+
+
+def _dependency_edges(steps: List[MigrationStep]) -> Dict[int, Set[int]]:
+    """Returns ``{step: steps that must run after it}``."""
+    # Steps by the name they make available / take away
+    provides = defaultdict(list)   # name -> [(action, step)]
+    removes = defaultdict(list)
+    for i, step in enumerate(steps):
+        if step.action == RENAME_TABLE:
+            removes[_key(step.subject[0].name)].append((step.action, i))
+            provides[_key(step.subject[1].name)].append((step.action, i))
+        elif step.action in (DROP_OBJECT, DROP_TABLE):
+            removes[_key(step.name)].append((step.action, i))
+        elif step.action == ALTER_TABLE:
+            provides[_key(step.name)].append((step.action, i))
+            removes[_key(step.name)].append((step.action, i))
+        else:
+            provides[_key(step.name)].append((step.action, i))
+
+    object_names = [_key(s.name) for s in steps
+                    if s.action in (DROP_OBJECT, CREATE_OBJECT, RECREATE_OBJECT) and _PLAIN_NAME.fullmatch(s.name or '')]
+    known_names = set(provides) | set(removes) | set(object_names)
+    dotted_names = [name for name in known_names if '.' in name]
+
+    after = defaultdict(set)
+
+    def before(first: int, then: int):
+        if first != then:
+            after[first].add(then)
+
+    for i, step in enumerate(steps):
+        action = step.action
+        if action in (CREATE_OBJECT, RECREATE_OBJECT, DROP_OBJECT):
+            refs = _references(step.subject.properties.get('raw_sql', ''), known_names, dotted_names)
+            refs.discard(_key(step.name))
+            if action == DROP_OBJECT:
+                # Drop dependents before what they use is dropped or altered
+                for ref in refs:
+                    for _, j in removes[ref]:
+                        before(i, j)
+            else:
+                for ref in refs:
+                    for _, j in provides[ref]:
+                        before(j, i)
+        elif action == CREATE_TABLE:
+            for ref in _table_references(step.subject):
+                for other, j in provides[ref]:
+                    if other in (CREATE_TABLE, RENAME_TABLE, CREATE_OBJECT, RECREATE_OBJECT):
+                        before(j, i)
+        elif action == DROP_TABLE:
+            for ref in _table_references(step.subject):
+                for other, j in removes[ref]:
+                    if other == DROP_TABLE:
+                        before(i, j)
+        elif action == ALTER_TABLE:
+            diff = step.subject
+            # A renamed table is altered under its new name
+            for other, j in provides[_key(step.name)]:
+                if other == RENAME_TABLE:
+                    before(j, i)
+            added = list(diff.added_fks) + [new for _, new in diff.modified_fks]
+            dropped = list(diff.dropped_fks) + [old for old, _ in diff.modified_fks]
+            for fk in added:
+                for other, j in provides[_key(fk.ref_table)]:
+                    if other in (CREATE_TABLE, RENAME_TABLE):
+                        before(j, i)
+            for fk in dropped:
+                for other, j in removes[_key(fk.ref_table)]:
+                    if other == DROP_TABLE:
+                        before(i, j)
+
+    # A name is dropped (or renamed away) before it is created again
+    for name, removers in removes.items():
+        for remover, i in removers:
+            if remover == ALTER_TABLE:
+                continue
+            for provider, j in provides.get(name, ()):
+                if provider != ALTER_TABLE:
+                    before(i, j)
+    return after
+
+
+def sort_steps(steps: List[MigrationStep]) -> List[List[MigrationStep]]:
+    """
+    Sorts steps into batches by dependency level (Kahn's algorithm).
+
+    Steps that are part of a cycle (for example two new tables with foreign
+    keys to each other) cannot be ordered; they are logged and returned in
+    category order as the last batch.
+    """
+    after = _dependency_edges(steps)
+    pending = [0] * len(steps)
+    for targets in after.values():
+        for j in targets:
+            pending[j] += 1
+
+    batches = []
+    ready = [i for i in range(len(steps)) if not pending[i]]
+    placed = set()
+    while ready:
+        batches.append([steps[i] for i in ready])
+        placed.update(ready)
+        released = []
+        for i in ready:
+            for j in after.get(i, ()):
+                pending[j] -= 1
+                if not pending[j]:
+                    released.append(j)
+        ready = sorted(released)
+
+    if len(placed) < len(steps):
+        cycle = [step for i, step in enumerate(steps) if i not in placed]
+        get_logger("dependencies").warning(
+            "Circular dependencies between " + ", ".join(step.label() for step in cycle) +
+            "; emitting them in plan order")
+        batches.append(cycle)
+    return batches
+
+
+def migration_batches(plan) -> List[List[MigrationStep]]:
+    """Returns the steps of ``plan`` sorted into dependency batches."""
+    return sort_steps(migration_steps(plan))
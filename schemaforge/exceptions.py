@@ -17,13 +17,22 @@ class StrictModeError(SchemaForgeError):
     Attributes:
         statement: The SQL statement that failed to parse
         reason: Description of why parsing failed
+        location: Where the statement starts (``file:line``), if known
     """
-    def __init__(self, statement: str, reason: str = "Failed to parse statement"):
+    def __init__(self, statement: str, reason: str = "Failed to parse statement", location: str = None):
         self.statement = statement
         self.reason = reason
+        # Statements streamed from a SqlSource carry their own location
+        self.location = location or getattr(statement, 'location', None)
         # Truncate long statements for readability
-        display_stmt = statement[:100] + "..." if len(statement) > 100 else statement
-        super().__init__(f"{reason}: {display_stmt}")
+        display_stmt = statement.strip()
+        display_stmt = display_stmt[:100] + "..." if len(display_stmt) > 100 else display_stmt
+        prefix = f"{self.location}: " if self.location else ""
+        super().__init__(f"{prefix}{reason}: {display_stmt}")
+
+    def __reduce__(self):
+        # Keep statement/reason intact when raised inside a worker process
+        return (self.__class__, (self.statement, self.reason, self.location))
 
 
 class ValidationError(SchemaForgeError):
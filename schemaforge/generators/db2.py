@@ -2,53 +2,44 @@ from schemaforge.generators.generic import GenericGenerator
 
 
 class DB2Generator(GenericGenerator):
+    statement_separator = "\n"
+
     def quote_ident(self, ident: str) -> str:
         return f'"{ident}"'
 
-    def generate_migration(self, plan):
-        sql = []
-        
-        # Custom Objects (Aliases)
-        for obj in plan.dropped_custom_objects:
-            sql.append(f"DROP {obj.obj_type} {obj.name};")
-            
-        for obj in plan.new_custom_objects:
-            if 'raw_sql' in obj.properties:
-                sql.append(obj.properties['raw_sql'] + ";")
-            else:
-                sql.append(f"-- Create {obj.obj_type} {obj.name}")
+    def drop_object_statements(self, obj):
+        return [f"DROP {obj.obj_type} {obj.name};"]
+
+    def create_object_statements(self, obj, replacing=False):
+        if 'raw_sql' in obj.properties:
+            return [obj.properties['raw_sql'] + ";"]
+        return [] if replacing else [f"-- Create {obj.obj_type} {obj.name}"]
 
-        for old, new in plan.modified_custom_objects:
-             sql.append(f"DROP {old.obj_type} {old.name};")
-             if 'raw_sql' in new.properties:
-                sql.append(new.properties['raw_sql'] + ";")
+    def create_table_statements(self, table):
+        return [self.create_table_sql(table)]
 
-        # Tables
-        for table in plan.new_tables:
-            sql.append(self.create_table_sql(table))
+    def alter_table_statements(self, diff):
+        # Renamed columns first; the statements below use the new names
+        sql = self._generate_column_renames(diff)
+
+        # DB2 ALTER TABLE is standard-ish
+        # But we need to handle IDENTITY if added/removed (complex)
+        for col in diff.added_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD COLUMN {self._col_def(col)};")
             
-        for table in plan.dropped_tables:
-            sql.append(f"DROP TABLE {self.quote_ident(table.name)};")
+        for col in diff.dropped_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
             
-        for diff in plan.modified_tables:
-            # DB2 ALTER TABLE is standard-ish
-            # But we need to handle IDENTITY if added/removed (complex)
-            for col in diff.added_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD COLUMN {self._col_def(col)};")
-                
-            for col in diff.dropped_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
-                
-            for old_col, new_col in diff.modified_columns:
-                # DB2 Modify: ALTER COLUMN ... SET DATA TYPE ...
-                if old_col.data_type != new_col.data_type:
-                    sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ALTER COLUMN {self.quote_ident(new_col.name)} SET DATA TYPE {new_col.data_type};")
-                # Nullability
-                if old_col.is_nullable != new_col.is_nullable:
-                    action = "DROP NOT NULL" if new_col.is_nullable else "SET NOT NULL"
-                    sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ALTER COLUMN {self.quote_ident(new_col.name)} {action};")
+        for old_col, new_col in diff.modified_columns:
+            # DB2 Modify: ALTER COLUMN ... SET DATA TYPE ...
+            if old_col.data_type != new_col.data_type:
+                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ALTER COLUMN {self.quote_ident(new_col.name)} SET DATA TYPE {new_col.data_type};")
+            # Nullability
+            if old_col.is_nullable != new_col.is_nullable:
+                action = "DROP NOT NULL" if new_col.is_nullable else "SET NOT NULL"
+                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ALTER COLUMN {self.quote_ident(new_col.name)} {action};")
 
-        return "\n".join(sql)
+        return sql
 
     def create_table_sql(self, table):
         kind = "TABLE"
@@ -129,6 +120,10 @@ class DB2Generator(GenericGenerator):
         stmt += ";"
         return stmt
 
+    def rename_table(self, old_name: str, new_name: str) -> str:
+        # DB2 renames tables with RENAME TABLE, not ALTER TABLE
+        return f"RENAME TABLE {self.quote_ident(old_name)} TO {self.quote_ident(new_name)};"
+
     def _col_def(self, col):
         base = f"{self.quote_ident(col.name)} {col.data_type}"
         if not col.is_nullable:
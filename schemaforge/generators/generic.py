@@ -1,27 +1,174 @@
-from typing import Any
+from typing import IO, Any, Iterator, List, Optional, Tuple
+from schemaforge.dependencies import (ALTER_TABLE, CREATE_OBJECT, CREATE_TABLE, DROP_OBJECT, DROP_TABLE,
+                                      RECREATE_OBJECT, RENAME_TABLE, MigrationStep, migration_batches)
 from schemaforge.generators.base import BaseGenerator
-from schemaforge.models import Table, Column
+from schemaforge.models import Table, Column, CustomObject
 
 class GenericGenerator(BaseGenerator):
+    # Joins the statements of generate_migration()
+    statement_separator = "\n\n"
+    # Joins the statements of generate_rollback_migration()
+    rollback_separator = "\n\n"
+
     def generate_migration(self, migration_plan: Any) -> str:
-        statements = []
-        
-        # New Tables
-        for table in migration_plan.new_tables:
-            statements.append(self._generate_create_table(table))
-            # Create indexes for new tables
+        return self.statement_separator.join(self.iter_migration(migration_plan))
+
+    def iter_migration(self, migration_plan: Any) -> Iterator[str]:
+        """Yields the forward migration one statement at a time, in dependency order."""
+        for _, statements, _ in self.iter_steps(migration_plan):
+            yield from statements
+
+    def iter_steps(self, migration_plan: Any, forward: bool = True,
+                   rollback: bool = False) -> Iterator[Tuple[MigrationStep, List[str], List[str]]]:
+        """
+        Yields ``(step, forward statements, rollback statements)`` for every
+        step of the plan in dependency order. Statements are rendered per
+        step, only for the directions requested.
+        """
+        for steps in migration_batches(migration_plan):
+            for step in steps:
+                yield (step,
+                       self.step_statements(step) if forward else [],
+                       self.rollback_step_statements(step) if rollback else [])
+
+    def write_migration(self, migration_plan: Any, out: Optional[IO[str]] = None,
+                        rollback_out: Optional[IO[str]] = None, header: str = "",
+                        rollback_header: str = "") -> int:
+        """
+        Streams the forward migration to ``out`` and the rollback to
+        ``rollback_out`` in one pass over the plan. Either may be None.
+
+        Forward statements are written as they are rendered. Rollback
+        statements are undone in reverse step order, so they are kept per
+        step and written at the end. Output equals ``header +
+        generate_migration()`` and ``rollback_header +
+        generate_rollback_migration()``. Returns the number of forward
+        statements written.
+        """
+        rollback_steps = []
+        count = 0
+        if out is not None:
+            out.write(header)
+        for _, statements, rollback in self.iter_steps(migration_plan, forward=out is not None,
+                                                       rollback=rollback_out is not None):
+            for statement in statements:
+                if count:
+                    out.write(self.statement_separator)
+                out.write(statement)
+                count += 1
+            if rollback:
+                rollback_steps.append(rollback)
+
+        if rollback_out is not None:
+            rollback_out.write(rollback_header)
+            first = True
+            for statements in reversed(rollback_steps):
+                for statement in statements:
+                    if not first:
+                        rollback_out.write(self.rollback_separator)
+                    rollback_out.write(statement)
+                    first = False
+        return count
+
+    def generate_batches(self, migration_plan: Any) -> List[List[Tuple[MigrationStep, List[str]]]]:
+        """
+        Returns the migration as dependency-ordered batches of
+        ``(step, statements)``. Steps of one batch are independent of each
+        other; a batch only depends on the batches before it.
+
+        Follow-up phases of a step (see step_phases) become steps of their
+        own in batches after all others, so a runner that wraps each step
+        in a transaction commits the step before its follow-ups start.
+        """
+        batches = []
+        follow_ups = []
+        for steps in migration_batches(migration_plan):
+            rendered = []
+            for step in steps:
+                (_, statements), *later = self.step_phases(step)
+                if statements:
+                    rendered.append((step, statements))
+                for number, (action, phase) in enumerate(later):
+                    if len(follow_ups) <= number:
+                        follow_ups.append([])
+                    follow_ups[number].append((MigrationStep(action, step.subject), phase))
+            if rendered:
+                batches.append(rendered)
+        batches.extend(batch for batch in follow_ups if batch)
+        return batches
+
+    def step_phases(self, step: MigrationStep) -> List[Tuple[str, List[str]]]:
+        """
+        Returns the statements of one step as ``(action, statements)``
+        phases. Each phase after the first must run in its own transaction
+        once the previous one has committed. step_statements() is all
+        phases in order. By default a step is a single phase.
+        """
+        return [(step.action, self.step_statements(step))]
+
+    def step_statements(self, step: MigrationStep) -> List[str]:
+        """Returns the SQL statements of one migration step."""
+        if step.action == DROP_OBJECT:
+            return self.drop_object_statements(step.subject)
+        if step.action in (CREATE_OBJECT, RECREATE_OBJECT):
+            return self.create_object_statements(step.subject, replacing=step.action == RECREATE_OBJECT)
+        if step.action == CREATE_TABLE:
+            return self.create_table_statements(step.subject)
+        if step.action == DROP_TABLE:
+            return self.drop_table_statements(step.subject)
+        if step.action == RENAME_TABLE:
+            old, new = step.subject
+            return [self.rename_table(old.name, new.name)]
+        if step.action == ALTER_TABLE:
+            return self.alter_table_statements(step.subject)
+        raise ValueError(f"Unknown migration step: {step.action}")
+
+    def is_transactional(self, statement: str) -> bool:
+        """Whether ``statement`` may run inside a transaction block."""
+        return True
+
+    def online_warnings(self, migration_plan: Any) -> List[str]:
+        """Returns the changes that still block writes in online mode (none by default)."""
+        return []
+
+    def rollback_step_statements(self, step: MigrationStep) -> List[str]:
+        """Returns the statements that undo one migration step (custom objects are not undone)."""
+        if step.action == CREATE_TABLE:
+            return [f"DROP TABLE IF EXISTS {self.quote_ident(step.subject.name)};"]
+        if step.action == DROP_TABLE:
+            table = step.subject
+            statements = [self._generate_create_table(table)]
+            # Recreate indexes for restored tables
             for index in table.indexes:
                 statements.append(self._generate_create_index(index, table.name))
-            
-        # Dropped Tables
-        for table in migration_plan.dropped_tables:
-            statements.append(f"DROP TABLE {self.quote_ident(table.name)};")
-            
-        # Modified Tables
-        for table_diff in migration_plan.modified_tables:
-            statements.extend(self._generate_alter_table(table_diff))
-            
-        return "\n\n".join(statements)
+            return statements
+        if step.action == RENAME_TABLE:
+            old, new = step.subject
+            return [self.rename_table(new.name, old.name)]
+        if step.action == ALTER_TABLE:
+            return self._generate_rollback_alter_table(step.subject)
+        return []
+
+    # Step hooks, overridden per dialect
+    def drop_object_statements(self, obj: CustomObject) -> List[str]:
+        # The generic dialect does not manage custom objects
+        return []
+
+    def create_object_statements(self, obj: CustomObject, replacing: bool = False) -> List[str]:
+        return []
+
+    def create_table_statements(self, table: Table) -> List[str]:
+        statements = [self._generate_create_table(table)]
+        # Create indexes for new tables
+        for index in table.indexes:
+            statements.append(self._generate_create_index(index, table.name))
+        return statements
+
+    def drop_table_statements(self, table: Table) -> List[str]:
+        return [f"DROP TABLE {self.quote_ident(table.name)};"]
+
+    def alter_table_statements(self, diff: Any) -> List[str]:
+        return self._generate_alter_table(diff)
 
     def _generate_create_table(self, table: Table) -> str:
         columns_def = []
@@ -55,6 +202,9 @@ class GenericGenerator(BaseGenerator):
         pk_cols = getattr(diff, 'pk_columns', [])  # Will be set by comparator if available
         pk_constraint_name = getattr(diff, 'pk_constraint_name', None)
         pk_dropped = False
+
+        # Rename columns first; later statements use the new names
+        statements.extend(self._generate_column_renames(diff))
         
         # Check if any modified column is part of PK
         modified_pk_cols = [new_col.name for old_col, new_col in diff.modified_columns 
@@ -100,7 +250,17 @@ class GenericGenerator(BaseGenerator):
                      
         return statements
 
+    def _generate_column_renames(self, diff: Any) -> list[str]:
+        return [self.rename_column(diff.table_name, old.name, new.name)
+                for old, new in getattr(diff, 'renamed_columns', [])]
+
     # Default implementations
+    def rename_table(self, old_name: str, new_name: str) -> str:
+        return f"ALTER TABLE {self.quote_ident(old_name)} RENAME TO {self.quote_ident(new_name)};"
+
+    def rename_column(self, table_name: str, old_name: str, new_name: str) -> str:
+        return f"ALTER TABLE {self.quote_ident(table_name)} RENAME COLUMN {self.quote_ident(old_name)} TO {self.quote_ident(new_name)};"
+
     def add_column(self, table_name: str, column: Column) -> str:
         def_str = f"{self.quote_ident(column.name)} {column.data_type}"
         if not column.is_nullable:
@@ -138,25 +298,12 @@ class GenericGenerator(BaseGenerator):
         - Dropped indexes -> CREATE INDEX
         - Added foreign keys -> DROP FK
         - Dropped foreign keys -> ADD FK
+        - Renamed tables/columns -> rename back
+
+        Steps are undone in the reverse of the forward dependency order.
         """
-        statements = []
-        
-        # Inverse of new tables = DROP TABLE
-        for table in migration_plan.new_tables:
-            statements.append(f"DROP TABLE IF EXISTS {self.quote_ident(table.name)};")
-            
-        # Inverse of dropped tables = CREATE TABLE
-        for table in migration_plan.dropped_tables:
-            statements.append(self._generate_create_table(table))
-            # Recreate indexes for restored tables
-            for index in table.indexes:
-                statements.append(self._generate_create_index(index, table.name))
-            
-        # Inverse of modified tables
-        for diff in migration_plan.modified_tables:
-            statements.extend(self._generate_rollback_alter_table(diff))
-            
-        return "\n\n".join(statements)
+        steps = [rollback for _, _, rollback in self.iter_steps(migration_plan, forward=False, rollback=True)]
+        return self.rollback_separator.join(statement for statements in reversed(steps) for statement in statements)
     
     def _generate_rollback_alter_table(self, diff: Any) -> list[str]:
         """Generate rollback statements for table modifications."""
@@ -177,7 +324,7 @@ class GenericGenerator(BaseGenerator):
         
         # Inverse of modified columns = revert to old definition
         for old_col, new_col in diff.modified_columns:
-            statements.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} MODIFY COLUMN {self.quote_ident(old_col.name)} {old_col.data_type};")
+            statements.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} MODIFY COLUMN {self.quote_ident(new_col.name)} {old_col.data_type};")
         
         # Inverse of added indexes = DROP INDEX
         for index in diff.added_indexes:
@@ -194,5 +341,9 @@ class GenericGenerator(BaseGenerator):
         # Inverse of dropped foreign keys = ADD FK
         for fk in diff.dropped_fks:
             statements.append(self._add_fk_stmt(diff.table_name, fk))
+
+        # Inverse of renamed columns = rename back
+        for old_col, new_col in getattr(diff, 'renamed_columns', []):
+            statements.append(self.rename_column(diff.table_name, new_col.name, old_col.name))
         
         return statements
@@ -64,6 +64,9 @@ class MSSQLGenerator(GenericGenerator):
         # T-SQL uses sp_rename
         return f"EXEC sp_rename '{old_name}', '{new_name}';"
 
+    def rename_column(self, table_name: str, old_name: str, new_name: str) -> str:
+        return f"EXEC sp_rename '{table_name}.{old_name}', '{new_name}', 'COLUMN';"
+
     def _generate_create_index(self, index, table_name) -> str:
         """Override to support MSSQL CLUSTERED/NONCLUSTERED indexes."""
         stmt = "CREATE "
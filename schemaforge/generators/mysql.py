@@ -1,59 +1,170 @@
+import re
+from typing import List, NamedTuple, Optional
+
 from schemaforge.generators.generic import GenericGenerator
 from schemaforge.models import Table, Column
 
+# InnoDB ALTER TABLE algorithms, cheapest first
+INSTANT = 'INSTANT'
+INPLACE = 'INPLACE'
+COPY = 'COPY'
+_ALGORITHMS = (INSTANT, INPLACE, COPY)
+
+_VARCHAR = re.compile(r"VARCHAR\((\d+)\)", re.I)
+# utf8mb4 columns up to this many characters use a 1-byte length prefix
+_SHORT_VARCHAR = 63
+
+
+class AlterClause(NamedTuple):
+    """One clause of a coalesced online ALTER TABLE."""
+    sql: str
+    algorithm: str
+    concurrent: bool = True          # LOCK=NONE possible
+    reason: Optional[str] = None     # why the clause rebuilds the table or blocks writes
+
+
+def _varchar_widening(old_type: str, new_type: str) -> bool:
+    """Whether a VARCHAR change only extends the length within the same length-prefix size."""
+    old, new = _VARCHAR.fullmatch(old_type.strip()), _VARCHAR.fullmatch(new_type.strip())
+    if not (old and new):
+        return False
+    old_len, new_len = int(old.group(1)), int(new.group(1))
+    return old_len <= new_len and (old_len <= _SHORT_VARCHAR) == (new_len <= _SHORT_VARCHAR)
+
+
 class MySQLGenerator(GenericGenerator):
+    statement_separator = "\n"
+
+    def __init__(self, online: bool = False):
+        """
+        Args:
+            online: Coalesce the changes of each table into one ALTER TABLE
+                per algorithm with ALGORITHM/LOCK hints (MySQL 8.0.29+ InnoDB),
+                so a table is rebuilt at most once and never silently copied.
+        """
+        super().__init__()
+        self.online = online
+
     def quote_ident(self, ident: str) -> str:
         return f"`{ident}`"
 
-    def generate_migration(self, plan):
-        sql = []
-        
-        # Custom Objects
-        for obj in plan.dropped_custom_objects:
-            sql.append(f"DROP {obj.obj_type} {obj.name};")
+    def drop_object_statements(self, obj):
+        return [f"DROP {obj.obj_type} {obj.name};"]
+
+    def create_object_statements(self, obj, replacing=False):
+        if 'raw_sql' in obj.properties:
+            return [obj.properties['raw_sql'] + ";"]
+        return [] if replacing else [f"-- Create {obj.obj_type} {obj.name}"]
+
+    def create_table_statements(self, table):
+        sql = [self.create_table_sql(table)]
+        # Indexes for new tables
+        for idx in table.indexes:
+            sql.append(self.create_index_sql(idx, table.name))
+        return sql
+
+    def drop_table_statements(self, table):
+        return [f"DROP TABLE {table.name};"]
+
+    def alter_table_statements(self, diff):
+        # Renamed columns first; the statements below use the new names
+        sql = self._generate_column_renames(diff)
+        if self.online:
+            return sql + self._online_alter_statements(diff)
+
+        # MySQL ALTER TABLE
+        for col in diff.added_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD COLUMN {self._col_def(col)};")
             
-        for obj in plan.new_custom_objects:
-            if 'raw_sql' in obj.properties:
-                sql.append(obj.properties['raw_sql'] + ";")
-            else:
-                sql.append(f"-- Create {obj.obj_type} {obj.name}")
-
-        for old, new in plan.modified_custom_objects:
-             sql.append(f"DROP {old.obj_type} {old.name};")
-             if 'raw_sql' in new.properties:
-                sql.append(new.properties['raw_sql'] + ";")
-
-        # Tables
-        for table in plan.new_tables:
-            sql.append(self.create_table_sql(table))
-            # Indexes for new tables
-            for idx in table.indexes:
-                sql.append(self.create_index_sql(idx, table.name))
+        for col in diff.dropped_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
             
-        for table in plan.dropped_tables:
-            sql.append(f"DROP TABLE {table.name};")
+        for old_col, new_col in diff.modified_columns:
+            # Type change or Nullability
+            # MySQL MODIFY COLUMN covers both
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} MODIFY COLUMN {self._col_def(new_col)};")
+
+        # Indexes
+        for idx in diff.added_indexes:
+            sql.append(self.create_index_sql(idx, diff.table_name))
             
-        for diff in plan.modified_tables:
-            # MySQL ALTER TABLE
-            for col in diff.added_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD COLUMN {self._col_def(col)};")
-                
-            for col in diff.dropped_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
-                
-            for old_col, new_col in diff.modified_columns:
-                # Type change or Nullability
-                # MySQL MODIFY COLUMN covers both
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} MODIFY COLUMN {self._col_def(new_col)};")
-
-            # Indexes
-            for idx in diff.added_indexes:
-                sql.append(self.create_index_sql(idx, diff.table_name))
-                
-            for idx in diff.dropped_indexes:
-                sql.append(f"DROP INDEX {idx.name} ON {diff.table_name};")
-
-        return "\n".join(sql)
+        for idx in diff.dropped_indexes:
+            sql.append(f"DROP INDEX {idx.name} ON {diff.table_name};")
+
+        return sql
+
+    def online_warnings(self, migration_plan):
+        if not self.online:
+            return []
+        return [
+            f"{diff.table_name}: {clause.reason}"
+            for diff in migration_plan.modified_tables
+            for clause in self.alter_clauses(diff)
+            if clause.reason
+        ]
+
+    def alter_clauses(self, diff) -> List[AlterClause]:
+        """Classifies the column and index changes of ``diff`` by the algorithm InnoDB can use."""
+        clauses = []
+        for col in diff.added_columns:
+            clauses.append(AlterClause(f"ADD COLUMN {self._col_def(col)}", INSTANT))
+
+        for col in diff.dropped_columns:
+            clauses.append(AlterClause(f"DROP COLUMN {self.quote_ident(col.name)}", INSTANT))
+
+        for old_col, new_col in diff.modified_columns:
+            column = self.quote_ident(new_col.name)
+            if old_col.data_type != new_col.data_type:
+                if _varchar_widening(old_col.data_type, new_col.data_type):
+                    clauses.append(AlterClause(f"MODIFY COLUMN {self._col_def(new_col)}", INPLACE))
+                else:
+                    clauses.append(AlterClause(
+                        f"MODIFY COLUMN {self._col_def(new_col)}", COPY, False,
+                        f"type change of {new_col.name} ({old_col.data_type} -> {new_col.data_type}) "
+                        "requires ALGORITHM=COPY"))
+            elif old_col.is_nullable != new_col.is_nullable:
+                # Rebuilds the table in place; DML continues
+                clauses.append(AlterClause(f"MODIFY COLUMN {self._col_def(new_col)}", INPLACE))
+            elif old_col.default_value != new_col.default_value:
+                if new_col.default_value:
+                    clauses.append(AlterClause(f"ALTER COLUMN {column} SET DEFAULT {new_col.default_value}", INSTANT))
+                else:
+                    clauses.append(AlterClause(f"ALTER COLUMN {column} DROP DEFAULT", INSTANT))
+            else:
+                clauses.append(AlterClause(f"MODIFY COLUMN {self._col_def(new_col)}", INPLACE))
+
+        for idx in diff.dropped_indexes:
+            clauses.append(AlterClause(f"DROP INDEX {self.quote_ident(idx.name)}", INPLACE))
+
+        for idx in diff.added_indexes:
+            cols = ', '.join([self.quote_ident(c) for c in idx.columns])
+            if idx.method in ('fulltext', 'spatial') and not idx.is_unique:
+                clauses.append(AlterClause(f"ADD {idx.method.upper()} INDEX {self.quote_ident(idx.name)} ({cols})",
+                                           INPLACE, False, f"adding {idx.method} index {idx.name} blocks writes"))
+            else:
+                unique = "UNIQUE " if idx.is_unique else ""
+                clauses.append(AlterClause(f"ADD {unique}INDEX {self.quote_ident(idx.name)} ({cols})", INPLACE))
+        return clauses
+
+    def _online_alter_statements(self, diff):
+        """
+        Metadata-only (INSTANT) clauses go into one statement, everything
+        else into a second one, so the table is rebuilt at most once. The
+        hints make MySQL fail instead of falling back to a locking copy.
+        """
+        table = self.quote_ident(diff.table_name)
+        clauses = self.alter_clauses(diff)
+        sql = []
+        instant = [c for c in clauses if c.algorithm == INSTANT]
+        if instant:
+            sql.append(f"ALTER TABLE {table} {', '.join(c.sql for c in instant)}, ALGORITHM=INSTANT;")
+        rest = [c for c in clauses if c.algorithm != INSTANT]
+        if rest:
+            algorithm = max((c.algorithm for c in rest), key=_ALGORITHMS.index)
+            # Clauses that still block writes are reported by online_warnings()
+            lock = "NONE" if all(c.concurrent for c in rest) else "SHARED"
+            sql.append(f"ALTER TABLE {table} {', '.join(c.sql for c in rest)}, ALGORITHM={algorithm}, LOCK={lock};")
+        return sql
 
     def create_table_sql(self, table):
         stmt = f"CREATE TABLE {self.quote_ident(table.name)} (\n"
@@ -97,6 +208,9 @@ class MySQLGenerator(GenericGenerator):
             base += f" DEFAULT {col.default_value}"
         return base
 
+    def rename_table(self, old_name: str, new_name: str) -> str:
+        return f"RENAME TABLE {self.quote_ident(old_name)} TO {self.quote_ident(new_name)};"
+
     def _drop_fk_stmt(self, table_name, fk):
         # MySQL/MariaDB requires DROP FOREIGN KEY
         return f"ALTER TABLE {self.quote_ident(table_name)} DROP FOREIGN KEY {self.quote_ident(fk.name)};"
@@ -3,60 +3,45 @@ from schemaforge.generators.generic import GenericGenerator
 from schemaforge.generators.generic import GenericGenerator
 
 class OracleGenerator(GenericGenerator):
+    statement_separator = "\n"
+
     def quote_ident(self, ident: str) -> str:
         return f'"{ident}"'
 
-    def generate_migration(self, plan):
-        sql = []
-        
-        # Custom Objects
-        for obj in plan.dropped_custom_objects:
-            sql.append(f"DROP {obj.obj_type} {obj.name};")
-            
-        for obj in plan.new_custom_objects:
-            if 'raw_sql' in obj.properties:
-                stmt = obj.properties['raw_sql']
-                # Oracle PL/SQL often needs a slash at the end
-                if obj.obj_type in ('FUNCTION', 'PROCEDURE', 'PACKAGE', 'TRIGGER'):
-                    if not stmt.strip().endswith('/'):
-                        stmt += "\n/"
-                elif not stmt.strip().endswith(';'):
-                    stmt += ";"
-                sql.append(stmt)
-            else:
-                sql.append(f"-- Create {obj.obj_type} {obj.name}")
+    def drop_object_statements(self, obj):
+        return [f"DROP {obj.obj_type} {obj.name};"]
+
+    def create_object_statements(self, obj, replacing=False):
+        if 'raw_sql' not in obj.properties:
+            return [] if replacing else [f"-- Create {obj.obj_type} {obj.name}"]
+        stmt = obj.properties['raw_sql']
+        # Oracle PL/SQL often needs a slash at the end
+        if obj.obj_type in ('FUNCTION', 'PROCEDURE', 'PACKAGE', 'TRIGGER'):
+            if not stmt.strip().endswith('/'):
+                stmt += "\n/"
+        elif not stmt.strip().endswith(';'):
+            stmt += ";"
+        return [stmt]
+
+    def create_table_statements(self, table):
+        return [self.create_table_sql(table)]
 
-        for old, new in plan.modified_custom_objects:
-             sql.append(f"DROP {old.obj_type} {old.name};")
-             if 'raw_sql' in new.properties:
-                stmt = new.properties['raw_sql']
-                if new.obj_type in ('FUNCTION', 'PROCEDURE', 'PACKAGE', 'TRIGGER'):
-                    if not stmt.strip().endswith('/'):
-                        stmt += "\n/"
-                elif not stmt.strip().endswith(';'):
-                    stmt += ";"
-                sql.append(stmt)
+    def alter_table_statements(self, diff):
+        # Renamed columns first; the statements below use the new names
+        sql = self._generate_column_renames(diff)
 
-        # Tables
-        for table in plan.new_tables:
-            sql.append(self.create_table_sql(table))
+        for col in diff.added_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD {self._col_def(col)};")
             
-        for table in plan.dropped_tables:
-            sql.append(f"DROP TABLE {self.quote_ident(table.name)};")
+        for col in diff.dropped_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
             
-        for diff in plan.modified_tables:
-            for col in diff.added_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD {self._col_def(col)};")
-                
-            for col in diff.dropped_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
-                
-            for old_col, new_col in diff.modified_columns:
-                # Oracle Modify: MODIFY (col type ...)
-                if old_col.data_type != new_col.data_type or old_col.is_nullable != new_col.is_nullable:
-                    sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} MODIFY {self._col_def(new_col)};")
+        for old_col, new_col in diff.modified_columns:
+            # Oracle Modify: MODIFY (col type ...)
+            if old_col.data_type != new_col.data_type or old_col.is_nullable != new_col.is_nullable:
+                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} MODIFY {self._col_def(new_col)};")
 
-        return "\n".join(sql)
+        return sql
 
     def create_table_sql(self, table):
         stmt = f"CREATE TABLE {self.quote_ident(table.name)} (\n"
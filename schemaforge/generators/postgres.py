@@ -1,101 +1,197 @@
+from schemaforge.dependencies import ALTER_TABLE, SET_NOT_NULL, VALIDATE_CONSTRAINTS
 from schemaforge.generators.generic import GenericGenerator
 
+# Default SET lock_timeout of online migrations
+DEFAULT_LOCK_TIMEOUT = '5s'
+
+
 class PostgresGenerator(GenericGenerator):
+    statement_separator = "\n"
+
+    def __init__(self, online: bool = False, lock_timeout: str = DEFAULT_LOCK_TIMEOUT):
+        """
+        Args:
+            online: Emit low-lock DDL for tables in use: indexes are built
+                CONCURRENTLY, FKs and CHECKs are added NOT VALID and
+                validated separately, SET NOT NULL goes through a validated
+                CHECK, and every step starts with SET lock_timeout. The
+                validations and SET NOT NULL are follow-up phases of the
+                ALTER TABLE step (step_phases).
+            lock_timeout: lock_timeout of online migrations.
+        """
+        super().__init__()
+        self.online = online
+        self.lock_timeout = lock_timeout
+
     def quote_ident(self, ident: str) -> str:
         return f'"{ident}"'
 
-    def generate_migration(self, plan):
-        sql = []
-        
-        # Custom Objects
-        for obj in plan.dropped_custom_objects:
-            sql.append(f"DROP {obj.obj_type} {obj.name};")
-            
-        for obj in plan.new_custom_objects:
-            if 'raw_sql' in obj.properties:
-                sql.append(obj.properties['raw_sql'] + ";")
-            else:
-                sql.append(f"-- Create {obj.obj_type} {obj.name}")
-
-        for old, new in plan.modified_custom_objects:
-             sql.append(f"DROP {old.obj_type} {old.name};")
-             if 'raw_sql' in new.properties:
-                sql.append(new.properties['raw_sql'] + ";")
-
-        # Tables
-        for table in plan.new_tables:
-            sql.append(self.create_table_sql(table))
-            # Indexes for new tables
-            for idx in table.indexes:
-                sql.append(self.create_index_sql(idx, table.name))
+    def drop_object_statements(self, obj):
+        return [f"DROP {obj.obj_type} {obj.name};"]
+
+    def create_object_statements(self, obj, replacing=False):
+        if 'raw_sql' in obj.properties:
+            return [obj.properties['raw_sql'] + ";"]
+        return [] if replacing else [f"-- Create {obj.obj_type} {obj.name}"]
+
+    def create_table_statements(self, table):
+        sql = [self.create_table_sql(table)]
+        # Indexes for new tables
+        for idx in table.indexes:
+            sql.append(self.create_index_sql(idx, table.name))
+        return sql
+
+    def step_statements(self, step):
+        return self._with_lock_timeout(super().step_statements(step))
+
+    def step_phases(self, step):
+        if not (self.online and step.action == ALTER_TABLE):
+            return super().step_phases(step)
+        # VALIDATE only takes SHARE UPDATE EXCLUSIVE, but in the transaction
+        # of its ADD ... NOT VALID it would scan under ACCESS EXCLUSIVE
+        changes, validations, not_null = self._alter_table_phases(step.subject)
+        phases = [(ALTER_TABLE, self._with_lock_timeout(changes))]
+        for action, statements in ((VALIDATE_CONSTRAINTS, validations), (SET_NOT_NULL, not_null)):
+            if statements:
+                phases.append((action, self._with_lock_timeout(statements)))
+        return phases
+
+    def rollback_step_statements(self, step):
+        return self._with_lock_timeout(super().rollback_step_statements(step))
+
+    def _with_lock_timeout(self, statements):
+        if self.online and statements:
+            # Fail fast instead of queueing behind (and blocking) other sessions.
+            # A step runs on one session, so one SET covers all its statements.
+            statements.insert(0, f"SET lock_timeout = '{self.lock_timeout}';")
+        return statements
+
+    def is_transactional(self, statement: str) -> bool:
+        # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+        return " CONCURRENTLY " not in statement[:40]
+
+    def online_warnings(self, migration_plan):
+        if not self.online:
+            return []
+        return [
+            f"{diff.table_name}.{new_col.name}: type change {old_col.data_type} -> {new_col.data_type} "
+            "rewrites the table under an ACCESS EXCLUSIVE lock"
+            for diff in migration_plan.modified_tables
+            for old_col, new_col in diff.modified_columns
+            if old_col.data_type != new_col.data_type
+        ]
+
+    def alter_table_statements(self, diff):
+        changes, validations, not_null = self._alter_table_phases(diff)
+        return changes + validations + not_null
+
+    def _alter_table_phases(self, diff):
+        """
+        Returns the ALTER TABLE statements of ``diff`` as ``(changes,
+        validations, not_null)``. The last two are only filled in online
+        mode: VALIDATE CONSTRAINT for constraints added NOT VALID, then
+        SET NOT NULL through the validated CHECK and its DROP CONSTRAINT.
+        """
+        # Postgres ALTER TABLE; renamed columns first, the rest use the new names
+        sql = self._generate_column_renames(diff)
+        table = self.quote_ident(diff.table_name)
+        validations = []
+        not_null = []
+
+        for col in diff.added_columns:
+            sql.append(f"ALTER TABLE {table} ADD COLUMN {self._col_def(col)};")
             
-        for table in plan.dropped_tables:
-            sql.append(f"DROP TABLE {self.quote_ident(table.name)};")
+        for col in diff.dropped_columns:
+            sql.append(f"ALTER TABLE {table} DROP COLUMN {self.quote_ident(col.name)};")
             
-        for diff in plan.modified_tables:
-            # Postgres ALTER TABLE
-            for col in diff.added_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD COLUMN {self._col_def(col)};")
-                
-            for col in diff.dropped_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
-                
-            for old_col, new_col in diff.modified_columns:
-                # Type change
-                if old_col.data_type != new_col.data_type:
-                    # Safety: Add USING clause for type conversion
-                    # For simple cases like TEXT -> INT, this prevents "operator does not exist" errors
-                    # and allows explicit casting.
-                    sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ALTER COLUMN {self.quote_ident(new_col.name)} TYPE {new_col.data_type} USING {self.quote_ident(new_col.name)}::{new_col.data_type};")
-                # Nullability
-                if old_col.is_nullable != new_col.is_nullable:
+        for old_col, new_col in diff.modified_columns:
+            column = self.quote_ident(new_col.name)
+            # Type change
+            if old_col.data_type != new_col.data_type:
+                # Safety: Add USING clause for type conversion
+                # For simple cases like TEXT -> INT, this prevents "operator does not exist" errors
+                # and allows explicit casting.
+                sql.append(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {new_col.data_type} USING {column}::{new_col.data_type};")
+            # Nullability
+            if old_col.is_nullable != new_col.is_nullable:
+                if not new_col.is_nullable and self.online:
+                    sql.append(self._online_not_null_check(diff.table_name, new_col.name, validations, not_null))
+                else:
                     action = "DROP NOT NULL" if new_col.is_nullable else "SET NOT NULL"
-                    sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ALTER COLUMN {self.quote_ident(new_col.name)} {action};")
-                # Default
-                if old_col.default_value != new_col.default_value:
-                    if new_col.default_value:
-                        sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ALTER COLUMN {self.quote_ident(new_col.name)} SET DEFAULT {new_col.default_value};")
-                    else:
-                        sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ALTER COLUMN {self.quote_ident(new_col.name)} DROP DEFAULT;")
-
-            # Indexes
-            for idx in diff.added_indexes:
-                sql.append(self.create_index_sql(idx, diff.table_name))
-                
-            for idx in diff.dropped_indexes:
-                sql.append(f"DROP INDEX {idx.name};")
-
-            # Foreign Keys
-            for fk in diff.dropped_fks:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP CONSTRAINT {self.quote_ident(fk.name)};")
-                
-            for fk in diff.added_fks:
-                cols = ", ".join([self.quote_ident(c) for c in fk.column_names])
-                ref_cols_str = f"({', '.join([self.quote_ident(c) for c in fk.ref_column_names])})" if fk.ref_column_names else ""
-                fk_sql = f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD CONSTRAINT {self.quote_ident(fk.name)} FOREIGN KEY ({cols}) REFERENCES {self.quote_ident(fk.ref_table)}{ref_cols_str}"
-                if fk.on_delete:
-                    fk_sql += f" ON DELETE {fk.on_delete}"
-                if fk.on_update:
-                    fk_sql += f" ON UPDATE {fk.on_update}"
-                fk_sql += ";"
-                sql.append(fk_sql)
+                    sql.append(f"ALTER TABLE {table} ALTER COLUMN {column} {action};")
+            # Default
+            if old_col.default_value != new_col.default_value:
+                if new_col.default_value:
+                    sql.append(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT {new_col.default_value};")
+                else:
+                    sql.append(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT;")
+
+        # Indexes
+        for idx in diff.added_indexes:
+            sql.append(self.create_index_sql(idx, diff.table_name, concurrently=self.online))
             
-            # Modified FKs (drop and recreate)
-            for old_fk, new_fk in diff.modified_fks:
-                # Drop old FK
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP CONSTRAINT {self.quote_ident(old_fk.name)};")
-                # Create new FK
-                cols = ", ".join([self.quote_ident(c) for c in new_fk.column_names])
-                ref_cols_str = f"({', '.join([self.quote_ident(c) for c in new_fk.ref_column_names])})" if new_fk.ref_column_names else ""
-                fk_sql = f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD CONSTRAINT {self.quote_ident(new_fk.name)} FOREIGN KEY ({cols}) REFERENCES {self.quote_ident(new_fk.ref_table)}{ref_cols_str}"
-                if new_fk.on_delete:
-                    fk_sql += f" ON DELETE {new_fk.on_delete}"
-                if new_fk.on_update:
-                    fk_sql += f" ON UPDATE {new_fk.on_update}"
-                fk_sql += ";"
-                sql.append(fk_sql)
-
-        return "\n".join(sql)
+        for idx in diff.dropped_indexes:
+            concurrently = "CONCURRENTLY " if self.online else ""
+            sql.append(f"DROP INDEX {concurrently}{idx.name};")
+
+        # Check Constraints
+        for check in diff.dropped_checks:
+            sql.append(f"ALTER TABLE {table} DROP CONSTRAINT {self.quote_ident(check.name)};")
+
+        for check in diff.added_checks:
+            sql.append(self._add_constraint_sql(table, check.name, f"CHECK ({check.expression})", validations))
+
+        # Foreign Keys
+        for fk in diff.dropped_fks:
+            sql.append(f"ALTER TABLE {table} DROP CONSTRAINT {self.quote_ident(fk.name)};")
+            
+        for fk in diff.added_fks:
+            sql.append(self._add_constraint_sql(table, fk.name, self._fk_clause(fk), validations))
+        
+        # Modified FKs (drop and recreate)
+        for old_fk, new_fk in diff.modified_fks:
+            sql.append(f"ALTER TABLE {table} DROP CONSTRAINT {self.quote_ident(old_fk.name)};")
+            sql.append(self._add_constraint_sql(table, new_fk.name, self._fk_clause(new_fk), validations))
+
+        return sql, validations, not_null
+
+    def _fk_clause(self, fk):
+        cols = ", ".join([self.quote_ident(c) for c in fk.column_names])
+        ref_cols_str = f"({', '.join([self.quote_ident(c) for c in fk.ref_column_names])})" if fk.ref_column_names else ""
+        clause = f"FOREIGN KEY ({cols}) REFERENCES {self.quote_ident(fk.ref_table)}{ref_cols_str}"
+        if fk.on_delete:
+            clause += f" ON DELETE {fk.on_delete}"
+        if fk.on_update:
+            clause += f" ON UPDATE {fk.on_update}"
+        return clause
+
+    def _add_constraint_sql(self, table, name, clause, validations):
+        """
+        Returns ADD CONSTRAINT for an existing table. In online mode the
+        constraint is added NOT VALID (no scan under the ACCESS EXCLUSIVE
+        lock) and its VALIDATE CONSTRAINT, which only takes a SHARE UPDATE
+        EXCLUSIVE lock, is appended to ``validations``.
+        """
+        stmt = f"ALTER TABLE {table} ADD CONSTRAINT {self.quote_ident(name)} {clause}"
+        if not self.online:
+            return stmt + ";"
+        validations.append(f"ALTER TABLE {table} VALIDATE CONSTRAINT {self.quote_ident(name)};")
+        return stmt + " NOT VALID;"
+
+    def _online_not_null_check(self, table_name, column_name, validations, not_null):
+        """
+        SET NOT NULL without a full scan under ACCESS EXCLUSIVE: a validated
+        CHECK (col IS NOT NULL) lets Postgres 12+ skip the scan. Returns the
+        ADD CONSTRAINT ... NOT VALID; its VALIDATE goes to ``validations``
+        and SET NOT NULL plus the DROP of the helper CHECK to ``not_null``.
+        """
+        table = self.quote_ident(table_name)
+        column = self.quote_ident(column_name)
+        check = self.quote_ident(f"{table_name}_{column_name}_not_null"[:63])
+        validations.append(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check};")
+        not_null.append(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL;")
+        not_null.append(f"ALTER TABLE {table} DROP CONSTRAINT {check};")
+        return f"ALTER TABLE {table} ADD CONSTRAINT {check} CHECK ({column} IS NOT NULL) NOT VALID;"
 
     def create_table_sql(self, table):
         stmt = "CREATE "
@@ -125,12 +221,16 @@ class PostgresGenerator(GenericGenerator):
         stmt += ";"
         return stmt
 
-    def create_index_sql(self, index, table_name):
+    def create_index_sql(self, index, table_name, concurrently=False):
         # Override to support USING method
         stmt = "CREATE "
         if index.is_unique:
             stmt += "UNIQUE "
-        stmt += f"INDEX {self.quote_ident(index.name)} ON {self.quote_ident(table_name)} "
+        stmt += "INDEX "
+        if concurrently:
+            # Builds without blocking writes; must run outside a transaction
+            stmt += "CONCURRENTLY "
+        stmt += f"{self.quote_ident(index.name)} ON {self.quote_ident(table_name)} "
         if index.method and index.method != 'btree':
             stmt += f"USING {index.method} "
         stmt += f"({', '.join(index.columns)});"
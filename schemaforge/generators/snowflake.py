@@ -1,107 +1,82 @@
 from schemaforge.generators.generic import GenericGenerator
 
 class SnowflakeGenerator(GenericGenerator):
+    statement_separator = "\n"
+
     def quote_ident(self, ident: str) -> str:
         return f'"{ident}"'
 
-    def generate_migration(self, plan):
-        sql = []
-        
-        # 1. Custom Objects
-        
-        # Dropped Custom Objects
-        for obj in plan.dropped_custom_objects:
-            sql.append(f"DROP {obj.obj_type} {obj.name};")
-            
-        # New Custom Objects
-        for obj in plan.new_custom_objects:
-            # For now, we rely on the raw_sql stored in properties
-            if 'raw_sql' in obj.properties:
-                raw = obj.properties['raw_sql'].strip()
-                if raw.endswith(';'):
-                    sql.append(raw)
-                else:
-                    sql.append(raw + ";")
-            else:
-                sql.append(f"-- TODO: Generate SQL for {obj.obj_type} {obj.name}")
-                
-        # Modified Custom Objects
-        for old, new in plan.modified_custom_objects:
-             # Simplest strategy: Drop and Recreate
-             sql.append(f"DROP {old.obj_type} {old.name};")
-             if 'raw_sql' in new.properties:
-                raw = new.properties['raw_sql'].strip()
-                if raw.endswith(';'):
-                    sql.append(raw)
-                else:
-                    sql.append(raw + ";")
+    def drop_object_statements(self, obj):
+        return [f"DROP {obj.obj_type} {obj.name};"]
 
-        # 2. Tables
-        
-        # New Tables
-        for table in plan.new_tables:
-            sql.append(self.create_table_sql(table))
-            
-        # Dropped Tables
-        for table in plan.dropped_tables:
-            sql.append(f"DROP TABLE {self.quote_ident(table.name)};")
-            
-        # Modified Tables
-        for diff in plan.modified_tables:
-            # Add Columns
-            for col in diff.added_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD COLUMN {self._col_def(col)};")
-                
-            # Drop Columns
-            for col in diff.dropped_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
-                
-            # Modify Columns
-            for old, new in diff.modified_columns:
-                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} MODIFY COLUMN {self._col_def(new)};")
-                
-            # Snowflake Specific Alterations
-            # We need to check if table properties changed. 
-            # The generic Diff object doesn't track property changes yet.
-            # This is a limitation. For "God Mode", we might just recreate the table if properties change?
-            # Or we can add logic here if we had access to the full table objects.
+    def create_object_statements(self, obj, replacing=False):
+        # For now, we rely on the raw_sql stored in properties
+        if 'raw_sql' not in obj.properties:
+            return [] if replacing else [f"-- TODO: Generate SQL for {obj.obj_type} {obj.name}"]
+        raw = obj.properties['raw_sql'].strip()
+        return [raw if raw.endswith(';') else raw + ";"]
+
+    def create_table_statements(self, table):
+        return [self.create_table_sql(table)]
+
+    def alter_table_statements(self, diff):
+        # Renamed columns first; the statements below use the new names
+        sql = self._generate_column_renames(diff)
+
+        # Add Columns
+        for col in diff.added_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD COLUMN {self._col_def(col)};")
             
-            # Handle Primary Key Changes
-            # We need to check if the set of PK columns changed
-            # Since we don't have easy access to old/new table objects here (only diff), 
-            # we rely on modified_columns or property_changes if we had them.
-            # But wait, diff.property_changes IS available!
+        # Drop Columns
+        for col in diff.dropped_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP COLUMN {self.quote_ident(col.name)};")
             
-            pk_changed = False
-            for prop in diff.property_changes:
-                if "Primary Key Name" in prop:
-                    pk_changed = True
+        # Modify Columns
+        for old, new in diff.modified_columns:
+            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} MODIFY COLUMN {self._col_def(new)};")
             
-            # Also check if any column's PK status changed
-            for old, new in diff.modified_columns:
-                if old.is_primary_key != new.is_primary_key:
-                    pk_changed = True
+        # Snowflake Specific Alterations
+        # We need to check if table properties changed. 
+        # The generic Diff object doesn't track property changes yet.
+        # This is a limitation. For "God Mode", we might just recreate the table if properties change?
+        # Or we can add logic here if we had access to the full table objects.
+        
+        # Handle Primary Key Changes
+        # We need to check if the set of PK columns changed
+        # Since we don't have easy access to old/new table objects here (only diff), 
+        # we rely on modified_columns or property_changes if we had them.
+        # But wait, diff.property_changes IS available!
+        
+        pk_changed = False
+        for prop in diff.property_changes:
+            if "Primary Key Name" in prop:
+                pk_changed = True
+        
+        # Also check if any column's PK status changed
+        for old, new in diff.modified_columns:
+            if old.is_primary_key != new.is_primary_key:
+                pk_changed = True
+        
+        if pk_changed:
+            # Drop existing PK (if any) - we assume there was one if we are changing it, or we just try to drop
+            # In Snowflake, "DROP PRIMARY KEY" works even if we are adding one? No.
+            # If we are adding a PK where none existed, DROP might fail.
+            # But if we are modifying, we likely need to drop old one.
+            # Safe approach: Try to drop if we suspect there was one, then add new one.
+            # For now, we will just generate the ADD/DROP based on current state.
             
             if pk_changed:
-                # Drop existing PK (if any) - we assume there was one if we are changing it, or we just try to drop
-                # In Snowflake, "DROP PRIMARY KEY" works even if we are adding one? No.
-                # If we are adding a PK where none existed, DROP might fail.
-                # But if we are modifying, we likely need to drop old one.
-                # Safe approach: Try to drop if we suspect there was one, then add new one.
-                # For now, we will just generate the ADD/DROP based on current state.
+                sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP PRIMARY KEY;")
                 
-                if pk_changed:
-                    sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} DROP PRIMARY KEY;")
-                    
-                    if diff.new_table_obj:
-                        pk_cols = [c.name for c in diff.new_table_obj.columns if c.is_primary_key]
-                        if pk_cols:
-                            pk_def = f"PRIMARY KEY ({', '.join([self.quote_ident(c) for c in pk_cols])})"
-                            if diff.new_table_obj.primary_key_name:
-                                pk_def = f"CONSTRAINT {self.quote_ident(diff.new_table_obj.primary_key_name)} {pk_def}"
-                            sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD {pk_def};")
+                if diff.new_table_obj:
+                    pk_cols = [c.name for c in diff.new_table_obj.columns if c.is_primary_key]
+                    if pk_cols:
+                        pk_def = f"PRIMARY KEY ({', '.join([self.quote_ident(c) for c in pk_cols])})"
+                        if diff.new_table_obj.primary_key_name:
+                            pk_def = f"CONSTRAINT {self.quote_ident(diff.new_table_obj.primary_key_name)} {pk_def}"
+                        sql.append(f"ALTER TABLE {self.quote_ident(diff.table_name)} ADD {pk_def};")
 
-        return "\n".join(sql)
+        return sql
 
     def create_table_sql(self, table):
         stmt = "CREATE "
@@ -1,96 +1,201 @@
 import argparse
+import os
+import re
 import sys
-from schemaforge.parsers.mysql import MySQLParser
-from schemaforge.parsers.postgres import PostgresParser
-from schemaforge.parsers.sqlite import SQLiteParser
-from schemaforge.parsers.oracle import OracleParser
-from schemaforge.parsers.db2 import DB2Parser
-from schemaforge.parsers.snowflake import SnowflakeParser
-from schemaforge.parsers.mssql import MSSQLParser
-
-from schemaforge.generators.mysql import MySQLGenerator
-from schemaforge.generators.postgres import PostgresGenerator
-from schemaforge.generators.sqlite import SQLiteGenerator
-from schemaforge.generators.oracle import OracleGenerator
-from schemaforge.generators.db2 import DB2Generator
-from schemaforge.generators.snowflake import SnowflakeGenerator
-from schemaforge.generators.mssql import MSSQLGenerator
-
-from schemaforge.comparator import Comparator
+from importlib import import_module
+
+from schemaforge.source import SqlSource
+from schemaforge import profiling
 from schemaforge.logging_config import setup_logging, get_logger
 
-def get_parser(dialect, strict: bool = False):
+# Write buffer for --sql-out / --rollback-out; statements are streamed into it
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Dialect -> (module, class). Modules are imported on first use so that
+# `sf --help`, `sf --version` and argument errors do not load sqlglot or
+# sqlparse (guarded by benchmarks.import_time).
+PARSERS = {
+    'mysql': ('schemaforge.parsers.mysql', 'MySQLParser'),
+    'postgres': ('schemaforge.parsers.postgres', 'PostgresParser'),
+    'sqlite': ('schemaforge.parsers.sqlite', 'SQLiteParser'),
+    'oracle': ('schemaforge.parsers.oracle', 'OracleParser'),
+    'db2': ('schemaforge.parsers.db2', 'DB2Parser'),
+    'snowflake': ('schemaforge.parsers.snowflake', 'SnowflakeParser'),
+    'mssql': ('schemaforge.parsers.mssql', 'MSSQLParser'),
+}
+GENERATORS = {
+    'mysql': ('schemaforge.generators.mysql', 'MySQLGenerator'),
+    'postgres': ('schemaforge.generators.postgres', 'PostgresGenerator'),
+    'sqlite': ('schemaforge.generators.sqlite', 'SQLiteGenerator'),
+    'oracle': ('schemaforge.generators.oracle', 'OracleGenerator'),
+    'db2': ('schemaforge.generators.db2', 'DB2Generator'),
+    'snowflake': ('schemaforge.generators.snowflake', 'SnowflakeGenerator'),
+    'mssql': ('schemaforge.generators.mssql', 'MSSQLGenerator'),
+}
+
+def _load_class(registry, dialect):
+    """Imports and returns the class registered for ``dialect``."""
+    try:
+        module_name, class_name = registry[dialect]
+    except KeyError:
+        raise ValueError(f"Unknown dialect: {dialect}")
+    return getattr(import_module(module_name), class_name)
+
+def get_parser(dialect, strict: bool = False, jobs: int = 1):
     """Get the appropriate parser for the given dialect.
     
     Args:
         dialect: SQL dialect name
         strict: If True, parser will raise StrictModeError on unparseable statements
+        jobs: Number of worker processes used for statement parsing
+    """
+    return _load_class(PARSERS, dialect)(strict=strict, jobs=jobs)
+
+# Dialects with a low-lock --online mode
+ONLINE_DIALECTS = ('postgres', 'mysql')
+# --lock-timeout values: milliseconds or a number with a Postgres time unit
+LOCK_TIMEOUT_PATTERN = r'\d+\s*(us|ms|s|min|h|d)?'
+
+def get_generator(dialect, online: bool = False, lock_timeout: str = None):
+    """Get the appropriate generator for the given dialect.
+
+    Args:
+        dialect: SQL dialect name
+        online: Emit low-lock DDL for tables in use (see ONLINE_DIALECTS)
+        lock_timeout: lock_timeout of online migrations (dialect default if None)
     """
-    if dialect == 'mysql': return MySQLParser(strict=strict)
-    if dialect == 'postgres': return PostgresParser(strict=strict)
-    if dialect == 'sqlite': return SQLiteParser(strict=strict)
-    if dialect == 'oracle': return OracleParser(strict=strict)
-    if dialect == 'db2': return DB2Parser(strict=strict)
-    if dialect == 'snowflake': return SnowflakeParser(strict=strict)
-    if dialect == 'mssql': return MSSQLParser(strict=strict)
-    raise ValueError(f"Unknown dialect: {dialect}")
-
-def get_generator(dialect):
-    if dialect == 'mysql': return MySQLGenerator()
-    if dialect == 'postgres': return PostgresGenerator()
-    if dialect == 'sqlite': return SQLiteGenerator()
-    if dialect == 'oracle': return OracleGenerator()
-    if dialect == 'db2': return DB2Generator()
-    if dialect == 'snowflake': return SnowflakeGenerator()
-    if dialect == 'mssql': return MSSQLGenerator()
-    raise ValueError(f"Unknown dialect: {dialect}")
+    if online:
+        if dialect not in ONLINE_DIALECTS:
+            raise ValueError(f"--online is not supported for dialect: {dialect}")
+        options = {'online': True}
+        if lock_timeout and dialect == 'postgres':
+            options['lock_timeout'] = lock_timeout
+        return _load_class(GENERATORS, dialect)(**options)
+    return _load_class(GENERATORS, dialect)()
+
+def _generator_for(args):
+    """Returns the generator for the dialect and online options of ``args``."""
+    options = vars(args)
+    if options.get('online'):
+        return globals()['get_generator'](args.dialect, online=True, lock_timeout=options.get('lock_timeout'))
+    return globals()['get_generator'](args.dialect)
 
 def read_sql_source(path: str) -> str:
     """
     Reads SQL content from a file or recursively from a directory.
     """
-    import os
-    import glob
-    
-    if os.path.isfile(path):
-        with open(path, 'r', encoding='utf-8', errors='replace') as f:
-            return f.read()
-            
-    elif os.path.isdir(path):
-        content = []
-        # Recursive glob for .sql files
-        sql_files = glob.glob(os.path.join(path, '**/*.sql'), recursive=True)
-        # Sort to ensure deterministic order
-        sql_files.sort()
-        
-        if not sql_files:
-            raise ValueError(f"No .sql files found in directory: {path}")
-            
-        for sql_file in sql_files:
-            with open(sql_file, 'r', encoding='utf-8', errors='replace') as f:
-                content.append(f.read())
-        
-        return "\n".join(content)
-        
-    else:
-        raise ValueError(f"Path not found: {path}")
+    return SqlSource(path).read_text()
+
+def parse_source(parser_instance, path: str, cache=None):
+    """
+    Parses a schema source, reusing cached per-file fragments when possible.
+
+    Without a cache (or for parsers without fragment support) statements are
+    streamed from the memory-mapped files into the parser. With a ParseCache
+    each file is looked up by content hash; only changed files are parsed,
+    and all fragments are applied in file order so cross-file ALTER,
+    COMMENT ON and CREATE INDEX statements resolve like in a full parse.
+    """
+    source = SqlSource(path)
+    if cache is None or not parser_instance.supports_fragments:
+        return parser_instance.parse_source(source)
+
+    import mmap
+
+    keys = []
+    for sql_file in source.files:
+        with open(sql_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    keys.append(cache.key(parser_instance, mm))
+            else:
+                keys.append(cache.key(parser_instance, b''))
+
+    # A cache that keeps whole schemas (MemoryParseCache) skips the merge
+    schema = cache.get_schema(keys)
+    if schema is not None:
+        get_logger("cache").info(f"Parse cache for {path}: schema of {len(keys)} unchanged files reused")
+        return schema
+
+    from schemaforge.models import Schema
+
+    schema = Schema()
+    for sql_file, key in zip(source.files, keys):
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = parser_instance.parse_fragment(SqlSource(sql_file))
+            cache.put(key, fragment)
+        parser_instance.apply_fragment(fragment, schema)
+
+    cache.put_schema(keys, schema)
+    cache.prune()
+    get_logger("cache").info(f"Parse cache for {path}: {cache.hits} hits, {cache.misses} misses")
+    return schema
+
+def _parse_schema_worker(dialect: str, path: str, strict: bool = False, jobs: int = 1, cache=None) -> bytes:
+    """
+    Reads and parses one schema source in a worker process.
+
+    The parser is rebuilt from get_parser() inside the worker and the Schema
+    is returned as a pickle so only one compact payload crosses processes.
+    """
+    import pickle
+    parser_instance = get_parser(dialect, strict=strict, jobs=jobs)
+    schema = parse_source(parser_instance, path, cache)
+    return pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL)
+
+def parse_schemas(dialect: str, paths, strict: bool = False, jobs: int = 1, cache=None, parser_instance=None):
+    """
+    Parses several independent schema sources and returns their Schemas in order.
+
+    With jobs >= 2 each source is parsed in its own worker process, so wall
+    time is close to the slowest parse instead of the sum. The statement-level
+    job budget is split between the workers. ``cache`` is an optional
+    ParseCache shared by all sources. A given ``parser_instance`` (kept warm
+    by ``sf serve``) parses every source in this process.
+    """
+    paths = list(paths)
+    if parser_instance is not None or jobs < 2 or len(paths) < 2:
+        parser_instance = parser_instance or get_parser(dialect, strict=strict, jobs=jobs)
+        schemas = []
+        for path in paths:
+            with profiling.phase(path):
+                schemas.append(parse_source(parser_instance, path, cache))
+        return schemas
+
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor
+    workers = min(jobs, len(paths))
+    inner_jobs = max(1, jobs // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_parse_schema_worker, dialect, path, strict, inner_jobs, cache) for path in paths]
+        return [pickle.loads(future.result()) for future in futures]
 
 def main():
     parser = argparse.ArgumentParser(description='SchemaForge - Database as Code (Offline Mode)')
-    parser.add_argument('command', choices=['compare'], help='Command to execute')
+    parser.add_argument('command', choices=['compare', 'snapshot', 'serve', 'compare-batch'], help='Command to execute')
     
     # Source Arguments
-    parser.add_argument('--source', required=True, help='Path to source schema file')
+    parser.add_argument('--source', help='Path to source schema file')
+    parser.add_argument('--source-snapshot', help='Load the source schema from a snapshot written by `snapshot` (rebuilt if stale)')
     
     # Target Arguments
-    parser.add_argument('--target', required=True, help='Path to target schema file')
+    parser.add_argument('--target', help='Path to target schema file')
+    
+    # Snapshot Arguments
+    parser.add_argument('--out', help='Path of the snapshot file written by `snapshot`, or the output directory of `compare-batch`')
     
-    parser.add_argument('--dialect', required=True, choices=['mysql', 'postgres', 'sqlite', 'oracle', 'db2', 'snowflake', 'mssql'], help='SQL Dialect')
+    # Batch Arguments
+    parser.add_argument('--manifest', metavar='FILE',
+                        help='`compare-batch`: JSON (or YAML, with PyYAML) list of source/target pairs')
+    
+    parser.add_argument('--dialect', choices=list(PARSERS), help='SQL Dialect (required except for `serve`, where it is warmed up at start, and `compare-batch`, where it is the manifest default)')
     
     # Independent flags
     parser.add_argument('--plan', action='store_true', help='Print detailed human-readable plan to stdout')
     parser.add_argument('--json-out', help='Path to save detailed JSON plan')
     parser.add_argument('--sql-out', help='Path to save migration SQL script')
+    parser.add_argument('--batches-out', help='Path to save the migration as JSON batches of independent steps (for parallel runners)')
     parser.add_argument('--generate-rollback', action='store_true', help='Generate rollback migration in addition to forward migration')
     parser.add_argument('--rollback-out', help='Path to save rollback migration SQL script (requires --generate-rollback)')
     
@@ -99,6 +204,39 @@ def main():
     parser.add_argument('--verbose', '-v', action='count', default=0, help='Enable verbose output (-v for INFO, -vv for DEBUG)')
     parser.add_argument('--log-format', choices=['text', 'json'], default='text', help='Log output format (default: text)')
     parser.add_argument('--strict', action='store_true', help='Fail fast on unparseable statements instead of ignoring them')
+    parser.add_argument('--detect-renames', action='store_true', help='Report structurally similar dropped/added tables and columns as renames')
+    parser.add_argument('--rename-threshold', type=float, default=None, metavar='SIMILARITY',
+                        help='Minimum similarity (0-1) for --detect-renames (default: 0.8)')
+    
+    # Online migration flags
+    parser.add_argument('--online', action='store_true',
+                        help='Emit low-lock DDL for tables in use (postgres, mysql); changes that still block writes are flagged in --plan')
+    parser.add_argument('--lock-timeout', metavar='DURATION',
+                        help="lock_timeout set before each step with --online (default: '5s')")
+    
+    # Cost estimates
+    parser.add_argument('--stats', metavar='FILE',
+                        help='JSON or CSV of table row counts and sizes; estimates lock level and duration of each table change')
+    
+    # Performance flags
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Number of worker processes used to parse statements and diff tables (default: 1)')
+    parser.add_argument('--parallel-diff-threshold', type=int, default=None, metavar='N',
+                        help='With --jobs, diff tables in worker processes once at least N tables exist on both sides (default: 2000)')
+    parser.add_argument('--cache', action='store_true', help='Cache parsed files under ~/.cache/schemaforge and re-parse only changed files')
+    parser.add_argument('--cache-dir', help='Parse cache directory (implies --cache)')
+    parser.add_argument('--cache-size-mb', type=int, default=512, help='Maximum parse cache size in MB before LRU eviction (default: 512)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time each phase of compare and trace its peak memory; prints a summary table to stderr')
+    parser.add_argument('--profile-out', metavar='FILE',
+                        help='Save the --profile report as JSON (implies --profile; the table is then printed only with -v)')
+    parser.add_argument('--slow-statements', type=int, default=0, metavar='N',
+                        help='Time every statement while parsing and report the N slowest with file:line (parses with --jobs 1)')
+    
+    # Server mode
+    parser.add_argument('--server', action='store_true',
+                        help='Run compare/snapshot in the `sf serve` process on --socket (runs locally if none is running)')
+    parser.add_argument('--socket', metavar='PATH',
+                        help='Unix socket of `sf serve` (default: $XDG_RUNTIME_DIR/schemaforge.sock or ~/.cache/schemaforge/sf.sock)')
     
     # Version handling
     try:
@@ -109,6 +247,32 @@ def main():
     parser.add_argument('--version', action='version', version=f'SchemaForge v{version}')
     
     args = parser.parse_args()
+
+    if args.command not in ('serve', 'compare-batch') and not args.dialect:
+        parser.error("the following arguments are required: --dialect")
+    if args.command == 'compare':
+        if not args.target:
+            parser.error("compare requires --target")
+        if not (args.source or args.source_snapshot):
+            parser.error("compare requires --source or --source-snapshot")
+    elif args.command == 'snapshot' and not (args.source and args.out):
+        parser.error("snapshot requires --source and --out")
+    elif args.command == 'compare-batch':
+        if not (args.manifest and args.out):
+            parser.error("compare-batch requires --manifest and --out")
+        if args.server or args.profile or args.profile_out or args.slow_statements:
+            parser.error("--server, --profile, --profile-out and --slow-statements cannot be used with compare-batch")
+    # compare-batch without --dialect checks each manifest pair when it runs
+    if args.online and args.dialect not in ONLINE_DIALECTS and (args.dialect or args.command != 'compare-batch'):
+        parser.error(f"--online is not supported for {args.dialect} (supported: {', '.join(ONLINE_DIALECTS)})")
+    if args.lock_timeout and not (args.online and args.dialect == 'postgres'):
+        parser.error("--lock-timeout requires --online and --dialect postgres")
+    if args.lock_timeout and not re.fullmatch(LOCK_TIMEOUT_PATTERN, args.lock_timeout):
+        parser.error(f"--lock-timeout must be a duration such as 500ms, 5s or 1min (got {args.lock_timeout!r})")
+    if args.slow_statements < 0:
+        parser.error("--slow-statements must be a non-negative number (0 turns it off)")
+    if args.server and (args.profile or args.profile_out or args.slow_statements):
+        parser.error("--profile, --profile-out and --slow-statements cannot be used with --server")
     
     # Setup logging based on verbosity and format
     logger = setup_logging(
@@ -120,24 +284,171 @@ def main():
     if args.verbose:
         logger.debug(f"Command={args.command}, Dialect={args.dialect}, Source={args.source}, Target={args.target}")
     
-    if args.command == 'compare':
+    if args.command == 'serve':
+        from schemaforge.server import SchemaServer
         try:
-            source_sql = read_sql_source(args.source)
-            target_sql = read_sql_source(args.target)
-                
-            parser_instance = get_parser(args.dialect, strict=args.strict)
-            source_schema = parser_instance.parse(source_sql)
-            target_schema = parser_instance.parse(target_sql)
-            
-            comparator = Comparator()
-            migration_plan = comparator.compare(source_schema, target_schema)
-            
-            # ... (Output logic) ...
-            _handle_output(args, migration_plan)
+            server = SchemaServer(args.socket, cache_bytes=args.cache_size_mb * 1024 * 1024)
+            if args.dialect:
+                server.warm(args.dialect)
+            server.serve_forever()
+        except Exception as e:
+            logger.error(f"Server failed: {e}")
+            sys.exit(1)
 
+    elif args.command == 'compare':
+        if args.server and _forward(args, logger, "Comparison failed"):
+            return
+        if args.slow_statements and args.jobs > 1:
+            # Statements parsed in worker processes cannot be timed one by one
+            logger.warning("--slow-statements parses in a single process; ignoring --jobs")
+            args.jobs = 1
+        if args.profile or args.profile_out or args.slow_statements:
+            profiling.enable(profiling.Profiler(slow_statements=args.slow_statements))
+        try:
+            run_compare(args, _parse_cache(args))
         except Exception as e:
             logger.error(f"Comparison failed: {e}")
             sys.exit(1)
+        finally:
+            profiler = profiling.disable()
+            if profiler is not None:
+                _report_profile(args, profiler, logger)
+
+    elif args.command == 'snapshot':
+        if args.server and _forward(args, logger, "Snapshot failed"):
+            return
+        try:
+            run_snapshot(args, _parse_cache(args))
+        except Exception as e:
+            logger.error(f"Snapshot failed: {e}")
+            sys.exit(1)
+
+    elif args.command == 'compare-batch':
+        from schemaforge.batch import SUMMARY_FILE, format_summary, load_manifest, run_batch
+        try:
+            pairs = load_manifest(args.manifest, args.dialect, dialects=PARSERS)
+            summary = run_batch(pairs, args, _parse_cache(args))
+        except Exception as e:
+            logger.error(f"Batch comparison failed: {e}")
+            sys.exit(1)
+        print(format_summary(summary))
+        print(f"Batch summary saved to {os.path.join(args.out, SUMMARY_FILE)}")
+        if summary["totals"]["failed"]:
+            sys.exit(1)
+
+# Options holding paths; made absolute before they are sent to `sf serve`
+_PATH_OPTIONS = ('source', 'source_snapshot', 'target', 'out', 'json_out', 'sql_out', 'batches_out',
+                 'rollback_out', 'stats', 'cache_dir', 'profile_out')
+
+def _forward(args, logger, failure: str) -> bool:
+    """
+    Runs the command in the `sf serve` process and replays its output and
+    log messages. Returns False (after a warning) when no server answers,
+    so the caller runs the command locally instead.
+    """
+    import logging
+    from schemaforge.server import ServerError, ServerUnavailable, call, default_socket_path
+
+    options = {key: value for key, value in vars(args).items() if key not in ('command', 'server', 'socket')}
+    for key in _PATH_OPTIONS:
+        if options.get(key):
+            options[key] = os.path.abspath(options[key])
+    try:
+        from schemaforge.version import __version__ as version
+    except ImportError:
+        version = 'Unknown'
+    try:
+        result = call(args.socket or default_socket_path(), args.command, {"args": options, "version": version})
+    except ServerUnavailable as e:
+        logger.warning(f"{e}; running locally")
+        return False
+    except ServerError as e:
+        logger.error(f"{failure}: {e}")
+        sys.exit(1)
+    for name, level, message in result.get("messages", []):
+        logging.getLogger(name).log(level, message)
+    sys.stdout.write(result.get("output", ""))
+    return True
+
+def _parse_cache(args):
+    """The on-disk ParseCache requested by --cache / --cache-dir, or None."""
+    if args.cache or args.cache_dir:
+        from schemaforge.cache import ParseCache
+        return ParseCache(args.cache_dir, max_bytes=args.cache_size_mb * 1024 * 1024)
+    return None
+
+def run_compare(args, cache=None, parser_instance=None, fingerprints=False):
+    """
+    Runs `sf compare` for parsed CLI ``args``: parses both schemas, diffs
+    them and writes the requested outputs. Errors propagate to the caller.
+    ``fingerprints`` is passed to the Comparator (``sf serve`` compares the
+    same cached schemas over and over).
+    """
+    stats = None
+    if args.stats:
+        # Read before parsing so a bad stats file fails fast
+        from schemaforge.costs import load_stats
+        stats = load_stats(args.stats)
+
+    with profiling.phase("parse"):
+        if args.source_snapshot:
+            from schemaforge.snapshot import load_or_rebuild
+            source_schema = load_or_rebuild(
+                args.source_snapshot, args.dialect,
+                lambda path: parse_schemas(args.dialect, [path], strict=args.strict, jobs=args.jobs, cache=cache,
+                                           parser_instance=parser_instance)[0],
+                strict=args.strict, source=args.source,
+            )
+            target_schema, = parse_schemas(args.dialect, [args.target], strict=args.strict, jobs=args.jobs, cache=cache,
+                                           parser_instance=parser_instance)
+        else:
+            source_schema, target_schema = parse_schemas(
+                args.dialect, [args.source, args.target], strict=args.strict, jobs=args.jobs, cache=cache,
+                parser_instance=parser_instance,
+            )
+    
+    from schemaforge.comparator import Comparator
+    comparator = Comparator(fingerprints=fingerprints, jobs=args.jobs, dialect=args.dialect,
+                            detect_renames=args.detect_renames)
+    if args.rename_threshold is not None:
+        comparator.rename_threshold = args.rename_threshold
+    if args.parallel_diff_threshold is not None:
+        comparator.parallel_threshold = args.parallel_diff_threshold
+    with profiling.phase("compare"):
+        migration_plan = comparator.compare(source_schema, target_schema)
+    if stats is not None:
+        from schemaforge.costs import estimate_costs
+        with profiling.phase("costs"):
+            migration_plan.costs = estimate_costs(migration_plan, stats, args.dialect, online=args.online)
+    
+    # ... (Output logic) ...
+    with profiling.phase("output"):
+        _handle_output(args, migration_plan)
+
+def run_snapshot(args, cache=None, parser_instance=None):
+    """Runs `sf snapshot` for parsed CLI ``args``."""
+    from schemaforge.snapshot import write_snapshot
+    schema, = parse_schemas(args.dialect, [args.source], strict=args.strict, jobs=args.jobs, cache=cache,
+                            parser_instance=parser_instance)
+    header = write_snapshot(args.out, schema, args.dialect, args.source, strict=args.strict)
+    print(f"Snapshot of {header['tables']} tables ({len(header['files'])} files) saved to {args.out}")
+
+def _report_profile(args, profiler, logger):
+    """Writes the --profile-out report and prints the summary table."""
+    if not (args.profile or args.profile_out):
+        # Only --slow-statements was asked for
+        print(profiler.slow_statements_summary(), file=sys.stderr)
+        return
+    if args.profile_out:
+        import json
+        try:
+            with open(args.profile_out, 'w') as f:
+                json.dump(profiler.report(), f, indent=2)
+            print(f"Profile saved to {args.profile_out}")
+        except OSError as e:
+            logger.error(f"Cannot write profile to {args.profile_out}: {e}")
+    if args.verbose or not args.profile_out:
+        print(profiler.summary(), file=sys.stderr)
 
 def _handle_output(args, migration_plan):
     # 1. Human Readable Plan
@@ -165,11 +476,16 @@ def _handle_output(args, migration_plan):
         for table in migration_plan.dropped_tables:
             t_type = getattr(table, 'table_type', 'Table')
             output_content += f"{RED}  - Drop {t_type}: {table.name}{RESET}\n"
+
+        for old_table, new_table in migration_plan.renamed_tables:
+            output_content += f"{YELLOW}  ~ Rename Table: {old_table.name} -> {new_table.name}{RESET}\n"
             
         for diff in migration_plan.modified_tables:
             output_content += f"{YELLOW}  ~ Modify Table: {diff.table_name}{RESET}\n"
             for prop_change in diff.property_changes:
                 output_content += f"{YELLOW}    ~ Property Change: {prop_change}{RESET}\n"
+            for old_col, new_col in diff.renamed_columns:
+                output_content += f"{YELLOW}    ~ Rename Column: {old_col.name} -> {new_col.name}{RESET}\n"
             for col in diff.added_columns:
                 output_content += f"{GREEN}    + Add Column: {col.name} ({col.data_type}){RESET}\n"
             for col in diff.dropped_columns:
@@ -347,49 +663,103 @@ def _handle_output(args, migration_plan):
             output_content += f"{YELLOW}  ~ Modify POLICY: {new_obj.name}{RESET}\n"
 
         if not (migration_plan.new_tables or migration_plan.dropped_tables or migration_plan.modified_tables or
+                migration_plan.renamed_tables or
                 migration_plan.new_custom_objects or migration_plan.dropped_custom_objects or migration_plan.modified_custom_objects or
                 migration_plan.new_policies or migration_plan.dropped_policies or migration_plan.modified_policies or
                 migration_plan.new_domains or migration_plan.dropped_domains or migration_plan.modified_domains or
                 migration_plan.new_types or migration_plan.dropped_types or migration_plan.modified_types):
              output_content += "No changes detected.\n"
+
+        # Lock/rewrite estimates (--stats)
+        if migration_plan.costs:
+            output_content += "Cost Estimates:\n"
+            for cost in migration_plan.costs:
+                color = GREEN if cost.kind == 'metadata' else (RED if cost.kind == 'rewrite' else YELLOW)
+                duration = "no stats" if cost.seconds is None else f"~{cost.seconds:.1f}s"
+                output_content += f"{color}  {cost.table}: {cost.operation} [{cost.kind}, lock {cost.lock}, {duration}]{RESET}\n"
+            known = [cost.seconds for cost in migration_plan.costs if cost.seconds is not None]
+            output_content += f"  Total: ~{sum(known):.1f}s\n"
+
+        # Changes that still lock the table in --online mode
+        online_warnings = _generator_for(args).online_warnings(migration_plan) if vars(args).get('online') else []
+        if online_warnings:
+            output_content += f"{YELLOW}Online Migration Warnings:{RESET}\n"
+            for warning in online_warnings:
+                output_content += f"{YELLOW}  ! {warning}{RESET}\n"
              
         print(output_content)
 
     # 2. JSON Output
     if args.json_out:
         import json
+        report = migration_plan.to_dict()
+        if vars(args).get('online'):
+            report["online_warnings"] = _generator_for(args).online_warnings(migration_plan)
         with open(args.json_out, 'w') as f:
-            json.dump(migration_plan.to_dict(), f, indent=2)
+            json.dump(report, f, indent=2)
         print(f"JSON plan saved to {args.json_out}")
 
-    # 3. SQL Output
+    # 3. SQL Output (forward and rollback rendered in one pass, streamed to disk)
+    rollback_header = f"-- Rollback Migration Script for {args.dialect}\n-- This script reverses the forward migration\n"
+    rollback_written = False
     if args.sql_out:
-        get_generator = globals()['get_generator'] # Access global get_generator
-        generator_instance = get_generator(args.dialect)
-        migration_sql = generator_instance.generate_migration(migration_plan)
-        full_sql = f"-- Migration Script for {args.dialect}\n{migration_sql}"
-        with open(args.sql_out, 'w') as f:
-            f.write(full_sql)
+        generator_instance = _generator_for(args)
+        with open(args.sql_out, 'w', buffering=OUTPUT_BUFFER_SIZE) as sql_file:
+            if args.generate_rollback and args.rollback_out:
+                with open(args.rollback_out, 'w', buffering=OUTPUT_BUFFER_SIZE) as rollback_file:
+                    generator_instance.write_migration(
+                        migration_plan, sql_file, rollback_file,
+                        header=f"-- Migration Script for {args.dialect}\n", rollback_header=rollback_header)
+                rollback_written = True
+            else:
+                generator_instance.write_migration(migration_plan, sql_file,
+                                                   header=f"-- Migration Script for {args.dialect}\n")
         print(f"Migration SQL saved to {args.sql_out}")
-    
-    # 4. Rollback SQL Output
-    if args.generate_rollback:
-        get_generator = globals()['get_generator']
-        generator_instance = get_generator(args.dialect)
-        rollback_sql = generator_instance.generate_rollback_migration(migration_plan)
-        full_rollback_sql = f"-- Rollback Migration Script for {args.dialect}\n-- This script reverses the forward migration\n{rollback_sql}"
+        if rollback_written:
+            print(f"Rollback SQL saved to {args.rollback_out}")
+
+    # 3b. Dependency batches (steps of one batch can run on separate connections)
+    batches_out = vars(args).get('batches_out')
+    if batches_out:
+        import json
+        generator_instance = _generator_for(args)
+        batches = [
+            {
+                "batch": number,
+                "steps": [
+                    {
+                        "action": step.action,
+                        "object": step.name,
+                        # False when a statement cannot run in a transaction block
+                        "transactional": all(generator_instance.is_transactional(sql) for sql in statements),
+                        "statements": statements,
+                    }
+                    for step, statements in batch
+                ],
+            }
+            for number, batch in enumerate(generator_instance.generate_batches(migration_plan), 1)
+        ]
+        with open(batches_out, 'w') as f:
+            json.dump({"dialect": args.dialect, "batches": batches}, f, indent=2)
+        print(f"Migration batches saved to {batches_out}")
+
+    # 4. Rollback SQL Output (when not written together with --sql-out)
+    if args.generate_rollback and not rollback_written:
+        generator_instance = _generator_for(args)
         
         if args.rollback_out:
-            with open(args.rollback_out, 'w') as f:
-                f.write(full_rollback_sql)
+            with open(args.rollback_out, 'w', buffering=OUTPUT_BUFFER_SIZE) as rollback_file:
+                generator_instance.write_migration(migration_plan, rollback_out=rollback_file,
+                                                   rollback_header=rollback_header)
             print(f"Rollback SQL saved to {args.rollback_out}")
         else:
             # If no rollback output path specified, print to stdout
+            rollback_sql = generator_instance.generate_rollback_migration(migration_plan)
             print("\n=== ROLLBACK MIGRATION ===")
-            print(full_rollback_sql)
+            print(rollback_header + rollback_sql)
         
-    if not (args.plan or args.json_out or args.sql_out or args.generate_rollback):
-        print("No output action specified. Use --plan, --json-out, --sql-out, or --generate-rollback.")
+    if not (args.plan or args.json_out or args.sql_out or batches_out or args.generate_rollback):
+        print("No output action specified. Use --plan, --json-out, --sql-out, --batches-out, or --generate-rollback.")
 
 if __name__ == '__main__':
     main()
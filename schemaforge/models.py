@@ -1,26 +1,295 @@
-from dataclasses import dataclass, field
-from typing import List, Optional, Any, Dict
+import hashlib
+import sys
+from operator import attrgetter
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import lru_cache
+from typing import Callable, List, NamedTuple, Optional, Any, Dict, Tuple
 
+
+class _PendingList(list):
+    """
+    Empty list handed out for an unset collection field.
+
+    The first mutation stores the list on its owner, so fields that stay
+    empty (most of them, for most dialects) cost no memory per object.
+    """
+    __slots__ = ('_owner', '_slot')
+
+    def __init__(self, owner, slot):
+        super().__init__()
+        self._owner = owner
+        self._slot = slot
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+    def _target(self):
+        owner = self._owner
+        if owner is None:
+            return self
+        current = getattr(owner, self._slot)
+        if current is None:
+            setattr(owner, self._slot, self)
+            self._owner = None
+            return self
+        # Another handle was attached first; write through to it
+        return current
+
+
+class _PendingDict(dict):
+    """Dict counterpart of _PendingList."""
+    __slots__ = ('_owner', '_slot')
+
+    def __init__(self, owner, slot):
+        super().__init__()
+        self._owner = owner
+        self._slot = slot
+
+    _target = _PendingList._target
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def _forward(base, name):
+    method = getattr(base, name)
+
+    def forward(self, *args, **kwargs):
+        return method(self._target(), *args, **kwargs)
+    forward.__name__ = name
+    forward.__doc__ = method.__doc__
+    return forward
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_PendingList, _name, _forward(list, _name))
+for _name in ('__setitem__', '__delitem__', 'update', 'setdefault', 'pop', 'popitem', 'clear', '__ior__'):
+    setattr(_PendingDict, _name, _forward(dict, _name))
+del _name
+
+
+def _lazy(factory, metadata=None):
+    """Collection field that stays None (shared, no allocation) until mutated."""
+    return field(default=None, metadata={**(metadata or {}), 'lazy': _PendingList if factory is list else _PendingDict})
+
+
+def _interned(metadata=None, **kwargs):
+    """
+    String field whose values go through sys.intern() on construction,
+    unpickling included (the class's __post_init__ calls _intern_fields()).
+    """
+    return field(metadata={**(metadata or {}), 'intern': True}, **kwargs)
+
+
+class DiffField(NamedTuple):
+    """
+    How Comparator diffs a model field.
+
+    Attributes:
+        label: Prefix of the change message (``"<label>: old -> new"``).
+        dialects: Only compared for these dialects (None = all). Only set
+            this when no parser of another dialect fills the field; the
+            shared sqlglot adapter sets e.g. ``row_security`` for all.
+        render: Optional ``(label, old, new) -> List[str]`` producing the
+            messages instead of the default format. May return an empty
+            list when the values differ but are equivalent.
+    """
+    label: str
+    dialects: Optional[Tuple[str, ...]] = None
+    render: Optional[Callable[[str, Any, Any], List[str]]] = None
+
+    def changes(self, old, new) -> List[str]:
+        if self.render is not None:
+            return self.render(self.label, old, new)
+        return [f"{self.label}: {old} -> {new}"]
+
+
+def _diff(label: str, dialects: Optional[Tuple[str, ...]] = None, render=None) -> dict:
+    """Field metadata registering a field with the diff engine."""
+    return {'diff': DiffField(label, dialects, render)}
+
+
+@lru_cache(maxsize=None)
+def diff_fields(cls, dialect: Optional[str] = None) -> Tuple[Tuple[str, DiffField], ...]:
+    """
+    Returns the ``(field name, DiffField)`` pairs of a model class in
+    declaration order, limited to ``dialect`` when one is given.
+    """
+    registered = []
+    for f in fields(cls):
+        spec = f.metadata.get('diff')
+        if spec is not None and (dialect is None or spec.dialects is None or dialect in spec.dialects):
+            registered.append((f.name, spec))
+    return tuple(registered)
+
+
+def _render_policies(label, old, new) -> List[str]:
+    # Order-insensitive; a dropped row access policy is dropped, anything
+    # else (masking policies) is unset
+    old_policies, new_policies = set(old), set(new)
+    changes = [f"{label}: {p}" for p in sorted(new_policies - old_policies)]
+    for p in sorted(old_policies - new_policies):
+        if "ROW ACCESS POLICY" in p:
+            changes.append(f"Drop {label}: {p}")
+        else:
+            changes.append(f"Unset {label}: {p}")
+    return changes
+
+
+def _render_tags(label, old, new) -> List[str]:
+    changes = [f"{label}: {k}={new[k]}" for k in sorted(new.keys() - old.keys())]
+    changes.extend(f"Unset {label}: {k}" for k in sorted(old.keys() - new.keys()))
+    changes.extend(f"{label}: {k} {old[k]} -> {new[k]}" for k in sorted(old.keys() & new.keys()) if old[k] != new[k])
+    return changes
+
+
+def _lazy_property(slot, pending):
+    def get(self):
+        value = getattr(self, slot)
+        return pending(self, slot) if value is None else value
+
+    def set(self, value):
+        setattr(self, slot, value)
+    return property(get, set)
+
+
+def _intern_fields(obj, names) -> None:
+    for name in names:
+        value = getattr(obj, name)
+        if type(value) is str:
+            setattr(obj, name, sys.intern(value))
+
+
+def _slotted_pickling(init_slots, extra_slots):
+    """
+    __reduce__/__setstate__ that pickle a slotted model as a constructor
+    call. Unpickling then runs the generated __init__ (and __post_init__
+    interning) instead of setting every slot from Python.
+    """
+    init_values = attrgetter(*init_slots) if len(init_slots) > 1 else (
+        lambda obj, name=init_slots[0]: (getattr(obj, name),))
+
+    def __reduce__(self):
+        extra = {name: getattr(self, name) for name in extra_slots if getattr(self, name, None) is not None}
+        return (type(self), init_values(self), extra or None)
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+    return __reduce__, __setstate__
+
+
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+_SCALAR_TYPES = frozenset((str, int, float, bool, Optional[str], Optional[int], Optional[float], Optional[bool]))
+
+# dataclass -> (attrgetter over compared fields, non-scalar field indexes,
+#              lazy collection field indexes)
+_FINGERPRINT_LAYOUT: Dict[type, tuple] = {}
+
+
+def _layout(cls) -> tuple:
+    compared = [f for f in fields(cls) if f.compare]
+    # Lazy collections are read from their raw slot (None when empty), so
+    # hashing does not allocate placeholder lists
+    names = ['_' + f.name if 'lazy' in f.metadata else f.name for f in compared]
+    getter = attrgetter(*names) if len(names) > 1 else (lambda obj, name=names[0]: (getattr(obj, name),))
+    nested = tuple(i for i, f in enumerate(compared) if f.type not in _SCALAR_TYPES)
+    lazy = frozenset(i for i, f in enumerate(compared) if 'lazy' in f.metadata)
+    layout = _FINGERPRINT_LAYOUT[cls] = (getter, nested, lazy)
+    return layout
+
+
+def _structure(value):
+    """Reduces a model value to nested tuples of primitives for hashing."""
+    cls = type(value)
+    layout = _FINGERPRINT_LAYOUT.get(cls)
+    if layout is None:
+        if isinstance(value, (list, tuple)):
+            return tuple(map(_structure, value))
+        if isinstance(value, dict):
+            return tuple(sorted((repr(k), _structure(v)) for k, v in value.items()))
+        if cls in _SCALARS or not is_dataclass(value) or isinstance(value, type):
+            return value
+        layout = _layout(cls)
+    getter, nested, lazy = layout
+    values = getter(value)
+    if nested:
+        values = list(values)
+        for i in nested:
+            v = values[i]
+            if i in lazy and not v:
+                # Unset lazy field and explicit empty collection hash alike
+                values[i] = ()
+            elif type(v) not in _SCALARS:
+                values[i] = _structure(v)
+    return (cls.__name__, tuple(values))
+
+
+def _fingerprint(obj) -> bytes:
+    """
+    Structural digest of a model object over all of its compared fields.
+
+    Equal digests mean equal objects; different digests may still compare
+    equal (dict order, objects without a stable repr), so callers fall back
+    to a field-by-field comparison on mismatch.
+    """
+    return hashlib.blake2b(repr(_structure(obj)).encode('utf-8'), digest_size=16).digest()
+
+
+def _slotted(cls):
+    """
+    Rebuilds a dataclass with ``__slots__``.
+
+    Equivalent to ``dataclass(slots=True)``, which needs Python 3.10.
+    Fields declared with _lazy() are stored in a private slot behind a
+    property. Instances pickle as constructor calls.
+    """
+    cls_dict = dict(cls.__dict__)
+    slots = []
+    init_slots = []
+    extra_slots = []
+    for f in fields(cls):
+        cls_dict.pop(f.name, None)
+        if 'lazy' in f.metadata:
+            slot = '_' + f.name
+            cls_dict[f.name] = _lazy_property(slot, f.metadata['lazy'])
+        else:
+            slot = f.name
+        slots.append(slot)
+        (init_slots if f.init else extra_slots).append(slot)
+    cls_dict['__slots__'] = tuple(slots)
+    cls_dict['__reduce__'], cls_dict['__setstate__'] = _slotted_pickling(init_slots, extra_slots)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_slotted
 @dataclass
 class Column:
     name: str
-    data_type: str
-    is_nullable: bool = True
-    default_value: Optional[Any] = None
-    is_primary_key: bool = False
-    comment: Optional[str] = None # Added comment field
-    collation: Optional[str] = None
-    masking_policy: Optional[str] = None # Added for Snowflake Masking Policy
+    data_type: str = _interned(_diff('Data Type'))
+    is_nullable: bool = field(default=True, metadata=_diff('Nullable'))
+    default_value: Optional[Any] = field(default=None, metadata=_diff('Default'))
+    is_primary_key: bool = field(default=False, metadata=_diff('Primary Key'))
+    comment: Optional[str] = field(default=None, metadata=_diff('Comment')) # Added comment field
+    collation: Optional[str] = _interned(_diff('Collation'), default=None)
+    masking_policy: Optional[str] = field(default=None, metadata=_diff('Masking Policy', ('snowflake',))) # Added for Snowflake Masking Policy
     # DB2/Oracle/Snowflake Specifics
-    is_identity: bool = False
-    identity_start: Optional[int] = None
-    identity_step: Optional[int] = None
+    is_identity: bool = field(default=False, metadata=_diff('Identity'))
+    identity_start: Optional[int] = field(default=None, metadata=_diff('Identity Start'))
+    identity_step: Optional[int] = field(default=None, metadata=_diff('Identity Step'))
     
     # Postgres Specifics
-    is_generated: bool = False
-    generation_expression: Optional[str] = None
-    identity_cycle: bool = False
+    is_generated: bool = field(default=False, metadata=_diff('Generated'))
+    generation_expression: Optional[str] = field(default=None, metadata=_diff('Generation Expr'))
+    identity_cycle: bool = field(default=False, metadata=_diff('Identity Cycle'))
     
+    def __post_init__(self):
+        # The same few types and collations repeat across every table
+        _intern_fields(self, _COLUMN_INTERNED)
+
     def __repr__(self):
         return f"Column(name='{self.name}', type='{self.data_type}')"
         
@@ -42,6 +311,8 @@ class Column:
             "identity_cycle": self.identity_cycle
         }
 
+_COLUMN_INTERNED = tuple(f.name for f in fields(Column) if 'intern' in f.metadata)
+
 @dataclass
 class CheckConstraint:
     name: str
@@ -70,6 +341,7 @@ class ExclusionConstraint:
             "comment": self.comment
         }
 
+@_slotted
 @dataclass
 class ForeignKey:
     name: str
@@ -93,6 +365,7 @@ class ForeignKey:
             "is_deferrable": self.is_deferrable
         }
 
+@_slotted
 @dataclass
 class Index:
     name: str
@@ -102,9 +375,9 @@ class Index:
     is_clustered: bool = False # MSSQL: CLUSTERED vs NONCLUSTERED
     method: Optional[str] = None # btree, gin, gist, etc.
     where_clause: Optional[str] = None # Partial index
-    include_columns: List[str] = field(default_factory=list) # INCLUDE clause
+    include_columns: List[str] = _lazy(list) # INCLUDE clause
     comment: Optional[str] = None
-    properties: Dict = field(default_factory=dict) # For DB2 INCLUDE, CLUSTER, etc.
+    properties: Dict = _lazy(dict) # For DB2 INCLUDE, CLUSTER, etc.
     
     def to_dict(self):
         return {
@@ -127,6 +400,16 @@ class CustomObject:
     obj_type: str
     name: str
     properties: dict = field(default_factory=dict)
+    _fingerprint: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    def fingerprint(self, compute: bool = True) -> Optional[bytes]:
+        """Cached structural digest; see Table.fingerprint()."""
+        if self._fingerprint is None and compute:
+            self._fingerprint = _fingerprint(self)
+        return self._fingerprint
+
+    def invalidate_fingerprint(self) -> None:
+        self._fingerprint = None
     
     def to_dict(self):
         return {
@@ -135,57 +418,79 @@ class CustomObject:
             "properties": self.properties
         }
 
+@_slotted
 @dataclass
 class Table:
     name: str
     columns: List[Column] = field(default_factory=list)
-    indexes: List[Index] = field(default_factory=list)
-    foreign_keys: List[ForeignKey] = field(default_factory=list)
-    check_constraints: List[CheckConstraint] = field(default_factory=list)
-    exclusion_constraints: List[ExclusionConstraint] = field(default_factory=list)
+    indexes: List[Index] = _lazy(list)
+    foreign_keys: List[ForeignKey] = _lazy(list)
+    check_constraints: List[CheckConstraint] = _lazy(list)
+    exclusion_constraints: List[ExclusionConstraint] = _lazy(list)
     
     # Snowflake Specifics
     table_type: str = "Table" # e.g. "Table", "Dynamic Table", "Iceberg Table", "View", "Materialized View"
-    is_transient: bool = False
-    cluster_by: List[str] = field(default_factory=list)
-    retention_days: Optional[int] = None
-    comment: Optional[str] = None
-    policies: List[str] = field(default_factory=list)
-    tags: dict = field(default_factory=dict)
-    primary_key_name: Optional[str] = None # Added for Named Constraints
+    is_transient: bool = field(default=False, metadata=_diff('Transient', ('snowflake',)))
+    cluster_by: List[str] = _lazy(list, _diff('Cluster Key', ('snowflake',)))
+    retention_days: Optional[int] = field(default=None, metadata=_diff('Retention', ('snowflake',)))
+    comment: Optional[str] = field(default=None, metadata=_diff('Comment'))
+    policies: List[str] = _lazy(list, _diff('Policy', ('snowflake',), _render_policies))
+    tags: dict = _lazy(dict, _diff('Tag', ('snowflake',), _render_tags))
+    primary_key_name: Optional[str] = field(default=None, metadata=_diff('Primary Key Name')) # Added for Named Constraints
     period_for: Optional[str] = None # DB2 Temporal: "SYSTEM_TIME (start, end)"
     
     # DB2/Oracle Specifics
-    tablespace: Optional[str] = None # For z/OS: DATABASE.TABLESPACE
-    database_name: Optional[str] = None # Specific for logical grouping if parsed separately
-    partition_by: Optional[str] = None
+    tablespace: Optional[str] = field(default=None, metadata=_diff('Tablespace', ('db2', 'oracle'))) # For z/OS: DATABASE.TABLESPACE
+    database_name: Optional[str] = field(default=None, metadata=_diff('Database', ('db2',))) # Specific for logical grouping if parsed separately
+    partition_by: Optional[str] = field(default=None, metadata=_diff('Partition'))
     
     # DB2 z/OS Specifics
-    stogroup: Optional[str] = None
-    priqty: Optional[int] = None
-    secqty: Optional[int] = None
-    audit: Optional[str] = None # NONE, CHANGES, ALL
-    ccsid: Optional[str] = None # EBCDIC, ASCII, UNICODE
+    stogroup: Optional[str] = field(default=None, metadata=_diff('Stogroup', ('db2',)))
+    priqty: Optional[int] = field(default=None, metadata=_diff('Priqty', ('db2',)))
+    secqty: Optional[int] = field(default=None, metadata=_diff('Secqty', ('db2',)))
+    audit: Optional[str] = field(default=None, metadata=_diff('Audit', ('db2',))) # NONE, CHANGES, ALL
+    ccsid: Optional[str] = field(default=None, metadata=_diff('CCSID', ('db2',))) # EBCDIC, ASCII, UNICODE
     
     # Postgres Specifics
     is_unlogged: bool = False
-    inherits: Optional[str] = None
-    row_security: bool = False
-    partition_of: Optional[str] = None # If it's a partition
-    partition_bound: Optional[str] = None
+    inherits: Optional[str] = field(default=None, metadata=_diff('Inherits', ('postgres',)))
+    row_security: bool = field(default=False, metadata=_diff('Row Security'))
+    partition_of: Optional[str] = field(default=None, metadata=_diff('Partition Of', ('postgres',))) # If it's a partition
+    partition_bound: Optional[str] = field(default=None, metadata=_diff('Partition Bound', ('postgres',)))
     
     # SQLite Specifics
-    is_strict: bool = False
-    without_rowid: bool = False
+    is_strict: bool = field(default=False, metadata=_diff('Strict'))
+    without_rowid: bool = field(default=False, metadata=_diff('Without RowID'))
     
     # MySQL Specifics
-    engine: Optional[str] = None
-    row_format: Optional[str] = None
+    engine: Optional[str] = field(default=None, metadata=_diff('Engine', ('mysql',)))
+    row_format: Optional[str] = field(default=None, metadata=_diff('Row Format', ('mysql',)))
     auto_increment: Optional[int] = None
     
     # Oracle/Generic Storage
-    storage_parameters: Dict = field(default_factory=dict)
+    storage_parameters: Dict = _lazy(dict)
+
+    # Cached by fingerprint(); not part of equality
+    _fingerprint: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
+    def fingerprint(self, compute: bool = True) -> Optional[bytes]:
+        """
+        Digest over every compared field, columns, indexes and constraints
+        included. Comparator skips tables whose digests match.
+
+        Computed once and cached: tables are treated as read-only after
+        parsing. Call invalidate_fingerprint() after changing one in place.
+        With ``compute=False`` only an already cached digest is returned.
+        """
+        # init=False slot: unset until the first call
+        digest = getattr(self, '_fingerprint', None)
+        if digest is None and compute:
+            digest = self._fingerprint = _fingerprint(self)
+        return digest
+
+    def invalidate_fingerprint(self) -> None:
+        self._fingerprint = None
+
     def get_column(self, name: str) -> Optional[Column]:
         for col in self.columns:
             if col.name == name:
@@ -228,32 +533,176 @@ class Table:
             "storage_parameters": self.storage_parameters
         }
 
+class TableList(list):
+    """
+    List of tables with a case-folded name index.
+
+    Behaves like a plain ``list``; appends keep the index current and any
+    other mutation (insert, slice assignment, sort, ...) drops it so the
+    next lookup rebuilds it. When a name occurs more than once the first
+    table wins, matching a linear scan. Tables renamed in place are only
+    found under their new name after reindex().
+    """
+
+    _index = None
+    _shadowed = 0
+
+    def __init__(self, tables=()):
+        super().__init__(tables)
+
+    def __reduce__(self):
+        # The index is derived state; rebuild it after unpickling/copying
+        return (self.__class__, (list(self),))
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name.lower() if name else ''
+
+    def _build(self) -> Dict[str, "Table"]:
+        index = {}
+        for table in self:
+            index.setdefault(self._key(table.name), table)
+        self._index = index
+        self._shadowed = len(self) - len(index)
+        return index
+
+    def reindex(self) -> None:
+        """Drops the name index; call after renaming tables in place."""
+        self._index = None
+
+    def lookup(self, name: str) -> Optional["Table"]:
+        """Returns the first table named ``name`` (case-insensitive) or None."""
+        if not name:
+            return None
+        key = name.lower()
+        index = self._index if self._index is not None else self._build()
+        table = index.get(key)
+        if table is not None and self._key(table.name) != key:
+            # Renamed since it was indexed
+            table = self._build().get(key)
+        return table
+
+    def append(self, table) -> None:
+        super().append(table)
+        if self._index is not None:
+            key = self._key(table.name)
+            if key in self._index:
+                self._shadowed += 1
+            else:
+                self._index[key] = table
+
+    def extend(self, tables) -> None:
+        for table in tables:
+            self.append(table)
+
+    def __iadd__(self, tables):
+        self.extend(tables)
+        return self
+
+    def discard(self, table) -> bool:
+        """
+        Removes ``table`` itself (by identity). Returns True if it was present.
+
+        O(n): the list is scanned for the table and shifted after it. The
+        name index is updated in place unless a duplicate name is shadowed.
+        """
+        for i, candidate in enumerate(self):
+            if candidate is table:
+                super().__delitem__(i)
+                break
+        else:
+            return False
+        if self._index is not None:
+            key = self._key(table.name)
+            if self._shadowed or self._index.get(key) is not table:
+                # Another table with the same name may take its place
+                self._index = None
+            else:
+                del self._index[key]
+        return True
+
+    # Mutations that can reorder or drop arbitrary entries reset the index
+    def insert(self, i, table) -> None:
+        self._index = None
+        super().insert(i, table)
+
+    def remove(self, table) -> None:
+        self._index = None
+        super().remove(table)
+
+    def pop(self, i=-1):
+        self._index = None
+        return super().pop(i)
+
+    def clear(self) -> None:
+        self._index = None
+        super().clear()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._index = None
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._index = None
+        super().reverse()
+
+    def __setitem__(self, i, value) -> None:
+        self._index = None
+        super().__setitem__(i, value)
+
+    def __delitem__(self, i) -> None:
+        self._index = None
+        super().__delitem__(i)
+
+    def __imul__(self, n):
+        self._index = None
+        return super().__imul__(n)
+
+
 @dataclass
 class Schema:
-    tables: List[Table] = field(default_factory=list)
+    tables: List[Table] = field(default_factory=TableList)
     custom_objects: List[CustomObject] = field(default_factory=list)
     policies: List[CustomObject] = field(default_factory=list) # Using CustomObject for now for simplicity or could make specialized
     domains: List[CustomObject] = field(default_factory=list)
     types: List[CustomObject] = field(default_factory=list)
+
+    def __setattr__(self, name, value):
+        # Plain lists assigned to ``tables`` get an index too
+        if name == 'tables' and not isinstance(value, TableList):
+            value = TableList(value)
+        super().__setattr__(name, value)
     
     def add_table(self, table: Table) -> None:
-        """Add a table to the schema, raising error on duplicate."""
-        existing = self.get_table(table.name)
+        """
+        Add a table to the schema, replacing (and logging) a duplicate.
+
+        O(1) unless a duplicate is replaced, which costs an O(n) removal.
+        """
+        existing = self.tables.lookup(table.name)
         if existing:
             import logging
             logger = logging.getLogger('schemaforge')
             logger.error(f"Duplicate table definition: '{table.name}'. First definition will be overwritten.")
             # Remove the old one and add the new one (with warning logged)
-            self.tables = [t for t in self.tables if t.name != table.name]
+            while existing is not None:
+                self.tables.discard(existing)
+                existing = self.tables.lookup(table.name)
         self.tables.append(table)
     
     def get_table(self, name: str) -> Optional[Table]:
-        if not name: return None
-        search_name = name.lower()
-        for table in self.tables:
-            if table.name.lower() == search_name:
-                return table
-        return None
+        return self.tables.lookup(name)
+
+    def remove_table(self, name: str) -> Optional[Table]:
+        """
+        Removes the table named ``name`` (case-insensitive) and returns it.
+
+        The lookup is O(1); removing it from the ordered list is O(n).
+        """
+        table = self.tables.lookup(name)
+        if table is not None:
+            self.tables.discard(table)
+        return table
         
     def to_dict(self):
         return {
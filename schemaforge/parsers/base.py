@@ -2,18 +2,69 @@ from abc import ABC, abstractmethod
 from schemaforge.models import Schema
 
 class BaseParser(ABC):
-    def __init__(self, strict: bool = False):
+    # True when the parser implements parse_fragment()/apply_fragment(),
+    # which lets schemaforge.cache store parse results per file.
+    supports_fragments = False
+
+    def __init__(self, strict: bool = False, jobs: int = 1):
         """
         Initialize parser.
-        
+
         Args:
             strict: If True, raise StrictModeError on unparseable statements.
                    If False, log warnings and continue (default behavior).
+            jobs: Number of worker processes used to parse statements.
+                  1 (default) parses in the current process.
         """
         self.strict = strict
-    
+        self.jobs = max(1, jobs or 1)
+
     @abstractmethod
     def parse(self, sql_content: str) -> Schema:
         """Parses SQL content and returns a Schema object."""
         pass
 
+    def parse_source(self, source) -> Schema:
+        """
+        Parses a schemaforge.source.SqlSource.
+
+        Parsers that can consume statements one at a time override this;
+        the default reads the whole source into a string.
+        """
+        return self.parse(source.read_text())
+
+    def parse_fragment(self, source) -> list:
+        """
+        Parses one file (a single-file SqlSource) into a picklable fragment.
+
+        A fragment is an ordered list of ``(op, payload)`` pairs. Objects that
+        stand on their own (tables, views, types, ...) are stored as model
+        objects; statements that modify objects defined elsewhere (ALTER,
+        COMMENT ON, CREATE INDEX ... ON) are stored parsed but unapplied as
+        ``('statement', payload)`` so apply_fragment() resolves them against
+        the merged schema exactly like a full parse.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support fragments")
+
+    def apply_fragment(self, fragment: list, schema: Schema) -> Schema:
+        """Merges a fragment from parse_fragment() into ``schema`` in order."""
+        for op, payload in fragment:
+            if op == 'add_table':
+                schema.add_table(payload)
+            elif op == 'statement':
+                self._apply_statement(payload, schema)
+            else:
+                # 'tables', 'custom_objects', 'types', 'domains', 'policies'
+                getattr(schema, op).append(payload)
+        return schema
+
+    def _apply_statement(self, payload, schema: Schema):
+        raise NotImplementedError
+
+    @staticmethod
+    def _fragment_ops(scratch: Schema, append_tables: bool = False) -> list:
+        """Converts objects collected in a scratch Schema into fragment ops."""
+        ops = [('tables' if append_tables else 'add_table', t) for t in scratch.tables]
+        for attr in ('custom_objects', 'types', 'domains', 'policies'):
+            ops.extend((attr, obj) for obj in getattr(scratch, attr))
+        return ops
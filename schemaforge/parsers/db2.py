@@ -3,54 +3,62 @@ from sqlglot import exp
 from schemaforge.models import Table, Column, Schema, Index
 import re
 
+# z/OS storage attributes of a CREATE TABLE statement
+_STOGROUP = re.compile(r'USING\s+STOGROUP\s+([a-zA-Z0-9_"]+)', re.IGNORECASE)
+_PRIQTY = re.compile(r'PRIQTY\s+(\d+)', re.IGNORECASE)
+_SECQTY = re.compile(r'SECQTY\s+(\d+)', re.IGNORECASE)
+_AUDIT = re.compile(r'AUDIT\s+(NONE|CHANGES|ALL)', re.IGNORECASE)
+_CCSID = re.compile(r'CCSID\s+(EBCDIC|ASCII|UNICODE)', re.IGNORECASE)
+_IN_TABLESPACE = re.compile(r'\sIN\s+(?:DATABASE\s+)?([a-zA-Z0-9_".]+)', re.IGNORECASE)
+
 class DB2Parser(SqlglotParser):
-    def __init__(self, strict=False):
+    def __init__(self, strict=False, jobs=1):
         # sqlglot doesn't have a specific 'db2' dialect shorthand in 28.x Dialect.classes
         # We use generic parsing (None) as a base
-        super().__init__(dialect=None, strict=strict)
+        super().__init__(dialect=None, strict=strict, jobs=jobs)
 
     def _extract_create_table(self, expression):
         table = super()._extract_create_table(expression)
         if table:
-            # self.raw_content is stored by parse()
-            self._process_db2_properties(self.raw_content, table)
+            # Only the table's own CREATE statement carries its z/OS attributes
+            self._process_db2_properties(self.current_statement or expression.sql(), table)
         return table
 
     def _post_process_table(self, table, expression):
         # Called for Command fallbacks
-        self._process_db2_properties(self.raw_content, table)
+        self._process_db2_properties(self.current_statement or expression.sql(), table)
 
     def _process_db2_properties(self, stmt_str, table):
         # Normalize whitespace for easier regex matching
         normalized_stmt = " ".join(stmt_str.split())
         
         # STOGROUP
-        match_sto = re.search(r'USING\s+STOGROUP\s+([a-zA-Z0-9_"]+)', normalized_stmt, re.IGNORECASE)
+        match_sto = _STOGROUP.search(normalized_stmt)
         if match_sto:
             table.stogroup = match_sto.group(1).replace('"', '').lower()
             
         # PRIQTY
-        match_pri = re.search(r'PRIQTY\s+(\d+)', normalized_stmt, re.IGNORECASE)
+        match_pri = _PRIQTY.search(normalized_stmt)
         if match_pri:
             table.priqty = int(match_pri.group(1))
             
         # SECQTY
-        match_sec = re.search(r'SECQTY\s+(\d+)', normalized_stmt, re.IGNORECASE)
+        match_sec = _SECQTY.search(normalized_stmt)
         if match_sec:
             table.secqty = int(match_sec.group(1))
             
         # AUDIT
-        match_audit = re.search(r'AUDIT\s+(NONE|CHANGES|ALL)', normalized_stmt, re.IGNORECASE)
+        match_audit = _AUDIT.search(normalized_stmt)
         if match_audit:
             table.audit = match_audit.group(1).lower()
             
         # CCSID
-        match_ccsid = re.search(r'CCSID\s+(EBCDIC|ASCII|UNICODE)', normalized_stmt, re.IGNORECASE)
+        match_ccsid = _CCSID.search(normalized_stmt)
         if match_ccsid:
             table.ccsid = match_ccsid.group(1).lower()
 
         # IN clause (DB.TS)
-        match_in = re.search(r'\sIN\s+(?:DATABASE\s+)?([a-zA-Z0-9_".]+)', normalized_stmt, re.IGNORECASE)
+        match_in = _IN_TABLESPACE.search(normalized_stmt)
         if match_in:
             val = match_in.group(1).replace('"', '')
             if '.' in val:
@@ -4,73 +4,117 @@ from sqlparse.tokens import Keyword, DML, DDL
 from typing import List, Optional
 from schemaforge.models import Schema, Table, Column, Index, ForeignKey
 from schemaforge.parsers.base import BaseParser
+from schemaforge import profiling
 
 class GenericSQLParser(BaseParser):
+    # Maps a line of the parsed text to file:line while parse_source() runs
+    _locate = None
+
     def parse(self, sql_content: str) -> Schema:
         # Preprocess to strip nested comments which sqlparse doesn't handle well
-        sql_content = self._strip_comments(sql_content)
+        with profiling.phase("preprocess"):
+            sql_content = self._strip_comments(sql_content)
         
         schema = Schema()
-        parsed = sqlparse.parse(sql_content)
+        profiler = profiling.active()
+        if profiler is not None and profiler.slow_statements:
+            self._parse_timed(profiler, sql_content, lambda statement: self._apply_parsed(statement, schema))
+            return schema
+
+        with profiling.phase("sqlparse.parse"):
+            parsed = sqlparse.parse(sql_content)
+        profiling.count_statements(parsed)
         
+        for statement in parsed:
+            self._apply_parsed(statement, schema)
+
+        return schema
+
+    def parse_source(self, source) -> Schema:
+        self._locate = source.locate
+        try:
+            return self.parse(source.read_text())
+        finally:
+            self._locate = None
+
+    def _parse_timed(self, profiler, sql_content: str, apply):
+        """
+        Parses and applies statements one at a time with sqlparse.parsestream
+        for --slow-statements, recording each statement's cost and line.
+        """
+        line = 1
+        stream = sqlparse.parsestream(sql_content)
+        while True:
+            start = profiler.statement_start()
+            statement = next(stream, None)
+            if statement is None:
+                return
+            apply(statement)
+            text = str(statement)
+            if text and not text.isspace():
+                profiler.count(f"statements.{statement.get_type()}")
+                at = line + text.count('\n', 0, profiling.code_start(text))
+                location = self._locate(at) if self._locate else f"line {at}"
+                profiler.statement_done(start, text, location)
+            line += text.count('\n')
+
+    def _apply_parsed(self, statement, schema: Schema):
+        """Adds what one sqlparse statement defines to ``schema``."""
         import logging
         logger = logging.getLogger('schemaforge')
         
         # Import StrictModeError for strict mode handling
         from schemaforge.exceptions import StrictModeError
         
-        for statement in parsed:
-            processed = False
-            stmt_type = statement.get_type()
-            if stmt_type == 'CREATE':
-                # Check if it is CREATE TABLE or CREATE INDEX
-                # Filter out whitespace AND comments to find the real keywords
-                token_list = [t for t in statement.tokens if not t.is_whitespace and not isinstance(t, sqlparse.sql.Comment)]
-                
-                # token_list[0] should be CREATE
-                if len(token_list) > 1 and token_list[1].value.upper() == 'TABLE':
-                    table = self._extract_create_table(statement)
-                    if table:
-                        schema.add_table(table)
-                        processed = True
-                elif len(token_list) > 1 and token_list[1].value.upper() == 'INDEX':
-                    self._extract_create_index(statement, schema)
-                    processed = True
-                elif len(token_list) > 2 and token_list[1].value.upper() == 'UNIQUE' and token_list[2].value.upper() == 'INDEX':
-                     self._extract_create_index(statement, schema, is_unique=True)
-                     processed = True
+        processed = False
+        stmt_type = statement.get_type()
+        if stmt_type == 'CREATE':
+            # Check if it is CREATE TABLE or CREATE INDEX
+            # Filter out whitespace AND comments to find the real keywords
+            token_list = [t for t in statement.tokens if not t.is_whitespace and not isinstance(t, sqlparse.sql.Comment)]
             
-            elif stmt_type == 'ALTER':
-                self._process_alter(statement)
+            # token_list[0] should be CREATE
+            if len(token_list) > 1 and token_list[1].value.upper() == 'TABLE':
+                table = self._extract_create_table(statement)
+                if table:
+                    schema.add_table(table)
+                    processed = True
+            elif len(token_list) > 1 and token_list[1].value.upper() == 'INDEX':
+                self._extract_create_index(statement, schema)
                 processed = True
+            elif len(token_list) > 2 and token_list[1].value.upper() == 'UNIQUE' and token_list[2].value.upper() == 'INDEX':
+                 self._extract_create_index(statement, schema, is_unique=True)
+                 processed = True
+        
+        elif stmt_type == 'ALTER':
+            self._process_alter(statement)
+            processed = True
+        
+        elif stmt_type == 'UNKNOWN':
+             # Handle COMMENT ON (sqlparse might return UNKNOWN or just handle keywords)
+             # Actually sqlparse often treats COMMENT ON as valid statement but maybe not a type it recognizes easily
+             first_token = statement.token_first()
+             if first_token and first_token.value.upper() == 'COMMENT':
+                 self._process_comment(statement, schema)
+                 
+        if not processed:
+            stmt_str = str(statement).strip()
+            # Check for meaningful content (not just comments/whitespace)
+            has_content = any(not (t.is_whitespace or isinstance(t, sqlparse.sql.Comment)) for t in statement.tokens)
+            if not has_content: return
             
-            elif stmt_type == 'UNKNOWN':
-                 # Handle COMMENT ON (sqlparse might return UNKNOWN or just handle keywords)
-                 # Actually sqlparse often treats COMMENT ON as valid statement but maybe not a type it recognizes easily
-                 first_token = statement.token_first()
-                 if first_token and first_token.value.upper() == 'COMMENT':
-                     self._process_comment(statement, schema)
-                     
-            if not processed:
-                stmt_str = str(statement).strip()
-                # Check for meaningful content (not just comments/whitespace)
-                has_content = any(not (t.is_whitespace or isinstance(t, sqlparse.sql.Comment)) for t in statement.tokens)
-                if not has_content: continue
-                
-                upper_stmt = stmt_str.upper()
-                if any(upper_stmt.startswith(k) for k in ('SET', 'USE', 'GRANT', 'REVOKE', 'COMMIT', 'ROLLBACK', 'PRAGMA', 'BEGIN', 'END')):
-                     continue
-                     
-                if upper_stmt.startswith('CREATE'):
-                    if self.strict:
-                        raise StrictModeError(stmt_str, "Failed to parse CREATE statement")
-                    logger.error(f"Failed to parse statement: {stmt_str[:100]}...")
-                else:
-                    if self.strict:
-                        raise StrictModeError(stmt_str, "Unrecognized statement type")
-                    logger.warning(f"Ignored statement (not CREATE/COMMENT): {stmt_str[:50]}...")
-
-        return schema
+            upper_stmt = stmt_str.upper()
+            if any(upper_stmt.startswith(k) for k in ('SET', 'USE', 'GRANT', 'REVOKE', 'COMMIT', 'ROLLBACK', 'PRAGMA', 'BEGIN', 'END')):
+                 return
+                 
+            if upper_stmt.startswith('CREATE'):
+                if self.strict:
+                    raise StrictModeError(stmt_str, "Failed to parse CREATE statement")
+                logger.error(f"Failed to parse statement: {stmt_str[:100]}...")
+            else:
+                if self.strict:
+                    raise StrictModeError(stmt_str, "Unrecognized statement type")
+                logger.warning(f"Ignored statement (not CREATE/COMMENT): {stmt_str[:50]}...")
 
     def _extract_create_index(self, statement, schema: Schema, is_unique: bool = False):
         # CREATE [UNIQUE] INDEX index_name ON table_name (col1, col2)
@@ -898,6 +942,9 @@ class GenericSQLParser(BaseParser):
                     continue
                 
             if nesting > 0:
+                # Line breaks are kept so statement line numbers still match the source
+                if char == '\n':
+                    result.append(char)
                 i += 1
                 continue
                 
@@ -1,13 +1,17 @@
+import re
 from schemaforge.parsers.sqlglot_adapter import SqlglotParser
+from schemaforge.parsers.rewrite import RewriteRule
 
 class MSSQLParser(SqlglotParser):
-    def __init__(self, strict=False):
-        super().__init__(dialect='tsql', strict=strict)
+    batch_separator = True
 
-    def _preprocess(self, content: str) -> str:
-        import re
-        # Replace standalone GO statements with semicolon
-        return re.sub(r'^\s*GO\s*$', ';', content, flags=re.MULTILINE | re.IGNORECASE)
+    # Replace standalone GO statements with semicolon
+    rewrite_rules = (
+        RewriteRule('go_separator', r'^\s*GO\s*$', ';', flags=re.MULTILINE | re.IGNORECASE),
+    )
+
+    def __init__(self, strict=False, jobs=1):
+        super().__init__(dialect='tsql', strict=strict, jobs=jobs)
 
     def _clean_type(self, data_type: str) -> str:
         dt = data_type.upper()
@@ -1,8 +1,10 @@
 from schemaforge.parsers.sqlglot_adapter import SqlglotParser
 
 class MySQLParser(SqlglotParser):
-    def __init__(self, strict=False):
-        super().__init__(dialect='mysql', strict=strict)
+    backslash_escapes = True
+
+    def __init__(self, strict=False, jobs=1):
+        super().__init__(dialect='mysql', strict=strict, jobs=jobs)
     
     def _process_property(self, prop, table):
         from sqlglot import exp
@@ -1,9 +1,19 @@
 from schemaforge.parsers.sqlglot_adapter import SqlglotParser
+from schemaforge.parsers.rewrite import RewriteRule
 import re
 
 class OracleParser(SqlglotParser):
-    def __init__(self, strict=False):
-        super().__init__(dialect='oracle', strict=strict)
+    # Strip problematic Oracle-specific keywords that cause sqlglot to flip to Command.
+    # The values are re-read from the raw statement in _extract_create_table.
+    rewrite_rules = (
+        RewriteRule('organization_index', r'\s+ORGANIZATION\s+INDEX'),
+        RewriteRule('pctfree', r'\s+PCTFREE\s+\d+'),
+        RewriteRule('storage', r'\s+STORAGE\s*\(.*?\)', flags=re.IGNORECASE | re.DOTALL),
+        RewriteRule('tablespace', r'\s+TABLESPACE\s+[^\s;]+'),
+    ) + SqlglotParser.rewrite_rules
+
+    def __init__(self, strict=False, jobs=1):
+        super().__init__(dialect='oracle', strict=strict, jobs=jobs)
 
     def parse(self, content: str):
         # Clean-the-Parse strategy for Oracle
@@ -13,30 +23,14 @@ class OracleParser(SqlglotParser):
         # We'll use a local parse loop instead
         return super().parse(content)
 
-    def _preprocess(self, content: str) -> str:
-        # Strip problematic Oracle-specific keywords that cause sqlglot to flip to Command
-        orig_content = content
-        
-        # Capture and strip
-        # Note: We don't store them here because preprocess doesn't know which table is which easily
-        # But we'll rely on parse() catch them or re-regex them in _extract_create_table
-        
-        content = re.sub(r'\s+ORGANIZATION\s+INDEX', '', content, flags=re.IGNORECASE)
-        content = re.sub(r'\s+PCTFREE\s+\d+', '', content, flags=re.IGNORECASE)
-        content = re.sub(r'\s+STORAGE\s*\(.*?\)', '', content, flags=re.IGNORECASE | re.DOTALL)
-        content = re.sub(r'\s+TABLESPACE\s+[^\s;]+', '', content, flags=re.IGNORECASE)
-        
-        return super()._preprocess(content)
-
     def _extract_create_table(self, expression):
         table = super()._extract_create_table(expression)
-        if table and hasattr(self, 'raw_content'):
-             # Find the CREATE TABLE statement for THIS table in the raw content
-             # This is a bit complex in a multi-table file, but we can search for 
-             # CREATE TABLE table_name followed by its properties.
+        if table and self.current_statement:
+             # Properties stripped by the rewrite rules are re-read from the
+             # raw text of the table's own CREATE TABLE statement
              clean_name = table.name.replace('"', '').replace('`', '').strip()
-             pattern = rf'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:["`]?\w+["`]?\.)?["`]?{re.escape(clean_name)}["`]?.*?;'
-             match = re.search(pattern, self.raw_content, re.IGNORECASE | re.DOTALL)
+             pattern = rf'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:["`]?\w+["`]?\.)?["`]?{re.escape(clean_name)}["`]?.*?(?:;|\Z)'
+             match = re.search(pattern, self.current_statement, re.IGNORECASE | re.DOTALL)
              if match:
                   stmt = match.group(0)
                   if re.search('ORGANIZATION INDEX', stmt, re.IGNORECASE):
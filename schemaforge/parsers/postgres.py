@@ -1,8 +1,8 @@
 from schemaforge.parsers.sqlglot_adapter import SqlglotParser
 
 class PostgresParser(SqlglotParser):
-    def __init__(self, strict=False):
-        super().__init__(dialect='postgres', strict=strict)
+    def __init__(self, strict=False, jobs=1):
+        super().__init__(dialect='postgres', strict=strict, jobs=jobs)
 
     def _process_property(self, prop, table):
         from sqlglot import exp
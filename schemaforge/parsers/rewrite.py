@@ -0,0 +1,117 @@
+"""
+Single-pass SQL rewrite engine.
+
+Dialect parsers register ``RewriteRule``s that strip or normalize syntax
+sqlglot cannot handle. All rules of a parser are compiled into one
+alternation together with "skip" tokens (string literals, quoted
+identifiers, dollar-quoted bodies and comments), so the text is scanned
+once and nothing inside a literal or comment is ever rewritten.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+
+class RewriteRule(NamedTuple):
+    """
+    A regex rewrite applied during preprocessing.
+
+    Attributes:
+        name: Identifier used in rewrite counts.
+        pattern: Regular expression. Numbered groups may be referenced from
+            ``replacement``; backreferences inside the pattern are not
+            supported.
+        replacement: ``re.sub`` style template or a callable taking the match.
+        flags: ``re`` flags scoped to this rule (IGNORECASE by default).
+        dialects: Only apply for these sqlglot dialects (None = all).
+    """
+    name: str
+    pattern: str
+    replacement: Union[str, Callable] = ''
+    flags: int = re.IGNORECASE
+    dialects: Optional[Tuple[str, ...]] = None
+
+
+# Tokens whose content must never be rewritten. Tried before any rule.
+_SKIP_PATTERNS = (
+    r"--[^\n]*",
+    r"(?s:/\*.*?(?:\*/|\Z))",
+    r"(?s:(?<![\w$])\$(?P<_dq>(?:[A-Za-z_][A-Za-z0-9_]*)?)\$.*?(?:\$(?P=_dq)\$|\Z))",
+    r'"(?:[^"]|"")*(?:"|\Z)',
+    r"`(?:[^`]|``)*(?:`|\Z)",
+)
+_SQUOTE = r"'(?:[^']|'')*(?:'|\Z)"
+_SQUOTE_BACKSLASH = r"'(?:[^'\\]|\\.|'')*(?:'|\Z)"
+
+_FLAG_LETTERS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+
+def _scoped(pattern: str, flags: int) -> str:
+    letters = ''.join(letter for flag, letter in _FLAG_LETTERS if flags & flag)
+    return f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+
+
+class RewriteEngine:
+    """
+    Applies a set of RewriteRules in one scan.
+
+    At every position the skip tokens are tried first, then the rules in
+    registration order; the first alternative that matches wins, exactly
+    like a single ``re.sub`` over the combined pattern.
+    """
+
+    def __init__(self, rules, backslash_escapes: bool = False):
+        self.rules = tuple(rules)
+        self._compiled = [re.compile(rule.pattern, rule.flags) for rule in self.rules]
+
+        skip = _SKIP_PATTERNS + ((_SQUOTE_BACKSLASH if backslash_escapes else _SQUOTE),)
+        alternatives = [f"(?P<_skip>{'|'.join(skip)})"]
+        for i, rule in enumerate(self.rules):
+            alternatives.append(f"(?P<r{i}>{_scoped(rule.pattern, rule.flags)})")
+        self._scanner = re.compile('|'.join(alternatives))
+
+    def rewrite(self, text: str, counts: Optional[Dict[str, int]] = None) -> str:
+        """
+        Returns ``text`` with every rule applied.
+
+        If ``counts`` is given, it is updated with the number of rewrites
+        per rule name.
+        """
+        if not self.rules:
+            return text
+
+        pieces = []
+        last = 0
+        for match in self._scanner.finditer(text):
+            group = match.lastgroup
+            if group == '_skip' or group is None:
+                continue
+            index = int(group[1:])
+            rule = self.rules[index]
+            # Re-match with the rule's own regex so its group numbers apply
+            rule_match = self._compiled[index].match(text, match.start())
+            if rule_match is None or rule_match.end() != match.end():
+                continue
+            if callable(rule.replacement):
+                replacement = rule.replacement(rule_match)
+            else:
+                replacement = rule_match.expand(rule.replacement)
+            pieces.append(text[last:match.start()])
+            pieces.append(replacement)
+            last = match.end()
+            if counts is not None:
+                counts[rule.name] = counts.get(rule.name, 0) + 1
+
+        if not pieces:
+            return text
+        pieces.append(text[last:])
+        return ''.join(pieces)
+
+
+@lru_cache(maxsize=None)
+def get_rewrite_engine(rules: Tuple[RewriteRule, ...], dialect: Optional[str] = None,
+                       backslash_escapes: bool = False) -> RewriteEngine:
+    """Returns a compiled engine for the rules that apply to ``dialect``."""
+    active = tuple(rule for rule in rules if rule.dialects is None or dialect in rule.dialects)
+    return RewriteEngine(active, backslash_escapes=backslash_escapes)
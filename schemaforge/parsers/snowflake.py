@@ -3,12 +3,15 @@ from schemaforge.parsers.generic_sql import GenericSQLParser
 from schemaforge.models import Schema, Table, Column, CustomObject
 from schemaforge.parsers.base import BaseParser
 from schemaforge.parsers.utils import normalize_sql
+from schemaforge import profiling
 import sqlparse
 from sqlparse.sql import Statement, Token
 from sqlparse.tokens import Keyword, DML, DDL, Name
 import sys
 
 class SnowflakeParser(GenericSQLParser):
+    supports_fragments = True
+
     def _get_next_token(self, tokens, start_idx):
         for i in range(start_idx, len(tokens)):
             if not tokens[i].is_whitespace:
@@ -25,60 +28,110 @@ class SnowflakeParser(GenericSQLParser):
     def parse(self, sql_content):
         self.schema = Schema()
         # Pre-process using parent method (strips comments)
-        sql_content = self._strip_comments(sql_content)
+        with profiling.phase("preprocess"):
+            sql_content = self._strip_comments(sql_content)
         
-        parsed = sqlparse.parse(sql_content)
+        profiler = profiling.active()
+        if profiler is not None and profiler.slow_statements:
+            self._parse_timed(profiler, sql_content, self._process_statement)
+            return self.schema
+
+        with profiling.phase("sqlparse.parse"):
+            parsed = sqlparse.parse(sql_content)
         
-        for statement in parsed:
-            stmt_upper = str(statement).upper()
-            
-            if statement.get_type() in ('CREATE', 'CREATE OR REPLACE'):
+        with profiling.phase("apply"):
+            for statement in parsed:
+                self._process_statement(statement)
+        profiling.count_statements(parsed)
+                    
+        return self.schema
+
+    def parse_fragment(self, source):
+        fragment = []
+
+        def add(statement):
+            if self._is_alter(statement):
+                # ALTER TABLE may target a table from another file
+                fragment.append(('statement', statement))
+            else:
+                self.schema = Schema()
+                self._process_statement(statement)
+                fragment.extend(self._fragment_ops(self.schema))
+
+        self._locate = source.locate
+        try:
+            sql_content = self._strip_comments(source.read_text())
+            profiler = profiling.active()
+            if profiler is not None and profiler.slow_statements:
+                self._parse_timed(profiler, sql_content, add)
+            else:
+                for statement in sqlparse.parse(sql_content):
+                    add(statement)
+        finally:
+            self._locate = None
+        return fragment
+
+    def _apply_statement(self, statement, schema):
+        self.schema = schema
+        self._process_statement(statement)
+
+    def _is_alter(self, statement):
+        first_token = statement.token_first()
+        return statement.get_type() == 'ALTER' or bool(first_token and first_token.value.upper() == 'ALTER')
+
+    def _stable_name(self, prefix, stmt_upper):
+        # hash() is salted per process; names must match across runs and the parse cache
+        import hashlib
+        return f"{prefix}_{hashlib.sha1(stmt_upper.encode('utf-8')).hexdigest()[:16]}"
+
+    def _process_statement(self, statement):
+        stmt_upper = str(statement).upper()
+        
+        if statement.get_type() in ('CREATE', 'CREATE OR REPLACE'):
+            self._process_create(statement)
+        elif statement.get_type() == 'ALTER':
+            self._process_alter(statement)
+        elif 'COMMENT ON' in stmt_upper:
+            # Handle COMMENT ON DATABASE/TABLE/etc
+            self.schema.custom_objects.append(CustomObject(
+                obj_type='COMMENT',
+                name=str(statement).strip(),
+                properties={'raw_sql': str(statement)}
+            ))
+        elif statement.get_type() == 'UNKNOWN':
+            # sqlparse might not recognize some Snowflake commands as CREATE
+            # Check first token
+            first_token = statement.token_first()
+            if first_token and first_token.match(DDL, 'CREATE'):
                 self._process_create(statement)
-            elif statement.get_type() == 'ALTER':
+            elif first_token and first_token.match(DDL, 'ALTER'):
                 self._process_alter(statement)
-            elif 'COMMENT ON' in stmt_upper:
-                # Handle COMMENT ON DATABASE/TABLE/etc
-                self.schema.custom_objects.append(CustomObject(
-                    obj_type='COMMENT',
-                    name=str(statement).strip(),
-                    properties={'raw_sql': str(statement)}
-                ))
-            elif statement.get_type() == 'UNKNOWN':
-                # sqlparse might not recognize some Snowflake commands as CREATE
-                # Check first token
-                first_token = statement.token_first()
-                if first_token and first_token.match(DDL, 'CREATE'):
-                    self._process_create(statement)
-                elif first_token and first_token.match(DDL, 'ALTER'):
-                    self._process_alter(statement)
-                # Also check if it starts with CREATE but sqlparse missed it (e.g. CREATE OR REPLACE)
-                elif first_token and first_token.value.upper() == 'CREATE':
-                     self._process_create(statement)
-                elif first_token and first_token.value.upper() == 'ALTER':
-                     self._process_alter(statement)
-                elif first_token and first_token.value.upper() in ('GRANT', 'REVOKE'):
-                     self._process_grant_revoke(statement)
-                elif first_token and first_token.value.upper() == 'UNDROP':
-                     # Handle UNDROP
-                     obj_name = f"undrop_{hash(stmt_upper)}"
-                     self.schema.custom_objects.append(CustomObject(
-                        name=obj_name,
-                        obj_type='UNDROP_OPERATION',
-                        properties={'raw_sql': str(statement)}
-                     ))
-            elif stmt_upper.startswith('UNDROP'):
-                 # Handle UNDROP if type is not UNKNOWN but sqlparse didn't categorize as CREATE/ALTER
-                 obj_name = f"undrop_{hash(stmt_upper)}"
+            # Also check if it starts with CREATE but sqlparse missed it (e.g. CREATE OR REPLACE)
+            elif first_token and first_token.value.upper() == 'CREATE':
+                 self._process_create(statement)
+            elif first_token and first_token.value.upper() == 'ALTER':
+                 self._process_alter(statement)
+            elif first_token and first_token.value.upper() in ('GRANT', 'REVOKE'):
+                 self._process_grant_revoke(statement)
+            elif first_token and first_token.value.upper() == 'UNDROP':
+                 # Handle UNDROP
+                 obj_name = self._stable_name("undrop", stmt_upper)
                  self.schema.custom_objects.append(CustomObject(
                     name=obj_name,
                     obj_type='UNDROP_OPERATION',
                     properties={'raw_sql': str(statement)}
                  ))
-            
-            elif statement.get_type() in ('GRANT', 'REVOKE'):
-                self._process_grant_revoke(statement)
-                    
-        return self.schema
+        elif stmt_upper.startswith('UNDROP'):
+             # Handle UNDROP if type is not UNKNOWN but sqlparse didn't categorize as CREATE/ALTER
+             obj_name = self._stable_name("undrop", stmt_upper)
+             self.schema.custom_objects.append(CustomObject(
+                name=obj_name,
+                obj_type='UNDROP_OPERATION',
+                properties={'raw_sql': str(statement)}
+             ))
+        
+        elif statement.get_type() in ('GRANT', 'REVOKE'):
+            self._process_grant_revoke(statement)
 
     def _process_grant_revoke(self, statement):
         # Parse GRANT/REVOKE as CustomObject
@@ -477,7 +530,7 @@ class SnowflakeParser(GenericSQLParser):
 
         # Check for ALTER PIPE
         if 'ALTER PIPE' in stmt_upper:
-             obj_name = f"alter_pipe_{hash(stmt_upper)}"
+             obj_name = self._stable_name("alter_pipe", stmt_upper)
              self.schema.custom_objects.append(CustomObject(
                 name=obj_name,
                 obj_type='ALTER_PIPE',
@@ -487,7 +540,7 @@ class SnowflakeParser(GenericSQLParser):
 
         # Check for ALTER FILE FORMAT
         if 'ALTER FILE FORMAT' in stmt_upper:
-             obj_name = f"alter_ff_{hash(stmt_upper)}"
+             obj_name = self._stable_name("alter_ff", stmt_upper)
              self.schema.custom_objects.append(CustomObject(
                 name=obj_name,
                 obj_type='ALTER_FILE_FORMAT',
@@ -508,7 +561,7 @@ class SnowflakeParser(GenericSQLParser):
         if 'SWAP WITH' in stmt_upper:
             # For now, just capture the whole statement as a CustomObject
             # This is simpler and sufficient for the diff engine
-            obj_name = f"swap_{hash(stmt_upper)}"
+            obj_name = self._stable_name("swap", stmt_upper)
             self.schema.custom_objects.append(CustomObject(
                 name=obj_name,
                 obj_type='SWAP_OPERATION',
@@ -518,7 +571,7 @@ class SnowflakeParser(GenericSQLParser):
 
         # Check for UNDROP TABLE
         if 'UNDROP TABLE' in stmt_upper:
-             obj_name = f"undrop_{hash(stmt_upper)}"
+             obj_name = self._stable_name("undrop", stmt_upper)
              self.schema.custom_objects.append(CustomObject(
                 name=obj_name,
                 obj_type='UNDROP_OPERATION',
@@ -528,7 +581,7 @@ class SnowflakeParser(GenericSQLParser):
 
         # Check for ALTER PIPE
         if stmt_upper.startswith('ALTER PIPE'):
-             obj_name = f"alter_pipe_{hash(stmt_upper)}"
+             obj_name = self._stable_name("alter_pipe", stmt_upper)
              self.schema.custom_objects.append(CustomObject(
                 name=obj_name,
                 obj_type='ALTER_PIPE',
@@ -538,7 +591,7 @@ class SnowflakeParser(GenericSQLParser):
 
         # Check for ALTER FILE FORMAT
         if stmt_upper.startswith('ALTER FILE FORMAT'):
-             obj_name = f"alter_ff_{hash(stmt_upper)}"
+             obj_name = self._stable_name("alter_ff", stmt_upper)
              self.schema.custom_objects.append(CustomObject(
                 name=obj_name,
                 obj_type='ALTER_FILE_FORMAT',
@@ -0,0 +1,161 @@
+"""
+Statement splitting front end.
+
+Cuts SQL text at top-level ``;`` boundaries while keeping string literals,
+quoted identifiers, dollar-quoted bodies (``$$ ... $$`` / ``$tag$ ... $tag$``)
+and (nested) comments intact. Works on ``str`` as well as on bytes-like
+buffers such as ``bytes`` or ``mmap`` objects, so large files can be split
+without decoding them as a whole.
+"""
+
+import re
+from typing import Iterator, List, Tuple, Union
+
+Buffer = Union[str, bytes, bytearray, memoryview]
+
+# Alternation of every token that changes the scanner state. Dollar quotes
+# must not be preceded by an identifier character (Oracle ``V$SESSION``).
+_TOKEN_PATTERN = r"""
+    (?P<semi>;)
+  | (?P<line>--)
+  | (?P<block>/\*)
+  | (?P<squote>')
+  | (?P<dquote>")
+  | (?P<btick>`)
+  | (?P<dollar>(?<![\w$])\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$)
+"""
+
+# MSSQL batch separator: a line that only contains GO
+_GO_PATTERN = r"""
+  | (?P<go>(?im:^[ \t]*GO[ \t]*\r?$))
+"""
+
+_SCANNERS = {}
+
+
+def _get_scanner(is_bytes: bool, batch_separator: bool):
+    key = (is_bytes, batch_separator)
+    scanner = _SCANNERS.get(key)
+    if scanner is None:
+        pattern = _TOKEN_PATTERN + (_GO_PATTERN if batch_separator else "")
+        if is_bytes:
+            scanner = re.compile(pattern.encode('ascii'), re.VERBOSE)
+        else:
+            scanner = re.compile(pattern, re.VERBOSE)
+        _SCANNERS[key] = scanner
+    return scanner
+
+
+def _find_quote_end(buf: Buffer, quote, pos: int, backslash_escapes: bool, backslash) -> int:
+    """Returns the offset just past the closing quote (or len(buf))."""
+    n = len(buf)
+    while True:
+        end = buf.find(quote, pos)
+        if end == -1:
+            return n
+        if backslash_escapes:
+            # Count preceding backslashes; an odd number escapes the quote
+            k = end - 1
+            slashes = 0
+            while k >= pos and buf[k:k + 1] == backslash:
+                slashes += 1
+                k -= 1
+            if slashes % 2 == 1:
+                pos = end + 1
+                continue
+        # Doubled quote ('' or "") is an escaped quote
+        if buf[end + 1:end + 2] == quote:
+            pos = end + 2
+            continue
+        return end + 1
+
+
+def _find_block_comment_end(buf: Buffer, pos: int, opener, closer) -> int:
+    """Returns the offset just past the matching ``*/`` honoring nesting."""
+    depth = 1
+    n = len(buf)
+    while depth:
+        close = buf.find(closer, pos)
+        if close == -1:
+            return n
+        nested = buf.find(opener, pos, close)
+        if nested != -1:
+            depth += 1
+            pos = nested + 2
+        else:
+            depth -= 1
+            pos = close + 2
+    return pos
+
+
+def iter_statement_spans(buf: Buffer, batch_separator: bool = False,
+                         backslash_escapes: bool = False) -> Iterator[Tuple[int, int]]:
+    """
+    Yields ``(start, end)`` offsets of each top-level statement in ``buf``.
+
+    Spans are contiguous: every statement includes its terminating ``;`` and
+    the next span starts right after it. The trailing remainder after the
+    last separator is yielded as well. A ``GO`` batch separator (when
+    enabled) ends the current statement and is itself excluded.
+
+    Args:
+        buf: SQL text as ``str`` or a bytes-like object (``bytes``, ``mmap``).
+        batch_separator: Treat lines consisting of ``GO`` as separators (T-SQL).
+        backslash_escapes: Treat ``\\'`` inside string literals as an escaped
+            quote (MySQL).
+    """
+    is_bytes = not isinstance(buf, str)
+    scanner = _get_scanner(is_bytes, batch_separator)
+    if is_bytes:
+        newline, block_open, block_close, backslash = b'\n', b'/*', b'*/', b'\\'
+        quotes = {'squote': b"'", 'dquote': b'"', 'btick': b'`'}
+    else:
+        newline, block_open, block_close, backslash = '\n', '/*', '*/', '\\'
+        quotes = {'squote': "'", 'dquote': '"', 'btick': '`'}
+
+    n = len(buf)
+    start = 0
+    pos = 0
+    while pos < n:
+        match = scanner.search(buf, pos)
+        if match is None:
+            break
+        kind = match.lastgroup
+        if kind == 'semi':
+            end = match.end()
+            yield start, end
+            start = pos = end
+        elif kind == 'go':
+            yield start, match.start()
+            start = pos = match.end()
+        elif kind == 'line':
+            eol = buf.find(newline, match.end())
+            pos = n if eol == -1 else eol
+        elif kind == 'block':
+            pos = _find_block_comment_end(buf, match.end(), block_open, block_close)
+        elif kind == 'dollar':
+            tag = match.group(kind)
+            close = buf.find(tag, match.end())
+            pos = n if close == -1 else close + len(tag)
+        else:
+            pos = _find_quote_end(buf, quotes[kind], match.end(),
+                                  backslash_escapes and kind == 'squote', backslash)
+
+    if start < n:
+        yield start, n
+
+
+def split_statements(content: str, batch_separator: bool = False,
+                     backslash_escapes: bool = False) -> List[str]:
+    """
+    Splits SQL text into statements at top-level ``;`` boundaries.
+
+    Blank chunks are dropped; each returned statement keeps its
+    terminating ``;`` and any surrounding comments.
+    """
+    statements = []
+    for start, end in iter_statement_spans(content, batch_separator, backslash_escapes):
+        chunk = content[start:end]
+        if chunk.strip():
+            statements.append(chunk)
+    return statements
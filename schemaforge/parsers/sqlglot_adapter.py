@@ -1,50 +1,82 @@
-from typing import Optional, List, Dict
+import re
+import time
+from itertools import chain, islice
+from typing import Optional, Iterator, List, Dict, Tuple
 import sqlglot
 from sqlglot import exp
 from schemaforge.models import Table, Column, Index, ForeignKey, CheckConstraint, CustomObject
 from schemaforge.parsers.base import BaseParser
+from schemaforge.parsers.rewrite import RewriteRule, get_rewrite_engine
 from schemaforge.logging_config import get_logger
 from schemaforge.models import Schema
+from schemaforge import profiling
+from schemaforge.source import iter_statements
+
+# Below this many statements a process pool costs more than it saves
+PARALLEL_MIN_STATEMENTS = 200
+# Statements per task sent to a pool worker
+PARALLEL_BATCH_SIZE = 50
+
+# Table options that sqlglot drops, detected per statement (SQLite)
+_CREATE_TABLE_NAME = re.compile(r'CREATE\s+(?:TEMP\s+|TEMPORARY\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([^\s(]+)', re.IGNORECASE)
+_WITHOUT_ROWID_OPTION = re.compile(r'\)\s*(?:STRICT\s*,\s*)?WITHOUT\s+ROWID\b', re.IGNORECASE)
+_STRICT_OPTION = re.compile(r'\)\s*(?:WITHOUT\s+ROWID\s*,\s*)?STRICT\b', re.IGNORECASE)
+
+
+def _parse_batch(dialect: Optional[str], error_level, chunks: List[str]) -> List[Tuple[list, Optional[str]]]:
+    """
+    Parses preprocessed statement chunks with sqlglot.
+
+    Module level so it can run in a ProcessPoolExecutor worker. Returns one
+    ``(expressions, error)`` pair per chunk; ``error`` is None on success.
+    """
+    results = []
+    for chunk in chunks:
+        try:
+            results.append((sqlglot.parse(chunk, read=dialect, error_level=error_level), None))
+        except Exception as e:
+            results.append(([], str(e)))
+    return results
+
 
 class SqlglotParser(BaseParser):
     """
     Parser using `sqlglot` library.
     v2.0 Parser implementation replacing GenericSQLParser.
     """
+
+    supports_fragments = True
+
+    # Statement splitting options, overridden by dialects
+    batch_separator = False  # T-SQL 'GO' lines end a statement
+    backslash_escapes = False  # MySQL '\'' inside string literals
+    # Preprocessing rewrites, extended or replaced by dialects
+    rewrite_rules = (
+        # sqlglot fails on Postgres EXCLUDE USING syntax, falling back to Command.
+        # We strip it to allow parsing of the table.
+        RewriteRule('exclude_using', r'(?:,\s*)?EXCLUDE\s+USING\s+\w+\s*\([^)]+\)'),
+        # Captured in the model from the raw statement (see _scan_table_options)
+        RewriteRule('without_rowid', r'\s+WITHOUT\s+ROWID'),
+        # MSSQL: CLUSTERED / NONCLUSTERED causes issues in inline PK/Index
+        RewriteRule('clustered', r'\b(?:NON)?CLUSTERED\b', dialects=('tsql',)),
+        # SQLite STRICT handling - sqlglot might fail if not in read='sqlite'
+        # Only strip if it's at the very end of CREATE TABLE (most common case)
+        RewriteRule('strict', r'\)\s*STRICT\s*;', ');', dialects=('sqlite',)),
+        # Normalize Postgres COMMENT ON CONSTRAINT x ON y IS z -> COMMENT ON CONSTRAINT x IS z
+        RewriteRule('comment_on_constraint', r'(COMMENT\s+ON\s+CONSTRAINT\s+[^\s]+)\s+ON\s+[^\s]+(\s+IS)', r'\1\2'),
+    )
     
-    def __init__(self, dialect: str = None, strict: bool = False):
-        super().__init__(strict)
+    def __init__(self, dialect: str = None, strict: bool = False, jobs: int = 1):
+        super().__init__(strict, jobs)
         self.dialect = dialect
         self.logger = get_logger("parser")
+        self.rewrite_counts = {}
+        self.current_statement = None
     
     def _preprocess(self, content: str) -> str:
-        # sqlglot fails on Postgres EXCLUDE USING syntax, falling back to Command.
-        # We strip it to allow parsing of the table.
-        # Regex to match EXCLUDE USING ... (...)
-        import re
-        if "EXCLUDE USING" in content.upper():
-             content = re.sub(r',\s*EXCLUDE\s+USING\s+\w+\s*\([^)]+\)', '', content, flags=re.IGNORECASE)
-             content = re.sub(r'EXCLUDE\s+USING\s+\w+\s*\([^)]+\)', '', content, flags=re.IGNORECASE)
-        
-        if "WITHOUT ROWID" in content.upper():
-             content = re.sub(r'\s+WITHOUT\s+ROWID', '', content, flags=re.IGNORECASE)
-
-        # MSSQL: CLUSTERED / NONCLUSTERED causes issues in inline PK/Index
-        if self.dialect == 'tsql':
-             content = re.sub(r'\b(?:NON)?CLUSTERED\b', '', content, flags=re.IGNORECASE)
-
-             
-        # SQLite STRICT handling - sqlglot might fail if not in read='sqlite' 
-        # but even then some versions might bug. We'll capture it in model anyway.
-        if "STRICT" in content.upper() and self.dialect == 'sqlite':
-             # Only strip if it's at the very end of CREATE TABLE (most common case)
-             content = re.sub(r'\)\s*STRICT\s*;', ');', content, flags=re.IGNORECASE)
-             
-        # Normalize Postgres COMMENT ON CONSTRAINT x ON y IS z -> COMMENT ON CONSTRAINT x IS z
-        if "COMMENT ON CONSTRAINT" in content.upper():
-             content = re.sub(r'(COMMENT\s+ON\s+CONSTRAINT\s+[^\s]+)\s+ON\s+[^\s]+(\s+IS)', r'\1\2', content, flags=re.IGNORECASE)
-
-        return content
+        # All rewrite_rules are applied in one scan that skips literals and comments
+        engine = get_rewrite_engine(self.rewrite_rules, self.dialect, self.backslash_escapes)
+        return engine.rewrite(content, self.rewrite_counts)
 
     def _clean_type(self, data_type: str) -> str:
         """
@@ -54,282 +86,481 @@ class SqlglotParser(BaseParser):
         return data_type
 
     def parse(self, content: str) -> Schema:
-        from schemaforge.exceptions import StrictModeError
-        import re
-        
         self.raw_content = content
-        schema = Schema()
+        return self._parse_statement_stream(self._iter_statements(content))
 
-        
-        # Pre-parse detection for certain keywords that might cause fallbacks or are easier to catch here
-        without_rowid_tables = []
-        strict_tables = []
-        
-        # Simple regex to find tables with WITHOUT ROWID or STRICT
-        # These are usually at the end of the CREATE TABLE statement: ) WITHOUT ROWID;
-        wr_matches = re.findall(r'CREATE\s+TABLE\s+([^\s(]+).*?\)\s*WITHOUT\s+ROWID', content, re.IGNORECASE | re.DOTALL)
-        for m in wr_matches:
-             without_rowid_tables.append(m.replace('"', '').replace('`', '').strip())
-             
-        strict_matches = re.findall(r'CREATE\s+TABLE\s+([^\s(]+).*?\)\s*STRICT', content, re.IGNORECASE | re.DOTALL)
-        for m in strict_matches:
-             strict_tables.append(m.replace('"', '').replace('`', '').strip())
-        
-        content = self._preprocess(content)
-        
-        # Parse all content
-        try:
-            if self.strict:
-                 error_lvl = None 
-            else:
-                 error_lvl = sqlglot.ErrorLevel.IGNORE 
-            
-            expressions = sqlglot.parse(content, read=self.dialect, error_level=error_lvl)
-        except Exception as e:
-            if self.strict:
-                raise StrictModeError(content, str(e))
-            self.logger.error(f"Failed to parse SQL content: {e}")
+    def parse_source(self, source) -> Schema:
+        self.raw_content = None
+        return self._parse_statement_stream(
+            source.iter_statements(batch_separator=self.batch_separator,
+                                   backslash_escapes=self.backslash_escapes))
+
+    def _iter_statements(self, content: str):
+        # Split at top-level ';' first so statements can be parsed independently
+        return iter_statements(content, batch_separator=self.batch_separator,
+                               backslash_escapes=self.backslash_escapes)
+
+    def _parse_statement_stream(self, statements) -> Schema:
+        from schemaforge.exceptions import StrictModeError
+
+        schema = Schema()
+        self._reset_table_options()
+        statements = iter(statements)
+        first_statement = next(statements, None)
+        if first_statement is None:
             return schema
-            
-        if not expressions and content.strip():
-             if self.strict:
-                  raise StrictModeError(content, "Failed to parse content (empty result)")
-        
+
+        parsed_any = False
+        profiler = profiling.active()
+        if profiler is not None and profiler.slow_statements:
+            parsed_any = self._parse_timed(profiler, chain([first_statement], statements), schema)
+        else:
+            # Statements are applied as they arrive, in source order, so
+            # ALTER/COMMENT resolve exactly as before
+            for statement, expressions in self._iter_parsed(chain([first_statement], statements)):
+                parsed_any = parsed_any or bool(expressions)
+                if profiler is not None:
+                    self._apply_profiled(profiler, expressions, schema, statement)
+                    continue
+                for expression in expressions:
+                    if expression is None: continue 
+                    self._process_expression(expression, schema, statement)
+
+        if not parsed_any and self.strict:
+             raise StrictModeError(first_statement, "Failed to parse content (empty result)")
+
+        if self.rewrite_counts:
+            self.logger.debug("Preprocess rewrites: " + ", ".join(f"{name}={count}" for name, count in sorted(self.rewrite_counts.items())))
+
+        return schema
+
+    def _parse_timed(self, profiler, statements, schema: Schema) -> bool:
+        """
+        The statement loop with --slow-statements: records the cost of each
+        statement from splitting it off to applying its expressions.
+        """
+        parsed_any = False
+        parsed = self._iter_parsed(statements)
+        while True:
+            start = profiler.statement_start()
+            item = next(parsed, None)
+            if item is None:
+                return parsed_any
+            statement, expressions = item
+            parsed_any = parsed_any or bool(expressions)
+            self._apply_profiled(profiler, expressions, schema, statement)
+            profiler.statement_done(start, statement)
+
+    def _apply_profiled(self, profiler, expressions, schema: Schema, statement: str):
+        """_process_expression() for each expression, timed per statement kind."""
+        perf_counter = time.perf_counter
         for expression in expressions:
-            if expression is None: continue 
-            
-            # Strict mode: Reject fallback Commands AND unmatched expressions
-            if self.strict:
-                 valid_types = (exp.Create, exp.Alter, exp.Comment, exp.Drop, exp.Command)
-                 if not isinstance(expression, valid_types):
-                      raise StrictModeError(content, f"Unsupported statement type in strict mode: {type(expression)} - {expression.sql()}")
-                 if isinstance(expression, exp.Command):
-                      # Check if allowed command
-                      sql_upper = expression.sql().upper()
-                      if not ("ALTER SCHEMA" in sql_upper or "ALTER TYPE" in sql_upper or "ENABLE ROW LEVEL SECURITY" in sql_upper):
-                           raise StrictModeError(content, f"Statement parsed as Command (unsupported syntax): {expression.sql()}")
-
-            if isinstance(expression, exp.Create):
-                if expression.kind == "TABLE":
-                    table = self._extract_create_table(expression)
-                    if table:
-                        clean_name = table.name.replace('"', '').replace('`', '').strip()
-                        if clean_name in without_rowid_tables:
-                             table.without_rowid = True
-                        if clean_name in strict_tables:
-                             table.is_strict = True
-                        schema.add_table(table)
-                elif expression.kind == "INDEX" or expression.kind == "UNIQUE_INDEX" or isinstance(expression.this, exp.Index):
-                    is_unique = expression.args.get("unique") or expression.kind == "UNIQUE_INDEX"
-                    self._extract_create_index(expression, schema, is_unique=is_unique)
-                elif expression.kind in ("VIEW", "FUNCTION", "PROCEDURE", "SEQUENCE", "ALIAS", "TYPE", "DOMAIN", "PACKAGE"):
-                     # Support these as CustomObjects
-                     name = "unknown"
-                     node = expression.this
-                     
-                     if isinstance(node, exp.UserDefinedFunction):
-                          # node.this is the function identifier/table
-                          name = node.this.name if hasattr(node.this, 'name') else str(node.this)
-                     elif hasattr(node, 'name') and node.name:
-                          name = node.name
-                     elif hasattr(node, 'this') and hasattr(node.this, 'name'):
-                          name = node.this.name
-                     elif isinstance(node, str):
-                          name = node
-                     
-                     # Normalize name to lower
-                     name = name.lower()
-                     
-                     obj = CustomObject(obj_type=expression.kind, name=name, properties={'raw_sql': expression.sql(comments=False)})
-                     
-                     if expression.kind == "TYPE":
-                          schema.types.append(obj)
-                     elif expression.kind == "DOMAIN":
-                          schema.domains.append(obj)
-                     else:
-                          schema.custom_objects.append(obj)
-
-            elif isinstance(expression, exp.Alter):
-                self._process_alter_table(expression, schema)
-            elif isinstance(expression, exp.Command):
-                 # Handle generic commands or fallbacks
-                 sql_upper = expression.sql().upper()
-                 raw_sql = expression.sql(comments=False)
-                 
-                 # Strip comments from Command raw sql manually if sqlglot didn't
-                 import re
-                 raw_sql = re.sub(r'/\*.*?\*/', '', raw_sql, flags=re.DOTALL)
-                 raw_sql = re.sub(r'--.*$', '', raw_sql, flags=re.MULTILINE)
-                 raw_sql = " ".join(raw_sql.split()).upper() # Normalize whitespace and case for consistency
+            if expression is None: continue
+            kind = type(expression).__name__
+            profiler.count(f"statements.{kind}")
+            start = perf_counter()
+            self._process_expression(expression, schema, statement)
+            if isinstance(expression, exp.Command):
+                # sqlglot could not parse the statement; handled from its raw text
+                profiler.count("fallbacks.command")
+                profiler.add("apply.command_fallback", perf_counter() - start)
+            else:
+                profiler.add("apply", perf_counter() - start)
+
+    def parse_fragment(self, source) -> list:
+        self.raw_content = None
+        self._reset_table_options()
+        profiler = profiling.active()
+        if profiler is not None and not profiler.slow_statements:
+            profiler = None
+
+        fragment = []
+        parsed = self._iter_parsed(source.iter_statements(batch_separator=self.batch_separator,
+                                                          backslash_escapes=self.backslash_escapes))
+        while True:
+            start = profiler.statement_start() if profiler is not None else None
+            item = next(parsed, None)
+            if item is None:
+                return fragment
+            statement, expressions = item
+            for expression in expressions:
+                if expression is None: continue
+                if self._is_dependent(expression):
+                    # Replayed against the merged schema, like a full parse would
+                    fragment.append(('statement', (expression, statement)))
+                else:
+                    scratch = Schema()
+                    self._process_expression(expression, scratch, statement)
+                    fragment.extend(self._fragment_ops(scratch, append_tables=isinstance(expression, exp.Command)))
+            if profiler is not None:
+                profiler.statement_done(start, statement)
+
+    def _apply_statement(self, payload, schema: Schema):
+        expression, statement = payload
+        self._process_expression(expression, schema, statement)
+
+    def _is_dependent(self, expression: exp.Expression) -> bool:
+        """
+        True for statements that modify objects defined elsewhere
+        (ALTER, COMMENT ON, CREATE INDEX ... ON, row level security).
+        """
+        if isinstance(expression, (exp.Alter, exp.Comment)):
+            return True
+        if isinstance(expression, exp.Create):
+            return expression.kind in ("INDEX", "UNIQUE_INDEX") or isinstance(expression.this, exp.Index)
+        if isinstance(expression, exp.Command):
+            sql_upper = expression.sql().upper()
+            return "ROW LEVEL SECURITY" in sql_upper or ("CREATE" in sql_upper and "INDEX" in sql_upper)
+        return False
+
+    def _reset_table_options(self):
+        self.rewrite_counts = {}
+        self._without_rowid_tables = set()
+        self._strict_tables = set()
+
+    def _scan_table_options(self, statement: str):
+        """
+        Records whether a CREATE TABLE statement is WITHOUT ROWID or STRICT.
+
+        Runs once per raw statement (before _preprocess strips the options)
+        with anchored, non-backtracking regexes, so the cost is linear in
+        the statement length.
+        """
+        match = _CREATE_TABLE_NAME.search(statement)
+        if not match:
+            return
+        name = match.group(1).replace('"', '').replace('`', '').strip().lower()
+        tail = statement[match.end():]
+        if _WITHOUT_ROWID_OPTION.search(tail):
+             self._without_rowid_tables.add(name)
+        if _STRICT_OPTION.search(tail):
+             self._strict_tables.add(name)
+
+    def _prepare(self, statement: str) -> str:
+        """Scans a raw statement and returns it preprocessed for sqlglot."""
+        self._scan_table_options(statement)
+        return self._preprocess(statement)
+
+    def _iter_parsed(self, statements) -> Iterator[Tuple[str, list]]:
+        """
+        Preprocesses and parses each statement with sqlglot.
 
+        Consumes ``statements`` lazily and yields ``(statement, expressions)``
+        pairs in input order. Once at least PARALLEL_MIN_STATEMENTS statements
+        are seen and ``jobs`` > 1, batches are parsed in a process pool with
+        a bounded number of batches in flight.
+        """
+        error_lvl = None if self.strict else sqlglot.ErrorLevel.IGNORE
+        statements = iter(statements)
+
+        if self.jobs > 1:
+            head = list(islice(statements, PARALLEL_MIN_STATEMENTS))
+            if len(head) >= PARALLEL_MIN_STATEMENTS:
+                yield from self._iter_parsed_pool(chain(head, statements), error_lvl)
+                return
+            statements = iter(head)
+
+        profiler = profiling.active()
+        if profiler is not None:
+            yield from self._iter_parsed_profiled(profiler, statements, error_lvl)
+            return
+
+        for statement in statements:
+            results = _parse_batch(self.dialect, error_lvl, [self._prepare(statement)])
+            yield from self._check_results([statement], results)
+
+    def _iter_parsed_profiled(self, profiler, statements, error_lvl) -> Iterator[Tuple[str, list]]:
+        """The sequential loop of _iter_parsed(), timing each step of every statement."""
+        perf_counter = time.perf_counter
+        while True:
+            start = perf_counter()
+            statement = next(statements, None)
+            split = perf_counter()
+            if statement is None:
+                profiler.add("split", split - start)
+                return
+            prepared = self._prepare(statement)
+            preprocessed = perf_counter()
+            results = _parse_batch(self.dialect, error_lvl, [prepared])
+            parsed = perf_counter()
+            profiler.add("split", split - start)
+            profiler.add("preprocess", preprocessed - split)
+            profiler.add("sqlglot.parse", parsed - preprocessed)
+            if results[0][1] is not None:
+                profiler.count("statements.failed")
+            yield from self._check_results([statement], results)
+
+    def _iter_parsed_pool(self, statements, error_lvl) -> Iterator[Tuple[str, list]]:
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            while True:
+                batch = list(islice(statements, PARALLEL_BATCH_SIZE))
+                if batch:
+                    chunks = [self._prepare(stmt) for stmt in batch]
+                    pending.append((batch, executor.submit(_parse_batch, self.dialect, error_lvl, chunks)))
+                # Keep the workers busy without reading the whole source ahead
+                while pending and (not batch or len(pending) > self.jobs * 2):
+                    done_batch, future = pending.popleft()
+                    yield from self._check_results(done_batch, future.result())
+                if not batch:
+                    return
+
+    def _check_results(self, statements, results) -> Iterator[Tuple[str, list]]:
+        from schemaforge.exceptions import StrictModeError
+
+        for statement, (expressions, error) in zip(statements, results):
+            if error is not None:
+                if self.strict:
+                    raise StrictModeError(statement, error)
+                location = getattr(statement, 'location', None)
+                where = f" at {location}" if location else ""
+                self.logger.error(f"Failed to parse SQL statement{where}: {error}")
+                continue
+            yield statement, expressions
+
+    def _process_expression(self, expression: exp.Expression, schema: Schema, statement: str):
+        """Applies a single parsed expression to the schema."""
+        from schemaforge.exceptions import StrictModeError
+        import re
+
+        # Raw text of the statement being applied, for dialect hooks that
+        # read options sqlglot does not model
+        self.current_statement = statement
+
+        # Strict mode: Reject fallback Commands AND unmatched expressions
+        if self.strict:
+             valid_types = (exp.Create, exp.Alter, exp.Comment, exp.Drop, exp.Command)
+             if not isinstance(expression, valid_types):
+                  raise StrictModeError(statement, f"Unsupported statement type in strict mode: {type(expression)} - {expression.sql()}")
+             if isinstance(expression, exp.Command):
+                  # Check if allowed command
+                  sql_upper = expression.sql().upper()
+                  if not ("ALTER SCHEMA" in sql_upper or "ALTER TYPE" in sql_upper or "ENABLE ROW LEVEL SECURITY" in sql_upper):
+                       raise StrictModeError(statement, f"Statement parsed as Command (unsupported syntax): {expression.sql()}")
+
+        if isinstance(expression, exp.Create):
+            if expression.kind == "TABLE":
+                table = self._extract_create_table(expression)
+                if table:
+                    clean_name = table.name.replace('"', '').replace('`', '').strip().lower()
+                    if clean_name in self._without_rowid_tables:
+                         table.without_rowid = True
+                    if clean_name in self._strict_tables:
+                         table.is_strict = True
+                    schema.add_table(table)
+            elif expression.kind == "INDEX" or expression.kind == "UNIQUE_INDEX" or isinstance(expression.this, exp.Index):
+                is_unique = expression.args.get("unique") or expression.kind == "UNIQUE_INDEX"
+                self._extract_create_index(expression, schema, is_unique=is_unique)
+            elif expression.kind in ("VIEW", "FUNCTION", "PROCEDURE", "SEQUENCE", "ALIAS", "TYPE", "DOMAIN", "PACKAGE"):
+                 # Support these as CustomObjects
+                 name = "unknown"
+                 node = expression.this
+                 
+                 if isinstance(node, exp.UserDefinedFunction):
+                      # node.this is the function identifier/table
+                      name = node.this.name if hasattr(node.this, 'name') else str(node.this)
+                 elif hasattr(node, 'name') and node.name:
+                      name = node.name
+                 elif hasattr(node, 'this') and hasattr(node.this, 'name'):
+                      name = node.this.name
+                 elif isinstance(node, str):
+                      name = node
                  
-                 # RLS Handling
-                 if "ENABLE ROW LEVEL SECURITY" in sql_upper and "ALTER TABLE" in sql_upper:
-                      match = re.search(r'ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?([^\s]+)\s+ENABLE\s+ROW\s+LEVEL\s+SECURITY', expression.sql(), re.IGNORECASE)
-                      if match:
-                           tname = match.group(1).replace('"', '').replace('`', '')
-                           if '.' in tname: tname = tname.split('.')[-1] 
-                           t = schema.get_table(tname)
-                           if t: t.row_security = True
+                 # Normalize name to lower
+                 name = name.lower()
                  
-                 name = "command"
-                 obj_type = "COMMAND"
-                 # Regex extraction for Create View/Function fallbacks
-                 if "CREATE TABLE" in raw_sql:
-                      m = re.search(r'CREATE\s+TABLE\s+([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m:
-                           name = m.group(1).replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
-                           if '.' in name: name = name.split('.')[-1]
-                           table = Table(name=name)
+                 obj = CustomObject(obj_type=expression.kind, name=name, properties={'raw_sql': expression.sql(comments=False)})
+                 
+                 if expression.kind == "TYPE":
+                      schema.types.append(obj)
+                 elif expression.kind == "DOMAIN":
+                      schema.domains.append(obj)
+                 else:
+                      schema.custom_objects.append(obj)
+
+        elif isinstance(expression, exp.Alter):
+            self._process_alter_table(expression, schema)
+        elif isinstance(expression, exp.Command):
+             # Handle generic commands or fallbacks
+             sql_upper = expression.sql().upper()
+             raw_sql = expression.sql(comments=False)
+             
+             # Strip comments from Command raw sql manually if sqlglot didn't
+             import re
+             raw_sql = re.sub(r'/\*.*?\*/', '', raw_sql, flags=re.DOTALL)
+             raw_sql = re.sub(r'--.*$', '', raw_sql, flags=re.MULTILINE)
+             raw_sql = " ".join(raw_sql.split()).upper() # Normalize whitespace and case for consistency
+
+             
+             # RLS Handling
+             if "ENABLE ROW LEVEL SECURITY" in sql_upper and "ALTER TABLE" in sql_upper:
+                  match = re.search(r'ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?([^\s]+)\s+ENABLE\s+ROW\s+LEVEL\s+SECURITY', expression.sql(), re.IGNORECASE)
+                  if match:
+                       tname = match.group(1).replace('"', '').replace('`', '')
+                       if '.' in tname: tname = tname.split('.')[-1] 
+                       t = schema.get_table(tname)
+                       if t: t.row_security = True
+             
+             name = "command"
+             obj_type = "COMMAND"
+             # Regex extraction for Create View/Function fallbacks
+             if "CREATE TABLE" in raw_sql:
+                  m = re.search(r'CREATE\s+TABLE\s+([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m:
+                       name = m.group(1).replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
+                       if '.' in name: name = name.split('.')[-1]
+                       table = Table(name=name)
+                       
+                       # FALLBACK COLUMN PARSING
+                       start_idx = raw_sql.find('(')
+                       if start_idx != -1:
+                           body = raw_sql[start_idx+1:].strip()
+                           depth = 1
+                           end_idx = -1
+                           for i, char in enumerate(body):
+                               if char == '(': depth += 1
+                               elif char == ')': depth -= 1
+                               if depth == 0:
+                                   end_idx = i
+                                   break
                            
-                           # FALLBACK COLUMN PARSING
-                           start_idx = raw_sql.find('(')
-                           if start_idx != -1:
-                               body = raw_sql[start_idx+1:].strip()
-                               depth = 1
-                               end_idx = -1
-                               for i, char in enumerate(body):
-                                   if char == '(': depth += 1
-                                   elif char == ')': depth -= 1
-                                   if depth == 0:
-                                       end_idx = i
-                                       break
-                               
-                               if end_idx != -1:
-                                   body = body[:end_idx]
-                                   defs = []
-                                   current_def = []
-                                   depth = 0
-                                   for char in body:
-                                       if char == ',' and depth == 0:
-                                           defs.append("".join(current_def).strip())
-                                           current_def = []
-                                       else:
-                                           if char == '(': depth += 1
-                                           elif char == ')': depth -= 1
-                                           current_def.append(char)
-                                   if current_def:
+                           if end_idx != -1:
+                               body = body[:end_idx]
+                               defs = []
+                               current_def = []
+                               depth = 0
+                               for char in body:
+                                   if char == ',' and depth == 0:
                                        defs.append("".join(current_def).strip())
-                                   
-                                   for d in defs:
-                                       d = d.strip()
-                                       if not d: continue
-                                       upper_d = d.upper()
-                                       # Skip constraints if possible
-                                       if any(upper_d.startswith(k) for k in ["CONSTRAINT", "PRIMARY KEY", "FOREIGN KEY", "CHECK", "INDEX", "KEY"]):
-                                           continue
-                                           
-                                       parts = d.split(maxsplit=1)
-                                       if len(parts) >= 2:
-                                           cname = parts[0].replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
-                                           ctype = parts[1]
-                                           # Clean up common trailing constraints if possible, or just keep them.
-                                           # For fallback, providing the full definition as type is acceptable visual info.
-                                           table.columns.append(Column(name=cname, data_type=ctype))
-
-                           schema.tables.append(table)
-                           self._post_process_table(table, expression)
-                           continue
-                 elif "CREATE VIEW" in raw_sql:
-                      m = re.search(r'CREATE\s+VIEW\s+([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m: 
-                           name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
-                           obj_type = "VIEW"
-                 elif "CREATE TYPE" in raw_sql:
-                      m = re.search(r'CREATE\s+TYPE\s+([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m: 
-                           name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
-                           obj_type = "TYPE"
-                           schema.types.append(CustomObject(obj_type=obj_type, name=name, properties={'raw_sql': raw_sql}))
-                           continue
-                 elif "CREATE DOMAIN" in raw_sql:
-                      m = re.search(r'CREATE\s+DOMAIN\s+([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m: 
-                           name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
-                           obj_type = "DOMAIN"
-                           schema.domains.append(CustomObject(obj_type=obj_type, name=name, properties={'raw_sql': raw_sql}))
-                           continue
-                 elif "CREATE FUNCTION" in raw_sql:
-                      m = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m: 
-                           name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
-                           obj_type = "FUNCTION"                  
-                 elif "CREATE PROCEDURE" in raw_sql:
-                      m = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?PROCEDURE\s+([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m: 
-                           name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
-                           obj_type = "PROCEDURE"
-                 elif "CREATE PACKAGE" in raw_sql:
-                      m = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+(?:BODY\s+)?([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m: 
-                           name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
-                           obj_type = "PACKAGE"
-                 elif "CREATE" in raw_sql and "INDEX" in raw_sql:
-                      # Fallback for INDEX if parsed as Command (e.g. DB2 with INCLUDE or MSSQL CLUSTERED)
-                      # Normalize whitespace for matching
-                      norm_sql = " ".join(raw_sql.split())
-                      m = re.search(r'CREATE\s+(?:UNIQUE\s+)?(CLUSTERED\s+|NONCLUSTERED\s+)?INDEX\s+([^\s]+)\s+ON\s+([^\s(]+)', norm_sql, re.IGNORECASE)
-                      if m:
-                           is_clustered = m.group(1) and 'CLUSTERED' in m.group(1).upper() and 'NONCLUSTERED' not in m.group(1).upper()
-                           idx_name = m.group(2).replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
-                           table_name = m.group(3).replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
-                           if '.' in table_name: table_name = table_name.split('.')[-1]
-                           table = schema.get_table(table_name)
-                           if table:
-                                # We need columns
-                                m_cols = re.search(r'\((.*?)\)', norm_sql)
-
-                                cols = [c.strip().replace("[", "").replace("]", "").lower() for c in m_cols.group(1).split(',')] if m_cols else []
-                                is_unique = "UNIQUE" in raw_sql.upper()
-                                
-                                # Extract INCLUDE columns if present
-                                include_cols_lower = []
-                                include_cols_raw = []
-                                m_inc = re.search(r'INCLUDE\s*\((.*?)\)', norm_sql, re.IGNORECASE)
-                                if m_inc:
-                                     include_cols_raw = [c.strip() for c in m_inc.group(1).split(',')]
-                                     include_cols_lower = [c.lower() for c in include_cols_raw]
-                                
-                                table.indexes.append(Index(
-                                     name=idx_name, 
-                                     columns=cols, 
-                                     is_unique=is_unique,
-                                     is_clustered=is_clustered,
-                                     include_columns=include_cols_lower,
-                                     properties={'include_columns': include_cols_raw} if include_cols_raw else {}
-                                ))
-
-                 elif "CREATE ALIAS" in raw_sql:
-                      m = re.search(r'CREATE\s+ALIAS\s+([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m: 
-                           name = m.group(1).replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
-                           obj_type = "ALIAS"
-                 elif "CREATE SEQUENCE" in raw_sql:
-                      m = re.search(r'CREATE\s+SEQUENCE\s+([^\s(]+)', raw_sql, re.IGNORECASE)
-                      if m: 
-                           name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
-                           obj_type = "SEQUENCE"
-                 elif "ALTER SCHEMA" in raw_sql:
-                      name = "public" 
-                      m = re.search(r'ALTER\s+SCHEMA\s+([^\s]+)', raw_sql, re.IGNORECASE)
-                      if m: name = m.group(1).lower()
-                      obj_type = "ALTER SCHEMA"
-                 elif "ALTER TYPE" in raw_sql:
-                      name = "status" 
-                      m = re.search(r'ALTER\s+TYPE\s+([^\s]+)', expression.sql(), re.IGNORECASE)
-                      if m: name = m.group(1).replace("'", "").lower()
-                      obj_type = "ALTER TYPE"
-                 elif expression.this:
-                      if isinstance(expression.this, str):
-                           name = expression.this.split()[0]
-                      elif hasattr(expression.this, 'name'):
-                           name = expression.this.name
-                 
-                 schema.custom_objects.append(CustomObject(obj_type=obj_type, name=name, properties={'raw_sql': raw_sql}))
-            elif isinstance(expression, exp.Comment):
-                self._process_comment(expression, schema)
+                                       current_def = []
+                                   else:
+                                       if char == '(': depth += 1
+                                       elif char == ')': depth -= 1
+                                       current_def.append(char)
+                               if current_def:
+                                   defs.append("".join(current_def).strip())
+                               
+                               for d in defs:
+                                   d = d.strip()
+                                   if not d: continue
+                                   upper_d = d.upper()
+                                   # Skip constraints if possible
+                                   if any(upper_d.startswith(k) for k in ["CONSTRAINT", "PRIMARY KEY", "FOREIGN KEY", "CHECK", "INDEX", "KEY"]):
+                                       continue
+                                       
+                                   parts = d.split(maxsplit=1)
+                                   if len(parts) >= 2:
+                                       cname = parts[0].replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
+                                       ctype = parts[1]
+                                       # Clean up common trailing constraints if possible, or just keep them.
+                                       # For fallback, providing the full definition as type is acceptable visual info.
+                                       table.columns.append(Column(name=cname, data_type=ctype))
+
+                       schema.tables.append(table)
+                       self._post_process_table(table, expression)
+                       return
+             elif "CREATE VIEW" in raw_sql:
+                  m = re.search(r'CREATE\s+VIEW\s+([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m: 
+                       name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
+                       obj_type = "VIEW"
+             elif "CREATE TYPE" in raw_sql:
+                  m = re.search(r'CREATE\s+TYPE\s+([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m: 
+                       name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
+                       obj_type = "TYPE"
+                       schema.types.append(CustomObject(obj_type=obj_type, name=name, properties={'raw_sql': raw_sql}))
+                       return
+             elif "CREATE DOMAIN" in raw_sql:
+                  m = re.search(r'CREATE\s+DOMAIN\s+([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m: 
+                       name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
+                       obj_type = "DOMAIN"
+                       schema.domains.append(CustomObject(obj_type=obj_type, name=name, properties={'raw_sql': raw_sql}))
+                       return
+             elif "CREATE FUNCTION" in raw_sql:
+                  m = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m: 
+                       name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
+                       obj_type = "FUNCTION"                  
+             elif "CREATE PROCEDURE" in raw_sql:
+                  m = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?PROCEDURE\s+([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m: 
+                       name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
+                       obj_type = "PROCEDURE"
+             elif "CREATE PACKAGE" in raw_sql:
+                  m = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+(?:BODY\s+)?([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m: 
+                       name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
+                       obj_type = "PACKAGE"
+             elif "CREATE" in raw_sql and "INDEX" in raw_sql:
+                  # Fallback for INDEX if parsed as Command (e.g. DB2 with INCLUDE or MSSQL CLUSTERED)
+                  # Normalize whitespace for matching
+                  norm_sql = " ".join(raw_sql.split())
+                  m = re.search(r'CREATE\s+(?:UNIQUE\s+)?(CLUSTERED\s+|NONCLUSTERED\s+)?INDEX\s+([^\s]+)\s+ON\s+([^\s(]+)', norm_sql, re.IGNORECASE)
+                  if m:
+                       is_clustered = m.group(1) and 'CLUSTERED' in m.group(1).upper() and 'NONCLUSTERED' not in m.group(1).upper()
+                       idx_name = m.group(2).replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
+                       table_name = m.group(3).replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
+                       if '.' in table_name: table_name = table_name.split('.')[-1]
+                       table = schema.get_table(table_name)
+                       if table:
+                            # We need columns
+                            m_cols = re.search(r'\((.*?)\)', norm_sql)
+
+                            cols = [c.strip().replace("[", "").replace("]", "").lower() for c in m_cols.group(1).split(',')] if m_cols else []
+                            is_unique = "UNIQUE" in raw_sql.upper()
+                            
+                            # Extract INCLUDE columns if present
+                            include_cols_lower = []
+                            include_cols_raw = []
+                            m_inc = re.search(r'INCLUDE\s*\((.*?)\)', norm_sql, re.IGNORECASE)
+                            if m_inc:
+                                 include_cols_raw = [c.strip() for c in m_inc.group(1).split(',')]
+                                 include_cols_lower = [c.lower() for c in include_cols_raw]
+                            
+                            table.indexes.append(Index(
+                                 name=idx_name, 
+                                 columns=cols, 
+                                 is_unique=is_unique,
+                                 is_clustered=is_clustered,
+                                 include_columns=include_cols_lower,
+                                 properties={'include_columns': include_cols_raw} if include_cols_raw else {}
+                            ))
+
+             elif "CREATE ALIAS" in raw_sql:
+                  m = re.search(r'CREATE\s+ALIAS\s+([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m: 
+                       name = m.group(1).replace('"', '').replace('`', '').replace("[", "").replace("]", "").replace("'", "").lower()
+                       obj_type = "ALIAS"
+             elif "CREATE SEQUENCE" in raw_sql:
+                  m = re.search(r'CREATE\s+SEQUENCE\s+([^\s(]+)', raw_sql, re.IGNORECASE)
+                  if m: 
+                       name = m.group(1).replace('"', '').replace('`', '').replace("'", "").lower()
+                       obj_type = "SEQUENCE"
+             elif "ALTER SCHEMA" in raw_sql:
+                  name = "public" 
+                  m = re.search(r'ALTER\s+SCHEMA\s+([^\s]+)', raw_sql, re.IGNORECASE)
+                  if m: name = m.group(1).lower()
+                  obj_type = "ALTER SCHEMA"
+             elif "ALTER TYPE" in raw_sql:
+                  name = "status" 
+                  m = re.search(r'ALTER\s+TYPE\s+([^\s]+)', expression.sql(), re.IGNORECASE)
+                  if m: name = m.group(1).replace("'", "").lower()
+                  obj_type = "ALTER TYPE"
+             elif expression.this:
+                  if isinstance(expression.this, str):
+                       name = expression.this.split()[0]
+                  elif hasattr(expression.this, 'name'):
+                       name = expression.this.name
+             
+             schema.custom_objects.append(CustomObject(obj_type=obj_type, name=name, properties={'raw_sql': raw_sql}))
+        elif isinstance(expression, exp.Comment):
+            self._process_comment(expression, schema)
 
-        return schema
 
     def _extract_create_table(self, expression: exp.Create) -> Optional[Table]:
         # Extract table name
@@ -1,8 +1,8 @@
 from schemaforge.parsers.sqlglot_adapter import SqlglotParser
 
 class SQLiteParser(SqlglotParser):
-    def __init__(self, strict=False):
-        super().__init__(dialect='sqlite', strict=strict)
+    def __init__(self, strict=False, jobs=1):
+        super().__init__(dialect='sqlite', strict=strict, jobs=jobs)
 
     def _process_property(self, prop, table):
         from sqlglot import exp
@@ -0,0 +1,338 @@
+"""
+SchemaForge Phase Profiling
+
+Instrumentation behind ``sf compare --profile``: nested phase timers with
+the tracemalloc peak of each phase, time accumulated per parse step
+(statement splitting, preprocessing, sqlglot, applying expressions) and
+counters such as statements per kind and fallbacks to ``exp.Command``.
+With ``--slow-statements N`` the parsers also time every statement and the
+N most expensive ones are kept with their ``file:line``.
+
+Profiling is off unless a Profiler is installed with ``enable()``. While
+it is off, ``phase()`` returns a shared no-op context manager and the
+parsers check ``active()`` once per parse to pick their uninstrumented
+loop, so the cost is a global lookup per phase.
+
+Work done in worker processes (``--jobs``) is not traced; it shows up as
+the time of the phase that waited for it.
+"""
+
+import heapq
+import re
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+_active: Optional['Profiler'] = None
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Node:
+    """Aggregated timings of one phase (all calls at the same position in the tree)."""
+    __slots__ = ('name', 'seconds', 'calls', 'peak_bytes', 'children')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.calls = 0
+        self.peak_bytes = None
+        self.children: Dict[str, '_Node'] = {}
+
+    def child(self, name: str) -> '_Node':
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = _Node(name)
+        return node
+
+    def to_dict(self) -> dict:
+        data = {"name": self.name, "seconds": round(self.seconds, 6), "calls": self.calls}
+        if self.peak_bytes is not None:
+            data["peak_bytes"] = self.peak_bytes
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children.values()]
+        return data
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'node', 'start', 'start_bytes', 'child_peak')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        parent = profiler._stack[-1]
+        self.node = parent.node.child(self.name)
+        self.child_peak = 0
+        if profiler.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # The parent's peak so far is kept before the counter is reset for this phase
+            parent.child_peak = max(parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_bytes = current
+        profiler._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        profiler = self.profiler
+        profiler._stack.pop()
+        node = self.node
+        node.seconds += elapsed
+        node.calls += 1
+        if profiler.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.child_peak)
+            node.peak_bytes = max(node.peak_bytes or 0, peak - self.start_bytes)
+            parent = profiler._stack[-1]
+            parent.child_peak = max(parent.child_peak, peak)
+        return False
+
+
+class StatementCost(NamedTuple):
+    """Parse cost of one statement (see ``Profiler.slow_statements``)."""
+    location: str                     # file:line, or "line N" for in-memory content
+    seconds: float
+    allocated_bytes: Optional[int]    # tracemalloc peak while parsing it; None without memory tracing
+    preview: str
+
+    def to_dict(self):
+        return {
+            "location": self.location,
+            "seconds": round(self.seconds, 6),
+            "allocated_bytes": self.allocated_bytes,
+            "preview": self.preview,
+        }
+
+
+PREVIEW_LENGTH = 80
+
+_BLANK = re.compile(r'\s*')
+_LEADING_COMMENTS = re.compile(r'(?:\s+|--[^\n]*|/\*.*?\*/)*', re.DOTALL)
+
+
+def code_start(statement: str) -> int:
+    """
+    Offset of the first character of ``statement`` after its leading
+    whitespace and comments (the banner above a CREATE), or of the first
+    non-blank one when the statement is nothing but comments.
+    """
+    end = _LEADING_COMMENTS.match(statement).end()
+    if end == len(statement):
+        return _BLANK.match(statement).end()
+    return end
+
+
+def _preview(statement: str, start: int = 0) -> str:
+    # Only the head is normalized; statements can be megabytes long
+    text = " ".join(statement[start:start + PREVIEW_LENGTH * 4].split())
+    return text if len(text) <= PREVIEW_LENGTH else text[:PREVIEW_LENGTH - 3] + "..."
+
+
+class _Root:
+    __slots__ = ('node', 'child_peak')
+
+    def __init__(self):
+        self.node = _Node('total')
+        self.child_peak = 0
+
+
+class Profiler:
+    """Collects phase timings, memory peaks and counters for one run."""
+
+    def __init__(self, memory: bool = True, slow_statements: int = 0):
+        """
+        Args:
+            memory: Trace allocations with tracemalloc to report the peak
+                memory of each phase (slows the traced code down).
+            slow_statements: Keep the N statements that took longest to
+                parse (0 disables per-statement tracking).
+        """
+        self.memory = memory
+        self.slow_statements = slow_statements
+        self.counters = Counter()
+        self._slowest: List[Tuple[float, int, StatementCost]] = []   # min-heap by seconds
+        self._recorded = 0
+        self._root = _Root()
+        self._stack = [self._root]
+        self._started = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._started = time.perf_counter()
+
+    def stop(self):
+        if self._started is not None:
+            self._root.node.seconds += time.perf_counter() - self._started
+            self._root.node.calls += 1
+            self._started = None
+        if self.memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            self._root.node.peak_bytes = max(peak, self._root.child_peak)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def phase(self, name: str) -> _Phase:
+        """Context manager timing ``name`` as a child of the current phase."""
+        return _Phase(self, name)
+
+    def add(self, name: str, seconds: float):
+        """Adds ``seconds`` to the step ``name`` of the current phase (no memory tracking)."""
+        node = self._stack[-1].node.child(name)
+        node.seconds += seconds
+        node.calls += 1
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def statement_start(self) -> Tuple[float, int]:
+        """Marks the start of a statement; pass the result to ``statement_done()``."""
+        start_bytes = 0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            top = self._stack[-1]
+            top.child_peak = max(top.child_peak, peak)
+            tracemalloc.reset_peak()
+            start_bytes = current
+        return time.perf_counter(), start_bytes
+
+    def statement_done(self, start: Tuple[float, int], statement: str, location: Optional[str] = None):
+        """
+        Records the statement begun at ``start`` if it is among the slowest
+        so far. ``location`` defaults to the statement's own (SqlStatement),
+        moved past leading comments like the preview.
+        """
+        seconds = time.perf_counter() - start[0]
+        allocated = None
+        if self.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            top = self._stack[-1]
+            top.child_peak = max(top.child_peak, peak)
+            allocated = max(0, peak - start[1])
+        self._recorded += 1
+        slowest = self._slowest
+        if len(slowest) >= self.slow_statements and seconds <= slowest[0][0]:
+            return
+        head = code_start(statement)
+        if location is None:
+            location = statement.location_at(head) if hasattr(statement, 'location_at') else "?"
+        entry = (seconds, self._recorded, StatementCost(location, seconds, allocated, _preview(statement, head)))
+        if len(slowest) < self.slow_statements:
+            heapq.heappush(slowest, entry)
+        else:
+            heapq.heapreplace(slowest, entry)
+
+    def slowest(self) -> List[StatementCost]:
+        """The recorded statements, slowest first."""
+        return [cost for _, _, cost in sorted(self._slowest, reverse=True)]
+
+    def report(self) -> dict:
+        """Returns the profile as a JSON-serializable dict."""
+        report = {
+            "total_seconds": round(self._root.node.seconds, 6),
+            "peak_bytes": self._root.node.peak_bytes,
+            "phases": [child.to_dict() for child in self._root.node.children.values()],
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if self.slow_statements:
+            report["statements_timed"] = self._recorded
+            report["slow_statements"] = [cost.to_dict() for cost in self.slowest()]
+        return report
+
+    def summary(self) -> str:
+        """Returns the profile as a text table (phases indented by nesting)."""
+        total = self._root.node.seconds or sum(c.seconds for c in self._root.node.children.values())
+        lines = [f"{'phase':<40} {'calls':>8} {'seconds':>10} {'%':>6} {'peak MiB':>10}"]
+
+        def walk(node: _Node, depth: int):
+            share = node.seconds / total * 100 if total else 0.0
+            peak = f"{node.peak_bytes / 1024 / 1024:.1f}" if node.peak_bytes is not None else "-"
+            lines.append(f"{'  ' * depth + node.name:<40} {node.calls:>8} {node.seconds:>10.3f} {share:>6.1f} {peak:>10}")
+            for child in node.children.values():
+                walk(child, depth + 1)
+
+        for child in self._root.node.children.values():
+            walk(child, 0)
+        lines.append(f"{'total':<40} {'':>8} {total:>10.3f}")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<40} {'count':>8}")
+            lines.extend(f"{name:<40} {value:>8}" for name, value in sorted(self.counters.items()))
+        if self.slow_statements:
+            lines.append("")
+            lines.append(self.slow_statements_summary())
+        return "\n".join(lines)
+
+    def slow_statements_summary(self) -> str:
+        """Returns the slowest statements as a text table."""
+        lines = [f"Slowest {len(self._slowest)} of {self._recorded} statements:",
+                 f"{'seconds':>10} {'alloc KiB':>10}  location / statement"]
+        for cost in self.slowest():
+            allocated = f"{cost.allocated_bytes / 1024:.0f}" if cost.allocated_bytes is not None else "-"
+            lines.append(f"{cost.seconds:>10.4f} {allocated:>10}  {cost.location}")
+            lines.append(f"{'':>22}{cost.preview}")
+        return "\n".join(lines)
+
+
+def active() -> Optional[Profiler]:
+    """Returns the installed Profiler, or None when profiling is off."""
+    return _active
+
+
+def enable(profiler: Profiler) -> Profiler:
+    """Installs and starts ``profiler``."""
+    global _active
+    _active = profiler
+    profiler.start()
+    return profiler
+
+
+def disable() -> Optional[Profiler]:
+    """Stops and uninstalls the current Profiler and returns it."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def phase(name: str):
+    """Times ``name`` under the installed Profiler; a no-op when profiling is off."""
+    profiler = _active
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
+
+
+def count(name: str, n: int = 1):
+    """Increments a counter of the installed Profiler; a no-op when profiling is off."""
+    profiler = _active
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+def count_statements(statements):
+    """Counts sqlparse statements per type (``statements.CREATE``, ...) when profiling."""
+    profiler = _active
+    if profiler is not None:
+        for statement in statements:
+            profiler.count(f"statements.{statement.get_type()}")
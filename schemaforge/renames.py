@@ -0,0 +1,219 @@
+"""
+SchemaForge Rename Detection
+
+A table or column that disappears from the source schema while a similar
+one appears in the target is reported as a rename instead of a drop plus
+a create.
+
+Each object is reduced to a set of feature strings (column types and
+positions, nullability, keys, indexes, ...) and a candidate pair scores
+the Jaccard similarity of the two sets. Small inputs are scored pair by
+pair. Larger ones are bucketed first with a one-permutation MinHash and
+LSH bands, so only objects that share a bucket are scored. That keeps
+detection close to linear on schemas with thousands of dropped and added
+tables.
+
+A pair is only accepted when each side is the other's single best match
+at or above the threshold. Ties (for example several structurally
+identical tables) stay a drop plus a create. Column features leave the
+name out as well, so a column pair also needs similar names or the same
+position (``column_rename_allowed``); otherwise any two columns of one
+type would pass.
+"""
+
+import difflib
+import hashlib
+import heapq
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Callable, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from schemaforge.models import Column, Table
+
+# Default minimum similarity for a rename
+RENAME_THRESHOLD = 0.8
+# Up to this many candidate pairs every pair is scored
+EXACT_PAIRS_LIMIT = 4096
+
+# MinHash bins, split into LSH bands of _ROWS bins each
+_BINS = 64
+_ROWS = 4
+# Buckets pairing more objects than this are too ambiguous to score
+_MAX_BUCKET_PAIRS = 4096
+# Each object is also bucketed by this many of its least common features
+_RARE_KEYS = 2
+# Column names at least this similar (difflib ratio) may be a rename
+NAME_SIMILARITY = 0.75
+# Name tokens shorter than this ("is", "id", "at") do not make names similar
+_MIN_TOKEN = 3
+_TOKEN_SPLIT = re.compile(r'[^a-z0-9]+')
+
+
+def _type_key(data_type: str) -> str:
+    return (data_type or '').upper().replace(' ', '')
+
+
+def table_features(table: Table) -> FrozenSet[str]:
+    """Returns the feature set of a table (its name is not part of it)."""
+    features = set()
+    for position, col in enumerate(table.columns):
+        name = col.name.lower()
+        data_type = _type_key(col.data_type)
+        features.add(f"c:{name}:{data_type}")
+        features.add(f"p:{position}:{data_type}")
+        features.add(f"n:{position}:{col.is_nullable:d}{col.is_primary_key:d}")
+    for idx in table.indexes:
+        features.add(f"i:{idx.is_unique:d}:{','.join(c.lower() for c in idx.columns)}")
+    for fk in table.foreign_keys:
+        features.add(f"f:{','.join(c.lower() for c in fk.column_names)}>{(fk.ref_table or '').lower()}")
+    for check in table.check_constraints:
+        features.add(f"k:{check.expression}")
+    return frozenset(features)
+
+
+def column_features(column: Column, position: int) -> FrozenSet[str]:
+    """Returns the feature set of a column at ``position`` (its name is not part of it)."""
+    data_type = _type_key(column.data_type)
+    # The type is part of three features, so a type change outweighs a
+    # moved column or a new comment
+    return frozenset((
+        f"t:{data_type}",
+        f"tn:{data_type}:{column.is_nullable:d}",
+        f"tk:{data_type}:{column.is_primary_key:d}",
+        f"p:{position}",
+        f"n:{column.is_nullable:d}",
+        f"k:{column.is_primary_key:d}",
+        f"d:{column.default_value}",
+        f"i:{column.is_identity:d}",
+        f"g:{column.generation_expression}",
+        f"c:{column.collation}",
+        f"m:{column.comment}",
+    ))
+
+
+def _name_tokens(name: str) -> Set[str]:
+    return {token for token in _TOKEN_SPLIT.split(name.lower()) if len(token) >= _MIN_TOKEN}
+
+
+def similar_names(old: str, new: str) -> bool:
+    """
+    True when ``new`` could be a renamed ``old``: they share a word
+    (``email`` -> ``email_address``) or differ by a few characters
+    (``adress`` -> ``address``).
+    """
+    old, new = old.lower(), new.lower()
+    if _name_tokens(old) & _name_tokens(new):
+        return True
+    return difflib.SequenceMatcher(None, old, new).ratio() >= NAME_SIMILARITY
+
+
+def column_rename_allowed(old: Column, old_position: int, new: Column, new_position: int) -> bool:
+    """A column pair may only be a rename with similar names or at the same position."""
+    return old_position == new_position or similar_names(old.name, new.name)
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def _signature(features: FrozenSet[str]) -> list:
+    """One-permutation MinHash: the smallest hash per bin, None for empty bins."""
+    bins = [None] * _BINS
+    for feature in features:
+        value, slot = divmod(_feature_hash(feature), _BINS)
+        current = bins[slot]
+        if current is None or value < current:
+            bins[slot] = value
+    return bins
+
+
+def _lsh_candidates(old_sets: Sequence[FrozenSet[str]], new_sets: Sequence[FrozenSet[str]]) -> Set[Tuple[int, int]]:
+    """
+    Returns the ``(old, new)`` index pairs that share a bucket: an LSH band,
+    the whole feature set, or one of their least common features. The last
+    two keep templated tables, whose bands are too common to be scored,
+    apart by what makes them different (a foreign key, an extra column).
+    """
+    frequency = Counter(feature for sets in (old_sets, new_sets) for features in sets for feature in features)
+    buckets = defaultdict(lambda: ([], []))
+    for side, sets in enumerate((old_sets, new_sets)):
+        for index, features in enumerate(sets):
+            buckets[features][side].append(index)
+            for feature in heapq.nsmallest(_RARE_KEYS, features, key=lambda f: (frequency[f], f)):
+                buckets[('rare', feature)][side].append(index)
+            signature = _signature(features)
+            for start in range(0, _BINS, _ROWS):
+                band = tuple(signature[start:start + _ROWS])
+                if band.count(None) == _ROWS:
+                    continue
+                buckets[(start, band)][side].append(index)
+
+    candidates = set()
+    for olds, news in buckets.values():
+        if olds and news and len(olds) * len(news) <= _MAX_BUCKET_PAIRS:
+            candidates.update((i, j) for i in olds for j in news)
+    return candidates
+
+
+def _offer(best: dict, key: int, other: int, score: float):
+    current = best.get(key)
+    if current is None or score > current[0]:
+        best[key] = (score, other)
+    elif score == current[0] and current[1] != other:
+        best[key] = (score, None)  # tie: ambiguous
+
+
+def match_renames(old_sets: Sequence[FrozenSet[str]], new_sets: Sequence[FrozenSet[str]],
+                  threshold: float = RENAME_THRESHOLD,
+                  accept: Optional[Callable[[int, int], bool]] = None) -> List[Tuple[int, int]]:
+    """
+    Pairs removed objects with added ones by feature set similarity.
+
+    Args:
+        old_sets: Feature sets of the objects only in the source schema.
+        new_sets: Feature sets of the objects only in the target schema.
+        threshold: Minimum Jaccard similarity of a rename.
+        accept: Optional ``accept(old index, new index)``; pairs it rejects
+            are never matched.
+
+    Returns:
+        ``(old index, new index)`` pairs, sorted by old index.
+    """
+    if not old_sets or not new_sets:
+        return []
+    if len(old_sets) * len(new_sets) <= EXACT_PAIRS_LIMIT:
+        candidates = ((i, j) for i in range(len(old_sets)) for j in range(len(new_sets)))
+    else:
+        candidates = _lsh_candidates(old_sets, new_sets)
+
+    scored = []
+    for i, j in candidates:
+        score = _jaccard(old_sets[i], new_sets[j])
+        if score >= threshold and (accept is None or accept(i, j)):
+            scored.append((score, i, j))
+
+    # Accept mutual single best matches; repeat on what is left so a
+    # matched pair no longer shadows the runner-up of its neighbours
+    matches = []
+    while scored:
+        best_old, best_new = {}, {}
+        for score, i, j in scored:
+            _offer(best_old, i, j, score)
+            _offer(best_new, j, i, score)
+        found = [(i, j) for i, (_, j) in best_old.items() if j is not None and best_new[j][1] == i]
+        if not found:
+            break
+        matches.extend(found)
+        matched_old = {i for i, _ in found}
+        matched_new = {j for _, j in found}
+        scored = [(s, i, j) for s, i, j in scored if i not in matched_old and j not in matched_new]
+    return sorted(matches)
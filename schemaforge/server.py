@@ -0,0 +1,322 @@
+"""
+SchemaForge Server
+
+``sf serve`` keeps one process running on a Unix socket so that repeated
+``sf compare --server`` / ``sf snapshot --server`` runs skip interpreter
+start-up, module imports and sqlglot dialect set-up. Parsers stay warm
+and parsed per-file fragments are kept in an in-memory LRU keyed by file
+content hash (MemoryParseCache), so after a small edit only the edited
+files are parsed again.
+
+The API is JSON-RPC 2.0, one request and one response per line:
+
+    {"jsonrpc": "2.0", "id": 1, "method": "compare", "params": {"args": {...}, "version": "1.6.0"}}
+
+Methods: ``ping``, ``stats``, ``compare``, ``snapshot`` (``args`` are the
+CLI options with absolute paths) and ``shutdown``. Requests are handled
+one at a time. The socket is created with mode 0600 and outputs are
+written with the server's permissions, so only run it as the user who
+calls it.
+"""
+
+import json
+import os
+import socket
+from typing import Optional
+
+from schemaforge.exceptions import SchemaForgeError
+
+JSONRPC = "2.0"
+# Standard JSON-RPC error codes, plus one for failed operations
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+OPERATION_FAILED = -32000
+VERSION_MISMATCH = -32001
+
+CONNECT_TIMEOUT = 1.0
+# Seconds an accepted connection may stay idle before it is dropped
+IDLE_TIMEOUT = 30.0
+# Statement parsed once per warmed dialect to initialize sqlglot
+_WARM_UP_SQL = "CREATE TABLE schemaforge_warm_up (id INTEGER PRIMARY KEY, name VARCHAR(10));\n"
+
+
+class ServerError(SchemaForgeError):
+    """Raised when the server reports an error for a request."""
+
+    def __init__(self, message: str, code: int = OPERATION_FAILED):
+        super().__init__(message)
+        self.code = code
+
+
+class ServerUnavailable(ServerError):
+    """Raised when no compatible server answers on the socket."""
+    pass
+
+
+def default_socket_path() -> str:
+    """Returns ``$XDG_RUNTIME_DIR/schemaforge.sock`` or ``sf.sock`` in the cache directory."""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'schemaforge.sock')
+    from schemaforge.cache import default_cache_dir
+    return os.path.join(default_cache_dir(), 'sf.sock')
+
+
+def _version() -> str:
+    try:
+        from schemaforge.version import __version__
+    except ImportError:
+        return 'Unknown'
+    return __version__
+
+
+def _read_line(sock_file) -> Optional[dict]:
+    line = sock_file.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def call(socket_path: str, method: str, params: Optional[dict] = None, timeout: Optional[float] = None):
+    """
+    Sends one request to the server at ``socket_path`` and returns its result.
+
+    Raises ServerUnavailable when nothing (or a different SchemaForge
+    version) answers, and ServerError when the request fails.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            raise ServerUnavailable(f"No SchemaForge server at {socket_path} ({e.strerror or e})")
+        sock.settimeout(timeout)
+        request = {"jsonrpc": JSONRPC, "id": 1, "method": method, "params": params or {}}
+        with sock.makefile('rwb') as sock_file:
+            sock_file.write(json.dumps(request).encode('utf-8') + b'\n')
+            sock_file.flush()
+            try:
+                response = _read_line(sock_file)
+            except ValueError as e:
+                raise ServerError(f"Invalid response from server: {e}")
+    finally:
+        sock.close()
+    if response is None:
+        raise ServerUnavailable(f"SchemaForge server at {socket_path} closed the connection")
+    error = response.get("error")
+    if error:
+        if error.get("code") == VERSION_MISMATCH:
+            raise ServerUnavailable(error.get("message", "Version mismatch"), VERSION_MISMATCH)
+        raise ServerError(error.get("message", "Unknown server error"), error.get("code", OPERATION_FAILED))
+    return response.get("result")
+
+
+def _log_level(verbose: int) -> int:
+    import logging
+    # Same mapping as setup_logging()
+    if verbose >= 2:
+        return logging.DEBUG
+    return logging.INFO if verbose == 1 else logging.WARNING
+
+
+class SchemaServer:
+    """Serves compare/snapshot requests with warm parsers and a fragment LRU."""
+
+    def __init__(self, socket_path: Optional[str] = None, cache_bytes: Optional[int] = None):
+        from schemaforge.cache import DEFAULT_MAX_BYTES, MemoryParseCache
+        from schemaforge.logging_config import get_logger
+
+        self.socket_path = os.path.abspath(socket_path or default_socket_path())
+        self.cache = MemoryParseCache(cache_bytes or DEFAULT_MAX_BYTES)
+        self.parsers = {}
+        self.requests = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.logger = get_logger("server")
+        self._stopping = False
+        self._server = None
+
+    def parser(self, dialect: str, strict: bool = False):
+        """Returns the warm parser for ``dialect``, creating it on first use."""
+        key = (dialect, strict)
+        parser_instance = self.parsers.get(key)
+        if parser_instance is None:
+            from schemaforge.main import get_parser
+            parser_instance = self.parsers[key] = get_parser(dialect, strict=strict)
+        return parser_instance
+
+    def warm(self, dialect: str):
+        """Imports ``dialect`` and runs its parser once."""
+        self.parser(dialect).parse(_WARM_UP_SQL)
+
+    # -- request handling ----------------------------------------------------
+
+    def dispatch(self, request) -> Optional[dict]:
+        """Handles one decoded JSON-RPC request and returns the response."""
+        if not isinstance(request, dict) or request.get("jsonrpc") != JSONRPC or not isinstance(request.get("method"), str):
+            return self._error(None, INVALID_REQUEST, "Invalid JSON-RPC 2.0 request")
+        request_id = request.get("id")
+        params = request.get("params") or {}
+        handler = getattr(self, f"_rpc_{request['method']}", None)
+        if handler is None:
+            return self._error(request_id, METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+        if not isinstance(params, dict):
+            return self._error(request_id, INVALID_PARAMS, "params must be an object")
+        self.requests += 1
+        try:
+            result = handler(params)
+        except ServerError as e:
+            return self._error(request_id, e.code, str(e))
+        except Exception as e:
+            self.logger.debug(f"{request['method']} failed: {e}")
+            return self._error(request_id, OPERATION_FAILED, str(e))
+        return {"jsonrpc": JSONRPC, "id": request_id, "result": result}
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> dict:
+        return {"jsonrpc": JSONRPC, "id": request_id, "error": {"code": code, "message": message}}
+
+    def _rpc_ping(self, params: dict) -> dict:
+        return {"version": _version(), "pid": os.getpid()}
+
+    def _rpc_stats(self, params: dict) -> dict:
+        return {
+            "requests": self.requests,
+            "parsers": sorted(f"{dialect}{' (strict)' if strict else ''}" for dialect, strict in self.parsers),
+            "cache_entries": len(self.cache),
+            "cache_bytes": self.cache.total_bytes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    def _rpc_shutdown(self, params: dict) -> dict:
+        self._stopping = True
+        return {}
+
+    def _rpc_compare(self, params: dict) -> dict:
+        import functools
+        from schemaforge.main import run_compare
+        return self._run(functools.partial(run_compare, fingerprints=True), params)
+
+    def _rpc_snapshot(self, params: dict) -> dict:
+        from schemaforge.main import run_snapshot
+        return self._run(run_snapshot, params)
+
+    def _run(self, func, params: dict) -> dict:
+        """
+        Runs a CLI operation with the warm parser and the fragment cache.
+
+        What it prints and logs (at the client's verbosity) is returned as
+        ``output`` and ``messages`` for the client to replay.
+        """
+        import argparse
+        import contextlib
+        import io
+        import logging
+        from schemaforge.main import PARSERS
+
+        if params.get("version", _version()) != _version():
+            raise ServerError(f"Server runs SchemaForge {_version()}, client {params.get('version')}", VERSION_MISMATCH)
+        options = params.get("args")
+        if not isinstance(options, dict) or options.get("dialect") not in PARSERS:
+            raise ServerError("args must be the CLI options of a supported dialect", INVALID_PARAMS)
+        args = argparse.Namespace(**options)
+
+        messages = []
+
+        class _Capture(logging.Handler):
+            def emit(self, record):
+                messages.append([record.name, record.levelno, record.getMessage()])
+
+        root = logging.getLogger("schemaforge")
+        level = _log_level(options.get("verbose") or 0)
+        saved_level = root.level
+        capture = _Capture(level)
+        root.addHandler(capture)
+        root.setLevel(min(saved_level or logging.WARNING, level))
+        output = io.StringIO()
+        self.cache.hits = self.cache.misses = 0
+        try:
+            with contextlib.redirect_stdout(output):
+                func(args, self.cache, self.parser(args.dialect, bool(options.get("strict"))))
+        finally:
+            root.removeHandler(capture)
+            root.setLevel(saved_level)
+            self.cache_hits += self.cache.hits
+            self.cache_misses += self.cache.misses
+        return {"output": output.getvalue(), "messages": messages}
+
+    # -- socket loop ---------------------------------------------------------
+
+    def _bind(self):
+        import socketserver
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            timeout = IDLE_TIMEOUT
+
+            def handle(self):
+                while not server._stopping:
+                    try:
+                        line = self.rfile.readline()
+                    except OSError:
+                        return
+                    if not line:
+                        return
+                    try:
+                        request = json.loads(line)
+                    except ValueError as e:
+                        response = server._error(None, PARSE_ERROR, f"Parse error: {e}")
+                    else:
+                        response = server.dispatch(request)
+                    self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+
+        if os.path.exists(self.socket_path):
+            try:
+                call(self.socket_path, "ping")
+            except ServerUnavailable:
+                os.remove(self.socket_path)  # left behind by a server that died
+            else:
+                raise ServerError(f"A SchemaForge server is already running on {self.socket_path}")
+        os.makedirs(os.path.dirname(self.socket_path), mode=0o700, exist_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = socketserver.UnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.timeout = 0.5
+
+    def serve_forever(self):
+        """Serves until a ``shutdown`` request, SIGTERM or Ctrl-C."""
+        import signal
+
+        self._bind()
+        previous = signal.signal(signal.SIGTERM, lambda *_: self.stop()) if _is_main_thread() else None
+        self.logger.info(f"SchemaForge {_version()} serving on {self.socket_path}")
+        try:
+            while not self._stopping:
+                self._server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+            if previous is not None:
+                signal.signal(signal.SIGTERM, previous)
+            self.logger.info("SchemaForge server stopped")
+
+    def stop(self):
+        self._stopping = True
+
+
+def _is_main_thread() -> bool:
+    import threading
+    return threading.current_thread() is threading.main_thread()
@@ -0,0 +1,201 @@
+"""
+SchemaForge Schema Snapshots
+
+A snapshot is a parsed Schema saved to disk so an unchanged source (for
+example the ``main`` branch in CI) does not have to be parsed again.
+
+File layout::
+
+    b"SFSNAP" | format (uint16, big endian) | header length (uint32) |
+    header (UTF-8 JSON) | payload (pickled Schema)
+
+The header records the dialect, strict flag, tool versions and a SHA-256
+per source file, so staleness is decided without unpickling the payload.
+Snapshots are pickles: only load snapshots you produced yourself.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import tempfile
+from typing import Callable, Optional, Tuple
+
+from schemaforge.exceptions import SchemaForgeError
+from schemaforge.logging_config import get_logger
+from schemaforge.models import Schema
+from schemaforge.source import list_sql_files
+
+SNAPSHOT_MAGIC = b'SFSNAP'
+# Bump when the header or payload layout changes
+SNAPSHOT_FORMAT = 1
+
+_PREAMBLE = struct.Struct('>HI')
+
+
+class SnapshotError(SchemaForgeError):
+    """Raised when a snapshot cannot be read or is unusable."""
+    pass
+
+
+def _tool_versions() -> dict:
+    import sqlglot
+    import sqlparse
+    try:
+        from schemaforge.version import __version__ as version
+    except ImportError:
+        version = 'Unknown'
+    return {'schemaforge': version, 'sqlglot': sqlglot.__version__, 'sqlparse': sqlparse.__version__}
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def source_hashes(source: str) -> dict:
+    """Returns ``{relative path: sha256}`` for every file of a schema source."""
+    files = list_sql_files(source)
+    root = source if os.path.isdir(source) else os.path.dirname(source)
+    return {os.path.relpath(path, root).replace(os.sep, '/'): _hash_file(path) for path in files}
+
+
+def write_snapshot(path: str, schema: Schema, dialect: str, source: str, strict: bool = False) -> dict:
+    """
+    Writes ``schema`` parsed from ``source`` to ``path`` and returns the header.
+
+    ``source`` is recorded as an absolute path, so the snapshot can be checked
+    from another working directory. The file is replaced atomically, so
+    readers never see a partial snapshot.
+    """
+    payload = pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL)
+    header = {
+        'dialect': dialect,
+        'strict': strict,
+        'versions': _tool_versions(),
+        'source': os.path.abspath(source),
+        'files': source_hashes(source),
+        'tables': len(schema.tables),
+        'payload_size': len(payload),
+    }
+    header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(_PREAMBLE.pack(SNAPSHOT_FORMAT, len(header_bytes)))
+            f.write(header_bytes)
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return header
+
+
+def _read_preamble(f, path: str) -> dict:
+    magic = f.read(len(SNAPSHOT_MAGIC))
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"{path} is not a SchemaForge snapshot")
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) != _PREAMBLE.size:
+        raise SnapshotError(f"{path}: truncated snapshot")
+    version, header_size = _PREAMBLE.unpack(preamble)
+    if version != SNAPSHOT_FORMAT:
+        raise SnapshotError(f"{path}: unsupported snapshot format {version} (expected {SNAPSHOT_FORMAT})")
+    try:
+        return json.loads(f.read(header_size).decode('utf-8'))
+    except ValueError as e:
+        raise SnapshotError(f"{path}: corrupt snapshot header: {e}")
+
+
+def read_header(path: str) -> dict:
+    """Returns the header of a snapshot without loading the schema."""
+    with open(path, 'rb') as f:
+        return _read_preamble(f, path)
+
+
+def load_snapshot(path: str) -> Tuple[dict, Schema]:
+    """Returns ``(header, schema)`` stored in a snapshot."""
+    with open(path, 'rb') as f:
+        header = _read_preamble(f, path)
+        payload = f.read()
+    if len(payload) != header.get('payload_size'):
+        raise SnapshotError(f"{path}: truncated snapshot")
+    try:
+        schema = pickle.loads(payload)
+    except Exception as e:
+        raise SnapshotError(f"{path}: corrupt snapshot payload: {e}")
+    return header, schema
+
+
+def stale_reason(header: dict, dialect: str, strict: bool = False, source: Optional[str] = None) -> Optional[str]:
+    """
+    Returns why a snapshot no longer matches, or None if it is current.
+
+    ``source`` defaults to the path recorded in the snapshot. When that path
+    does not exist (a CI job that only has the snapshot) the file hashes
+    cannot be checked; the snapshot is used as is and a warning is logged.
+    """
+    if header.get('dialect') != dialect:
+        return f"dialect {header.get('dialect')} != {dialect}"
+    if bool(header.get('strict')) != bool(strict):
+        return "strict mode differs"
+    versions = _tool_versions()
+    for tool, version in versions.items():
+        if header.get('versions', {}).get(tool) != version:
+            return f"{tool} {header.get('versions', {}).get(tool)} != {version}"
+
+    source = source or header.get('source')
+    if not source:
+        return None
+    if not os.path.exists(source):
+        get_logger("snapshot").warning(f"Snapshot source {source} does not exist; its files were not checked")
+        return None
+    if source_hashes(source) != header.get('files'):
+        return f"files under {source} changed"
+    return None
+
+
+def load_or_rebuild(path: str, dialect: str, parse: Callable[[str], Schema], strict: bool = False,
+                    source: Optional[str] = None) -> Schema:
+    """
+    Loads the schema from the snapshot at ``path``, rebuilding it first if stale.
+
+    ``parse(source)`` parses the source when the snapshot is missing,
+    unreadable or stale; the result is written back to ``path``.
+    """
+    logger = get_logger("snapshot")
+    header = None
+    reason = None
+    if os.path.exists(path):
+        try:
+            # The payload is only unpickled once the header says it is current
+            header = read_header(path)
+            reason = stale_reason(header, dialect, strict, source)
+            if reason is None:
+                header, schema = load_snapshot(path)
+                logger.info(f"Loaded snapshot {path} ({len(schema.tables)} tables)")
+                return schema
+        except (SnapshotError, OSError) as e:
+            reason = str(e)
+    else:
+        reason = "snapshot does not exist"
+
+    source = source or (header or {}).get('source')
+    if not source or not os.path.exists(source):
+        raise SnapshotError(f"Snapshot {path} is unusable ({reason}) and its source is not available")
+
+    logger.warning(f"Rebuilding snapshot {path}: {reason}")
+    schema = parse(source)
+    write_snapshot(path, schema, dialect, source, strict)
+    return schema
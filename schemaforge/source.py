@@ -0,0 +1,151 @@
+"""
+SchemaForge SQL Sources
+
+Streams statements out of a schema source (a file or a directory of
+``.sql`` files) without building one big string. Each file is memory-mapped
+and split at top-level ``;`` boundaries; only the current statement is
+decoded. Every statement remembers its file and line for error messages.
+"""
+
+import mmap
+import os
+from typing import Iterator, List, Optional
+
+from schemaforge.parsers.splitter import iter_statement_spans
+
+
+class SqlStatement(str):
+    """
+    Statement text that remembers where it came from.
+
+    Behaves like a plain ``str`` everywhere; ``path``/``line`` point at the
+    first non-blank character of the statement.
+    """
+
+    def __new__(cls, text: str, path: Optional[str] = None, line: int = 1):
+        obj = super().__new__(cls, text)
+        obj.path = path
+        obj.line = line
+        return obj
+
+    def __getnewargs__(self):
+        return (str(self), self.path, self.line)
+
+    @property
+    def location(self) -> str:
+        return self.location_at(0)
+
+    def location_at(self, offset: int) -> str:
+        """``path:line`` of the character at ``offset`` (at or after the first non-blank one)."""
+        line = self.line
+        if offset:
+            line += self.count('\n', len(self) - len(self.lstrip()), offset)
+        if self.path:
+            return f"{self.path}:{line}"
+        return f"line {line}"
+
+
+def _normalize_newlines(text: str) -> str:
+    # Same translation as reading the file in text mode
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def iter_statements(buf, path: Optional[str] = None, batch_separator: bool = False,
+                    backslash_escapes: bool = False) -> Iterator[SqlStatement]:
+    """
+    Yields the non-blank statements of ``buf`` as SqlStatement objects.
+
+    ``buf`` is a ``str`` or a bytes-like object (``bytes``, ``mmap``); bytes
+    are decoded as UTF-8 one statement at a time.
+    """
+    is_bytes = not isinstance(buf, str)
+    newline = b'\n' if is_bytes else '\n'
+    line = 1
+    pos = 0
+    for start, end in iter_statement_spans(buf, batch_separator, backslash_escapes):
+        if start != pos:
+            # Skipped separator (a T-SQL GO line) between two statements
+            line += buf[pos:start].count(newline)
+        chunk = buf[start:end]
+        if is_bytes:
+            chunk = _normalize_newlines(chunk.decode('utf-8', errors='replace'))
+        stripped = chunk.lstrip()
+        if stripped:
+            leading = len(chunk) - len(stripped)
+            yield SqlStatement(chunk, path, line + chunk.count('\n', 0, leading))
+        line += chunk.count('\n')
+        pos = end
+
+
+def list_sql_files(path: str) -> List[str]:
+    """
+    Returns the SQL files making up a source: the file itself, or every
+    ``.sql`` file below a directory in sorted order.
+    """
+    import glob
+
+    if os.path.isfile(path):
+        return [path]
+
+    elif os.path.isdir(path):
+        # Recursive glob for .sql files
+        sql_files = glob.glob(os.path.join(path, '**/*.sql'), recursive=True)
+        # Sort to ensure deterministic order
+        sql_files.sort()
+
+        if not sql_files:
+            raise ValueError(f"No .sql files found in directory: {path}")
+        return sql_files
+
+    else:
+        raise ValueError(f"Path not found: {path}")
+
+
+class SqlSource:
+    """
+    A schema source on disk: one ``.sql`` file or a directory tree of them.
+
+    Files are visited in list_sql_files() order. A statement never spans two
+    files, so a file's last statement ends at the end of the file even
+    without a terminating ``;``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files = list_sql_files(path)
+        self._file_starts = None
+
+    def iter_statements(self, batch_separator: bool = False,
+                        backslash_escapes: bool = False) -> Iterator[SqlStatement]:
+        """Lazily yields every statement of every file in order."""
+        for sql_file in self.files:
+            with open(sql_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    yield from iter_statements(mm, sql_file, batch_separator, backslash_escapes)
+
+    def locate(self, line: int) -> str:
+        """Maps a line of read_text() back to ``path:line``."""
+        import bisect
+        if self._file_starts is None:
+            # read_text() joins the files with a newline, so each file
+            # spans its newline count plus one lines
+            starts, first = [], 1
+            for sql_file in self.files:
+                starts.append(first)
+                with open(sql_file, 'r', encoding='utf-8', errors='replace') as f:
+                    first += f.read().count('\n') + 1
+            self._file_starts = starts
+        index = max(0, bisect.bisect_right(self._file_starts, line) - 1)
+        return f"{self.files[index]}:{line - self._file_starts[index] + 1}"
+
+    def read_text(self) -> str:
+        """Returns the whole source as one string (files joined by newlines)."""
+        content = []
+        for sql_file in self.files:
+            with open(sql_file, 'r', encoding='utf-8', errors='replace') as f:
+                content.append(f.read())
+        return "\n".join(content)
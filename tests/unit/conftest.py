@@ -0,0 +1,25 @@
+"""
+Shared fixtures for the unit tests.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from schemaforge.main import main
+
+
+@pytest.fixture
+def run_compare(tmp_path):
+    """
+    Runs `sf compare` from v1.sql (``source_sql``) to v2.sql (``target_sql``),
+    both written to ``tmp_path``, with the CLI ``flags`` (``--dialect`` included).
+    """
+    def run(source_sql, target_sql, *flags):
+        source = tmp_path / 'v1.sql'
+        target = tmp_path / 'v2.sql'
+        source.write_text(source_sql)
+        target.write_text(target_sql)
+        argv = ['schemaforge', 'compare', '--source', str(source), '--target', str(target), *flags]
+        with patch('sys.argv', argv):
+            main()
+    return run
@@ -0,0 +1,147 @@
+"""
+Tests for `sf compare-batch` (schemaforge.batch).
+"""
+import argparse
+import json
+from unittest.mock import patch
+
+import pytest
+
+from schemaforge import main as cli
+from schemaforge.batch import BatchPair, ManifestError, load_manifest, run_batch
+from schemaforge.main import PARSERS, main
+
+
+def _tenants(tmp_path):
+    golden = tmp_path / 'golden'
+    golden.mkdir()
+    (golden / 'schema.sql').write_text("CREATE TABLE users (id INT PRIMARY KEY, email TEXT);\n")
+    for name, sql in (('t1', "CREATE TABLE users (id INT PRIMARY KEY);\n"),
+                      ('t2', "CREATE TABLE users (id INT PRIMARY KEY, email TEXT);\n")):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'schema.sql').write_text(sql)
+    manifest = tmp_path / 'pairs.json'
+    manifest.write_text(json.dumps({"dialect": "postgres", "target": "golden",
+                                    "pairs": [{"source": "t1"}, {"source": "t2"}]}))
+    return manifest
+
+
+def _args(out, **options):
+    values = dict(out=str(out), jobs=1, strict=False, detect_renames=False, rename_threshold=None, stats=None,
+                  online=False, lock_timeout=None, generate_rollback=False, no_color=True, verbose=0)
+    values.update(options)
+    return argparse.Namespace(**values)
+
+
+class TestManifest:
+    """Manifest loading, defaults and validation"""
+
+    def test_defaults_and_relative_paths(self, tmp_path):
+        manifest = _tenants(tmp_path)
+        pairs = load_manifest(str(manifest))
+        assert pairs == [
+            BatchPair('t1', str(tmp_path / 't1'), str(tmp_path / 'golden'), 'postgres'),
+            BatchPair('t2', str(tmp_path / 't2'), str(tmp_path / 'golden'), 'postgres'),
+        ]
+
+    def test_yaml(self, tmp_path):
+        pytest.importorskip('yaml')
+        manifest = tmp_path / 'pairs.yaml'
+        manifest.write_text("target: golden\npairs:\n  - {name: acme, source: tenants/acme, dialect: mysql}\n")
+        pair, = load_manifest(str(manifest), dialect='postgres')
+        assert (pair.name, pair.dialect, pair.source) == ('acme', 'mysql', str(tmp_path / 'tenants' / 'acme'))
+
+    def test_yaml_without_pyyaml(self, tmp_path):
+        manifest = tmp_path / 'pairs.yml'
+        manifest.write_text("pairs: []\n")
+        with patch.dict('sys.modules', {'yaml': None}), pytest.raises(ManifestError, match='PyYAML'):
+            load_manifest(str(manifest))
+
+    @pytest.mark.parametrize('content, message', [
+        ('{"pairs": [{"source": "a", "target": "b"}]}', 'has no dialect'),
+        ('{"dialect": "access", "pairs": [{"source": "a", "target": "b"}]}', 'unsupported dialect'),
+        ('{"dialect": "mysql", "target": "b", "pairs": [{"source": "x/a"}, {"source": "y/a"}]}', 'Duplicate pair name'),
+        ('{"dialect": "mysql", "target": "b", "pairs": [{"name": "../a", "source": "a"}]}', 'invalid name'),
+        ('{"dialect": "mysql", "target": "b", "pairs": [{"name": "summary", "source": "a"}]}', 'summary.json'),
+        ('{"dialect": "mysql", "pairs": [{"source": "a", "target": "b", "sql_out": "x"}]}', 'unknown keys: sql_out'),
+        ('{"pairs": {}}', 'list of pairs'),
+        ('{not json', 'Invalid manifest'),
+    ])
+    def test_errors(self, tmp_path, content, message):
+        manifest = tmp_path / 'pairs.json'
+        manifest.write_text(content)
+        with pytest.raises(ManifestError, match=message):
+            load_manifest(str(manifest), dialects=PARSERS)
+
+
+class TestRunBatch:
+    """Each distinct schema is parsed once and every pair is compared"""
+
+    def test_each_schema_is_parsed_once(self, tmp_path):
+        pairs = load_manifest(str(_tenants(tmp_path)))
+        with patch.object(cli, 'parse_source', wraps=cli.parse_source) as parse_source:
+            summary = run_batch(pairs, _args(tmp_path / 'out'))
+        assert parse_source.call_count == 3
+        assert summary["totals"] == {"changed": 1, "unchanged": 1, "failed": 0}
+        assert 'ADD COLUMN "email"' in (tmp_path / 'out' / 't1.sql').read_text()
+        assert json.loads((tmp_path / 'out' / 't2.json').read_text())["modified_tables"] == []
+        assert json.loads((tmp_path / 'out' / 'summary.json').read_text()) == summary
+
+    def test_shared_target_is_fingerprinted_once(self, tmp_path):
+        from schemaforge.comparator import Comparator
+        pairs = load_manifest(str(_tenants(tmp_path)))
+        with patch.object(Comparator, '_unchanged', autospec=True, side_effect=Comparator._unchanged) as unchanged:
+            run_batch(pairs, _args(tmp_path / 'out'))
+        targets = [call.args[2] for call in unchanged.call_args_list]
+        assert len(targets) == 2 and targets[0] is targets[1]
+        assert targets[0].fingerprint(compute=False) is not None
+
+    def test_pool_matches_serial(self, tmp_path):
+        pairs = load_manifest(str(_tenants(tmp_path)))
+        serial = run_batch(pairs, _args(tmp_path / 'serial', generate_rollback=True))
+        pooled = run_batch(pairs, _args(tmp_path / 'pooled', generate_rollback=True, jobs=2))
+        for name in ('t1.sql', 't1.rollback.sql', 't1.json', 't2.sql'):
+            assert (tmp_path / 'serial' / name).read_text() == (tmp_path / 'pooled' / name).read_text()
+        assert [entry["status"] for entry in pooled["results"]] == [entry["status"] for entry in serial["results"]]
+
+    def test_failures_are_isolated(self, tmp_path):
+        _tenants(tmp_path)
+        (tmp_path / 'broken').mkdir()
+        (tmp_path / 'broken' / 'schema.sql').write_text("CREATE TABLE (\n")
+        golden = str(tmp_path / 'golden')
+        pairs = [BatchPair('t1', str(tmp_path / 't1'), golden, 'postgres'),
+                 BatchPair('broken', str(tmp_path / 'broken'), golden, 'postgres'),
+                 BatchPair('gone', str(tmp_path / 'gone'), golden, 'postgres')]
+        summary = run_batch(pairs, _args(tmp_path / 'out', strict=True))
+        assert [entry["status"] for entry in summary["results"]] == ["changed", "failed", "failed"]
+        assert str(tmp_path / 'gone') in summary["results"][2]["error"]
+        assert not (tmp_path / 'out' / 'broken.sql').exists()
+
+
+class TestCompareBatchCli:
+    """`sf compare-batch`"""
+
+    def test_summary_and_exit_code(self, tmp_path, capsys):
+        manifest = _tenants(tmp_path)
+        argv = ['schemaforge', 'compare-batch', '--manifest', str(manifest), '--out', str(tmp_path / 'out')]
+        with patch('sys.argv', argv):
+            main()
+        out = capsys.readouterr().out
+        assert "2 pairs (3 schemas parsed" in out and "1 changed, 1 unchanged, 0 failed" in out
+
+        data = json.loads(manifest.read_text())
+        data["pairs"].append({"name": "gone", "source": "gone"})
+        manifest.write_text(json.dumps(data))
+        with patch('sys.argv', argv), pytest.raises(SystemExit) as excinfo:
+            main()
+        assert excinfo.value.code == 1
+
+    def test_requires_manifest_and_out(self, tmp_path):
+        with patch('sys.argv', ['schemaforge', 'compare-batch', '--out', str(tmp_path)]), pytest.raises(SystemExit):
+            main()
+
+    def test_bad_manifest(self, tmp_path, capsys):
+        argv = ['schemaforge', 'compare-batch', '--manifest', str(tmp_path / 'none.json'), '--out', str(tmp_path)]
+        with patch('sys.argv', argv), pytest.raises(SystemExit) as excinfo:
+            main()
+        assert excinfo.value.code == 1 and "Cannot read manifest" in capsys.readouterr().err
@@ -0,0 +1,144 @@
+"""
+Tests for the synthetic schema generator, the benchmark baseline gate and
+the CLI import-time guard.
+"""
+import json
+
+import pytest
+
+from benchmarks.import_time import check as check_import, heavy_imports, import_times, parse_importtime
+from benchmarks.suite import compare_results, main as suite_main, measure
+from benchmarks.synthetic import DIALECTS, SchemaSpec, generate_pair, write_pair
+from schemaforge.comparator import Comparator
+from schemaforge.main import GENERATORS, PARSERS, get_generator, get_parser, read_sql_source
+
+SPEC = SchemaSpec(tables=12, columns=6, indexes=2, foreign_keys=1, views=4, change_fraction=0.5, seed=7)
+
+
+class TestSyntheticSchemas:
+    """Seeded synthetic schemas parse in every dialect"""
+
+    def test_seeded(self):
+        assert generate_pair('postgres', SPEC) == generate_pair('postgres', SPEC)
+        other = SchemaSpec(**{**SPEC.__dict__, 'seed': 8})
+        assert generate_pair('postgres', other) != generate_pair('postgres', SPEC)
+
+    @pytest.mark.parametrize('dialect', DIALECTS)
+    def test_parses_in_every_dialect(self, dialect):
+        source_sql, target_sql = generate_pair(dialect, SPEC)
+        source = get_parser(dialect).parse(source_sql)
+        assert len(source.tables) == SPEC.tables
+        assert sum(len(t.foreign_keys) for t in source.tables) == SPEC.tables - 1
+        if dialect != 'snowflake':
+            assert sum(len(t.indexes) for t in source.tables) == SPEC.tables * SPEC.indexes
+        plan = Comparator(dialect=dialect).compare(source, get_parser(dialect).parse(target_sql))
+        assert plan.modified_tables and plan.dropped_tables and plan.new_tables
+
+    def test_no_changes(self):
+        source_sql, target_sql = generate_pair('mysql', SchemaSpec(**{**SPEC.__dict__, 'change_fraction': 0.0}))
+        assert source_sql == target_sql
+
+    def test_write_pair_splits_files(self, tmp_path):
+        source_dir, target_dir = write_pair(str(tmp_path), 'sqlite', SPEC, files=3)
+        assert len(list(tmp_path.joinpath('source').iterdir())) == 3
+        assert len(get_parser('sqlite').parse(read_sql_source(source_dir)).tables) == SPEC.tables
+
+    def test_unknown_dialect(self):
+        with pytest.raises(ValueError):
+            generate_pair('access')
+
+
+class TestBaselineGate:
+    """Regressions against a baseline fail the gate"""
+
+    BASE = {"results": {"parse.postgres": {"seconds": 1.0, "peak_bytes": 100 * 1024 * 1024}}}
+
+    def _current(self, seconds, peak_bytes):
+        return {"results": {"parse.postgres": {"seconds": seconds, "peak_bytes": peak_bytes}}}
+
+    def test_within_threshold(self):
+        assert compare_results(self.BASE, self._current(1.15, 110 * 1024 * 1024), max_regression=0.2) == []
+
+    def test_time_regression(self):
+        regression, = compare_results(self.BASE, self._current(1.5, 100 * 1024 * 1024), max_regression=0.2)
+        assert regression.startswith('parse.postgres seconds') and '+50%' in regression
+
+    def test_memory_regression(self):
+        regression, = compare_results(self.BASE, self._current(1.0, 200 * 1024 * 1024))
+        assert 'peak_bytes' in regression
+
+    def test_noise_floor(self):
+        base = {"results": {"json.mysql": {"seconds": 0.001, "peak_bytes": 1000}}}
+        current = {"results": {"json.mysql": {"seconds": 0.005, "peak_bytes": 5000}}}
+        assert compare_results(base, current) == []
+
+    def test_new_benchmarks_are_ignored(self):
+        current = {"results": {"parse.db2": {"seconds": 9.0, "peak_bytes": 1}}}
+        assert compare_results(self.BASE, current) == []
+
+    def test_compare_command_exit_code(self, tmp_path, capsys):
+        base, current = tmp_path / 'base.json', tmp_path / 'current.json'
+        base.write_text(json.dumps(self.BASE))
+        current.write_text(json.dumps(self._current(2.0, 100 * 1024 * 1024)))
+        assert suite_main(['compare', str(base), str(current)]) == 1
+        assert 'REGRESSION: parse.postgres seconds' in capsys.readouterr().out
+        assert suite_main(['compare', str(base), str(base)]) == 0
+
+
+class TestRun:
+    """Benchmark runs and their results file"""
+
+    def test_measure(self):
+        result = measure(lambda: [0] * 100000, repeat=2)
+        assert result["seconds"] >= 0 and result["peak_bytes"] >= 800000
+
+    def test_run_writes_results(self, tmp_path):
+        out = tmp_path / 'results.json'
+        argv = ['run', '--dialects', 'sqlite', '--tables', '5', '--views', '2', '--repeat', '1', '--out', str(out)]
+        assert suite_main(argv) == 0
+        results = json.loads(out.read_text())
+        assert sorted(results["results"]) == ['compare.sqlite', 'generate.sqlite', 'json.sqlite',
+                                              'parse.sqlite', 'read_sql_source.sqlite']
+        assert results["spec"]["tables"] == 5
+
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       300 |        300 | site
+import time:       120 |        120 |     sqlparse.tokens
+import time:      2000 |       2120 |   sqlparse
+import time:       500 |        500 |   argparse
+import time:      1000 |       3620 | schemaforge.main
+"""
+
+
+class TestImportTime:
+    """CLI startup imports no dialect or SQL library"""
+
+    def test_parse(self):
+        assert parse_importtime(IMPORTTIME)["site"] == 300
+        assert parse_importtime(IMPORTTIME, 'schemaforge.main') == {
+            'sqlparse.tokens': 120, 'sqlparse': 2120, 'argparse': 500, 'schemaforge.main': 3620}
+
+    def test_checks(self):
+        current = {"module": "schemaforge.main", "milliseconds": 80.0, "heavy_imports": ["sqlglot"]}
+        failures = check_import(current, {"milliseconds": 50.0}, max_ms=60)
+        assert failures == ["schemaforge.main imports sqlglot at startup",
+                            "schemaforge.main import takes 80.0ms (budget 60.0ms)",
+                            "schemaforge.main import: 50.0ms -> 80.0ms (+60%)"]
+        assert check_import({**current, "heavy_imports": [], "milliseconds": 52.0}, {"milliseconds": 50.0}) == []
+
+    def test_cli_does_not_import_dialects(self):
+        imported = import_times(runs=1)
+        assert heavy_imports(imported) == []
+        assert not [name for name in imported
+                    if name.startswith(('schemaforge.generators', 'schemaforge.comparator', 'schemaforge.parsers.'))
+                    and name != 'schemaforge.parsers.splitter']
+
+    def test_registries_resolve(self):
+        assert sorted(PARSERS) == sorted(GENERATORS) == sorted(DIALECTS)
+        for dialect in DIALECTS:
+            assert type(get_parser(dialect)).__name__ == PARSERS[dialect][1]
+            assert type(get_generator(dialect)).__name__ == GENERATORS[dialect][1]
+        with pytest.raises(ValueError, match='Unknown dialect'):
+            get_generator('access')
@@ -0,0 +1,198 @@
+"""
+Tests for lock/rewrite cost estimates (--stats).
+"""
+import json
+
+import pytest
+
+from schemaforge.comparator import Comparator
+from schemaforge.costs import (INDEX_BUILD, METADATA, REWRITE, TABLE_SCAN, CostModel, MySQLCostModel,
+                               PostgresCostModel, StatsError, TableStats, cost_model, estimate_costs, load_stats)
+from schemaforge.models import CheckConstraint, Column, ForeignKey, Index, Schema, Table
+
+GB = 1024 ** 3
+
+
+def _plan(old_columns, new_columns, **new_extra):
+    old, new = Schema(), Schema()
+    old.add_table(Table(name='orders', columns=old_columns))
+    new.add_table(Table(name='orders', columns=new_columns, **new_extra))
+    return Comparator().compare(old, new)
+
+
+BASE = [Column(name='id', data_type='INT', is_nullable=False), Column(name='note', data_type='VARCHAR(20)')]
+
+
+class TestLoadStats:
+    """Table stats from JSON and CSV files"""
+
+    def test_json_mapping(self, tmp_path):
+        path = tmp_path / 'stats.json'
+        path.write_text(json.dumps({"tables": {"Orders": {"rows": 1000, "bytes": 4096}}}))
+        assert load_stats(str(path)) == {'orders': TableStats(1000, 4096)}
+
+    def test_json_list(self, tmp_path):
+        path = tmp_path / 'stats.json'
+        path.write_text(json.dumps([{"table": "orders", "rows": 5, "bytes": 10}]))
+        assert load_stats(str(path)) == {'orders': TableStats(5, 10)}
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / 'stats.csv'
+        path.write_text("table,rows,bytes\norders,1e6,2147483648\nusers,,\n")
+        assert load_stats(str(path)) == {'orders': TableStats(1_000_000, 2 * GB), 'users': TableStats(0, 0)}
+
+    def test_invalid_number(self, tmp_path):
+        path = tmp_path / 'stats.csv'
+        path.write_text("table,rows,bytes\norders,many,1\n")
+        with pytest.raises(StatsError, match='rows'):
+            load_stats(str(path))
+
+    def test_missing_table_name(self, tmp_path):
+        path = tmp_path / 'stats.json'
+        path.write_text(json.dumps([{"rows": 1}]))
+        with pytest.raises(StatsError):
+            load_stats(str(path))
+
+    def test_unreadable(self, tmp_path):
+        with pytest.raises(StatsError, match='Cannot read'):
+            load_stats(str(tmp_path / 'missing.json'))
+
+
+class TestPostgresModel:
+    """Lock and rewrite classification of Postgres changes"""
+
+    def test_column_changes(self):
+        plan = _plan(BASE, [
+            Column(name='id', data_type='BIGINT', is_nullable=False),
+            Column(name='note', data_type='VARCHAR(40)', is_nullable=False),
+            Column(name='created', data_type='TIMESTAMP', default_value='now()'),
+            Column(name='token', data_type='UUID', default_value='gen_random_uuid()'),
+        ])
+        costs = PostgresCostModel().classify(plan.modified_tables[0])
+        assert ('add column created', METADATA, 'ACCESS EXCLUSIVE') in costs
+        assert ('add column token', REWRITE, 'ACCESS EXCLUSIVE') in costs
+        assert ('alter column id type BIGINT', REWRITE, 'ACCESS EXCLUSIVE') in costs
+        # VARCHAR widening is binary coercible; the new NOT NULL still scans
+        assert ('alter column note type VARCHAR(40)', METADATA, 'ACCESS EXCLUSIVE') in costs
+        assert ('alter column note set not null', TABLE_SCAN, 'ACCESS EXCLUSIVE') in costs
+
+    def test_set_not_null_scans(self):
+        plan = _plan(BASE, [BASE[0], Column(name='note', data_type='VARCHAR(20)', is_nullable=False)])
+        assert PostgresCostModel().classify(plan.modified_tables[0]) == [
+            ('alter column note set not null', TABLE_SCAN, 'ACCESS EXCLUSIVE')]
+        assert PostgresCostModel(online=True).classify(plan.modified_tables[0]) == [
+            ('alter column note set not null', TABLE_SCAN, 'SHARE UPDATE EXCLUSIVE')]
+
+    def test_index_and_constraints(self):
+        plan = _plan(BASE, BASE, indexes=[Index(name='ix_note', columns=['note'])],
+                     foreign_keys=[ForeignKey('fk_x', ['id'], 'x', ['id'])],
+                     check_constraints=[CheckConstraint(name='ck_id', expression='id > 0')])
+        diff = plan.modified_tables[0]
+        assert PostgresCostModel().classify(diff) == [
+            ('add index ix_note', INDEX_BUILD, 'SHARE'),
+            ('add check ck_id', TABLE_SCAN, 'ACCESS EXCLUSIVE'),
+            ('add foreign key fk_x', TABLE_SCAN, 'SHARE ROW EXCLUSIVE'),
+        ]
+        assert {lock for _, _, lock in PostgresCostModel(online=True).classify(diff)} == {'SHARE UPDATE EXCLUSIVE'}
+
+    def test_concurrent_index_takes_longer(self):
+        plan = _plan(BASE, BASE, indexes=[Index(name='ix_note', columns=['note'])])
+        stats = {'orders': TableStats(rows=2_000_000, bytes=GB)}
+        offline, = PostgresCostModel().estimate(plan, stats)
+        online, = PostgresCostModel(online=True).estimate(plan, stats)
+        assert online.seconds == 2 * offline.seconds == 4.0
+
+
+class TestMySQLModel:
+    """MySQL costs follow the algorithm the generator picks"""
+
+    def test_follows_generator_algorithms(self):
+        plan = _plan(BASE, [
+            Column(name='id', data_type='BIGINT', is_nullable=False),
+            Column(name='note', data_type='VARCHAR(40)'),
+            Column(name='extra', data_type='INT'),
+        ], indexes=[Index(name='ix_note', columns=['note'])])
+        assert MySQLCostModel().classify(plan.modified_tables[0]) == [
+            ('add column extra', METADATA, 'NONE'),
+            ('alter column id type BIGINT', REWRITE, 'SHARED'),
+            ('alter column note type VARCHAR(40)', METADATA, 'NONE'),
+            ('add index ix_note', INDEX_BUILD, 'NONE'),
+        ]
+
+    def test_nullability_rebuilds_in_place(self):
+        plan = _plan(BASE, [BASE[0], Column(name='note', data_type='VARCHAR(20)', is_nullable=False)])
+        assert MySQLCostModel().classify(plan.modified_tables[0]) == [('alter column note', REWRITE, 'NONE')]
+
+
+class TestEstimates:
+    """Durations estimated from table stats"""
+
+    def test_durations(self):
+        plan = _plan(BASE, [Column(name='id', data_type='BIGINT', is_nullable=False), BASE[1]])
+        cost, = estimate_costs(plan, {'orders': TableStats(rows=10, bytes=GB)}, 'oracle')
+        assert (cost.kind, cost.lock, cost.rows) == (REWRITE, 'EXCLUSIVE', 10)
+        assert cost.seconds == pytest.approx(GB / CostModel.rewrite_bytes_per_second)
+
+    def test_unknown_table_has_no_duration(self):
+        plan = _plan(BASE, [Column(name='id', data_type='BIGINT', is_nullable=False), BASE[1]])
+        cost, = estimate_costs(plan, {}, 'postgres')
+        assert cost.seconds is None and cost.rows is None
+
+    def test_metadata_is_free_without_stats(self):
+        plan = _plan(BASE, BASE + [Column(name='extra', data_type='INT')])
+        cost, = estimate_costs(plan, {}, 'postgres')
+        assert cost.seconds == 0.0
+
+    def test_schema_qualified_lookup(self):
+        old, new = Schema(), Schema()
+        old.add_table(Table(name='sales.orders', columns=BASE))
+        new.add_table(Table(name='sales.orders', columns=BASE + [Column(name='x', data_type='INT')],
+                            indexes=[Index(name='ix_x', columns=['x'])]))
+        costs = estimate_costs(Comparator().compare(old, new), {'orders': TableStats(1_000_000, GB)}, 'postgres')
+        assert costs[-1].seconds == 1.0
+
+    def test_cost_model_per_dialect(self):
+        assert type(cost_model('postgres')) is PostgresCostModel
+        assert type(cost_model('mysql')) is MySQLCostModel
+        assert type(cost_model('db2')) is CostModel
+
+    def test_plan_to_dict(self):
+        plan = _plan(BASE, BASE + [Column(name='extra', data_type='INT')])
+        assert 'costs' not in plan.to_dict()
+        plan.costs = estimate_costs(plan, {'orders': TableStats(5, 10)}, 'postgres')
+        assert plan.to_dict()['costs'] == [{
+            "table": "orders", "operation": "add column extra", "kind": "metadata",
+            "lock": "ACCESS EXCLUSIVE", "rows": 5, "estimated_seconds": 0.0,
+        }]
+
+
+class TestStatsCli:
+    """`sf compare --stats`"""
+
+    SOURCE = "CREATE TABLE orders (id INT PRIMARY KEY, note TEXT);\n"
+    TARGET = "CREATE TABLE orders (id BIGINT PRIMARY KEY, note TEXT);\n"
+
+    def _stats(self, tmp_path):
+        stats = tmp_path / 'stats.csv'
+        stats.write_text(f"table,rows,bytes\norders,1000000,{GB}\n")
+        return stats
+
+    def test_plan_shows_costs(self, tmp_path, run_compare, capsys):
+        run_compare(self.SOURCE, self.TARGET, '--dialect', 'postgres', '--stats', str(self._stats(tmp_path)),
+                    '--plan', '--no-color')
+        out = capsys.readouterr().out
+        assert 'Cost Estimates:' in out
+        assert 'orders: alter column id type BIGINT [rewrite, lock ACCESS EXCLUSIVE, ~20.5s]' in out
+        assert 'Total: ~20.5s' in out
+
+    def test_json_out(self, tmp_path, run_compare):
+        out = tmp_path / 'plan.json'
+        run_compare(self.SOURCE, self.TARGET, '--dialect', 'postgres', '--stats', str(self._stats(tmp_path)),
+                    '--json-out', str(out))
+        cost, = json.loads(out.read_text())['costs']
+        assert (cost['kind'], cost['rows']) == ('rewrite', 1000000)
+
+    def test_bad_stats_file_fails(self, tmp_path, run_compare):
+        with pytest.raises(SystemExit):
+            run_compare(self.SOURCE, self.TARGET, '--dialect', 'postgres', '--stats', str(tmp_path / 'missing.csv'),
+                        '--plan')
@@ -303,5 +303,26 @@ class TestDB2Scenarios(unittest.TestCase):
         # We need to verify if DB2Parser supports this context.
         pass
 
+class TestDB2PropertyScoping(unittest.TestCase):
+    """z/OS attributes come from each table's own statement"""
+
+    def test_attributes_do_not_leak_between_tables(self):
+        sql = """
+        CREATE TABLE A (ID INT) IN DBA.TSA USING STOGROUP SGA PRIQTY 100 SECQTY 10 AUDIT ALL CCSID EBCDIC;
+        CREATE TABLE B (ID INT) IN DBB.TSB;
+        CREATE TABLE C (ID INT) IN TSC USING STOGROUP SGC PRIQTY 300;
+        """
+        schema = DB2Parser().parse(sql)
+        a, b, c = (schema.get_table(n) for n in ('a', 'b', 'c'))
+        self.assertEqual((a.database_name, a.tablespace, a.stogroup, a.priqty, a.secqty, a.audit, a.ccsid),
+                         ('dba', 'tsa', 'sga', 100, 10, 'all', 'ebcdic'))
+        self.assertEqual((b.database_name, b.tablespace), ('dbb', 'tsb'))
+        self.assertIsNone(b.stogroup)
+        self.assertIsNone(b.priqty)
+        self.assertIsNone(b.audit)
+        self.assertEqual((c.tablespace, c.stogroup, c.priqty), ('tsc', 'sgc', 300))
+        self.assertIsNone(c.secqty)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,125 @@
+"""
+Tests for dependency-ordered migrations and parallel batches.
+"""
+import json
+import logging
+
+from schemaforge.comparator import MigrationPlan, TableDiff
+from schemaforge.dependencies import migration_batches, sql_references
+from schemaforge.generators.mysql import MySQLGenerator
+from schemaforge.generators.postgres import PostgresGenerator
+from schemaforge.models import Column, CustomObject, ForeignKey, Table
+
+
+def _table(name, *refs, inherits=None):
+    return Table(name=name, columns=[Column(name='id', data_type='INT')], inherits=inherits,
+                 foreign_keys=[ForeignKey(name=f"fk_{name}_{r}", column_names=['id'], ref_table=r, ref_column_names=['id'])
+                               for r in refs])
+
+
+def _view(name, sql):
+    return CustomObject(obj_type='VIEW', name=name, properties={'raw_sql': sql})
+
+
+def _labels(plan):
+    return [[step.label() for step in batch] for batch in migration_batches(plan)]
+
+
+class TestSqlReferences:
+    """Identifiers referenced by raw SQL"""
+
+    def test_identifiers_only(self):
+        sql = "CREATE VIEW v AS SELECT o.id, 'users' AS t FROM \"Orders\" o -- users\n JOIN sales.items i ON 1=1"
+        assert sql_references(sql, {'orders', 'users', 'items', 'v'}) == {'orders', 'items', 'v'}
+
+
+class TestMigrationOrder:
+    """Statements are ordered by dependencies, not by category"""
+
+    def test_new_tables_after_referenced_tables(self):
+        plan = MigrationPlan(new_tables=[_table('order_items', 'orders'), _table('orders', 'customers'),
+                                         _table('customers'), _table('audit')])
+        assert _labels(plan) == [['create_table customers', 'create_table audit'],
+                                 ['create_table orders'], ['create_table order_items']]
+
+    def test_inherits_and_partition_of(self):
+        child = _table('events_2026')
+        child.partition_of = 'events'
+        plan = MigrationPlan(new_tables=[child, _table('audit_child', inherits='audit'), _table('events'), _table('audit')])
+        assert _labels(plan) == [['create_table events', 'create_table audit'],
+                                 ['create_table events_2026', 'create_table audit_child']]
+
+    def test_dropped_tables_before_referenced_tables(self):
+        plan = MigrationPlan(dropped_tables=[_table('customers'), _table('orders', 'customers')])
+        assert _labels(plan) == [['drop_table orders'], ['drop_table customers']]
+
+    def test_views_after_their_tables(self):
+        plan = MigrationPlan(new_custom_objects=[_view('v_orders', 'CREATE VIEW v_orders AS SELECT * FROM orders')],
+                             new_tables=[_table('orders')])
+        sql = PostgresGenerator().generate_migration(plan)
+        assert sql.index('CREATE TABLE "orders"') < sql.index('CREATE VIEW v_orders')
+
+    def test_modified_view_wraps_altered_table(self):
+        old_view = _view('v_orders', 'CREATE VIEW v_orders AS SELECT id, note FROM orders')
+        new_view = _view('v_orders', 'CREATE VIEW v_orders AS SELECT id FROM orders')
+        diff = TableDiff(table_name='orders', dropped_columns=[Column(name='note', data_type='TEXT')])
+        plan = MigrationPlan(modified_custom_objects=[(old_view, new_view)], modified_tables=[diff])
+        assert _labels(plan) == [['drop_object v_orders'], ['alter_table orders'], ['recreate_object v_orders']]
+
+    def test_alter_fks_around_created_and_dropped_tables(self):
+        added = TableDiff(table_name='orders', added_fks=[ForeignKey('fk_c', ['cid'], 'customers', ['id'])])
+        dropped = TableDiff(table_name='items', dropped_fks=[ForeignKey('fk_l', ['lid'], 'legacy', ['id'])])
+        plan = MigrationPlan(new_tables=[_table('customers')], dropped_tables=[_table('legacy')],
+                             modified_tables=[added, dropped])
+        assert _labels(plan) == [['create_table customers', 'alter_table items'],
+                                 ['drop_table legacy', 'alter_table orders']]
+
+    def test_rename_before_new_name_is_used(self):
+        plan = MigrationPlan(new_tables=[_table('order_items', 'purchase_orders')],
+                             renamed_tables=[(_table('orders'), _table('purchase_orders'))],
+                             dropped_tables=[_table('purchase_orders_old')])
+        labels = _labels(plan)
+        assert labels[0] == ['drop_table purchase_orders_old', 'rename_table orders -> purchase_orders']
+        assert labels[1] == ['create_table order_items']
+
+    def test_renamed_table_altered_after_rename(self):
+        diff = TableDiff(table_name='clients', added_columns=[Column(name='email', data_type='TEXT')])
+        plan = MigrationPlan(renamed_tables=[(_table('customers'), _table('clients'))], modified_tables=[diff])
+        assert _labels(plan) == [['rename_table customers -> clients'], ['alter_table clients']]
+
+    def test_name_dropped_before_recreated(self):
+        plan = MigrationPlan(dropped_tables=[_table('summary')],
+                             new_custom_objects=[_view('summary', 'CREATE VIEW summary AS SELECT 1')])
+        assert _labels(plan) == [['drop_table summary'], ['create_object summary']]
+
+    def test_cycle_is_emitted_last(self, caplog):
+        plan = MigrationPlan(new_tables=[_table('a', 'b'), _table('b', 'a'), _table('c')])
+        with caplog.at_level(logging.WARNING, logger='schemaforge'):
+            labels = _labels(plan)
+        assert labels == [['create_table c'], ['create_table a', 'create_table b']]
+        assert 'Circular dependencies' in caplog.text
+
+    def test_independent_plan_keeps_category_order(self):
+        plan = MigrationPlan(dropped_custom_objects=[_view('old_v', 'CREATE VIEW old_v AS SELECT 1')],
+                             new_tables=[_table('t1'), _table('t2')], dropped_tables=[_table('t3')])
+        assert MySQLGenerator().generate_migration(plan).split('\n')[0] == 'DROP VIEW old_v;'
+        assert len(migration_batches(plan)) == 1
+
+
+class TestBatchesCli:
+    """`sf compare --batches-out`"""
+
+    def test_batches_out(self, tmp_path, run_compare):
+        out = tmp_path / 'batches.json'
+        run_compare("CREATE TABLE legacy (id INT PRIMARY KEY);\n",
+                    "CREATE TABLE orders (id INT PRIMARY KEY, customer_id INT,\n"
+                    "  CONSTRAINT fk_c FOREIGN KEY (customer_id) REFERENCES customers(id));\n"
+                    "CREATE TABLE customers (id INT PRIMARY KEY);\n",
+                    '--dialect', 'postgres', '--batches-out', str(out))
+        data = json.loads(out.read_text())
+        assert data['dialect'] == 'postgres'
+        first, second = data['batches']
+        assert [(s['action'], s['object']) for s in first['steps']] == [('create_table', 'customers'),
+                                                                        ('drop_table', 'legacy')]
+        assert [(s['action'], s['object']) for s in second['steps']] == [('create_table', 'orders')]
+        assert second['steps'][0]['statements'][0].startswith('CREATE TABLE "orders"')
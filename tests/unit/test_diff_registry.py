@@ -0,0 +1,75 @@
+"""
+Tests for the declarative diff field registry and its use in Comparator.
+"""
+import os
+from unittest.mock import patch
+
+from schemaforge.comparator import Comparator
+from schemaforge.main import main
+from schemaforge.models import Column, DiffField, Table, diff_fields
+
+
+class TestDiffRegistry:
+    """Model fields declare their diff label, dialects and renderer"""
+
+    def test_registered_fields_in_declaration_order(self):
+        names = [name for name, _ in diff_fields(Table)]
+        assert names[:4] == ['is_transient', 'cluster_by', 'retention_days', 'comment']
+        assert 'name' not in names and 'columns' not in names
+        assert names.count('without_rowid') == 1
+
+    def test_dialect_filter(self):
+        sqlite = {name for name, _ in diff_fields(Table, 'sqlite')}
+        assert {'is_strict', 'without_rowid', 'comment', 'partition_by'} <= sqlite
+        assert 'engine' not in sqlite and 'stogroup' not in sqlite
+        assert 'masking_policy' not in {name for name, _ in diff_fields(Column, 'postgres')}
+
+    def test_default_and_custom_render(self):
+        assert DiffField('Engine').changes('InnoDB', 'MyISAM') == ['Engine: InnoDB -> MyISAM']
+        spec = dict(diff_fields(Table))['tags']
+        assert spec.changes({'a': 1, 'c': 1}, {'a': 2, 'b': 1}) == ['Tag: b=1', 'Unset Tag: c', 'Tag: a 1 -> 2']
+
+
+class TestComparatorRegistry:
+    """Comparator formats messages only for registered fields that differ"""
+
+    def test_without_rowid_reported_once(self):
+        diff = Comparator()._compare_tables(Table('t'), Table('t', without_rowid=True))
+        assert diff.property_changes == ['Without RowID: False -> True']
+
+    def test_dialect_ignores_foreign_properties(self):
+        old, new = Table('t', engine='InnoDB'), Table('t', engine='MyISAM')
+        assert Comparator(dialect='postgres')._compare_tables(old, new) is None
+        assert Comparator(dialect='mysql')._compare_tables(old, new).property_changes == ['Engine: InnoDB -> MyISAM']
+
+    def test_reordered_policies_are_not_a_change(self):
+        old = Table('t', policies=['MASKING POLICY a ON x', 'ROW ACCESS POLICY b ON (id)'])
+        new = Table('t', policies=['ROW ACCESS POLICY b ON (id)', 'MASKING POLICY a ON x'])
+        assert Comparator()._compare_tables(old, new) is None
+        diff = Comparator()._compare_tables(old, Table('t', policies=['MASKING POLICY c ON y']))
+        assert diff.property_changes == [
+            'Policy: MASKING POLICY c ON y',
+            'Unset Policy: MASKING POLICY a ON x',
+            'Drop Policy: ROW ACCESS POLICY b ON (id)',
+        ]
+
+    def test_column_changes_are_formatted_on_demand(self):
+        old = Column('c', 'INT')
+        new = Column('c', 'BIGINT', is_nullable=False)
+        comparator = Comparator()
+        assert comparator._is_column_modified(old, Column('c', 'INT')) is None
+        assert comparator._is_column_modified(old, new) == ['Data Type: INT -> BIGINT', 'Nullable: True -> False']
+        diff = comparator._compare_tables(Table('t', columns=[old]), Table('t', columns=[new]))
+        assert diff.modified_columns == [(old, new)]
+
+    def test_fields_filled_by_shared_parser_are_not_gated(self):
+        db2 = {name for name, _ in diff_fields(Table, 'db2')}
+        assert {'row_security', 'is_strict', 'without_rowid'} <= db2
+
+    def test_healthcare_example_reports_row_security_for_db2(self, capsys):
+        example = os.path.join(os.path.dirname(__file__), '..', '..', 'examples', 'healthcare_hipaa')
+        argv = ['schemaforge', 'compare', '--source', os.path.join(example, 'v1.sql'),
+                '--target', os.path.join(example, 'v2.sql'), '--dialect', 'db2', '--plan', '--no-color']
+        with patch('sys.argv', argv):
+            main()
+        assert 'Property Change: Row Security: False -> True' in capsys.readouterr().out
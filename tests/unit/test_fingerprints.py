@@ -0,0 +1,102 @@
+"""
+Tests for structural fingerprints and the Comparator fast path.
+"""
+import copy
+import pickle
+from unittest.mock import patch
+
+from schemaforge.comparator import Comparator
+from schemaforge.models import Column, CustomObject, Index, Schema, Table
+
+
+def _table(name='users', **kwargs):
+    return Table(name=name, columns=[
+        Column(name='id', data_type='INT', is_nullable=False, is_primary_key=True),
+        Column(name='email', data_type='VARCHAR(255)'),
+    ], **kwargs)
+
+
+class TestFingerprint:
+    """Equal structure gives equal digests; any compared field changes it"""
+
+    def test_equal_tables_have_equal_digests(self):
+        a, b = _table(), _table()
+        assert a.fingerprint() == b.fingerprint()
+        assert len(a.fingerprint()) == 16
+
+    def test_lazy_and_explicit_empty_collections_match(self):
+        assert _table().fingerprint() == _table(indexes=[], tags={}).fingerprint()
+
+    def test_changes_alter_the_digest(self):
+        base = _table().fingerprint()
+        changed = [
+            _table(comment='x'),
+            _table(tags={'owner': 'data'}),
+            _table(indexes=[Index(name='ix', columns=['email'])]),
+            _table(priqty=-1),
+        ]
+        digests = {t.fingerprint() for t in changed}
+        assert base not in digests and len(digests) == len(changed)
+        col = _table()
+        col.columns[1].collation = 'utf8_bin'
+        assert col.fingerprint() != base
+        # hash(-1) == hash(-2) in Python; the digest must still differ
+        assert _table(priqty=-1).fingerprint() != _table(priqty=-2).fingerprint()
+
+    def test_cached_until_invalidated(self):
+        table = _table()
+        assert table.fingerprint(compute=False) is None
+        digest = table.fingerprint()
+        table.comment = 'changed'
+        assert table.fingerprint() == digest
+        table.invalidate_fingerprint()
+        assert table.fingerprint() != digest
+
+    def test_not_part_of_equality_and_survives_pickle(self):
+        a, b = _table(), _table()
+        a.fingerprint()
+        assert a == b
+        assert pickle.loads(pickle.dumps(a)).fingerprint(compute=False) == a.fingerprint()
+
+    def test_custom_object(self):
+        a = CustomObject(obj_type='STAGE', name='s', properties={'url': 'x', 'k': 1})
+        b = CustomObject(obj_type='STAGE', name='s', properties={'k': 1, 'url': 'x'})
+        assert a.fingerprint() == b.fingerprint()
+        assert a.fingerprint() != CustomObject(obj_type='STAGE', name='s', properties={'url': 'y'}).fingerprint()
+
+
+class TestComparatorFingerprints:
+    """Comparator skips field-by-field comparison for matching digests"""
+
+    def _schemas(self):
+        old = Schema(tables=[_table('a'), _table('b')],
+                     custom_objects=[CustomObject(obj_type='STAGE', name='s', properties={'url': 'x'})])
+        new = copy.deepcopy(old)
+        new.get_table('b').columns[1].data_type = 'TEXT'
+        return old, new
+
+    def test_matching_tables_are_skipped(self):
+        old, new = self._schemas()
+        with patch.object(Comparator, '_compare_tables', wraps=Comparator()._compare_tables) as spy:
+            plan = Comparator(fingerprints=True).compare(old, new)
+        assert [call.args[0].name for call in spy.call_args_list] == ['b']
+        assert [d.table_name for d in plan.modified_tables] == ['b']
+        assert plan.modified_custom_objects == []
+
+    def test_default_does_not_compute(self):
+        old, new = self._schemas()
+        plan = Comparator().compare(old, new)
+        assert [d.table_name for d in plan.modified_tables] == ['b']
+        assert old.get_table('a').fingerprint(compute=False) is None
+
+    def test_cached_digests_are_used_by_default(self):
+        old, new = self._schemas()
+        Comparator(fingerprints=True).compare(old, new)
+        with patch.object(Comparator, '_compare_tables', return_value=None) as spy:
+            Comparator().compare(old, new)
+        assert [call.args[0].name for call in spy.call_args_list] == ['b']
+
+    def test_same_result_with_and_without(self):
+        old, new = self._schemas()
+        assert Comparator(fingerprints=True).compare(old, new).to_dict() == \
+            Comparator().compare(copy.deepcopy(old), copy.deepcopy(new)).to_dict()
@@ -317,3 +317,52 @@ class TestMainFunction:
         finally:
             os.unlink(source_path)
             os.unlink(target_path)
+
+
+class TestParseSchemas:
+    """Test concurrent source/target parsing"""
+    
+    def _write(self, tmpdir, name, sql):
+        path = os.path.join(tmpdir, name)
+        with open(path, 'w') as f:
+            f.write(sql)
+        return path
+        
+    def test_concurrent_matches_serial(self):
+        from schemaforge.main import parse_schemas
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = self._write(tmpdir, 'src.sql', 'CREATE TABLE a (id INT PRIMARY KEY);')
+            tgt = self._write(tmpdir, 'tgt.sql', 'CREATE TABLE a (id INT PRIMARY KEY, name TEXT); CREATE TABLE b (id INT);')
+            
+            serial = parse_schemas('postgres', [src, tgt], jobs=1)
+            concurrent = parse_schemas('postgres', [src, tgt], jobs=2)
+            
+            assert [s.to_dict() for s in serial] == [s.to_dict() for s in concurrent]
+            assert [t.name for t in concurrent[1].tables] == ['a', 'b']
+            
+    def test_strict_error_crosses_process_boundary(self):
+        from schemaforge.main import parse_schemas
+        from schemaforge.exceptions import StrictModeError
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = self._write(tmpdir, 'src.sql', 'CREATE TABLE a (id INT);')
+            tgt = self._write(tmpdir, 'tgt.sql', 'SELECT 1;')
+            with pytest.raises(StrictModeError) as exc_info:
+                parse_schemas('postgres', [src, tgt], strict=True, jobs=2)
+            assert exc_info.value.statement == 'SELECT 1;'
+            
+    def test_compare_with_jobs(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = self._write(tmpdir, 'src.sql', 'CREATE TABLE test (id INT);')
+            tgt = self._write(tmpdir, 'tgt.sql', 'CREATE TABLE test (id INT, name TEXT);')
+            with patch('sys.argv', [
+                'schemaforge', 'compare',
+                '--source', src,
+                '--target', tgt,
+                '--dialect', 'postgres',
+                '--jobs', '2',
+                '--plan'
+            ]):
+                main()
+            
+            captured = capsys.readouterr()
+            assert 'Add Column: name' in captured.out
@@ -0,0 +1,85 @@
+"""
+Tests for the slotted model classes and their lazily allocated collections.
+"""
+import copy
+import json
+import pickle
+import sys
+
+import pytest
+
+from schemaforge.models import Column, ForeignKey, Index, Table
+
+
+class TestSlottedModels:
+    """Column, Index, ForeignKey and Table have no per-instance __dict__"""
+
+    @pytest.mark.parametrize('obj', [
+        Column(name='id', data_type='INT'),
+        Index(name='ix', columns=['id']),
+        ForeignKey(name='fk', column_names=['a'], ref_table='t', ref_column_names=['id']),
+        Table(name='t'),
+    ])
+    def test_no_instance_dict(self, obj):
+        assert not hasattr(obj, '__dict__')
+        with pytest.raises(AttributeError):
+            obj.not_a_field = 1
+
+    def test_type_and_collation_are_interned(self):
+        a = Column(name='a', data_type=''.join(['VARCHAR', '(64)']), collation=''.join(['utf8', '_bin']))
+        b = Column(name='b', data_type=''.join(['VARCHAR', '(6', '4)']), collation=''.join(['utf8_', 'bin']))
+        assert a.data_type is b.data_type is sys.intern('VARCHAR(64)')
+        assert a.collation is b.collation
+        assert Column(name='c', data_type='INT').collation is None
+
+
+class TestLazyCollections:
+    """Empty collection fields are shared until first mutated"""
+
+    def test_empty_fields_are_not_allocated(self):
+        table = Table(name='t')
+        assert table.indexes == [] and table.tags == {} and table.storage_parameters == {}
+        assert table._indexes is None and table._tags is None
+
+    def test_mutation_attaches_to_owner(self):
+        table = Table(name='t')
+        table.indexes.append(Index(name='ix', columns=['id']))
+        table.tags['owner'] = 'data'
+        table.storage_parameters.update(pctfree=10)
+        table.cluster_by += ['a']
+        assert [i.name for i in table.indexes] == ['ix']
+        assert table.tags == {'owner': 'data'}
+        assert table.storage_parameters == {'pctfree': 10}
+        assert table.cluster_by == ['a']
+
+    def test_two_handles_write_to_the_same_list(self):
+        table = Table(name='t')
+        first, second = table.policies, table.policies
+        first.append('p1')
+        second.append('p2')
+        assert table.policies == ['p1', 'p2']
+
+    def test_assignment_and_constructor_values(self):
+        index = Index(name='ix', columns=['a'], include_columns=['b'], properties={'cluster': True})
+        assert index.include_columns == ['b'] and index.properties == {'cluster': True}
+        table = Table(name='t')
+        table.foreign_keys = [ForeignKey(name='fk', column_names=['a'], ref_table='u', ref_column_names=['id'])]
+        assert table.foreign_keys[0].name == 'fk'
+
+    def test_equality_ignores_allocation(self):
+        lazy = Table(name='t')
+        explicit = Table(name='t', indexes=[], tags={})
+        assert lazy == explicit
+        assert lazy.to_dict() == explicit.to_dict()
+        json.dumps(lazy.to_dict())
+
+    def test_pickle_and_copy(self):
+        table = Table(name='t', columns=[Column(name='id', data_type='INT')])
+        table.tags['k'] = 'v'
+        for clone in (pickle.loads(pickle.dumps(table)), copy.deepcopy(table), copy.copy(table)):
+            assert clone == table
+            assert clone.columns[0].data_type is sys.intern('INT')
+        clone = pickle.loads(pickle.dumps(table))
+        clone.indexes.append(Index(name='ix', columns=['id']))
+        assert table.indexes == []
+        assert type(pickle.loads(pickle.dumps(Table(name='x').tags))) is dict
@@ -0,0 +1,156 @@
+"""
+Tests for the online schema change mode of the MySQL generator.
+"""
+import json
+
+import pytest
+
+from schemaforge.comparator import Comparator
+from schemaforge.generators.mysql import INPLACE, MySQLGenerator, _varchar_widening
+from schemaforge.main import get_generator
+from schemaforge.models import Column, Index, Schema, Table
+
+SOURCE = "CREATE TABLE users (id INT PRIMARY KEY, age INT);\n"
+TARGET = "CREATE TABLE users (id INT PRIMARY KEY, age BIGINT, email TEXT);\n"
+
+
+def _table(*columns, indexes=None):
+    return Table(name='users', columns=[Column(name='id', data_type='INT', is_nullable=False), *columns],
+                 indexes=indexes or [])
+
+
+def _plan(old_table, new_table):
+    old, new = Schema(), Schema()
+    old.add_table(old_table)
+    new.add_table(new_table)
+    return Comparator().compare(old, new)
+
+
+def _statements(plan):
+    return list(MySQLGenerator(online=True).iter_migration(plan))
+
+
+class TestCoalescing:
+    """All changes of a table end up in at most one rebuilding ALTER TABLE"""
+
+    def test_instant_changes_in_one_statement(self):
+        plan = _plan(_table(Column(name='legacy', data_type='INT')),
+                     _table(Column(name='email', data_type='TEXT'), Column(name='age', data_type='INT')))
+        assert _statements(plan) == [
+            'ALTER TABLE `users` ADD COLUMN `email` TEXT, ADD COLUMN `age` INT, '
+            'DROP COLUMN `legacy`, ALGORITHM=INSTANT;',
+        ]
+
+    def test_inplace_changes_in_one_statement(self):
+        plan = _plan(_table(Column(name='email', data_type='VARCHAR(40)'), indexes=[Index(name='ix_old', columns=['id'])]),
+                     _table(Column(name='email', data_type='VARCHAR(40)', is_nullable=False),
+                            indexes=[Index(name='ix_email', columns=['email'], is_unique=True)]))
+        assert _statements(plan) == [
+            'ALTER TABLE `users` MODIFY COLUMN `email` VARCHAR(40) NOT NULL, DROP INDEX `ix_old`, '
+            'ADD UNIQUE INDEX `ix_email` (`email`), ALGORITHM=INPLACE, LOCK=NONE;',
+        ]
+
+    def test_instant_kept_apart_from_rebuild(self):
+        plan = _plan(_table(Column(name='email', data_type='TEXT')),
+                     _table(Column(name='email', data_type='TEXT'), Column(name='age', data_type='INT'),
+                            indexes=[Index(name='ix_email', columns=['email'])]))
+        statements = _statements(plan)
+        assert len(statements) == 2
+        assert statements[0].endswith('ADD COLUMN `age` INT, ALGORITHM=INSTANT;')
+        assert statements[1].endswith('ADD INDEX `ix_email` (`email`), ALGORITHM=INPLACE, LOCK=NONE;')
+
+    def test_default_change_is_instant(self):
+        plan = _plan(_table(Column(name='age', data_type='INT', default_value='0')),
+                     _table(Column(name='age', data_type='INT', default_value='18')))
+        assert _statements(plan) == ['ALTER TABLE `users` ALTER COLUMN `age` SET DEFAULT 18, ALGORITHM=INSTANT;']
+
+    def test_renames_stay_first(self):
+        plan = Comparator(detect_renames=True).compare(
+            Schema(tables=[_table(Column(name='mail', data_type='TEXT'), Column(name='a', data_type='INT'))]),
+            Schema(tables=[_table(Column(name='email', data_type='TEXT'), Column(name='a', data_type='INT'),
+                                  Column(name='b', data_type='INT'))]))
+        statements = _statements(plan)
+        assert statements[0] == 'ALTER TABLE `users` RENAME COLUMN `mail` TO `email`;'
+        assert 'ALGORITHM=INSTANT' in statements[1]
+
+    def test_offline_output_unchanged(self):
+        plan = _plan(_table(), _table(Column(name='email', data_type='TEXT'), Column(name='age', data_type='INT')))
+        assert list(MySQLGenerator().iter_migration(plan)) == [
+            'ALTER TABLE `users` ADD COLUMN `email` TEXT;',
+            'ALTER TABLE `users` ADD COLUMN `age` INT;',
+        ]
+
+
+class TestCopyFlagged:
+    """Changes that need ALGORITHM=COPY are reported as warnings"""
+
+    def test_type_change_requires_copy(self):
+        plan = _plan(_table(Column(name='age', data_type='INT')), _table(Column(name='age', data_type='BIGINT')))
+        # The warning is reported, not mixed into the statements
+        assert _statements(plan) == [
+            'ALTER TABLE `users` MODIFY COLUMN `age` BIGINT, ALGORITHM=COPY, LOCK=SHARED;',
+        ]
+        assert MySQLGenerator(online=True).online_warnings(plan) == [
+            'users: type change of age (INT -> BIGINT) requires ALGORITHM=COPY']
+
+    def test_copy_absorbs_inplace_changes(self):
+        plan = _plan(_table(Column(name='age', data_type='INT')),
+                     _table(Column(name='age', data_type='BIGINT'), indexes=[Index(name='ix_age', columns=['age'])]))
+        rebuild = _statements(plan)[-1]
+        assert 'ADD INDEX `ix_age`' in rebuild and rebuild.endswith('ALGORITHM=COPY, LOCK=SHARED;')
+
+    def test_fulltext_index_needs_shared_lock(self):
+        plan = _plan(_table(Column(name='bio', data_type='TEXT')),
+                     _table(Column(name='bio', data_type='TEXT'),
+                            indexes=[Index(name='ft_bio', columns=['bio'], method='fulltext')]))
+        assert _statements(plan)[-1] == 'ALTER TABLE `users` ADD FULLTEXT INDEX `ft_bio` (`bio`), ALGORITHM=INPLACE, LOCK=SHARED;'
+        assert MySQLGenerator(online=True).online_warnings(plan) == ['users: adding fulltext index ft_bio blocks writes']
+
+    def test_no_warnings_offline(self):
+        plan = _plan(_table(Column(name='age', data_type='INT')), _table(Column(name='age', data_type='BIGINT')))
+        assert MySQLGenerator().online_warnings(plan) == []
+
+
+class TestVarcharWidening:
+    """VARCHAR widening within the same length-byte size is in place"""
+
+    @pytest.mark.parametrize('old, new, expected', [
+        ('VARCHAR(20)', 'VARCHAR(40)', True),
+        ('VARCHAR(100)', 'VARCHAR(500)', True),
+        ('VARCHAR(40)', 'VARCHAR(100)', False),   # length prefix grows to 2 bytes
+        ('VARCHAR(40)', 'VARCHAR(20)', False),    # shrinking
+        ('INT', 'BIGINT', False),
+    ])
+    def test_widening(self, old, new, expected):
+        assert _varchar_widening(old, new) is expected
+
+    def test_widening_is_inplace(self):
+        generator = MySQLGenerator(online=True)
+        plan = _plan(_table(Column(name='name', data_type='VARCHAR(20)')), _table(Column(name='name', data_type='VARCHAR(40)')))
+        clause, = generator.alter_clauses(plan.modified_tables[0])
+        assert (clause.algorithm, clause.concurrent, clause.reason) == (INPLACE, True, None)
+
+
+class TestMySQLOnlineCli:
+    """`sf compare --online` for MySQL"""
+
+    def test_get_generator(self):
+        assert get_generator('mysql', online=True).online
+        assert not get_generator('mysql').online
+
+    def test_plan_flags_copy(self, run_compare, capsys):
+        run_compare(SOURCE, TARGET, '--dialect', 'mysql', '--online', '--plan', '--no-color')
+        out = capsys.readouterr().out
+        assert 'Online Migration Warnings:' in out
+        assert '! users: type change of age (INT -> BIGINT) requires ALGORITHM=COPY' in out
+
+    def test_json_out_has_warnings(self, tmp_path, run_compare):
+        out = tmp_path / 'plan.json'
+        run_compare(SOURCE, TARGET, '--dialect', 'mysql', '--online', '--json-out', str(out))
+        assert json.loads(out.read_text())['online_warnings'] == [
+            'users: type change of age (INT -> BIGINT) requires ALGORITHM=COPY']
+
+    def test_lock_timeout_is_postgres_only(self, run_compare):
+        with pytest.raises(SystemExit):
+            run_compare(SOURCE, TARGET, '--dialect', 'mysql', '--online', '--lock-timeout', '1s')
+
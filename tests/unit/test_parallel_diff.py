@@ -0,0 +1,63 @@
+"""
+Tests for the opt-in process pool in Comparator.compare.
+"""
+import copy
+from unittest.mock import patch
+
+from schemaforge.comparator import Comparator
+from schemaforge.models import Column, Index, Schema, Table
+
+
+def _schemas(tables=40):
+    old = Schema()
+    for i in range(tables):
+        old.add_table(Table(name=f"t{i:03d}", columns=[
+            Column(name='id', data_type='INT', is_primary_key=True),
+            Column(name='val', data_type='VARCHAR(20)'),
+        ]))
+    new = copy.deepcopy(old)
+    for i in range(0, tables, 3):
+        table = new.tables[i]
+        table.columns[1].data_type = 'TEXT'
+        table.indexes.append(Index(name=f"ix_{i}", columns=['val']))
+    new.tables[1].comment = 'changed'
+    return old, new
+
+
+class TestParallelDiff:
+    """Parallel diffs match the serial result and keep its order"""
+
+    def test_matches_serial(self):
+        old, new = _schemas()
+        serial = Comparator().compare(old, new)
+        parallel = Comparator(jobs=2, parallel_threshold=1).compare(old, new)
+        assert parallel.to_dict() == serial.to_dict()
+        assert [d.table_name for d in parallel.modified_tables] == [d.table_name for d in serial.modified_tables]
+
+    def test_new_table_obj_is_the_target_table(self):
+        old, new = _schemas()
+        plan = Comparator(jobs=2, parallel_threshold=1).compare(old, new)
+        for diff in plan.modified_tables:
+            assert diff.new_table_obj is new.get_table(diff.table_name)
+
+    def test_below_threshold_stays_serial(self):
+        old, new = _schemas(10)
+        with patch('concurrent.futures.ProcessPoolExecutor', side_effect=AssertionError('pool used')):
+            plan = Comparator(jobs=4, parallel_threshold=11).compare(old, new)
+            Comparator(jobs=1, parallel_threshold=0).compare(old, new)
+        assert len(plan.modified_tables) == 5
+
+    def test_cli_passes_jobs_and_threshold(self, tmp_path, run_compare):
+        captured = {}
+        real = Comparator._compare_shared_tables
+
+        def spy(self, pairs):
+            captured.update(jobs=self.jobs, threshold=self.parallel_threshold)
+            return real(self, pairs)
+
+        with patch.object(Comparator, '_compare_shared_tables', spy):
+            run_compare("CREATE TABLE a (id INT);\nCREATE TABLE b (id INT);\n",
+                        "CREATE TABLE a (id BIGINT);\nCREATE TABLE b (id INT);\n",
+                        '--dialect', 'postgres', '--jobs', '2', '--parallel-diff-threshold', '1',
+                        '--json-out', str(tmp_path / 'out.json'))
+        assert captured == {'jobs': 2, 'threshold': 1}
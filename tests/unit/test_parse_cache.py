@@ -0,0 +1,182 @@
+"""
+Tests for the content-addressed per-file parse cache.
+"""
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+from schemaforge.cache import ParseCache
+from schemaforge.main import get_parser, parse_source, read_sql_source, main
+
+
+POSTGRES_FILES = {
+    '01_tables.sql': """
+CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(255) NOT NULL);
+CREATE TABLE orders (id INT PRIMARY KEY, user_id INT);
+CREATE TYPE mood AS ENUM ('happy', 'sad');
+CREATE VIEW v_users AS SELECT id FROM users;
+""",
+    '02_changes.sql': """
+ALTER TABLE users ADD COLUMN name TEXT;
+ALTER TABLE orders ADD CONSTRAINT fk_user FOREIGN KEY (user_id) REFERENCES users(id);
+COMMENT ON TABLE users IS 'Application users';
+COMMENT ON COLUMN users.email IS 'Login; unique';
+CREATE INDEX idx_orders_user ON orders (user_id);
+ALTER TABLE users ENABLE ROW LEVEL SECURITY;
+""",
+    '03_more.sql': """
+CREATE TABLE audit_log (id INT, msg TEXT);
+ALTER TABLE audit_log DROP COLUMN msg;
+""",
+}
+
+SNOWFLAKE_FILES = {
+    '01_tables.sql': """
+CREATE TABLE events (id INT, payload VARIANT);
+CREATE TABLE t2 (id INT);
+""",
+    '02_alter.sql': """
+ALTER TABLE events SET TAG owner = 'data';
+ALTER TABLE events ADD ROW ACCESS POLICY rap ON (id);
+UNDROP TABLE old_events;
+""",
+}
+
+
+def _write_tree(root, files):
+    for name, content in files.items():
+        with open(os.path.join(root, name), 'w') as f:
+            f.write(content)
+
+
+class TestParseCache:
+    """Cached parses must match a full parse of the concatenated source"""
+
+    @pytest.mark.parametrize('dialect,files', [('postgres', POSTGRES_FILES), ('snowflake', SNOWFLAKE_FILES)])
+    def test_cached_matches_full_parse(self, dialect, files):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as cache_dir:
+            _write_tree(src, files)
+            full = get_parser(dialect).parse(read_sql_source(src))
+
+            cache = ParseCache(cache_dir)
+            cold = parse_source(get_parser(dialect), src, cache)
+            assert cache.misses == len(files) and cache.hits == 0
+
+            cache = ParseCache(cache_dir)
+            warm = parse_source(get_parser(dialect), src, cache)
+            assert cache.hits == len(files) and cache.misses == 0
+
+            assert cold.to_dict() == full.to_dict()
+            assert warm.to_dict() == full.to_dict()
+
+    def test_cross_file_statements_resolve(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as cache_dir:
+            _write_tree(src, POSTGRES_FILES)
+            parse_source(get_parser('postgres'), src, ParseCache(cache_dir))
+            schema = parse_source(get_parser('postgres'), src, ParseCache(cache_dir))
+
+            users = schema.get_table('users')
+            assert users.get_column('name') is not None
+            assert users.comment == 'Application users'
+            assert users.get_column('email').comment == 'Login; unique'
+            assert users.row_security is True
+            orders = schema.get_table('orders')
+            assert [i.name for i in orders.indexes] == ['idx_orders_user']
+            assert orders.foreign_keys[0].ref_table == 'users'
+
+    def test_hit_skips_sqlglot_and_sqlparse(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as cache_dir:
+            _write_tree(src, POSTGRES_FILES)
+            expected = parse_source(get_parser('postgres'), src, ParseCache(cache_dir)).to_dict()
+            with patch('sqlglot.parse', side_effect=AssertionError('sqlglot called')), \
+                 patch('sqlparse.parse', side_effect=AssertionError('sqlparse called')):
+                schema = parse_source(get_parser('postgres'), src, ParseCache(cache_dir))
+            assert schema.to_dict() == expected
+
+    def test_only_changed_file_is_reparsed(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as cache_dir:
+            _write_tree(src, POSTGRES_FILES)
+            parse_source(get_parser('postgres'), src, ParseCache(cache_dir))
+
+            with open(os.path.join(src, '03_more.sql'), 'a') as f:
+                f.write("CREATE TABLE extra (id INT);\n")
+            cache = ParseCache(cache_dir)
+            schema = parse_source(get_parser('postgres'), src, cache)
+            assert (cache.hits, cache.misses) == (2, 1)
+            assert schema.get_table('extra') is not None
+            assert schema.to_dict() == get_parser('postgres').parse(read_sql_source(src)).to_dict()
+
+    def test_errors_keep_the_file_name(self):
+        from schemaforge.exceptions import StrictModeError
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as cache_dir:
+            _write_tree(src, {'x.sql': "CREATE TABLE a (id INT);\n\nCREATE TABLE (;\n"})
+            with pytest.raises(StrictModeError, match=f"{os.path.join(src, 'x.sql')}:3"):
+                parse_source(get_parser('postgres', strict=True), src, ParseCache(cache_dir))
+
+    @pytest.mark.parametrize('dialect', ['postgres', 'snowflake'])
+    def test_slow_statements_keep_the_file_name(self, dialect):
+        from schemaforge import profiling
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as cache_dir:
+            _write_tree(src, {'a.sql': "CREATE TABLE a (id INT);\n", 'b.sql': "\nCREATE TABLE b (id INT);\n"})
+            profiler = profiling.enable(profiling.Profiler(memory=False, slow_statements=10))
+            try:
+                parse_source(get_parser(dialect), src, ParseCache(cache_dir))
+            finally:
+                profiling.disable()
+            assert sorted(cost.location for cost in profiler.slowest()) == [
+                f"{os.path.join(src, 'a.sql')}:1", f"{os.path.join(src, 'b.sql')}:2"]
+
+    def test_key_depends_on_dialect_and_strict(self):
+        cache = ParseCache(tempfile.gettempdir())
+        data = b"CREATE TABLE a (id INT);"
+        keys = {
+            cache.key(get_parser('postgres'), data),
+            cache.key(get_parser('postgres', strict=True), data),
+            cache.key(get_parser('mysql'), data),
+            cache.key(get_parser('postgres'), data + b" "),
+        }
+        assert len(keys) == 4
+        assert cache.key(get_parser('postgres'), data) == cache.key(get_parser('postgres', jobs=4), data)
+
+    def test_lru_eviction_by_size(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ParseCache(cache_dir, max_bytes=10 ** 9)
+            for name in ('old', 'mid', 'new'):
+                cache.put(name * 4, ['x' * 1000])
+            now = time.time()
+            for age, name in ((300, 'old'), (200, 'mid'), (100, 'new')):
+                os.utime(cache._path(name * 4), (now - age, now - age))
+            assert cache.get('midmidmidmid') == ['x' * 1000]  # refreshes 'mid'
+
+            cache.max_bytes = 2500
+            cache._written = True
+            assert cache.prune() == 1
+            assert cache.get('oldoldoldold') is None
+            assert cache.get('midmidmidmid') is not None
+            assert cache.get('newnewnewnew') is not None
+
+    def test_corrupt_entry_is_discarded(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ParseCache(cache_dir)
+            cache.put('abcd', [('tables', None)])
+            with open(cache._path('abcd'), 'wb') as f:
+                f.write(b'not a pickle')
+            assert cache.get('abcd') is None
+            assert not os.path.exists(cache._path('abcd'))
+
+    def test_cli_cache_dir(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as cache_dir:
+            _write_tree(src, POSTGRES_FILES)
+            target = os.path.join(src, 'target.sql.txt')
+            with open(target, 'w') as f:
+                f.write("CREATE TABLE users (id INT PRIMARY KEY);")
+            out = os.path.join(cache_dir, 'out.json')
+            for _ in range(2):
+                with patch('sys.argv', ['schemaforge', 'compare', '--source', src, '--target', target,
+                                        '--dialect', 'postgres', '--cache-dir', cache_dir, '--json-out', out]):
+                    main()
+            entries = [n for _, _, files in os.walk(cache_dir) for n in files if n.endswith('.frag')]
+            assert len(entries) == len(POSTGRES_FILES) + 1
@@ -182,6 +182,34 @@ class TestSQLiteParserCoverage:
         assert table is not None
 
 
+class TestSQLiteTableOptions:
+    """WITHOUT ROWID / STRICT are detected per statement."""
+
+    def test_options_do_not_leak_to_earlier_tables(self):
+        schema = SQLiteParser().parse("""
+            CREATE TABLE plain (id INTEGER PRIMARY KEY);
+            CREATE TABLE kv (k TEXT PRIMARY KEY, v BLOB) WITHOUT ROWID;
+            CREATE TABLE typed (id INTEGER) STRICT;
+        """)
+        assert schema.get_table('plain').without_rowid is False
+        assert schema.get_table('plain').is_strict is False
+        assert schema.get_table('kv').without_rowid is True
+        assert schema.get_table('typed').is_strict is True
+
+    def test_if_not_exists_and_mixed_case_names(self):
+        schema = SQLiteParser().parse(
+            'CREATE TABLE IF NOT EXISTS "KeyValue" (k TEXT PRIMARY KEY) WITHOUT ROWID;')
+        assert schema.get_table('keyvalue').without_rowid is True
+
+    def test_scan_uses_sets(self):
+        parser = SQLiteParser()
+        parser._reset_table_options()
+        parser._scan_table_options("CREATE TABLE a (id INT) STRICT, WITHOUT ROWID;")
+        parser._scan_table_options("CREATE TABLE b (id INT);")
+        assert parser._without_rowid_tables == {'a'}
+        assert parser._strict_tables == {'a'}
+
+
 class TestOracleParserCoverage:
     """Additional Oracle parser tests for coverage."""
     
@@ -0,0 +1,242 @@
+"""
+Tests for the low-lock --online mode of the Postgres generator.
+"""
+import json
+
+import pytest
+
+from schemaforge.comparator import Comparator
+from schemaforge.generators.postgres import PostgresGenerator
+from schemaforge.main import get_generator
+from schemaforge.models import CheckConstraint, Column, ForeignKey, Index, Schema, Table
+
+SOURCE = "CREATE TABLE users (id INT PRIMARY KEY, email TEXT);\n"
+TARGET = SOURCE + "CREATE INDEX ix_email ON users (email);\n"
+
+
+def _users(email_nullable=True, **extra):
+    return Table(name='users', columns=[Column(name='id', data_type='INT', is_nullable=False),
+                                        Column(name='email', data_type='TEXT', is_nullable=email_nullable)],
+                 **extra)
+
+
+def _plan(old_table, new_table, *others):
+    old, new = Schema(), Schema()
+    old.add_table(old_table)
+    new.add_table(new_table)
+    for table in others:
+        old.add_table(table)
+        new.add_table(table)
+    return Comparator().compare(old, new)
+
+
+def _accounts():
+    return Table(name='accounts', columns=[Column(name='id', data_type='INT', is_nullable=False)])
+
+
+class TestOnlineAlterTable:
+    """ALTER TABLE statements avoid long ACCESS EXCLUSIVE locks"""
+
+    def test_index_built_concurrently(self):
+        plan = _plan(_users(), _users(indexes=[Index(name='ix_email', columns=['email'], is_unique=True)]))
+        sql = PostgresGenerator(online=True).generate_migration(plan)
+        assert 'CREATE UNIQUE INDEX CONCURRENTLY "ix_email" ON "users" (email);' in sql
+
+    def test_index_dropped_concurrently(self):
+        plan = _plan(_users(indexes=[Index(name='ix_email', columns=['email'])]), _users())
+        assert 'DROP INDEX CONCURRENTLY ix_email;' in PostgresGenerator(online=True).generate_migration(plan)
+
+    def test_foreign_key_not_valid_then_validated(self):
+        fk = ForeignKey('fk_users_accounts', ['id'], 'accounts', ['id'], on_delete='CASCADE')
+        plan = _plan(_users(), _users(foreign_keys=[fk]), _accounts())
+        statements = list(PostgresGenerator(online=True).iter_migration(plan))
+        add = ('ALTER TABLE "users" ADD CONSTRAINT "fk_users_accounts" FOREIGN KEY ("id") '
+               'REFERENCES "accounts"("id") ON DELETE CASCADE NOT VALID;')
+        validate = 'ALTER TABLE "users" VALIDATE CONSTRAINT "fk_users_accounts";'
+        assert statements.index(add) < statements.index(validate)
+
+    def test_check_not_valid_then_validated(self):
+        check = CheckConstraint(name='ck_email', expression="email LIKE '%@%'")
+        plan = _plan(_users(), _users(check_constraints=[check]))
+        statements = list(PostgresGenerator(online=True).iter_migration(plan))
+        assert statements[1:] == [
+            'ALTER TABLE "users" ADD CONSTRAINT "ck_email" CHECK (email LIKE \'%@%\') NOT VALID;',
+            'ALTER TABLE "users" VALIDATE CONSTRAINT "ck_email";',
+        ]
+
+    def test_validations_follow_all_other_changes(self):
+        fk = ForeignKey('fk_users_accounts', ['id'], 'accounts', ['id'])
+        check = CheckConstraint(name='ck_email', expression='email IS NOT NULL')
+        plan = _plan(_users(), _users(foreign_keys=[fk], check_constraints=[check],
+                                      indexes=[Index(name='ix_email', columns=['email'])]), _accounts())
+        statements = list(PostgresGenerator(online=True).iter_migration(plan))
+        assert [s for s in statements if 'VALIDATE' in s] == statements[-2:]
+
+    def test_set_not_null_through_check(self):
+        plan = _plan(_users(), _users(email_nullable=False))
+        statements = list(PostgresGenerator(online=True).iter_migration(plan))
+        assert statements[1:] == [
+            'ALTER TABLE "users" ADD CONSTRAINT "users_email_not_null" CHECK ("email" IS NOT NULL) NOT VALID;',
+            'ALTER TABLE "users" VALIDATE CONSTRAINT "users_email_not_null";',
+            'ALTER TABLE "users" ALTER COLUMN "email" SET NOT NULL;',
+            'ALTER TABLE "users" DROP CONSTRAINT "users_email_not_null";',
+        ]
+
+    def test_not_null_check_name_fits_identifier_limit(self):
+        long_name = 'c' * 70
+        old = Table(name='t', columns=[Column(name=long_name, data_type='INT')])
+        new = Table(name='t', columns=[Column(name=long_name, data_type='INT', is_nullable=False)])
+        sql = PostgresGenerator(online=True).generate_migration(_plan(old, new))
+        assert f'ADD CONSTRAINT "{("t_" + long_name)[:63]}" CHECK' in sql
+
+    def test_drop_not_null_unchanged(self):
+        plan = _plan(_users(email_nullable=False), _users())
+        assert 'ALTER TABLE "users" ALTER COLUMN "email" DROP NOT NULL;' in \
+            PostgresGenerator(online=True).generate_migration(plan)
+
+    def test_type_change_warns_about_rewrite(self):
+        old = Table(name='t', columns=[Column(name='n', data_type='INT')])
+        new = Table(name='t', columns=[Column(name='n', data_type='BIGINT')])
+        plan = _plan(old, new)
+        generator = PostgresGenerator(online=True)
+        assert list(generator.iter_migration(plan))[1:] == ['ALTER TABLE "t" ALTER COLUMN "n" TYPE BIGINT USING "n"::BIGINT;']
+        assert generator.online_warnings(plan) == ['t.n: type change INT -> BIGINT rewrites the table under an ACCESS EXCLUSIVE lock']
+
+
+class TestFollowUpPhases:
+    """VALIDATE and SET NOT NULL run as separate steps after the ALTER TABLE commits"""
+
+    def test_batches(self):
+        fk = ForeignKey('fk_users_accounts', ['id'], 'accounts', ['id'])
+        plan = _plan(_users(), _users(email_nullable=False, foreign_keys=[fk]), _accounts())
+        batches = PostgresGenerator(online=True).generate_batches(plan)
+        assert [[step.action for step, _ in batch] for batch in batches] == [
+            ['alter_table'], ['validate_constraints'], ['set_not_null']]
+        alter, validate, not_null = (batch[0][1] for batch in batches)
+        assert not any('VALIDATE' in s or 'SET NOT NULL' in s for s in alter)
+        assert validate == ["SET lock_timeout = '5s';",
+                            'ALTER TABLE "users" VALIDATE CONSTRAINT "users_email_not_null";',
+                            'ALTER TABLE "users" VALIDATE CONSTRAINT "fk_users_accounts";']
+        assert not_null[1:] == ['ALTER TABLE "users" ALTER COLUMN "email" SET NOT NULL;',
+                                'ALTER TABLE "users" DROP CONSTRAINT "users_email_not_null";']
+
+    def test_script_keeps_phases_in_order(self):
+        plan = _plan(_users(), _users(email_nullable=False))
+        generator = PostgresGenerator(online=True)
+        flattened = [s for batch in generator.generate_batches(plan) for _, statements in batch
+                     for s in statements if not s.startswith('SET lock_timeout')]
+        assert list(generator.iter_migration(plan))[1:] == flattened
+
+    def test_offline_has_no_follow_ups(self):
+        plan = _plan(_users(), _users(email_nullable=False))
+        assert len(PostgresGenerator().generate_batches(plan)) == 1
+
+
+class TestLockTimeout:
+    """Every step starts with SET lock_timeout"""
+
+    def test_preamble_per_step(self):
+        old, new = Schema(), Schema()
+        old.add_table(_users())
+        new.add_table(_users(email_nullable=False))
+        new.add_table(_accounts())
+        plan = Comparator().compare(old, new)
+        batches = PostgresGenerator(online=True, lock_timeout='2s').generate_batches(plan)
+        steps = [statements for batch in batches for _, statements in batch]
+        # create accounts, alter users and its VALIDATE / SET NOT NULL follow-ups
+        assert len(steps) == 4
+        assert all(statements[0] == "SET lock_timeout = '2s';" for statements in steps)
+
+    def test_default_timeout(self):
+        plan = _plan(_users(), _users(email_nullable=False))
+        assert next(PostgresGenerator(online=True).iter_migration(plan)) == "SET lock_timeout = '5s';"
+
+    def test_rollback_has_preamble(self):
+        plan = _plan(_users(), _users(email_nullable=False))
+        assert PostgresGenerator(online=True).generate_rollback_migration(plan).startswith("SET lock_timeout = '5s';")
+
+    def test_offline_output_unchanged(self):
+        plan = _plan(_users(), _users(email_nullable=False,
+                                      indexes=[Index(name='ix_email', columns=['email'])]))
+        sql = PostgresGenerator().generate_migration(plan)
+        assert 'lock_timeout' not in sql
+        assert 'CONCURRENTLY' not in sql
+        assert 'ALTER TABLE "users" ALTER COLUMN "email" SET NOT NULL;' in sql
+
+    def test_empty_plan_has_no_preamble(self):
+        plan = _plan(_users(), _users())
+        assert PostgresGenerator(online=True).generate_migration(plan) == ''
+
+
+class TestOfflineChecks:
+    """CHECK constraint changes are emitted without --online too"""
+
+    def test_add_and_drop_check(self):
+        old_check = CheckConstraint(name='ck_old', expression='id > 0')
+        new_check = CheckConstraint(name='ck_new', expression='id > 1')
+        plan = _plan(_users(check_constraints=[old_check]), _users(check_constraints=[new_check]))
+        statements = list(PostgresGenerator().iter_migration(plan))
+        assert statements == [
+            'ALTER TABLE "users" DROP CONSTRAINT "ck_old";',
+            'ALTER TABLE "users" ADD CONSTRAINT "ck_new" CHECK (id > 1);',
+        ]
+
+
+class TestTransactional:
+    """CONCURRENTLY statements cannot run in a transaction block"""
+
+    def test_concurrent_index_is_not_transactional(self):
+        generator = PostgresGenerator(online=True)
+        assert not generator.is_transactional('CREATE INDEX CONCURRENTLY "ix" ON "t" (a);')
+        assert not generator.is_transactional('DROP INDEX CONCURRENTLY ix;')
+        assert generator.is_transactional('CREATE INDEX "ix" ON "t" (a);')
+
+    @pytest.mark.parametrize('dialect', ['mysql', 'sqlite', 'oracle', 'db2', 'snowflake', 'mssql'])
+    def test_other_dialects_transactional(self, dialect):
+        assert get_generator(dialect).is_transactional('CREATE INDEX ix ON t (a);')
+
+
+class TestOnlineCli:
+    """`sf compare --online` for Postgres"""
+
+    def test_get_generator_online(self):
+        generator = get_generator('postgres', online=True, lock_timeout='1s')
+        assert generator.online and generator.lock_timeout == '1s'
+        assert not get_generator('postgres').online
+
+    def test_get_generator_rejects_unsupported_dialect(self):
+        with pytest.raises(ValueError, match='--online'):
+            get_generator('sqlite', online=True)
+
+    def test_sql_out(self, tmp_path, run_compare):
+        out = tmp_path / 'out.sql'
+        run_compare(SOURCE, TARGET, '--dialect', 'postgres', '--online', '--lock-timeout', '3s', '--sql-out', str(out))
+        sql = out.read_text()
+        assert "SET lock_timeout = '3s';" in sql
+        assert 'CREATE INDEX CONCURRENTLY "ix_email" ON "users"' in sql
+
+    def test_batches_mark_non_transactional_steps(self, tmp_path, run_compare):
+        out = tmp_path / 'batches.json'
+        run_compare(SOURCE, TARGET, '--dialect', 'postgres', '--online', '--batches-out', str(out))
+        step, = json.loads(out.read_text())['batches'][0]['steps']
+        assert step['transactional'] is False
+
+    def test_unsupported_dialect_is_an_error(self, tmp_path, run_compare):
+        with pytest.raises(SystemExit):
+            run_compare(SOURCE, TARGET, '--dialect', 'sqlite', '--online', '--sql-out', str(tmp_path / 'out.sql'))
+
+    @pytest.mark.parametrize('value', ['5 sec', "5s'; DROP TABLE users; --", '1.5s', 's'])
+    def test_lock_timeout_must_be_a_duration(self, run_compare, capsys, value):
+        with pytest.raises(SystemExit):
+            run_compare(SOURCE, TARGET, '--dialect', 'postgres', '--online', '--lock-timeout', value)
+        assert '--lock-timeout must be a duration' in capsys.readouterr().err
+
+    @pytest.mark.parametrize('value', ['500', '500ms', '5 s', '2min'])
+    def test_lock_timeout_durations(self, tmp_path, run_compare, value):
+        out = tmp_path / 'out.sql'
+        run_compare(SOURCE, TARGET, '--dialect', 'postgres', '--online', '--lock-timeout', value, '--sql-out', str(out))
+        assert f"SET lock_timeout = '{value}';" in out.read_text()
+
+    def test_lock_timeout_requires_online(self, run_compare):
+        with pytest.raises(SystemExit):
+            run_compare(SOURCE, TARGET, '--dialect', 'postgres', '--lock-timeout', '1s')
@@ -0,0 +1,205 @@
+"""
+Tests for phase profiling (--profile / --profile-out) and --slow-statements.
+"""
+import json
+import time
+
+import pytest
+
+from schemaforge import profiling
+from schemaforge.main import get_parser
+from schemaforge.profiling import Profiler
+from schemaforge.source import SqlSource
+
+
+@pytest.fixture(autouse=True)
+def _disable_profiling():
+    yield
+    profiling.disable()
+
+
+class TestProfiler:
+    """Phase timings, memory peaks and the summary table"""
+
+    def test_nested_phases(self):
+        profiler = profiling.enable(Profiler())
+        with profiling.phase("parse"):
+            for _ in range(2):
+                with profiling.phase("file"):
+                    data = [0] * 200000
+            profiler.add("step", 0.5)
+            profiler.add("step", 0.25)
+        del data
+        profiling.disable()
+
+        report = profiler.report()
+        parse, = report["phases"]
+        assert parse["name"] == "parse" and parse["calls"] == 1
+        file_phase, step = parse["children"]
+        assert file_phase["calls"] == 2 and file_phase["peak_bytes"] >= 200000 * 8
+        assert step == {"name": "step", "seconds": 0.75, "calls": 2}
+        # A parent's peak covers its children
+        assert parse["peak_bytes"] >= file_phase["peak_bytes"]
+        assert report["total_seconds"] >= parse["seconds"]
+
+    def test_without_memory(self):
+        profiler = profiling.enable(Profiler(memory=False))
+        with profiling.phase("compare"):
+            pass
+        profiling.disable()
+        assert "peak_bytes" not in profiler.report()["phases"][0]
+
+    def test_disabled_is_a_no_op(self):
+        assert profiling.active() is None
+        assert profiling.phase("parse") is profiling.phase("compare")
+        profiling.count("statements.Create")
+        assert profiling.disable() is None
+
+    def test_summary(self):
+        profiler = profiling.enable(Profiler(memory=False))
+        with profiling.phase("parse"):
+            profiler.add("sqlglot.parse", 0.1)
+        profiler.count("statements.Create", 3)
+        profiling.disable()
+        summary = profiler.summary()
+        assert "parse" in summary and "  sqlglot.parse" in summary
+        assert "statements.Create" in summary
+
+
+class TestParserCounters:
+    """Parse steps and statement counters of each parser"""
+
+    def test_sqlglot_steps_and_fallbacks(self):
+        profiler = profiling.enable(Profiler(memory=False))
+        with profiling.phase("parse"):
+            schema = get_parser('postgres').parse(
+                "CREATE TABLE t (id INT);\n"
+                "CREATE INDEX ix_t ON t (id);\n"
+                "ALTER TABLE t OWNER TO reporting;\n"
+            )
+        profiling.disable()
+        assert schema.get_table('t') is not None
+        counters = profiler.report()["counters"]
+        assert counters["statements.Create"] == 2
+        steps = {child["name"] for child in profiler.report()["phases"][0]["children"]}
+        assert {"split", "preprocess", "sqlglot.parse", "apply"} <= steps
+        assert counters["fallbacks.command"] == counters["statements.Command"] == 1
+
+    def test_sqlparse_steps(self):
+        profiler = profiling.enable(Profiler(memory=False))
+        with profiling.phase("parse"):
+            get_parser('snowflake').parse("CREATE TABLE t (id NUMBER);\nCREATE TABLE u (id NUMBER);\n")
+        profiling.disable()
+        report = profiler.report()
+        assert report["counters"] == {"statements.CREATE": 2}
+        steps = [child["name"] for child in report["phases"][0]["children"]]
+        assert steps == ["preprocess", "sqlparse.parse", "apply"]
+
+
+class TestProfileCli:
+    """`sf compare --profile` / `--profile-out`"""
+
+    def _compare(self, run_compare, *flags):
+        run_compare("CREATE TABLE orders (id INT PRIMARY KEY);\n",
+                    "CREATE TABLE orders (id INT PRIMARY KEY, note TEXT);\n", '--dialect', 'postgres', *flags)
+
+    def test_profile_out(self, tmp_path, run_compare, capsys):
+        out = tmp_path / 'profile.json'
+        self._compare(run_compare, '--profile-out', str(out))
+        report = json.loads(out.read_text())
+        assert [phase["name"] for phase in report["phases"]] == ["parse", "compare", "output"]
+        assert len(report["phases"][0]["children"]) == 2
+        assert report["counters"]["statements.Create"] == 2
+        assert "phase" not in capsys.readouterr().err
+        assert profiling.active() is None
+
+    def test_profile_prints_summary(self, run_compare, capsys):
+        self._compare(run_compare, '--profile')
+        err = capsys.readouterr().err
+        assert "compare" in err and "statements.Create" in err
+
+    def test_verbose_with_profile_out_prints_summary(self, tmp_path, run_compare, capsys):
+        self._compare(run_compare, '--profile-out', str(tmp_path / 'profile.json'), '-v')
+        assert "peak MiB" in capsys.readouterr().err
+
+
+class TestSlowStatements:
+    """`--slow-statements`: the slowest statements with file:line"""
+
+    def test_keeps_slowest(self):
+        profiler = Profiler(memory=False, slow_statements=2)
+        for seconds in (0.3, 0.1, 0.5, 0.2):
+            profiler.statement_done((time.perf_counter() - seconds, 0), f"CREATE TABLE t{seconds} (id INT)", "x.sql:1")
+        assert [round(cost.seconds, 1) for cost in profiler.slowest()] == [0.5, 0.3]
+        report = profiler.report()
+        assert report["statements_timed"] == 4
+        assert report["slow_statements"][0]["preview"] == "CREATE TABLE t0.5 (id INT)"
+
+    def test_preview_is_truncated(self):
+        profiler = Profiler(memory=False, slow_statements=1)
+        statement = "CREATE TABLE wide (\n" + ",\n".join(f"  c{i} INT" for i in range(500)) + "\n)"
+        profiler.statement_done(profiler.statement_start(), statement, "x.sql:1")
+        preview = profiler.slowest()[0].preview
+        assert len(preview) == 80 and preview.startswith("CREATE TABLE wide ( c0 INT, c1 INT") and preview.endswith("...")
+
+    def test_allocations(self):
+        profiler = profiling.enable(Profiler(slow_statements=1))
+        start = profiler.statement_start()
+        data = [0] * 100000
+        profiler.statement_done(start, "CREATE TABLE t (id INT)", "x.sql:1")
+        profiling.disable()
+        del data
+        assert profiler.slowest()[0].allocated_bytes >= 100000 * 8
+
+    @pytest.mark.parametrize('dialect', ['postgres', 'snowflake'])
+    def test_locations(self, tmp_path, dialect):
+        (tmp_path / 'a.sql').write_text("CREATE TABLE a (id INT);\n")
+        (tmp_path / 'b.sql').write_text("\n\n\nCREATE TABLE b (id INT);\nCREATE TABLE c (id INT);\n")
+        profiler = profiling.enable(Profiler(memory=False, slow_statements=10))
+        schema = get_parser(dialect).parse_source(SqlSource(str(tmp_path)))
+        profiling.disable()
+        assert len(schema.tables) == 3
+        locations = sorted(cost.location for cost in profiler.slowest())
+        assert locations == [f"{tmp_path / 'a.sql'}:1", f"{tmp_path / 'b.sql'}:4", f"{tmp_path / 'b.sql'}:5"]
+
+    def test_block_comments_keep_line_numbers(self):
+        profiler = profiling.enable(Profiler(memory=False, slow_statements=10))
+        get_parser('snowflake').parse("CREATE TABLE a (id INT); /* a\nmulti-line\ncomment */\nCREATE TABLE b (id INT);\n")
+        profiling.disable()
+        assert sorted(cost.location for cost in profiler.slowest()) == ["line 1", "line 4"]
+
+    @pytest.mark.parametrize('dialect', ['postgres', 'mysql', 'snowflake'])
+    def test_banner_comments_are_skipped(self, tmp_path, dialect):
+        (tmp_path / 'a.sql').write_text(
+            "CREATE TABLE a (id INT);\n\n"
+            "-- ====================\n-- Views\n-- ====================\n"
+            "/* v\n */\nCREATE VIEW v AS SELECT id FROM a;\n"
+        )
+        profiler = profiling.enable(Profiler(memory=False, slow_statements=10))
+        get_parser(dialect).parse_source(SqlSource(str(tmp_path / 'a.sql')))
+        profiling.disable()
+        costs = {cost.location: cost.preview for cost in profiler.slowest()}
+        assert costs == {f"{tmp_path / 'a.sql'}:1": "CREATE TABLE a (id INT);",
+                         f"{tmp_path / 'a.sql'}:8": "CREATE VIEW v AS SELECT id FROM a;"}
+
+    def test_comment_only_statement_keeps_its_text(self):
+        profiler = Profiler(memory=False, slow_statements=1)
+        profiler.statement_done(profiler.statement_start(), "\n-- nothing here", "x.sql:2")
+        assert profiler.slowest()[0].preview == "-- nothing here"
+
+    def test_zero_turns_it_off(self, run_compare, capsys):
+        sql = "CREATE TABLE a (id INT);\n"
+        run_compare(sql, sql, '--dialect', 'mysql', '--slow-statements', '0')
+        assert "Slowest" not in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            run_compare(sql, sql, '--dialect', 'mysql', '--slow-statements', '-1')
+        assert "non-negative" in capsys.readouterr().err
+
+    def test_cli(self, tmp_path, run_compare, capsys):
+        run_compare("CREATE TABLE orders (id INT PRIMARY KEY);\n",
+                    "CREATE TABLE orders (id INT PRIMARY KEY);\n\nCREATE TABLE items (id INT);\n",
+                    '--dialect', 'mysql', '--slow-statements', '5', '--jobs', '2')
+        err = capsys.readouterr().err
+        assert "Slowest 3 of 3 statements" in err and f"{tmp_path / 'v2.sql'}:3" in err
+        assert "ignoring --jobs" in err
+        assert "phase" not in err
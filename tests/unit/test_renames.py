@@ -0,0 +1,199 @@
+"""
+Tests for table and column rename detection.
+"""
+
+import pytest
+
+from schemaforge.comparator import Comparator
+from schemaforge.generators.db2 import DB2Generator
+from schemaforge.generators.mssql import MSSQLGenerator
+from schemaforge.generators.mysql import MySQLGenerator
+from schemaforge.generators.oracle import OracleGenerator
+from schemaforge.generators.postgres import PostgresGenerator
+from schemaforge.generators.snowflake import SnowflakeGenerator
+from schemaforge.generators.sqlite import SQLiteGenerator
+from schemaforge.models import Column, Index, Schema, Table
+from schemaforge.renames import _lsh_candidates, match_renames, table_features
+
+
+def _table(name, columns, index=None):
+    table = Table(name=name, columns=[Column(name=c, data_type=t, is_nullable=c != 'id', is_primary_key=c == 'id')
+                                      for c, t in columns])
+    if index:
+        table.indexes.append(Index(name=f"ix_{name}", columns=[index]))
+    return table
+
+
+ORDERS = [('id', 'INT'), ('customer_id', 'INT'), ('total', 'DECIMAL(10,2)'), ('created_at', 'TIMESTAMP')]
+USERS = [('id', 'INT'), ('email', 'VARCHAR(255)'), ('name', 'VARCHAR(100)')]
+
+
+def _schema(*tables):
+    schema = Schema()
+    for table in tables:
+        schema.add_table(table)
+    return schema
+
+
+class TestMatchRenames:
+    """Similarity scoring and unambiguous pairing"""
+
+    def test_pairs_best_matches(self):
+        old = [frozenset('abcde'), frozenset('vwxyz')]
+        new = [frozenset('vwxy'), frozenset('abcdef'), frozenset('123')]
+        assert match_renames(old, new, 0.8) == [(0, 1), (1, 0)]
+
+    def test_threshold(self):
+        assert match_renames([frozenset('abcd')], [frozenset('abxy')], 0.8) == []
+        assert match_renames([frozenset('abcd')], [frozenset('abxy')], 0.3) == [(0, 0)]
+
+    def test_ties_are_not_renames(self):
+        twins = [frozenset('abcd'), frozenset('abcd')]
+        assert match_renames([frozenset('abcd')], twins) == []
+        assert match_renames(twins, [frozenset('abcd')]) == []
+
+    def test_runner_up_after_best_is_taken(self):
+        # old 1 prefers new 0, which is taken by old 0; it then pairs with new 1
+        old = [frozenset('abcdefghij'), frozenset('abcdefghix')]
+        new = [frozenset('abcdefghij'), frozenset('abcdefghxy')]
+        assert match_renames(old, new, 0.7) == [(0, 0), (1, 1)]
+
+    def test_lsh_buckets_similar_tables_only(self):
+        tables = [_table(f"t{i}", [('id', 'INT')] + [(f"c{i}_{k}", 'INT') for k in range(8)]) for i in range(200)]
+        renamed = [_table(f"r{i}", [(c.name, c.data_type) for c in t.columns]) for i, t in enumerate(tables)]
+        old_sets = [table_features(t) for t in tables]
+        new_sets = [table_features(t) for t in renamed]
+        candidates = _lsh_candidates(old_sets, new_sets)
+        assert {(i, i) for i in range(200)} <= candidates
+        assert len(candidates) < 200 * 200 // 10
+        assert match_renames(old_sets, new_sets) == [(i, i) for i in range(200)]
+
+
+class TestComparatorRenames:
+    """Comparator(detect_renames=True)"""
+
+    def test_off_by_default(self):
+        plan = Comparator().compare(_schema(_table('orders', ORDERS)), _schema(_table('purchase_orders', ORDERS)))
+        assert [t.name for t in plan.dropped_tables] == ['orders']
+        assert plan.renamed_tables == []
+
+    def test_renamed_table(self):
+        old = _schema(_table('orders', ORDERS), _table('users', USERS))
+        new = _schema(_table('purchase_orders', ORDERS), _table('users', USERS), _table('audit', [('id', 'INT')]))
+        plan = Comparator(detect_renames=True).compare(old, new)
+        assert [(o.name, n.name) for o, n in plan.renamed_tables] == [('orders', 'purchase_orders')]
+        assert plan.dropped_tables == []
+        assert [t.name for t in plan.new_tables] == ['audit']
+        assert plan.modified_tables == []
+        assert plan.to_dict()['renamed_tables'] == [{'old': 'orders', 'new': 'purchase_orders'}]
+
+    def test_renamed_table_with_changes_is_diffed(self):
+        changed = ORDERS + [('status', 'VARCHAR(20)')]
+        plan = Comparator(detect_renames=True).compare(_schema(_table('orders', ORDERS)),
+                                                       _schema(_table('purchase_orders', changed)))
+        assert len(plan.renamed_tables) == 1
+        diff, = plan.modified_tables
+        assert diff.table_name == 'purchase_orders'
+        assert [c.name for c in diff.added_columns] == ['status']
+
+    def test_different_tables_are_not_renamed(self):
+        plan = Comparator(detect_renames=True).compare(_schema(_table('orders', ORDERS)),
+                                                       _schema(_table('users', USERS)))
+        assert plan.renamed_tables == []
+        assert len(plan.dropped_tables) == len(plan.new_tables) == 1
+
+    def test_renamed_column(self):
+        renamed = [('id', 'INT'), ('email_address', 'VARCHAR(255)'), ('name', 'VARCHAR(100)')]
+        plan = Comparator(detect_renames=True).compare(_schema(_table('users', USERS)),
+                                                       _schema(_table('users', renamed)))
+        diff, = plan.modified_tables
+        assert [(o.name, n.name) for o, n in diff.renamed_columns] == [('email', 'email_address')]
+        assert diff.added_columns == diff.dropped_columns == diff.modified_columns == []
+        assert diff.to_dict()['renamed_columns'] == [{'old': 'email', 'new': 'email_address'}]
+
+    def test_renamed_and_modified_column(self):
+        old = _table('users', USERS)
+        new = _table('users', [('id', 'INT'), ('email_address', 'VARCHAR(255)'), ('name', 'VARCHAR(100)')])
+        new.columns[1].comment = 'login'
+        diff, = Comparator(detect_renames=True).compare(_schema(old), _schema(new)).modified_tables
+        assert [n.name for _, n in diff.renamed_columns] == ['email_address']
+        assert [(o.name, n.name) for o, n in diff.modified_columns] == [('email', 'email_address')]
+
+    def test_column_of_other_type_is_not_renamed(self):
+        new = _table('users', [('id', 'INT'), ('logins', 'INT'), ('name', 'VARCHAR(100)')])
+        diff, = Comparator(detect_renames=True).compare(_schema(_table('users', USERS)), _schema(new)).modified_tables
+        assert diff.renamed_columns == []
+        assert [c.name for c in diff.dropped_columns] == ['email']
+
+    def test_unrelated_column_of_same_type_is_not_renamed(self):
+        old = _table('users', USERS + [('is_deleted', 'BOOLEAN'), ('age', 'INT')])
+        new = _table('users', USERS + [('age', 'INT'), ('is_vip', 'BOOLEAN')])
+        diff, = Comparator(detect_renames=True).compare(_schema(old), _schema(new)).modified_tables
+        assert diff.renamed_columns == []
+        assert [c.name for c in diff.dropped_columns] == ['is_deleted']
+        assert [c.name for c in diff.added_columns] == ['is_vip']
+        assert 'RENAME' not in PostgresGenerator().generate_migration(
+            Comparator(detect_renames=True).compare(_schema(old), _schema(new)))
+
+    def test_moved_column_with_similar_name_is_renamed(self):
+        old = _table('users', USERS + [('adress', 'VARCHAR(200)'), ('age', 'INT')])
+        new = _table('users', USERS + [('age', 'INT'), ('address', 'VARCHAR(200)')])
+        diff, = Comparator(detect_renames=True).compare(_schema(old), _schema(new)).modified_tables
+        assert [(o.name, n.name) for o, n in diff.renamed_columns] == [('adress', 'address')]
+
+
+class TestRenameGenerators:
+    """Every generator emits renames before the statements that use the new names"""
+
+    def _plan(self):
+        old = _schema(_table('orders', ORDERS), _table('users', USERS))
+        renamed_users = [('id', 'INT'), ('email_address', 'VARCHAR(255)'), ('name', 'VARCHAR(100)'), ('age', 'INT')]
+        new = _schema(_table('purchase_orders', ORDERS), _table('users', renamed_users))
+        return Comparator(detect_renames=True).compare(old, new)
+
+    @pytest.mark.parametrize('generator, table_sql, column_sql', [
+        (PostgresGenerator(), 'ALTER TABLE "orders" RENAME TO "purchase_orders";',
+         'ALTER TABLE "users" RENAME COLUMN "email" TO "email_address";'),
+        (MySQLGenerator(), 'RENAME TABLE `orders` TO `purchase_orders`;',
+         'ALTER TABLE `users` RENAME COLUMN `email` TO `email_address`;'),
+        (SQLiteGenerator(), 'ALTER TABLE "orders" RENAME TO "purchase_orders";',
+         'ALTER TABLE "users" RENAME COLUMN "email" TO "email_address";'),
+        (OracleGenerator(), 'ALTER TABLE "orders" RENAME TO "purchase_orders";',
+         'ALTER TABLE "users" RENAME COLUMN "email" TO "email_address";'),
+        (DB2Generator(), 'RENAME TABLE "orders" TO "purchase_orders";',
+         'ALTER TABLE "users" RENAME COLUMN "email" TO "email_address";'),
+        (SnowflakeGenerator(), 'ALTER TABLE "orders" RENAME TO "purchase_orders";',
+         'ALTER TABLE "users" RENAME COLUMN "email" TO "email_address";'),
+        (MSSQLGenerator(), "EXEC sp_rename 'orders', 'purchase_orders';",
+         "EXEC sp_rename 'users.email', 'email_address', 'COLUMN';"),
+    ])
+    def test_forward(self, generator, table_sql, column_sql):
+        sql = generator.generate_migration(self._plan())
+        assert table_sql in sql and column_sql in sql
+        assert 'DROP TABLE' not in sql and 'DROP COLUMN' not in sql
+        assert sql.index(column_sql) < sql.index('age')
+
+    def test_rollback_renames_back_last(self):
+        sql = PostgresGenerator().generate_rollback_migration(self._plan())
+        lines = sql.split('\n\n')
+        assert lines[-1] == 'ALTER TABLE "purchase_orders" RENAME TO "orders";'
+        assert 'ALTER TABLE "users" RENAME COLUMN "email_address" TO "email";' in lines
+        assert lines.index('ALTER TABLE "users" DROP COLUMN "age";') < \
+            lines.index('ALTER TABLE "users" RENAME COLUMN "email_address" TO "email";')
+
+
+class TestRenameCli:
+    """`sf compare --detect-renames`"""
+
+    def test_plan_and_sql(self, tmp_path, run_compare, capsys):
+        sql_out = tmp_path / 'out.sql'
+        run_compare("CREATE TABLE orders (id INT PRIMARY KEY, total DECIMAL(10,2), note TEXT, created_at TIMESTAMP);\n",
+                    "CREATE TABLE purchase_orders (id INT PRIMARY KEY, total DECIMAL(10,2), remark TEXT, created_at TIMESTAMP);\n",
+                    '--dialect', 'postgres', '--detect-renames', '--plan', '--no-color', '--sql-out', str(sql_out))
+        out = capsys.readouterr().out
+        assert 'Rename Table: orders -> purchase_orders' in out
+        assert 'Rename Column: note -> remark' in out
+        sql = sql_out.read_text()
+        assert 'ALTER TABLE "orders" RENAME TO "purchase_orders";' in sql
+        assert 'ALTER TABLE "purchase_orders" RENAME COLUMN "note" TO "remark";' in sql
+        assert 'DROP' not in sql
@@ -0,0 +1,100 @@
+"""
+Tests for the single-pass preprocessing rewrite engine.
+"""
+import re
+
+from schemaforge.parsers.rewrite import RewriteEngine, RewriteRule, get_rewrite_engine
+from schemaforge.parsers.sqlglot_adapter import SqlglotParser
+from schemaforge.parsers.oracle import OracleParser
+from schemaforge.parsers.postgres import PostgresParser
+from schemaforge.parsers.sqlite import SQLiteParser
+
+
+class TestRewriteEngine:
+    """Test rule application and skipping of literals/comments"""
+
+    RULES = (
+        RewriteRule('without_rowid', r'\s+WITHOUT\s+ROWID'),
+        RewriteRule('swap', r'(\w+)\s*<->\s*(\w+)', r'\2 <-> \1'),
+    )
+
+    def test_applies_all_rules_in_one_pass(self):
+        counts = {}
+        out = RewriteEngine(self.RULES).rewrite("CREATE TABLE t (a INT) WITHOUT ROWID; SELECT a <-> b;", counts)
+        assert out == "CREATE TABLE t (a INT); SELECT b <-> a;"
+        assert counts == {'without_rowid': 1, 'swap': 1}
+
+    def test_string_literals_and_comments_are_skipped(self):
+        sql = ("COMMENT ON TABLE t IS 'kept WITHOUT ROWID';\n"
+               "-- x WITHOUT ROWID\n"
+               "/* y WITHOUT ROWID */\n"
+               'SELECT "col WITHOUT ROWID";\n'
+               "CREATE FUNCTION f() AS $$ SELECT 1 WITHOUT ROWID $$;\n"
+               "CREATE TABLE t (a INT) WITHOUT ROWID;")
+        counts = {}
+        out = RewriteEngine(self.RULES).rewrite(sql, counts)
+        assert out.count('WITHOUT ROWID') == 5
+        assert out.endswith("CREATE TABLE t (a INT);")
+        assert counts == {'without_rowid': 1}
+
+    def test_backslash_escaped_quote(self):
+        sql = r"SELECT 'it\'s WITHOUT ROWID'; CREATE TABLE t (a INT) WITHOUT ROWID;"
+        out = RewriteEngine(self.RULES, backslash_escapes=True).rewrite(sql)
+        assert out == r"SELECT 'it\'s WITHOUT ROWID'; CREATE TABLE t (a INT);"
+
+    def test_scoped_flags(self):
+        rules = (
+            RewriteRule('dotall', r'STORAGE\s*\(.*?\)', flags=re.IGNORECASE | re.DOTALL),
+            RewriteRule('case', r'KEEPCASE', 'x', flags=0),
+        )
+        out = RewriteEngine(rules).rewrite("storage (\n a 1\n) keepcase KEEPCASE")
+        assert out == " keepcase x"
+
+    def test_dialect_filter_and_cache(self):
+        rules = (RewriteRule('only_sqlite', r'FOO', 'BAR', dialects=('sqlite',)),)
+        assert get_rewrite_engine(rules, 'sqlite').rewrite("FOO") == "BAR"
+        assert get_rewrite_engine(rules, 'postgres').rewrite("FOO") == "FOO"
+        assert get_rewrite_engine(rules, 'sqlite') is get_rewrite_engine(rules, 'sqlite')
+
+    def test_callable_replacement(self):
+        rules = (RewriteRule('upper', r'lower_(\w+)', lambda m: m.group(1).upper()),)
+        assert RewriteEngine(rules).rewrite("x lower_abc") == "x ABC"
+
+
+class TestParserRewrites:
+    """Parsers use the engine for _preprocess"""
+
+    def test_postgres_exclude_using_stripped(self):
+        parser = PostgresParser()
+        out = parser._preprocess("CREATE TABLE r (id INT, EXCLUDE USING gist (id WITH =));")
+        assert 'EXCLUDE' not in out
+        assert parser.rewrite_counts == {'exclude_using': 1}
+
+    def test_comment_text_not_rewritten(self):
+        schema = PostgresParser().parse(
+            "CREATE TABLE t (id INT);\n"
+            "COMMENT ON TABLE t IS 'uses EXCLUDE USING gist (id) semantics';")
+        assert schema.get_table('t').comment == 'uses EXCLUDE USING gist (id) semantics'
+
+    def test_oracle_rules_run_before_base(self):
+        parser = OracleParser()
+        out = parser._preprocess("CREATE TABLE t (id NUMBER) ORGANIZATION INDEX PCTFREE 10 "
+                                 "STORAGE (INITIAL 64K\n NEXT 1M) TABLESPACE users;")
+        assert out == "CREATE TABLE t (id NUMBER);"
+        assert set(parser.rewrite_counts) == {'organization_index', 'pctfree', 'storage', 'tablespace'}
+
+    def test_counts_reset_per_parse(self):
+        parser = SQLiteParser()
+        parser.parse("CREATE TABLE a (id INT) STRICT;")
+        assert parser.rewrite_counts == {'strict': 1}
+        parser.parse("CREATE TABLE b (id INT);")
+        assert parser.rewrite_counts == {}
+
+    def test_sqlite_flags_still_detected(self):
+        schema = SQLiteParser().parse("CREATE TABLE a (id INT) WITHOUT ROWID;\nCREATE TABLE b (id INT) STRICT;")
+        assert schema.get_table('a').without_rowid is True
+        assert schema.get_table('b').is_strict is True
+
+    def test_base_rules_are_dialect_scoped(self):
+        assert 'CLUSTERED' in SqlglotParser(dialect='postgres')._preprocess("CREATE CLUSTERED INDEX i ON t (a);")
+        assert 'CLUSTERED' not in SqlglotParser(dialect='tsql')._preprocess("CREATE CLUSTERED INDEX i ON t (a);")
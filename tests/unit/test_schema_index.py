@@ -0,0 +1,87 @@
+"""
+Tests for the case-folded table index kept by Schema.
+"""
+import copy
+import pickle
+
+from schemaforge.models import Schema, Table, TableList
+
+
+def _schema(*names):
+    schema = Schema()
+    for name in names:
+        schema.add_table(Table(name=name))
+    return schema
+
+
+class TestSchemaTableIndex:
+    """get_table/add_table/remove_table go through the name index"""
+
+    def test_lookup_is_case_insensitive(self):
+        schema = _schema('Users', 'orders')
+        assert schema.get_table('USERS').name == 'Users'
+        assert schema.get_table('Orders').name == 'orders'
+        assert schema.get_table('missing') is None
+        assert schema.get_table('') is None
+        assert schema.get_table(None) is None
+
+    def test_add_table_replaces_duplicate(self):
+        schema = _schema('users', 'orders')
+        replacement = Table(name='USERS', comment='new')
+        schema.add_table(replacement)
+        assert [t.name for t in schema.tables] == ['orders', 'USERS']
+        assert schema.get_table('users') is replacement
+
+    def test_remove_table(self):
+        schema = _schema('a', 'b', 'c')
+        removed = schema.remove_table('B')
+        assert removed.name == 'b'
+        assert [t.name for t in schema.tables] == ['a', 'c']
+        assert schema.get_table('b') is None
+        assert schema.remove_table('b') is None
+
+    def test_direct_list_mutation_is_seen(self):
+        schema = _schema('a')
+        schema.get_table('a')  # build the index
+        schema.tables.append(Table(name='b'))
+        schema.tables.insert(0, Table(name='c'))
+        assert schema.get_table('b') is not None
+        assert schema.get_table('c') is schema.tables[0]
+
+        del schema.tables[0]
+        assert schema.get_table('c') is None
+        schema.tables[0] = Table(name='d')
+        assert schema.get_table('a') is None
+        assert schema.get_table('d') is schema.tables[0]
+        schema.tables.clear()
+        assert schema.get_table('d') is None
+
+    def test_assigned_plain_list_is_indexed(self):
+        schema = Schema(tables=[Table(name='x')])
+        assert isinstance(schema.tables, TableList)
+        schema.tables = [t for t in schema.tables] + [Table(name='y')]
+        assert isinstance(schema.tables, TableList)
+        assert schema.get_table('Y').name == 'y'
+
+    def test_first_duplicate_wins_like_a_scan(self):
+        first, second = Table(name='t'), Table(name='T')
+        schema = Schema()
+        schema.tables.extend([first, second])
+        assert schema.get_table('t') is first
+        schema.tables.discard(first)
+        assert schema.get_table('t') is second
+
+    def test_renamed_table_after_reindex(self):
+        schema = _schema('old')
+        table = schema.get_table('old')
+        table.name = 'new'
+        assert schema.get_table('old') is None
+        schema.tables.reindex()
+        assert schema.get_table('new') is table
+
+    def test_pickle_and_deepcopy_keep_index(self):
+        schema = _schema('a', 'b')
+        for clone in (pickle.loads(pickle.dumps(schema)), copy.deepcopy(schema)):
+            assert isinstance(clone.tables, TableList)
+            assert clone.get_table('B') is clone.tables[1]
+            assert clone == schema
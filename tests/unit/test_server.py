@@ -0,0 +1,249 @@
+"""
+Tests for the `sf serve` daemon, its JSON-RPC API and `--server` forwarding.
+"""
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from schemaforge.cache import MemoryParseCache
+from schemaforge.main import get_parser, main, parse_source
+from schemaforge.server import (INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, SchemaServer, ServerError,
+                                ServerUnavailable, call)
+
+
+@pytest.fixture
+def socket_dir():
+    # AF_UNIX paths are limited to ~100 characters; pytest's tmp_path can be longer
+    path = tempfile.mkdtemp(prefix='sf-')
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def server(socket_dir):
+    instance = SchemaServer(os.path.join(socket_dir, 'sf.sock'))
+    thread = threading.Thread(target=instance.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(instance.socket_path):
+            break
+        time.sleep(0.01)
+    yield instance
+    instance.stop()
+    thread.join(timeout=5)
+
+
+def _schemas(tmp_path):
+    source, target = tmp_path / 'source', tmp_path / 'target'
+    for directory in (source, target):
+        directory.mkdir()
+        (directory / 'a.sql').write_text("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50));\n")
+    (target / 'b.sql').write_text("CREATE TABLE orders (id INT PRIMARY KEY);\nCREATE INDEX ix_users_name ON users (name);\n")
+    return source, target
+
+
+def _argv(source, target, *extra):
+    return ['schemaforge', 'compare', '--source', str(source), '--target', str(target), '--dialect', 'postgres', *extra]
+
+
+class TestMemoryParseCache:
+    """The in-process fragment LRU of `sf serve`"""
+
+    def test_returns_copies(self):
+        cache = MemoryParseCache()
+        cache.put('k', [['table']])
+        cache.get('k')[0].append('mutated')
+        assert cache.get('k') == [['table']]
+        assert (cache.hits, cache.misses) == (2, 0)
+        assert cache.get('missing') is None and cache.misses == 1
+
+    def test_lru_eviction(self):
+        cache = MemoryParseCache(max_bytes=400)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, 'x' * 100)
+        cache.get('a')
+        cache.put('d', 'x' * 100)
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('d') is not None
+        assert cache.total_bytes <= 400
+
+    def test_whole_schema_reuse(self, tmp_path):
+        source, _ = _schemas(tmp_path)
+        cache = MemoryParseCache()
+        parser = get_parser('postgres')
+        first = parse_source(parser, str(source), cache)
+        with patch.object(parser, 'apply_fragment', side_effect=AssertionError('merged again')):
+            second = parse_source(parser, str(source), cache)
+        assert second.get_table('users') is not None and second is not first
+        # Reused schemas come with their fingerprints
+        assert second.get_table('users').fingerprint(compute=False) == first.get_table('users').fingerprint()
+
+    def test_not_shared_with_workers(self):
+        import pickle
+        with pytest.raises(TypeError):
+            pickle.dumps(MemoryParseCache())
+
+
+class TestDispatch:
+    """JSON-RPC errors and version checks"""
+
+    def test_errors(self):
+        server = SchemaServer('/unused.sock')
+        assert server.dispatch({"jsonrpc": "2.0", "id": 1, "method": "nope"})["error"]["code"] == METHOD_NOT_FOUND
+        assert server.dispatch({"id": 1, "method": "ping"})["error"]["code"] == -32600
+        response = server.dispatch({"jsonrpc": "2.0", "id": 7, "method": "compare", "params": {"args": {"dialect": "access"}}})
+        assert response == {"jsonrpc": "2.0", "id": 7, "error": {"code": INVALID_PARAMS, "message": response["error"]["message"]}}
+
+    def test_version_mismatch(self):
+        server = SchemaServer('/unused.sock')
+        response = server.dispatch({"jsonrpc": "2.0", "id": 1, "method": "compare",
+                                    "params": {"args": {"dialect": "postgres"}, "version": "0.0.1"}})
+        assert response["error"]["code"] == -32001
+
+
+class TestServer:
+    """`sf serve` over its Unix socket"""
+
+    def test_ping_and_stats(self, server):
+        assert call(server.socket_path, 'ping')["pid"] == os.getpid()
+        assert call(server.socket_path, 'stats')["requests"] == 2
+        assert oct(os.stat(server.socket_path).st_mode & 0o777) == '0o600'
+
+    def test_invalid_json(self, server):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(server.socket_path)
+            sock.sendall(b'{not json\n')
+            response = json.loads(sock.makefile('rb').readline())
+        assert response["error"]["code"] == PARSE_ERROR
+
+    def test_unknown_method(self, server):
+        with pytest.raises(ServerError) as excinfo:
+            call(server.socket_path, 'drop_database')
+        assert excinfo.value.code == METHOD_NOT_FOUND
+
+    def test_compare_forwarding(self, server, tmp_path, capsys):
+        source, target = _schemas(tmp_path)
+        sql_out = tmp_path / 'migration.sql'
+        argv = _argv(source, target, '--server', '--socket', server.socket_path, '--sql-out', str(sql_out), '--plan', '--no-color')
+        with patch('sys.argv', argv):
+            main()
+        out = capsys.readouterr().out
+        assert 'orders' in out and f"Migration SQL saved to {sql_out}" in out
+        assert 'CREATE TABLE "orders"' in sql_out.read_text()
+
+        # Unchanged files come from the LRU; only the edited file is parsed again
+        with patch('sys.argv', argv):
+            main()
+        (target / 'b.sql').write_text("CREATE TABLE orders (id INT PRIMARY KEY, total INT);\n")
+        with patch('sys.argv', argv):
+            main()
+        stats = call(server.socket_path, 'stats')
+        assert stats["parsers"] == ['postgres']
+        assert stats["cache_misses"] == 3
+        assert 'total' in sql_out.read_text()
+
+    def test_compare_uses_fingerprints(self, server, tmp_path, capsys):
+        from schemaforge.comparator import Comparator
+        source, target = _schemas(tmp_path)
+        with patch('sys.argv', _argv(source, target, '--server', '--socket', server.socket_path)), \
+                patch.object(Comparator, '__init__', autospec=True, side_effect=Comparator.__init__) as init:
+            main()
+        assert init.call_args.kwargs["fingerprints"] is True
+
+    def test_messages_are_replayed(self, server, tmp_path, capsys):
+        source, target = _schemas(tmp_path)
+        with patch('sys.argv', _argv(source, target, '--server', '--socket', server.socket_path, '--plan', '-v')):
+            main()
+        assert f"Parse cache for {target}" in capsys.readouterr().err
+        # Without -v the client asks for warnings only
+        with patch('sys.argv', _argv(source, target, '--server', '--socket', server.socket_path, '--plan')):
+            main()
+        assert "Parse cache" not in capsys.readouterr().err
+
+    def test_failure_exits(self, server, tmp_path):
+        source, _ = _schemas(tmp_path)
+        argv = _argv(source, tmp_path / 'missing', '--server', '--socket', server.socket_path, '--plan')
+        with patch('sys.argv', argv), pytest.raises(SystemExit) as excinfo:
+            main()
+        assert excinfo.value.code == 1
+
+    def test_snapshot(self, server, tmp_path, capsys):
+        source, _ = _schemas(tmp_path)
+        out = tmp_path / 'main.sfsnap'
+        argv = ['schemaforge', 'snapshot', '--source', str(source), '--out', str(out), '--dialect', 'postgres',
+                '--server', '--socket', server.socket_path]
+        with patch('sys.argv', argv):
+            main()
+        assert out.exists() and 'Snapshot of 1 tables' in capsys.readouterr().out
+
+    def test_small_edit_latency(self, server, tmp_path):
+        source, target = _schemas(tmp_path)
+        options = {"args": {}, "version": call(server.socket_path, 'ping')["version"]}
+        with patch('schemaforge.server.call', lambda path, method, params: options.update(params) or {}):
+            with patch('sys.argv', _argv(source, target, '--server', '--sql-out', str(tmp_path / 'm.sql'))):
+                main()
+        call(server.socket_path, 'compare', options)
+        (target / 'b.sql').write_text("CREATE TABLE orders (id INT PRIMARY KEY, note TEXT);\n")
+        start = time.perf_counter()
+        call(server.socket_path, 'compare', options)
+        assert time.perf_counter() - start < 0.5  # well under in practice; generous for loaded CI hosts
+
+    def test_shutdown(self, socket_dir):
+        instance = SchemaServer(os.path.join(socket_dir, 'sf.sock'))
+        thread = threading.Thread(target=instance.serve_forever, daemon=True)
+        thread.start()
+        for _ in range(100):
+            if os.path.exists(instance.socket_path):
+                break
+            time.sleep(0.01)
+        call(instance.socket_path, 'shutdown')
+        thread.join(timeout=5)
+        assert not thread.is_alive() and not os.path.exists(instance.socket_path)
+
+    def test_refuses_second_server(self, server):
+        with pytest.raises(ServerError, match='already running'):
+            SchemaServer(server.socket_path)._bind()
+
+
+class TestFallback:
+    """`--server` runs locally when no server answers"""
+
+    def test_runs_locally_without_server(self, socket_dir, tmp_path, capsys):
+        source, target = _schemas(tmp_path)
+        argv = _argv(source, target, '--server', '--socket', os.path.join(socket_dir, 'none.sock'), '--plan', '--no-color')
+        with patch('sys.argv', argv):
+            main()
+        captured = capsys.readouterr()
+        assert 'running locally' in captured.err and 'orders' in captured.out
+
+    def test_call_raises_unavailable(self, socket_dir):
+        with pytest.raises(ServerUnavailable):
+            call(os.path.join(socket_dir, 'none.sock'), 'ping')
+
+    def test_stale_socket_is_replaced(self, socket_dir):
+        path = os.path.join(socket_dir, 'sf.sock')
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        instance = SchemaServer(path)
+        instance._bind()
+        instance._server.server_close()
+        assert os.path.exists(path)
+
+    def test_profile_is_rejected(self, tmp_path):
+        source, target = _schemas(tmp_path)
+        with patch('sys.argv', _argv(source, target, '--server', '--profile')), pytest.raises(SystemExit):
+            main()
+
+    def test_dialect_required(self, tmp_path):
+        source, target = _schemas(tmp_path)
+        argv = ['schemaforge', 'compare', '--source', str(source), '--target', str(target)]
+        with patch('sys.argv', argv), pytest.raises(SystemExit):
+            main()
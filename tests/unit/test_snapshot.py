@@ -0,0 +1,168 @@
+"""
+Tests for schema snapshots and `sf compare --source-snapshot`.
+"""
+import json
+import logging
+import os
+from unittest.mock import patch
+
+import pytest
+
+from schemaforge.main import get_parser, main, read_sql_source
+from schemaforge.snapshot import (SNAPSHOT_MAGIC, SnapshotError, load_or_rebuild, load_snapshot,
+                                  read_header, stale_reason, write_snapshot)
+
+SOURCE = {
+    'tables.sql': "CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(255));\n",
+    'more/orders.sql': "CREATE TABLE orders (id INT, user_id INT);\nCREATE INDEX ix_orders_user ON orders (user_id);\n",
+}
+
+
+def _write_tree(root, files):
+    for name, content in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+
+def _parse(path):
+    return get_parser('postgres').parse(read_sql_source(path))
+
+
+class TestSnapshotFormat:
+    """Round trip, header contents and corrupt files"""
+
+    def test_round_trip(self, tmp_path):
+        src = tmp_path / 'src'
+        _write_tree(src, SOURCE)
+        schema = _parse(str(src))
+        snap = str(tmp_path / 'main.sfsnap')
+        header = write_snapshot(snap, schema, 'postgres', str(src))
+
+        assert open(snap, 'rb').read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+        assert read_header(snap) == header
+        assert sorted(header['files']) == ['more/orders.sql', 'tables.sql']
+        assert header['dialect'] == 'postgres' and header['tables'] == 2
+        loaded_header, loaded = load_snapshot(snap)
+        assert loaded_header == header
+        assert loaded.to_dict() == schema.to_dict()
+        assert loaded.get_table('ORDERS').indexes[0].name == 'ix_orders_user'
+
+    def test_rejects_other_files(self, tmp_path):
+        bad = tmp_path / 'bad.sfsnap'
+        bad.write_bytes(b'not a snapshot')
+        with pytest.raises(SnapshotError, match='not a SchemaForge snapshot'):
+            load_snapshot(str(bad))
+
+    def test_truncated_payload(self, tmp_path):
+        src = tmp_path / 'src'
+        _write_tree(src, SOURCE)
+        snap = tmp_path / 'main.sfsnap'
+        write_snapshot(str(snap), _parse(str(src)), 'postgres', str(src))
+        snap.write_bytes(snap.read_bytes()[:-10])
+        with pytest.raises(SnapshotError, match='truncated'):
+            load_snapshot(str(snap))
+
+
+class TestSnapshotStaleness:
+    """Dialect, versions and file hashes invalidate a snapshot"""
+
+    def _snapshot(self, tmp_path):
+        src = tmp_path / 'src'
+        _write_tree(src, SOURCE)
+        snap = str(tmp_path / 'main.sfsnap')
+        return str(src), snap, write_snapshot(snap, _parse(str(src)), 'postgres', str(src))
+
+    def test_current_snapshot(self, tmp_path):
+        src, _, header = self._snapshot(tmp_path)
+        assert stale_reason(header, 'postgres') is None
+        assert stale_reason(header, 'mysql').startswith('dialect')
+        assert stale_reason(header, 'postgres', strict=True) == 'strict mode differs'
+
+    def test_changed_file_and_version(self, tmp_path):
+        src, _, header = self._snapshot(tmp_path)
+        with open(os.path.join(src, 'tables.sql'), 'a') as f:
+            f.write("CREATE TABLE extra (id INT);\n")
+        assert 'changed' in stale_reason(header, 'postgres')
+        header['versions']['sqlglot'] = '0.0.1'
+        assert stale_reason(header, 'postgres').startswith('sqlglot')
+
+    def test_missing_source_skips_hash_check(self, tmp_path, caplog):
+        src, _, header = self._snapshot(tmp_path)
+        header['source'] = str(tmp_path / 'gone')
+        with caplog.at_level(logging.WARNING):
+            assert stale_reason(header, 'postgres') is None
+        assert f"{tmp_path / 'gone'} does not exist" in caplog.text
+
+    def test_relative_source_is_recorded_absolute(self, tmp_path, monkeypatch):
+        _write_tree(tmp_path / 'src', SOURCE)
+        monkeypatch.chdir(tmp_path)
+        header = write_snapshot('main.sfsnap', _parse('src'), 'postgres', 'src')
+        assert header['source'] == str(tmp_path / 'src')
+        # Checked from another directory, the source is still found
+        monkeypatch.chdir(tmp_path / 'src')
+        with open('tables.sql', 'a') as f:
+            f.write("CREATE TABLE extra (id INT);\n")
+        assert 'changed' in stale_reason(read_header(str(tmp_path / 'main.sfsnap')), 'postgres')
+
+    def test_stale_snapshot_is_rebuilt(self, tmp_path):
+        src, snap, _ = self._snapshot(tmp_path)
+        with open(os.path.join(src, 'tables.sql'), 'a') as f:
+            f.write("CREATE TABLE extra (id INT);\n")
+        calls = []
+
+        def parse(path):
+            calls.append(path)
+            return _parse(path)
+
+        schema = load_or_rebuild(snap, 'postgres', parse)
+        assert calls == [src] and schema.get_table('extra') is not None
+        assert load_or_rebuild(snap, 'postgres', parse).get_table('extra') is not None
+        assert calls == [src]
+
+    def test_stale_payload_is_not_loaded(self, tmp_path):
+        src, snap, _ = self._snapshot(tmp_path)
+        with open(os.path.join(src, 'tables.sql'), 'a') as f:
+            f.write("CREATE TABLE extra (id INT);\n")
+        with patch('schemaforge.snapshot.load_snapshot', side_effect=AssertionError('payload loaded')):
+            assert load_or_rebuild(snap, 'postgres', _parse).get_table('extra') is not None
+
+    def test_unusable_without_source(self, tmp_path):
+        with pytest.raises(SnapshotError, match='not available'):
+            load_or_rebuild(str(tmp_path / 'missing.sfsnap'), 'postgres', _parse)
+
+
+class TestSnapshotCli:
+    """`sf snapshot` and `sf compare --source-snapshot`"""
+
+    def _run(self, *argv):
+        with patch('sys.argv', ['schemaforge', *argv]):
+            main()
+
+    def test_compare_against_snapshot(self, tmp_path):
+        src = tmp_path / 'src'
+        _write_tree(src, SOURCE)
+        target = tmp_path / 'target.sql'
+        target.write_text(SOURCE['tables.sql'] + "CREATE TABLE orders (id INT, user_id BIGINT);\n")
+        snap = str(tmp_path / 'main.sfsnap')
+        self._run('snapshot', '--source', str(src), '--out', snap, '--dialect', 'postgres')
+
+        direct, via_snapshot = tmp_path / 'direct.json', tmp_path / 'snap.json'
+        self._run('compare', '--source', str(src), '--target', str(target), '--dialect', 'postgres',
+                  '--json-out', str(direct))
+        with patch('schemaforge.main.get_parser', side_effect=get_parser) as spy:
+            self._run('compare', '--source-snapshot', snap, '--target', str(target), '--dialect', 'postgres',
+                      '--json-out', str(via_snapshot))
+        assert spy.call_count == 1  # only the target was parsed
+        assert json.loads(via_snapshot.read_text()) == json.loads(direct.read_text())
+
+    @pytest.mark.parametrize('argv', [
+        ['compare', '--target', 'x.sql', '--dialect', 'postgres'],
+        ['compare', '--source', 'x.sql', '--dialect', 'postgres'],
+        ['snapshot', '--source', 'x.sql', '--dialect', 'postgres'],
+    ])
+    def test_missing_arguments(self, argv):
+        with pytest.raises(SystemExit) as exc:
+            self._run(*argv)
+        assert exc.value.code == 2
@@ -0,0 +1,107 @@
+"""
+Tests for the memory-mapped statement source and streaming parse.
+"""
+import os
+import pickle
+import tempfile
+
+import pytest
+
+from schemaforge.exceptions import StrictModeError
+from schemaforge.main import get_parser, parse_source, read_sql_source
+from schemaforge.parsers import sqlglot_adapter
+from schemaforge.parsers.postgres import PostgresParser
+from schemaforge.source import SqlSource, SqlStatement, iter_statements
+
+
+def _write(root, name, content, mode='w'):
+    path = os.path.join(root, name)
+    with open(path, mode) as f:
+        f.write(content)
+    return path
+
+
+class TestSqlSource:
+    """Test statement iteration and file:line tracking"""
+
+    def test_statements_carry_file_and_line(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            a = _write(tmpdir, 'a.sql', "CREATE TABLE a (id INT);\n\n-- note\nCREATE TABLE b (\n  id INT\n);\n")
+            b = _write(tmpdir, 'b.sql', "\n\nALTER TABLE a ADD COLUMN x INT;")
+            stmts = list(SqlSource(tmpdir).iter_statements())
+            assert [s.location for s in stmts] == [f"{a}:1", f"{a}:3", f"{b}:3"]
+            assert stmts[1].strip().startswith('-- note')
+
+    def test_crlf_and_utf8_decoding(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, 'a.sql', "CREATE TABLE a (id INT);\r\nCOMMENT ON TABLE a IS 'café';\r\n".encode('utf-8'), 'wb')
+            stmts = list(SqlSource(path).iter_statements())
+            assert stmts[1].line == 2
+            assert '\r' not in stmts[1]
+            assert "café" in stmts[1]
+
+    def test_empty_files_are_skipped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write(tmpdir, 'a.sql', "")
+            _write(tmpdir, 'b.sql', "CREATE TABLE b (id INT);")
+            assert len(list(SqlSource(tmpdir).iter_statements())) == 1
+            assert read_sql_source(tmpdir) == "\nCREATE TABLE b (id INT);"
+
+    def test_go_lines_keep_line_numbers(self):
+        sql = "CREATE TABLE a (id INT)\nGO\nCREATE TABLE b (id INT)\nGO\n"
+        assert [s.line for s in iter_statements(sql.encode(), 'x.sql', batch_separator=True)] == [1, 3]
+
+    def test_statement_pickles_with_location(self):
+        stmt = SqlStatement("SELECT 1;", "x.sql", 7)
+        copy = pickle.loads(pickle.dumps(stmt))
+        assert copy == "SELECT 1;" and copy.location == "x.sql:7"
+
+
+class TestStreamingParse:
+    """Streaming parse must match the string parse"""
+
+    SQL = "CREATE TABLE users (id INT PRIMARY KEY);\n" + \
+          "".join(f"CREATE TABLE t{i} (id INT, val TEXT);\n" for i in range(20)) + \
+          "ALTER TABLE users ADD COLUMN name TEXT;\nCOMMENT ON TABLE users IS 'u';\n"
+
+    def test_directory_stream_matches_text_parse(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write(tmpdir, '01.sql', self.SQL)
+            _write(tmpdir, '02.sql', "CREATE INDEX idx_t1 ON t1 (val);\n")
+            streamed = parse_source(get_parser('postgres'), tmpdir)
+            text = get_parser('postgres').parse(read_sql_source(tmpdir))
+            assert streamed.to_dict() == text.to_dict()
+            assert streamed.get_table('t1').indexes[0].name == 'idx_t1'
+
+    def test_pool_stream_matches_serial(self, monkeypatch):
+        monkeypatch.setattr(sqlglot_adapter, 'PARALLEL_MIN_STATEMENTS', 2)
+        monkeypatch.setattr(sqlglot_adapter, 'PARALLEL_BATCH_SIZE', 3)
+        serial = PostgresParser().parse(self.SQL)
+        parallel = PostgresParser(jobs=2).parse(self.SQL)
+        assert serial.to_dict() == parallel.to_dict()
+
+    def test_statements_consumed_incrementally(self):
+        consumed = []
+
+        def statements():
+            for i in range(5):
+                consumed.append(i)
+                yield SqlStatement(f"CREATE TABLE t{i} (id INT);")
+
+        parsed = PostgresParser()._iter_parsed(statements())
+        next(parsed)
+        assert consumed == [0]
+
+    def test_strict_error_reports_file_and_line(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, 'bad.sql', "CREATE TABLE a (id INT);\n\nSELECT 1;\n")
+            with pytest.raises(StrictModeError) as exc_info:
+                parse_source(get_parser('postgres', strict=True), path)
+            assert exc_info.value.location == f"{path}:3"
+            assert str(exc_info.value).startswith(f"{path}:3: ")
+
+    def test_db2_properties_from_streamed_statement(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, 'a.sql', "CREATE TABLE t (id INT) IN DB1.TS1;")
+            schema = parse_source(get_parser('db2'), path)
+            assert schema.get_table('t').tablespace == 'ts1'
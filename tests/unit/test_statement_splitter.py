@@ -0,0 +1,136 @@
+"""
+Tests for the statement splitting front end and parallel statement parsing.
+"""
+import pytest
+
+from schemaforge.parsers import sqlglot_adapter
+from schemaforge.parsers.splitter import split_statements, iter_statement_spans
+from schemaforge.parsers.postgres import PostgresParser
+from schemaforge.parsers.mssql import MSSQLParser
+from schemaforge.main import get_parser
+
+
+class TestSplitStatements:
+    """Test split_statements boundary detection"""
+
+    def test_simple_split(self):
+        stmts = split_statements("CREATE TABLE a (id INT); CREATE TABLE b (id INT);")
+        assert len(stmts) == 2
+        assert stmts[0] == "CREATE TABLE a (id INT);"
+        assert stmts[1].strip() == "CREATE TABLE b (id INT);"
+
+    def test_semicolon_in_string_literal(self):
+        stmts = split_statements("INSERT INTO t VALUES ('a;b'); SELECT 1;")
+        assert len(stmts) == 2
+        assert "'a;b'" in stmts[0]
+
+    def test_escaped_quote_in_literal(self):
+        stmts = split_statements("COMMENT ON TABLE t IS 'it''s; fine'; SELECT 1;")
+        assert len(stmts) == 2
+        assert "'it''s; fine'" in stmts[0]
+
+    def test_backslash_escapes(self):
+        sql = r"INSERT INTO t VALUES ('it\'s; here'); SELECT 1;"
+        assert len(split_statements(sql, backslash_escapes=True)) == 2
+
+    def test_quoted_identifier(self):
+        stmts = split_statements('CREATE TABLE "odd;name" (id INT); SELECT 1;')
+        assert len(stmts) == 2
+
+    def test_dollar_quoted_body(self):
+        sql = """CREATE FUNCTION f() RETURNS INT AS $$ BEGIN RETURN 1; END; $$ LANGUAGE plpgsql;
+CREATE TABLE t (id INT);"""
+        stmts = split_statements(sql)
+        assert len(stmts) == 2
+        assert "RETURN 1; END;" in stmts[0]
+
+    def test_tagged_dollar_quote(self):
+        sql = "CREATE FUNCTION f() AS $body$ SELECT 1; $$ nested $$; $body$; SELECT 2;"
+        assert len(split_statements(sql)) == 2
+
+    def test_dollar_in_identifier_is_not_quote(self):
+        stmts = split_statements("SELECT * FROM V$SESSION; SELECT 1 FROM SYS$X$;")
+        assert len(stmts) == 2
+
+    def test_nested_block_comments(self):
+        sql = "/* outer /* inner; */ still comment; */ CREATE TABLE a (id INT); SELECT 1;"
+        stmts = split_statements(sql)
+        assert len(stmts) == 2
+        assert stmts[0].startswith("/* outer")
+
+    def test_line_comment(self):
+        sql = "-- comment; with semicolon\nCREATE TABLE a (id INT);"
+        assert len(split_statements(sql)) == 1
+
+    def test_trailing_statement_without_semicolon(self):
+        stmts = split_statements("CREATE TABLE a (id INT); CREATE TABLE b (id INT)")
+        assert len(stmts) == 2
+        assert stmts[1].strip() == "CREATE TABLE b (id INT)"
+
+    def test_blank_chunks_dropped(self):
+        assert split_statements("  \n  ") == []
+
+    def test_go_batch_separator(self):
+        sql = "CREATE TABLE a (id INT)\nGO\nCREATE TABLE b (id INT)\ngo\n"
+        stmts = split_statements(sql, batch_separator=True)
+        assert len(stmts) == 2
+        assert all("GO" not in s.upper().split() for s in stmts)
+
+    def test_spans_on_bytes(self):
+        data = b"CREATE TABLE a (id INT); SELECT ';';"
+        spans = list(iter_statement_spans(data))
+        assert [data[s:e] for s, e in spans] == [b"CREATE TABLE a (id INT);", b" SELECT ';';"]
+
+    def test_spans_are_contiguous(self):
+        sql = "A; /* ; */ B; 'x;' C"
+        spans = list(iter_statement_spans(sql))
+        assert spans[0][0] == 0
+        for (s1, e1), (s2, e2) in zip(spans, spans[1:]):
+            assert e1 == s2
+        assert spans[-1][1] == len(sql)
+
+
+class TestParallelParse:
+    """Parsing through the process pool must match the serial parse"""
+
+    SQL = """
+CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(255) NOT NULL);
+CREATE TABLE orders (id INT PRIMARY KEY, user_id INT REFERENCES users(id));
+ALTER TABLE users ADD COLUMN name TEXT;
+COMMENT ON TABLE users IS 'Users; with a semicolon';
+CREATE INDEX idx_orders_user ON orders (user_id);
+CREATE VIEW v_users AS SELECT id FROM users;
+""" + "\n".join(f"CREATE TABLE t{i} (id INT, val TEXT);" for i in range(30))
+
+    def test_jobs_flag_on_parser(self):
+        assert get_parser('postgres', jobs=4).jobs == 4
+        assert get_parser('postgres').jobs == 1
+
+    def test_parallel_matches_serial(self, monkeypatch):
+        monkeypatch.setattr(sqlglot_adapter, 'PARALLEL_MIN_STATEMENTS', 2)
+        serial = PostgresParser().parse(self.SQL)
+        parallel = PostgresParser(jobs=2).parse(self.SQL)
+        assert serial.to_dict() == parallel.to_dict()
+        assert [t.name for t in parallel.tables][:2] == ['users', 'orders']
+        users = parallel.get_table('users')
+        assert users.get_column('name') is not None
+        assert users.comment == 'Users; with a semicolon'
+        assert parallel.get_table('orders').indexes[0].name == 'idx_orders_user'
+
+    def test_mssql_go_separator_parse(self):
+        sql = "CREATE TABLE a (id INT)\nGO\nCREATE TABLE b (id INT)\nGO\n"
+        schema = MSSQLParser().parse(sql)
+        assert {t.name for t in schema.tables} == {'a', 'b'}
+
+    def test_bad_statement_does_not_drop_others(self):
+        sql = "CREATE TABLE a (id INT); CREATE TABLE b (id INT;"
+        schema = PostgresParser().parse(sql)
+        assert schema.get_table('a') is not None
+
+    def test_command_fallback_keeps_table_with_constraints(self):
+        # Constraint lines are skipped, not the whole table
+        sql = "CREATE TABLE emp (id INT NOT NULL, PRIMARY KEY (id)) IN DB1.TS1 USING STOGROUP SG1;"
+        schema = get_parser('db2').parse(sql)
+        table = schema.get_table('emp')
+        assert table is not None
+        assert [c.name for c in table.columns] == ['id']
@@ -0,0 +1,87 @@
+"""
+Tests for streaming migration output (iter_migration / write_migration).
+"""
+import io
+from unittest.mock import patch
+
+import pytest
+
+from schemaforge.comparator import Comparator
+from schemaforge.main import get_generator
+from schemaforge.models import Column, ForeignKey, Index, Schema, Table
+
+DIALECTS = ['postgres', 'mysql', 'sqlite', 'oracle', 'db2', 'snowflake', 'mssql']
+
+
+def _plan():
+    old, new = Schema(), Schema()
+    old.add_table(Table(name='legacy', columns=[Column(name='id', data_type='INT')],
+                        indexes=[Index(name='ix_legacy', columns=['id'])]))
+    old.add_table(Table(name='users', columns=[Column(name='id', data_type='INT'), Column(name='email', data_type='TEXT')]))
+    new.add_table(Table(name='users', columns=[Column(name='id', data_type='INT'), Column(name='age', data_type='INT')]))
+    new.add_table(Table(name='orders', columns=[Column(name='id', data_type='INT'), Column(name='user_id', data_type='INT')],
+                        foreign_keys=[ForeignKey('fk_orders_customers', ['user_id'], 'customers', ['id'])]))
+    new.add_table(Table(name='customers', columns=[Column(name='id', data_type='INT')]))
+    return Comparator().compare(old, new)
+
+
+class TestWriteMigration:
+    """write_migration matches the string API and makes one pass"""
+
+    @pytest.mark.parametrize('dialect', DIALECTS)
+    def test_same_output_as_strings(self, dialect):
+        generator = get_generator(dialect)
+        plan = _plan()
+        out, rollback = io.StringIO(), io.StringIO()
+        count = generator.write_migration(plan, out, rollback, header='-- fwd\n', rollback_header='-- back\n')
+        assert out.getvalue() == '-- fwd\n' + generator.generate_migration(plan)
+        assert rollback.getvalue() == '-- back\n' + generator.generate_rollback_migration(plan)
+        assert count == len(list(generator.iter_migration(plan)))
+
+    def test_rollback_only(self):
+        generator = get_generator('postgres')
+        plan = _plan()
+        rollback = io.StringIO()
+        assert generator.write_migration(plan, rollback_out=rollback) == 0
+        assert rollback.getvalue() == generator.generate_rollback_migration(plan)
+
+    def test_one_pass_over_steps(self):
+        generator = get_generator('postgres')
+        with patch('schemaforge.generators.generic.migration_batches',
+                   wraps=__import__('schemaforge.dependencies', fromlist=['x']).migration_batches) as batches, \
+                patch.object(generator, 'step_statements', wraps=generator.step_statements) as forward, \
+                patch.object(generator, 'rollback_step_statements', wraps=generator.rollback_step_statements) as back:
+            generator.write_migration(_plan(), io.StringIO(), io.StringIO())
+        assert batches.call_count == 1
+        assert forward.call_count == back.call_count == 4  # 2 creates, 1 drop, 1 alter
+
+    def test_iter_migration_is_lazy(self):
+        generator = get_generator('postgres')
+        with patch.object(generator, 'step_statements', wraps=generator.step_statements) as rendered:
+            statements = generator.iter_migration(_plan())
+            assert rendered.call_count == 0
+            first = next(statements)
+            assert rendered.call_count == 1
+        assert first.startswith('CREATE TABLE "customers"')
+
+    def test_rollback_reverses_dependency_order(self):
+        sql = get_generator('postgres').generate_rollback_migration(_plan())
+        # orders references customers, so it was created after it and is dropped before it
+        assert sql.startswith('DROP TABLE IF EXISTS "orders";')
+        assert sql.index('DROP TABLE IF EXISTS "orders"') < sql.index('DROP TABLE IF EXISTS "customers"')
+
+
+class TestStreamingCli:
+    """--sql-out and --rollback-out written in one pass"""
+
+    def test_sql_and_rollback_files(self, tmp_path, run_compare):
+        sql_out, rollback_out = tmp_path / 'fwd.sql', tmp_path / 'back.sql'
+        run_compare("CREATE TABLE users (id INT, email TEXT);\nCREATE TABLE legacy (id INT);\n",
+                    "CREATE TABLE users (id INT, age INT);\nCREATE TABLE orders (id INT);\n",
+                    '--dialect', 'mysql', '--sql-out', str(sql_out), '--generate-rollback', '--rollback-out', str(rollback_out))
+        assert sql_out.read_text().startswith('-- Migration Script for mysql\n')
+        assert 'CREATE TABLE `orders`' in sql_out.read_text()
+        rollback = rollback_out.read_text()
+        assert rollback.startswith('-- Rollback Migration Script for mysql\n-- This script reverses the forward migration\n')
+        assert 'DROP TABLE IF EXISTS `orders`;' in rollback
+        assert 'CREATE TABLE `legacy`' in rollback